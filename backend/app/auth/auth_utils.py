@@ -2,7 +2,7 @@ from bson import ObjectId
 from jose import jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from app.models.funcionario import Funcionario
+from app.models.assincrono import FuncionarioAsync
 import os
 from dotenv import load_dotenv
 
@@ -32,7 +32,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
         if not user_id or not ObjectId.is_valid(user_id):
             raise HTTPException(status_code=401, detail="Token inválido")
 
-        user = Funcionario.buscar_por_id(ObjectId(user_id))
+        user = await FuncionarioAsync.buscar_por_id(ObjectId(user_id))
         if not user:
             raise HTTPException(status_code=401, detail="Usuário não encontrado")
 
@@ -0,0 +1,65 @@
+import os
+import threading
+from collections import OrderedDict
+
+from app.metricas import ContadorCache
+
+# Quantidade máxima de mensagens normalizadas mantidas no cache de intents
+TAMANHO_CACHE_INTENCOES = int(os.getenv("CHATBOT_CACHE_INTENCOES", "2048"))
+
+_metricas = ContadorCache("intencoes")
+
+
+# Cache LRU de mensagem normalizada -> predição do modelo
+# A maior parte do tráfego são os mesmos textos dos botões do site ("Ver serviços", "Agendar"...),
+# então a classificação dessas mensagens é feita uma única vez por modelo carregado
+# Deve ser limpo sempre que o modelo ou as intents mudarem (ver ChatbotAssistant)
+class CacheIntencoes:
+    def __init__(self, tamanho: int = TAMANHO_CACHE_INTENCOES):
+        self.tamanho = tamanho
+        self.hits = 0
+        self.misses = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    # Retorna a predição guardada para a chave ou None, contabilizando acertos e falhas
+    def obter(self, chave):
+        with self._lock:
+            valor = self._itens.get(chave)
+            if valor is None:
+                self.misses += 1
+                _metricas.falha.inc()
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+        _metricas.acerto.inc()
+        return valor
+
+    # Guarda a predição, descartando a entrada menos usada se o cache estiver cheio
+    def guardar(self, chave, valor):
+        if self.tamanho <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            if len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    # Esvazia o cache (chamado ao carregar um novo modelo ou novas intents)
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    # Contadores de uso do cache
+    def estatisticas(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "tamanho": len(self._itens),
+            "capacidade": self.tamanho,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
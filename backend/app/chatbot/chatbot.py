@@ -1,21 +1,33 @@
 import os
+import sys
 import json
-import random
+from types import MappingProxyType
 
-import nltk
 import numpy as np
 
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
-import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
-
-import re
 from app.models.cliente import Cliente
 from app.models.produto import Produto
 from app.models.agendamento import Agendamento
 from app.chatbot.handlers import *
+from app.chatbot.sessoes import ConversationState
+from app.chatbot.vetorizador import BagOfWords
+from app.chatbot.tokenizador import tokenizar
+from app.chatbot.inferencia import (
+    Classificacao,
+    MotorNumpy,
+    Predicao,
+    caminho_npz,
+    exportar_pesos,
+    maiores_k,
+    softmax,
+)
+from app.chatbot.cache import CacheIntencoes
+from app.chatbot.classificadores import BACKENDS, ClassificadorMLP, carregar_classificador
+from app.chatbot.fluxo import FluxoConversa
+from app.chatbot.entidades import Entidades, ExtratorEntidades
+from app.chatbot.pacote import PacoteModelo, imutavel_respostas
+from app.chatbot.compilador import carregar_intents
+from app.rastreamento import medir, rastrear
 from datetime import datetime
 
 from app.chatbot.handlers.produtos import (
@@ -24,270 +36,305 @@ from app.chatbot.handlers.produtos import (
 )
 
 
-# Modelo de rede neural para classificação de intents no chatbot
-# Possui três camadas densas com funções de ativação ReLU e dropout para evitar overfitting
-class ChatbotModel(nn.Module):
-
-    def __init__(self, input_size, output_size):
-        super(ChatbotModel, self).__init__()
+# Atributo do ChatbotAssistant guardado no PacoteModelo
+# Atribuir um valor cria um novo pacote; quem já obteve o anterior continua usando-o
+def _campo_pacote(nome, converter=None):
+    def obter(self):
+        return getattr(self.pacote, nome)
 
-        self.fc1 = nn.Linear(input_size, 128)
-        self.fc2 = nn.Linear(128, 64)
-        self.fc3 = nn.Linear(64, output_size)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.5)
+    def definir(self, valor):
+        if converter is not None:
+            valor = converter(valor)
+        self.pacote = self.pacote._replace(**{nome: valor})
 
-    def forward(self, x):
-        x = self.relu(self.fc1(x))
-        x = self.dropout(x)
-        x = self.relu(self.fc2(x))
-        x = self.dropout(x)
-        x = self.fc3(x)
-
-        return x
+    return property(obter, definir)
 
 
 class ChatbotAssistant:
 
+    intents = _campo_pacote("intents", tuple)
+    intents_responses = _campo_pacote("intents_responses", imutavel_respostas)
+    exact_patterns = _campo_pacote("exact_patterns", lambda v: MappingProxyType(dict(v)))
+    engine = _campo_pacote("engine")
+    intents_hash = _campo_pacote("intents_hash")
+    versao = _campo_pacote("versao")
+
     # Classe principal do assistente de chatbot
-    # Inicializa variáveis de estado para controle de contexto, cliente, agendamento e produtos
-    def __init__(self, intents_path, function_mappings=None):
-        self.model = None
+    # O modelo, as intents e as respostas ficam em um PacoteModelo imutável, compartilhado entre
+    # todas as conversas; o estado de cada conversa fica em um ConversationState, recebido em process_message
+    # documents, vocabulary, X, y e model só são preenchidos para treino (parse_intents(treino=True))
+    # `catalogo` (entidades.CatalogoProdutos) permite reconhecer produtos citados em texto livre
+    def __init__(self, intents_path, function_mappings=None, catalogo=None):
         self.intents_path = intents_path
+        self.pacote = PacoteModelo.vazio()
 
+        self.model = None
         self.documents = []
-        self.vocabulary = []
-        self.intents = []
-        self.intents_responses = {}
-
-        self.function_mappings = function_mappings
-
+        self.vocabulary = None
         self.X = None
         self.y = None
+        self._vectorizer_source = None
 
-        self.current_message = ""
-        self.last_user_choice = None
-
-        self.selected_products = []
-        self.awaiting_product_selection = False
+        self.cache = CacheIntencoes()
+        self.extrator = ExtratorEntidades(catalogo)
 
-        self.awaiting_confirmation = False
-
-        self.client_data = {"nome": None, "email": None, "telefone": None}
-        self.client_data_temp = None
-
-        self.awaiting_scheduling = False
-        self.awaiting_scheduling_confirmation = False
+        self.function_mappings = function_mappings
+        self.fluxo = FluxoConversa(self)
 
-    # Função utilitária para tokenização e lematização de texto
-    # Remove caracteres especiais, converte para minúsculas e aplica lematização
+    # Função utilitária para tokenização e normalização de texto
+    # Delega ao tokenizador em português (minúsculas, sem acentos e plurais reduzidos)
     @staticmethod
+    @medir("chatbot.tokenize")
     def tokenize_and_lemmatize(text):
-        lemmatizer = nltk.WordNetLemmatizer()
+        return tokenizar(text)
 
-        text = re.sub(r"[^a-zA-Z0-9áéíóúâêîôûãõç\s]", "", text).lower()
-        words = nltk.word_tokenize(text)
-        words = [lemmatizer.lemmatize(word.lower()) for word in words]
-
-        return words
+    # Retorna o vetorizador do pacote, recriando o índice se o vocabulário de treino foi substituído
+    def get_vectorizer(self):
+        if self.vocabulary is not None and self._vectorizer_source is not self.vocabulary:
+            self.pacote = self.pacote._replace(vectorizer=BagOfWords(self.vocabulary))
+            self._vectorizer_source = self.vocabulary
+        return self.pacote.vectorizer
 
     # Converte uma lista de palavras em um vetor binário com base no vocabulário conhecido
     def bag_of_words(self, words):
-        return [1 if word in words else 0 for word in self.vocabulary]
-
-    # Carrega e processa os padrões e respostas das intents a partir de um arquivo JSON
-    # Atualiza o vocabulário e a lista de intents
-    def parse_intents(self):
-        lemmatizer = nltk.WordNetLemmatizer()
+        vectorizer = self.get_vectorizer()
+        bag = [0] * len(vectorizer)
+        for col in vectorizer.columns(words):
+            bag[col] = 1
+        return bag
+
+    # Carrega os padrões e respostas das intents a partir do artefato compilado do intents.json
+    # O artefato só é recompilado (tokenizando todos os padrões) quando o conteúdo do arquivo
+    # ou a versão do tokenizador mudam; ver compilador.py
+    # Com treino=False (uso na API), apenas o pacote é mantido e os dados de treino são descartados
+    def parse_intents(self, treino=True):
+        self.cache.limpar()
 
         if os.path.exists(self.intents_path):
-            with open(self.intents_path, "r", encoding="utf-8") as f:
-                intents_data = json.load(f)
-
-            for intent in intents_data["intents"]:
-                if intent["tag"] not in self.intents:
-                    self.intents.append(intent["tag"])
-                    self.intents_responses[intent["tag"]] = intent["responses"]
+            compilados = carregar_intents(self.intents_path)
+            self.pacote = PacoteModelo.de_compilados(compilados, self.engine, self.versao)
 
-                for pattern in intent["patterns"]:
-                    pattern_words = self.tokenize_and_lemmatize(pattern)
-                    self.vocabulary.extend(pattern_words)
-                    self.documents.append((pattern_words, intent["tag"]))
+            if treino:
+                self.vocabulary = compilados.vocabulary
+                self.documents = compilados.documents
+                self.X = compilados.X
+                self.y = compilados.y
+                self._vectorizer_source = self.vocabulary
 
-                self.vocabulary = sorted(set(self.vocabulary))
+        self.fluxo = FluxoConversa(self)
 
     # Prepara os dados de treinamento a partir dos documentos e intents
-    # Gera a matriz de entrada (X) e o vetor de saída (y)
+    # Gera a matriz de entrada (X) de uma só vez e o vetor de saída (y)
+    # Quando as intents vieram do artefato compilado, a matriz já está pronta e é reaproveitada
     def prepare_data(self):
-        bags = []
-        indices = []
+        if self.X is not None and len(self.X) == len(self.documents):
+            return
 
-        for document in self.documents:
-            words = document[0]
-            bag = self.bag_of_words(words)
-
-            intent_index = self.intents.index(document[1])
-
-            bags.append(bag)
-            indices.append(intent_index)
-
-        self.X = np.array(bags)
-        self.y = np.array(indices)
+        self.X = self.get_vectorizer().transform_batch(
+            [words for words, _ in self.documents]
+        )
+        intent_index = {tag: i for i, tag in enumerate(self.intents)}
+        self.y = np.array(
+            [intent_index[tag] for _, tag in self.documents], dtype=np.int64
+        )
 
     # Treina o modelo de rede neural com os dados preparados
-    # Utiliza CrossEntropyLoss e otimizador Adam
+    # Utiliza CrossEntropyLoss e otimizador Adam, iterando sobre as matrizes já em memória
+    # O PyTorch é importado apenas aqui, pois a inferência em produção usa o MotorNumpy
+    # Para busca de hiperparâmetros e parada antecipada, ver treinamento.py
     def train_model(self, batch_size, lr, epochs):
-        X_tensor = torch.tensor(self.X, dtype=torch.float32)
-        y_tensor = torch.tensor(self.y, dtype=torch.long)
-
-        dataset = TensorDataset(X_tensor, y_tensor)
-        loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
-
-        self.model = ChatbotModel(self.X.shape[1], len(self.intents))
-
-        criterion = nn.CrossEntropyLoss()
-        optimizer = optim.Adam(self.model.parameters(), lr=lr)
-
-        for epoch in range(epochs):
-            running_loss = 0.0
-
-            for batch_X, batch_y in loader:
-                optimizer.zero_grad()
-                outputs = self.model(batch_X)
-                loss = criterion(outputs, batch_y)
-                loss.backward()
-                optimizer.step()
-                running_loss += loss
-
-            print(f"Epoch {epoch+1}: Loss: {running_loss / len(loader):.4f}")
+        from app.chatbot.treinamento import Hiperparametros, treinar_modelo
+
+        model, resultado = treinar_modelo(
+            self.X,
+            self.y,
+            len(self.intents),
+            Hiperparametros(lr=lr, batch_size=batch_size),
+            max_epocas=epochs,
+        )
+        print(
+            f"Treinamento concluído: {resultado.epocas} épocas, "
+            f"Loss: {resultado.perda:.4f}, {resultado.segundos:.1f}s"
+        )
+        self.usar_modelo(model)
+
+    # Passa a usar um modelo recém-treinado, convertendo seus pesos para o MotorNumpy
+    def usar_modelo(self, model):
+        model.eval()
+        self.model = model
+        self.engine = ClassificadorMLP(MotorNumpy.from_state_dict(model.state_dict()))
+        self.cache.limpar()
+
+    # Treina um dos classificadores de classificadores.py ("mlp", "linear" ou "centroide")
+    # sobre os dados preparados e passa a usá-lo nas predições
+    # Os parâmetros são repassados ao construtor do classificador escolhido
+    def train_classifier(self, backend, **params):
+        if backend not in BACKENDS:
+            raise ValueError(f"Classificador desconhecido: {backend}")
+
+        self.engine = BACKENDS[backend](**params).fit(self.X, self.y, len(self.intents))
+        self.model = None
+        self.cache.limpar()
 
     # Salva os pesos do modelo treinado e as dimensões de entrada/saída para posterior carregamento
+    # Além do .pth do PyTorch, grava os mesmos pesos em .npz para a inferência com NumPy
+    # Classificadores treinados sem o PyTorch (train_classifier) são gravados apenas no .npz
     def save_model(self, model_path, dimensions_path):
-        torch.save(self.model.state_dict(), model_path)
+        if self.model is not None:
+            import torch
+
+            torch.save(self.model.state_dict(), model_path)
+            exportar_pesos(model_path)
+        else:
+            self.engine.save(caminho_npz(model_path))
 
         with open(dimensions_path, "w") as f:
             json.dump(
-                {"input_size": self.X.shape[1], "output_size": len(self.intents)}, f
+                {
+                    "input_size": self.X.shape[1],
+                    "output_size": len(self.intents),
+                    "intents_hash": self.intents_hash,
+                    "backend": self.engine.tipo,
+                },
+                f,
             )
 
     # Carrega o modelo previamente salvo com as dimensões corretas
-    def load_model(self, model_path, dimensions_path):
+    # Usa os pesos .npz exportados; se eles não existirem ou forem mais antigos que o .pth,
+    # exporta-os novamente (única situação em que o PyTorch é necessário aqui)
+    # As dimensões do modelo são conferidas com as intents carregadas, para que um modelo treinado
+    # com outro intents.json seja rejeitado no carregamento e não na primeira mensagem
+    # O tipo do classificador é lido do próprio .npz (ver classificadores.py)
+    # Para o MLP, precisao ("float32" ou "int8") e poda (fração de neurônios removidos) seguem
+    # CHATBOT_PRECISAO e CHATBOT_PODA quando não informadas; ver inferencia.py
+    def load_model(self, model_path, dimensions_path, precisao=None, poda=None):
         with open(dimensions_path, "r") as f:
             dimensions = json.load(f)
 
-        self.model = ChatbotModel(dimensions["input_size"], dimensions["output_size"])
-        self.model.load_state_dict(torch.load(model_path, weights_only=True))
-
-    # Processa uma mensagem de entrada do usuário
-    # Realiza fluxo de controle conforme o estado atual e retorna a resposta apropriada
-    # Inclui reconhecimento de intents, confirmação de dados, seleção de produtos e agendamento
-    def process_message(self, input_message):
-        self.current_message = input_message
-        self.last_user_choice = input_message
-
-        if input_message in ["Adicionar mais produtos", "Continuar comprando"]:
-            return listar_produtos_por_categoria(self)
-
-        if self.awaiting_product_selection:
-            if hasattr(self, "produtos_temp") and any(
-                p["nome"] == input_message for p in self.produtos_temp
-            ):
-                return selecionar_produto(self, input_message)
-            elif input_message == "Quero comprar":
-                return selecionar_produto(self)
-
-        if input_message == "Ver meus produtos":
-            if "ver_produtos_selecionados" in self.function_mappings:
-                return self.function_mappings["ver_produtos_selecionados"](self)
-
-        if self.awaiting_confirmation:
-            return self._handle_confirmation(input_message)
-
-        if self.awaiting_scheduling:
-            return confirmar_agendamento(self, input_message)
-
-        if self.awaiting_scheduling_confirmation:
-            if input_message.lower() in ["sim", "s"]:
-                self.awaiting_scheduling = True
-                self.awaiting_scheduling_confirmation = False
-                return "📅 Por favor, informe a data e horário (DD/MM/AAAA HH:MM):"
-            else:
-                self.awaiting_scheduling_confirmation = False
-                return "Agendamento cancelado. Como posso ajudar?"
-
-        match = re.match(
-            r"([a-zA-Z\s]+),\s*([\w\.-]+@[\w\.-]+\.\w+),\s*(\+?\d{1,3}?[-.\s]?\(?\d{1,4}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4})",
-            input_message,
-        )
-        if match:
-            nome, email, telefone = match.groups()
-            self.client_data_temp = {
-                "nome": nome.strip(),
-                "email": email.strip(),
-                "telefone": telefone.strip(),
-            }
-            self.awaiting_confirmation = True
-            return self._generate_confirmation_message()
-
-        words = self.tokenize_and_lemmatize(input_message)
-        bag = self.bag_of_words(words)
-
-        bag_tensor = torch.tensor([bag], dtype=torch.float32)
-
-        self.model.eval()
-        with torch.no_grad():
-            predictions = self.model(bag_tensor)
-
-        predicted_class_index = torch.argmax(predictions, dim=1).item()
-        predicted_intent = self.intents[predicted_class_index]
-        print(f"Predicted intent: {predicted_intent}")
-
-        if self.function_mappings and predicted_intent in self.function_mappings:
-            response = self.function_mappings[predicted_intent](self)
-            if response:
-                return response
-
-        if self.intents_responses[predicted_intent]:
-            return random.choice(self.intents_responses[predicted_intent])
-        else:
-            return "Desculpe, não entendi. Poderia reformular sua pergunta?"
-
-    # Gera a mensagem de confirmação de dados do cliente antes do cadastro
-    def _generate_confirmation_message(self):
-        return (
-            "Por favor, confirme seus dados:\n"
-            f"Nome: {self.client_data_temp['nome']}\n"
-            f"Email: {self.client_data_temp['email']}\n"
-            f"Telefone: {self.client_data_temp['telefone']}\n\n"
-            "Digite 'dados corretos' para confirmar ou 'dados incorretos' para reenviar."
-        )
+        tamanho = len(self.get_vectorizer())
+        if tamanho and (tamanho, len(self.intents)) != (
+            dimensions["input_size"],
+            dimensions["output_size"],
+        ):
+            raise ValueError(
+                f"Modelo em {dimensions_path} foi treinado com outro intents.json "
+                f"({dimensions['input_size']}x{dimensions['output_size']}, esperado "
+                f"{tamanho}x{len(self.intents)}); treine o modelo novamente"
+            )
+
+        if self.intents_hash and dimensions.get("intents_hash") not in (None, self.intents_hash):
+            print("Aviso: intents.json mudou desde o último treinamento do modelo")
 
-    # Processa a confirmação ou correção dos dados enviados pelo cliente
-    # Atualiza o estado do assistente conforme a resposta
-    def _handle_confirmation(self, input_message):
-        if input_message.lower() == "dados corretos":
-            self.client_data = self.client_data_temp
-            self.client_data_temp = None
-            self.awaiting_confirmation = False
-
-            if "cadastrar_cliente" in self.function_mappings:
-                success = self.function_mappings["cadastrar_cliente"](self)
-                if success and self.selected_products:
-                    self.awaiting_scheduling = True
-                    return (
-                        "✅ Dados confirmados!\n\n"
-                        "📅 Informe a data e horário (DD/MM/AAAA HH:MM):"
-                    )
-                elif success:
-                    return "✅ Dados confirmados com sucesso!"
-                return "⚠️ Dados confirmados (cliente já existia)"
-
-        elif input_message.lower() == "dados incorretos":
-            self.client_data_temp = None
-            self.awaiting_confirmation = False
-            return "↩️ Por favor, reenvie seus dados: Nome, Email, Telefone"
-
-        return "⚠️ Digite 'dados corretos' para confirmar ou 'dados incorretos' para corrigir"
+        npz_path = caminho_npz(model_path)
+        if dimensions.get("backend", ClassificadorMLP.tipo) == ClassificadorMLP.tipo and (
+            not os.path.exists(npz_path)
+            or (
+                os.path.exists(model_path)
+                and os.path.getmtime(model_path) > os.path.getmtime(npz_path)
+            )
+        ):
+            exportar_pesos(model_path, npz_path)
+
+        engine = carregar_classificador(npz_path, precisao=precisao, poda=poda)
+        if (engine.input_size, engine.output_size) != (
+            dimensions["input_size"],
+            dimensions["output_size"],
+        ):
+            raise ValueError(
+                f"Pesos em {npz_path} não correspondem às dimensões de {dimensions_path}"
+            )
+
+        self.engine = engine
+        self.cache.limpar()
+
+    # Executa um forward com os padrões das intents para que a primeira mensagem real
+    # não pague o custo de inicialização das rotinas numéricas nem do tokenizador
+    def aquecer(self):
+        if self.engine is not None and self.exact_patterns:
+            padroes = [tokenizar(p) for p in list(self.exact_patterns)[:64]]
+            self.engine.forward(self.get_vectorizer().transform_batch(padroes))
+
+    # Indica se o modelo salvo em dimensions_path foi treinado com o intents.json atual
+    def modelo_atualizado(self, dimensions_path):
+        try:
+            with open(dimensions_path, "r") as f:
+                dimensions = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return self.intents_hash is not None and dimensions.get("intents_hash") == self.intents_hash
+
+    # Classifica uma mensagem, retornando a intent prevista, a confiança e os logits
+    def predict_intent(self, input_message) -> Predicao:
+        return self.predict_intents([input_message])[0]
+
+    # Classifica uma lista de mensagens, consultando o cache de intents
+    # Mensagens que resultam nos mesmos tokens normalizados reaproveitam a predição do cache;
+    # as demais são classificadas juntas em um único forward do modelo
+    @medir("chatbot.classify")
+    def predict_intents(self, messages):
+        docs = [self.tokenize_and_lemmatize(m) for m in messages]
+        chaves = [" ".join(words) for words in docs]
+        predicoes = [self.cache.obter(chave) for chave in chaves]
+
+        faltando = [i for i, predicao in enumerate(predicoes) if predicao is None]
+        if faltando:
+            vectorizer = self.get_vectorizer()
+            pacote = self.pacote
+            logits = pacote.engine.forward(
+                vectorizer.transform_batch([docs[i] for i in faltando])
+            )
+            probs = softmax(logits)
+            indices = logits.argmax(axis=1)
+
+            for linha, i in enumerate(faltando):
+                indice = int(indices[linha])
+                predicoes[i] = Predicao(
+                    pacote.intents[indice], float(probs[linha, indice]), logits[linha]
+                )
+                self.cache.guardar(chaves[i], predicoes[i])
+
+        return predicoes
+
+    # Classifica várias mensagens de uma só vez, sem ler nem alterar o estado de nenhuma conversa
+    # Todas as mensagens são vetorizadas em uma única matriz e passam por um único forward do modelo
+    # Com aquecer_cache=True, as predições também são guardadas no cache usado por predict_intent
+    @medir("chatbot.classify_batch")
+    def predict_batch(self, messages, top_k=3, aquecer_cache=False):
+        if not messages:
+            return []
+
+        docs = [self.tokenize_and_lemmatize(m) for m in messages]
+        vectorizer = self.get_vectorizer()
+        pacote = self.pacote
+        logits = pacote.engine.forward(vectorizer.transform_batch(docs))
+        probs = softmax(logits)
+        melhores = maiores_k(probs, max(top_k, 1))
+
+        resultados = []
+        for i, indices in enumerate(melhores):
+            ranking = [(pacote.intents[j], float(probs[i, j])) for j in indices]
+            resultados.append(Classificacao(ranking[0][0], ranking[0][1], ranking[:top_k]))
+
+            if aquecer_cache:
+                self.cache.guardar(
+                    " ".join(docs[i]),
+                    Predicao(ranking[0][0], ranking[0][1], logits[i]),
+                )
+
+        return resultados
+
+    # Extrai produtos, categoria, data, horário, email e telefone citados na mensagem (ver entidades.py)
+    @medir("chatbot.entidades")
+    def extrair_entidades(self, input_message) -> Entidades:
+        return self.extrator.extrair(input_message)
+
+    # Processa uma mensagem de entrada do usuário dentro da conversa representada por `state`
+    # O fluxo (seleção de produtos, confirmação de dados e agendamento) é resolvido pela máquina de
+    # estados em fluxo.py; o modelo de intents só é consultado para mensagens em texto livre
+    # Com o rastreamento ativo, o turno é registrado com o tempo de cada etapa (ver app/rastreamento.py)
+    def process_message(self, input_message, state):
+        with rastrear("chatbot.turno"):
+            return self.fluxo.processar(state, input_message)
 
 
 if __name__ == "__main__":
@@ -302,19 +349,35 @@ if __name__ == "__main__":
         "app/chatbot/intents.json", function_mappings=function_mappings
     )
     assistant.parse_intents()
-    assistant.prepare_data()
-    assistant.train_model(batch_size=8, lr=0.001, epochs=200)
 
-    assistant.save_model("app/chatbot/chatbot_model.pth", "app/chatbot/dimensions.json")
+    # Reaproveita o modelo salvo se ele foi treinado com o intents.json atual
+    # Use --treinar para forçar um novo treinamento
+    # O classificador treinado é escolhido por CHATBOT_CLASSIFICADOR (padrão: mlp);
+    # para comparar as opções, ver benchmarks/classificadores.py
+    model_path = "app/chatbot/chatbot_model.pth"
+    dimensions_path = "app/chatbot/dimensions.json"
+    backend = os.getenv("CHATBOT_CLASSIFICADOR", ClassificadorMLP.tipo)
+    if "--treinar" not in sys.argv and assistant.modelo_atualizado(dimensions_path):
+        assistant.load_model(model_path, dimensions_path)
+    elif backend == ClassificadorMLP.tipo:
+        assistant.prepare_data()
+        assistant.train_model(batch_size=8, lr=0.001, epochs=200)
+        assistant.save_model(model_path, dimensions_path)
+    else:
+        assistant.prepare_data()
+        assistant.train_classifier(backend)
+        assistant.save_model(model_path, dimensions_path)
 
     # assistant = ChatbotAssistant('intents.json', function_mappings = {'stocks': get_stocks})
     # assistant.parse_intents()
     # assistant.load_model('chatbot_model.pth', 'dimensions.json')
 
+    state = ConversationState()
+
     while True:
         message = input("Enter your message:")
 
         if message == "/quit":
             break
 
-        print(assistant.process_message(message))
+        print(assistant.process_message(message, state))
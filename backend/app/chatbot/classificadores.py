@@ -0,0 +1,228 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from app.chatbot.inferencia import CAMADAS, MotorNumpy, motor_de_arrays, softmax
+
+
+# Interface dos classificadores de intents usados pelo ChatbotAssistant
+# Todos recebem a matriz bag-of-words (N x vocabulário) e devolvem uma pontuação por intent:
+# - fit(X, y, n_classes): treina a partir da matriz de padrões e dos índices das intents
+# - forward(X): pontuações (logits) de cada intent, usadas pelo assistant e pelo cache
+# - predict_proba(X) / predict(X): probabilidades e intent mais provável
+# - save(npz_path) / load(npz_path): persistência em .npz, com o tipo do classificador gravado junto
+class Classificador(ABC):
+    tipo = None
+
+    input_size = 0
+    output_size = 0
+
+    @abstractmethod
+    def fit(self, X, y, n_classes):
+        raise NotImplementedError
+
+    @abstractmethod
+    def forward(self, X):
+        raise NotImplementedError
+
+    def predict_proba(self, X):
+        return softmax(self.forward(X))
+
+    def predict(self, X):
+        return np.argmax(self.forward(X), axis=1)
+
+    # Arrays que representam o classificador treinado
+    @abstractmethod
+    def arrays(self) -> dict:
+        raise NotImplementedError
+
+    @classmethod
+    @abstractmethod
+    def de_arrays(cls, arrays, **opcoes):
+        raise NotImplementedError
+
+    def save(self, npz_path: str):
+        np.savez(npz_path, tipo=np.array(self.tipo), **self.arrays())
+
+    @classmethod
+    def load(cls, npz_path: str, **opcoes):
+        return carregar_classificador(npz_path, **opcoes)
+
+    # Memória ocupada pelos parâmetros, em bytes
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays().values())
+
+
+# Rede neural atual (ChatbotModel), treinada com PyTorch e executada pelo MotorNumpy / MotorInt8
+class ClassificadorMLP(Classificador):
+    tipo = "mlp"
+
+    def __init__(self, motor=None, hiperparametros=None, epocas=300):
+        self.motor = motor
+        self.hiperparametros = hiperparametros
+        self.epocas = epocas
+        if motor is not None:
+            self.input_size = motor.input_size
+            self.output_size = motor.output_size
+
+    def fit(self, X, y, n_classes):
+        from app.chatbot.treinamento import Hiperparametros, treinar_modelo
+
+        model, _ = treinar_modelo(
+            X, y, n_classes, self.hiperparametros or Hiperparametros(lr=0.005), self.epocas
+        )
+        self.motor = MotorNumpy.from_state_dict(model.state_dict())
+        self.input_size = self.motor.input_size
+        self.output_size = self.motor.output_size
+        return self
+
+    def forward(self, X):
+        return self.motor.forward(X)
+
+    # Pesos no formato do state_dict do PyTorch (saída x entrada)
+    # Apenas o motor em float32 pode ser salvo; as versões quantizadas são geradas no carregamento
+    def arrays(self) -> dict:
+        if type(self.motor) is not MotorNumpy:
+            raise ValueError("Apenas o modelo em float32 pode ser salvo")
+
+        arrays = {}
+        for camada, (peso, vies) in zip(CAMADAS, self.motor.camadas):
+            arrays[f"{camada}.weight"] = np.ascontiguousarray(peso.T)
+            arrays[f"{camada}.bias"] = vies
+        return arrays
+
+    @property
+    def nbytes(self) -> int:
+        return self.motor.nbytes
+
+    @classmethod
+    def de_arrays(cls, arrays, precisao=None, poda=None, **opcoes):
+        return cls(motor_de_arrays(arrays, precisao, poda))
+
+
+# Pesos TF-IDF e normalização L2 aplicados à matriz bag-of-words
+# Palavras raras entre os padrões pesam mais que palavras que aparecem em muitas intents
+def _tfidf(X, idf):
+    X = np.asarray(X, dtype=np.float32) * idf
+    normas = np.linalg.norm(X, axis=1, keepdims=True)
+    normas[normas == 0] = 1
+    return X / normas
+
+
+def _calcular_idf(X):
+    documentos = np.asarray(X > 0, dtype=np.float32).sum(axis=0)
+    return (np.log((1 + len(X)) / (1 + documentos)) + 1).astype(np.float32)
+
+
+# Regressão logística multinomial sobre TF-IDF, treinada com gradiente descendente em NumPy
+# Cada mensagem ativa poucas palavras, então a classificação é um único produto vocabulário x intents
+class ClassificadorLinear(Classificador):
+    tipo = "linear"
+
+    def __init__(self, lr=0.5, regularizacao=1e-4, iteracoes=500):
+        self.lr = lr
+        self.regularizacao = regularizacao
+        self.iteracoes = iteracoes
+        self.idf = None
+        self.pesos = None
+        self.vies = None
+
+    def fit(self, X, y, n_classes):
+        self.idf = _calcular_idf(X)
+        entradas = _tfidf(X, self.idf)
+        alvo = np.eye(n_classes, dtype=np.float32)[np.asarray(y)]
+        n = len(entradas)
+
+        self.pesos = np.zeros((entradas.shape[1], n_classes), dtype=np.float32)
+        self.vies = np.zeros(n_classes, dtype=np.float32)
+
+        for _ in range(self.iteracoes):
+            erro = (softmax(entradas @ self.pesos + self.vies) - alvo) / n
+            self.pesos -= self.lr * (entradas.T @ erro + self.regularizacao * self.pesos)
+            self.vies -= self.lr * erro.sum(axis=0)
+
+        self.input_size, self.output_size = self.pesos.shape
+        return self
+
+    def forward(self, X):
+        return _tfidf(X, self.idf) @ self.pesos + self.vies
+
+    def arrays(self) -> dict:
+        return {"idf": self.idf, "pesos": self.pesos, "vies": self.vies}
+
+    @classmethod
+    def de_arrays(cls, arrays, **opcoes):
+        classificador = cls()
+        classificador.idf = np.asarray(arrays["idf"], dtype=np.float32)
+        classificador.pesos = np.ascontiguousarray(arrays["pesos"], dtype=np.float32)
+        classificador.vies = np.asarray(arrays["vies"], dtype=np.float32)
+        classificador.input_size, classificador.output_size = classificador.pesos.shape
+        return classificador
+
+
+# Classificador por centroide mais próximo: cada intent é a média normalizada dos seus padrões em TF-IDF
+# A pontuação é a similaridade de cosseno com cada centroide, multiplicada por `temperatura` para
+# que o softmax produza uma confiança comparável à dos outros classificadores
+class ClassificadorCentroide(Classificador):
+    tipo = "centroide"
+
+    def __init__(self, temperatura=10.0):
+        self.temperatura = temperatura
+        self.idf = None
+        self.centroides = None
+
+    def fit(self, X, y, n_classes):
+        self.idf = _calcular_idf(X)
+        entradas = _tfidf(X, self.idf)
+        y = np.asarray(y)
+
+        centroides = np.zeros((entradas.shape[1], n_classes), dtype=np.float32)
+        for classe in range(n_classes):
+            if (y == classe).any():
+                centroides[:, classe] = entradas[y == classe].mean(axis=0)
+
+        normas = np.linalg.norm(centroides, axis=0)
+        normas[normas == 0] = 1
+        self.centroides = np.ascontiguousarray(centroides / normas * self.temperatura)
+        self.input_size, self.output_size = self.centroides.shape
+        return self
+
+    def forward(self, X):
+        return _tfidf(X, self.idf) @ self.centroides
+
+    def arrays(self) -> dict:
+        return {"idf": self.idf, "centroides": self.centroides}
+
+    @classmethod
+    def de_arrays(cls, arrays, **opcoes):
+        classificador = cls()
+        classificador.idf = np.asarray(arrays["idf"], dtype=np.float32)
+        classificador.centroides = np.ascontiguousarray(arrays["centroides"], dtype=np.float32)
+        classificador.input_size, classificador.output_size = classificador.centroides.shape
+        return classificador
+
+
+# Classificadores disponíveis, pelo nome usado em CHATBOT_CLASSIFICADOR e nos comandos de treino
+BACKENDS = {
+    ClassificadorMLP.tipo: ClassificadorMLP,
+    ClassificadorLinear.tipo: ClassificadorLinear,
+    ClassificadorCentroide.tipo: ClassificadorCentroide,
+}
+
+
+# Tipo do classificador gravado em um .npz
+# Arquivos sem tipo são os pesos do MLP exportados do PyTorch (ver inferencia.exportar_pesos)
+def tipo_do_arquivo(npz) -> str:
+    return str(npz["tipo"]) if "tipo" in npz.files else ClassificadorMLP.tipo
+
+
+# Carrega um classificador salvo em .npz, identificando o tipo pelo próprio arquivo
+def carregar_classificador(npz_path: str, **opcoes) -> Classificador:
+    with np.load(npz_path) as npz:
+        tipo = tipo_do_arquivo(npz)
+        arrays = {nome: npz[nome] for nome in npz.files if nome != "tipo"}
+
+    if tipo not in BACKENDS:
+        raise ValueError(f"Classificador desconhecido: {tipo}")
+    return BACKENDS[tipo].de_arrays(arrays, **opcoes)
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from app.chatbot.tokenizador import TOKENIZER_VERSION, chave_exata, tokenizar
+from app.chatbot.vetorizador import BagOfWords
+
+# Versão do formato do artefato; deve ser incrementada se os arquivos gravados mudarem
+FORMATO_ARTEFATO = 2
+
+
+# Hash SHA-256 do conteúdo do intents.json, usado para saber se o artefato está atualizado
+def hash_intents(intents_path: str) -> str:
+    with open(intents_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# Diretório padrão do artefato compilado de um intents.json (ex.: app/chatbot/intents_compilado/)
+def caminho_artefato(intents_path: str) -> str:
+    return os.path.splitext(intents_path)[0] + "_compilado"
+
+
+# Grava um arquivo (do artefato ou do registro de modelos) em um temporário de nome único no mesmo diretório e o renomeia sobre
+# o destino, para que leitores nunca vejam um arquivo pela metade e dois processos compilando ao
+# mesmo tempo não escrevam no mesmo temporário
+def gravar_atomico(diretorio: str, nome: str, escrever, binario: bool = True):
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, prefix=f".{nome}.", suffix=".tmp")
+    modo, opcoes = ("wb", {}) if binario else ("w", {"encoding": "utf-8"})
+    try:
+        with os.fdopen(descritor, modo, **opcoes) as f:
+            escrever(f)
+        os.replace(temporario, os.path.join(diretorio, nome))
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except OSError:
+            pass
+        raise
+
+
+# Indexa os padrões das intents pelo texto normalizado, para responder sem passar pelo modelo
+# Padrões que aparecem em mais de uma intent são descartados, pois são ambíguos
+def indexar_padroes(intents) -> dict:
+    padroes = {}
+    ambiguos = set()
+    for intent in intents:
+        for pattern in intent["patterns"]:
+            chave = chave_exata(pattern)
+            if padroes.setdefault(chave, intent["tag"]) != intent["tag"]:
+                ambiguos.add(chave)
+    for chave in ambiguos:
+        del padroes[chave]
+    return padroes
+
+
+# Resultado do processamento do intents.json: vocabulário, intents, respostas e matriz de treino
+# É gravado em disco como um artefato (meta.json + X.npy + y.npy) identificado pelo hash do
+# intents.json e pela versão do tokenizador, para que a API e o treino não precisem retokenizar
+# todos os padrões a cada inicialização
+class IntentsCompilados:
+    def __init__(
+        self,
+        intents_hash,
+        vocabulary,
+        intents,
+        responses,
+        documents,
+        exact_patterns,
+        X,
+        y,
+        tokenizer_version=TOKENIZER_VERSION,
+    ):
+        self.intents_hash = intents_hash
+        self.tokenizer_version = tokenizer_version
+        self.vocabulary = vocabulary
+        self.intents = intents
+        self.responses = responses
+        self.documents = documents
+        self.exact_patterns = exact_patterns
+        self.X = X
+        self.y = y
+
+    # Contrato com o modelo treinado: deve coincidir com o dimensions.json salvo no treino
+    @property
+    def dimensoes(self) -> dict:
+        return {"input_size": len(self.vocabulary), "output_size": len(self.intents)}
+
+    # Indica se o artefato corresponde ao intents.json e ao tokenizador atuais
+    def atualizado(self, intents_hash: str) -> bool:
+        return (
+            self.intents_hash == intents_hash
+            and self.tokenizer_version == TOKENIZER_VERSION
+        )
+
+    # Tokeniza os padrões do intents.json e monta o vocabulário e a matriz de treino
+    @classmethod
+    def compilar(cls, intents_path: str):
+        with open(intents_path, "rb") as f:
+            conteudo = f.read()
+        intents_data = json.loads(conteudo.decode("utf-8"))
+
+        intents = []
+        responses = {}
+        documents = []
+        vocabulary = set()
+
+        for intent in intents_data["intents"]:
+            if intent["tag"] not in responses:
+                intents.append(intent["tag"])
+                responses[intent["tag"]] = intent["responses"]
+
+            for pattern in intent["patterns"]:
+                pattern_words = tokenizar(pattern)
+                vocabulary.update(pattern_words)
+                documents.append((pattern_words, intent["tag"]))
+
+        vocabulary = sorted(vocabulary)
+        intent_index = {tag: i for i, tag in enumerate(intents)}
+
+        X = BagOfWords(vocabulary).transform_batch([words for words, _ in documents])
+        y = np.array([intent_index[tag] for _, tag in documents], dtype=np.int64)
+
+        return cls(
+            hashlib.sha256(conteudo).hexdigest(),
+            vocabulary,
+            intents,
+            responses,
+            documents,
+            indexar_padroes(intents_data["intents"]),
+            X,
+            y,
+        )
+
+    # Grava o artefato no diretório informado
+    # As matrizes são gravadas antes e o meta.json por último, com os formatos delas: ao carregar,
+    # uma matriz que não corresponde ao meta.json (gravada por outra compilação) é detectada
+    def salvar(self, diretorio: str):
+        os.makedirs(diretorio, exist_ok=True)
+
+        for nome, array in (("X.npy", self.X), ("y.npy", self.y)):
+            gravar_atomico(diretorio, nome, lambda f, array=array: np.save(f, np.ascontiguousarray(array)))
+
+        meta = {
+            "formato": FORMATO_ARTEFATO,
+            "shapes": {"X": list(self.X.shape), "y": list(self.y.shape)},
+            "intents_hash": self.intents_hash,
+            "tokenizer_version": self.tokenizer_version,
+            "dimensions": self.dimensoes,
+            "vocabulary": self.vocabulary,
+            "intents": self.intents,
+            "responses": self.responses,
+            "documents": self.documents,
+            "exact_patterns": self.exact_patterns,
+        }
+        gravar_atomico(diretorio, "meta.json", lambda f: json.dump(meta, f, ensure_ascii=False), binario=False)
+
+    # Lê um artefato gravado por salvar; a matriz de treino é mapeada em memória, sem cópia
+    @classmethod
+    def carregar(cls, diretorio: str):
+        with open(os.path.join(diretorio, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("formato") != FORMATO_ARTEFATO:
+            raise ValueError(f"Formato de artefato desconhecido em {diretorio}")
+
+        X = np.load(os.path.join(diretorio, "X.npy"), mmap_mode="r")
+        y = np.load(os.path.join(diretorio, "y.npy"), mmap_mode="r")
+        if list(X.shape) != meta["shapes"]["X"] or list(y.shape) != meta["shapes"]["y"]:
+            raise ValueError(f"Matrizes do artefato em {diretorio} não correspondem ao meta.json")
+
+        return cls(
+            meta["intents_hash"],
+            meta["vocabulary"],
+            meta["intents"],
+            meta["responses"],
+            [(words, tag) for words, tag in meta["documents"]],
+            meta["exact_patterns"],
+            X,
+            y,
+            meta["tokenizer_version"],
+        )
+
+
+# Carrega o artefato compilado do intents.json, recompilando-o apenas se o conteúdo do arquivo
+# ou a versão do tokenizador tiverem mudado desde a última compilação
+def carregar_intents(intents_path: str, diretorio: str = None) -> IntentsCompilados:
+    diretorio = diretorio or caminho_artefato(intents_path)
+    intents_hash = hash_intents(intents_path)
+
+    try:
+        compilados = IntentsCompilados.carregar(diretorio)
+        if compilados.atualizado(intents_hash):
+            return compilados
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError) as e:
+        print(f"Erro ao ler artefato de intents (será recompilado): {e}")
+
+    compilados = IntentsCompilados.compilar(intents_path)
+    try:
+        compilados.salvar(diretorio)
+    except OSError as e:
+        print(f"Erro ao salvar artefato de intents: {e}")
+    return compilados
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else "app/chatbot/intents.json"
+    compilados = IntentsCompilados.compilar(origem)
+    compilados.salvar(caminho_artefato(origem))
+    print(f"Intents compiladas em {caminho_artefato(origem)}: {compilados.dimensoes}")
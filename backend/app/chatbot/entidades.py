@@ -0,0 +1,295 @@
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional
+
+from pytz import timezone
+
+from app.chatbot.tokenizador import remover_acentos, tokenizar
+from app.metricas import ContadorCache
+from app.rastreamento import etapa
+
+# Fuso horário das datas informadas pelos clientes: "hoje", "amanhã" e os dias da semana são
+# resolvidos no horário da loja, independentemente do fuso do servidor
+FUSO = timezone("America/Sao_Paulo")
+
+# Intervalo, em segundos, entre as atualizações do catálogo usado para reconhecer produtos (pode ser alterado via .env)
+TTL_CATALOGO = float(os.getenv("CHATBOT_TTL_CATALOGO", "300"))
+
+# Campos dos produtos usados pelo catálogo do chatbot (o restante do documento não é carregado)
+CAMPOS_CATALOGO = ("nome", "preco", "preco_mao_obra", "categoria")
+
+_metricas_catalogo = ContadorCache("catalogo")
+
+# Termos que identificam cada categoria de produtos, já tokenizados
+CATEGORIAS = {
+    ("insulfilm",): "insulfilm",
+    ("insulfim",): "insulfilm",
+    ("pelicula",): "insulfilm",
+    ("som",): "som",
+    ("caixa", "de", "som"): "som",
+    ("multimidia",): "multimidia",
+    ("central", "multimidia"): "multimidia",
+    ("ppf",): "ppf",
+}
+
+# Palavras que indicam que o cliente quer comprar ou agendar, e não apenas tirar uma dúvida
+PALAVRAS_COMPRA = frozenset(
+    {"quero", "queria", "comprar", "agendar", "agenda", "marcar", "instalar", "colocar", "fazer"}
+)
+
+# Palavras que, sozinhas, não identificam um produto (artigos, preposições e nomes de categoria)
+_IGNORADAS = frozenset(
+    {"de", "da", "do", "e", "com", "para", "o", "a", "em", "kit"}
+    | {palavra for termo in CATEGORIAS for palavra in termo}
+)
+
+# Dias da semana, na numeração de datetime.weekday()
+_DIAS_SEMANA = {
+    "segunda": 0,
+    "terca": 1,
+    "quarta": 2,
+    "quinta": 3,
+    "sexta": 4,
+    "sabado": 5,
+    "domingo": 6,
+}
+
+# Padrões aplicados ao texto em minúsculas e sem acentos
+_DATA_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{4}|\d{2}))?\b")
+_DATA_ISO_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_HORA_RE = re.compile(r"\b(\d{1,2})(?::(\d{2})|h(\d{2})?)(?!\d)")
+_HORA_AS_RE = re.compile(r"\bas (\d{1,2})\b(?![/:\d])")
+_RELATIVA_RE = re.compile(r"\b(depois de amanha|amanha|hoje)\b")
+_DIA_SEMANA_RE = re.compile(r"\b(segunda|terca|quarta|quinta|sexta|sabado|domingo)\b")
+
+# Padrões aplicados ao texto original
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_TELEFONE_RE = re.compile(r"(?<!\d)(?:\+?55\s?)?\(?\d{2}\)?[\s-]?9?\d{4}[\s-]?\d{4}(?!\d)")
+
+
+# Entidades encontradas em uma mensagem
+# - produtos: documentos do catálogo citados pelo nome, na ordem em que aparecem
+# - categoria: categoria citada (ou a do primeiro produto)
+# - data / hora: data pretendida e horário no formato "HH:MM"
+# - compra: a mensagem contém uma palavra de compra ou agendamento ("quero", "agendar", ...)
+class Entidades(NamedTuple):
+    produtos: List[dict]
+    categoria: Optional[str]
+    data: Optional[date]
+    hora: Optional[str]
+    email: Optional[str]
+    telefone: Optional[str]
+    compra: bool
+
+
+# Busca de vários termos de uma só vez em uma sequência de palavras
+# Os termos são tuplas de palavras guardadas em um dicionário; em cada posição é testado o termo
+# mais longo possível, então o custo é proporcional ao tamanho da mensagem e não ao número de termos
+class BuscaTermos:
+    def __init__(self, termos: dict):
+        self.termos = termos
+        self.maior = max(map(len, termos), default=0)
+
+    def __len__(self):
+        return len(self.termos)
+
+    # Retorna os valores dos termos encontrados, da esquerda para a direita e sem sobreposição
+    def encontrar(self, palavras: list) -> list:
+        encontrados = []
+        i = 0
+        while i < len(palavras):
+            for tamanho in range(min(self.maior, len(palavras) - i), 0, -1):
+                valor = self.termos.get(tuple(palavras[i : i + tamanho]))
+                if valor is not None:
+                    encontrados.append(valor)
+                    i += tamanho
+                    break
+            else:
+                i += 1
+        return encontrados
+
+
+# Monta a busca de produtos a partir do catálogo
+# Cada produto é encontrado pelo nome completo e por qualquer trecho do nome que só exista nele
+# (ex.: "g5" em "Insulfilm G5"), desde que o trecho não seja formado apenas por palavras ignoradas
+def indexar_produtos(produtos: List[dict]) -> BuscaTermos:
+    termos = {}
+    contagem = {}
+    trechos_por_produto = []
+
+    for produto in produtos:
+        palavras = tokenizar(produto.get("nome", ""))
+        if not palavras:
+            continue
+        termos[tuple(palavras)] = produto
+
+        trechos = {
+            tuple(palavras[i:j])
+            for i in range(len(palavras))
+            for j in range(i + 1, len(palavras) + 1)
+        }
+        trechos_por_produto.append((produto, trechos))
+        for trecho in trechos:
+            contagem[trecho] = contagem.get(trecho, 0) + 1
+
+    for produto, trechos in trechos_por_produto:
+        for trecho in trechos:
+            if contagem[trecho] == 1 and not _IGNORADAS.issuperset(trecho):
+                termos.setdefault(trecho, produto)
+
+    return BuscaTermos(termos)
+
+
+# Cópia em memória dos produtos cadastrados, usada para reconhecer nomes de produtos nas mensagens
+# A leitura nunca espera pelo banco: se o catálogo estiver vencido, a atualização é feita em uma
+# thread e, até ela terminar, as mensagens usam a versão anterior
+class CatalogoProdutos:
+    def __init__(self, carregar: Optional[Callable] = None, ttl: float = TTL_CATALOGO):
+        self._carregar = carregar
+        self.ttl = ttl
+
+        self.produtos = []
+        self.busca = BuscaTermos({})
+        self.atualizado_em = None
+        self._lock = threading.Lock()
+
+    # Lê os produtos do banco e recria a busca (usado no aquecimento da API)
+    def atualizar(self):
+        if self._carregar is None:
+            from app.models.produto import Produto
+
+            self._carregar = lambda: Produto.listar_todos(list(CAMPOS_CATALOGO))
+
+        produtos = list(self._carregar())
+        self.produtos, self.busca = produtos, indexar_produtos(produtos)
+        self.atualizado_em = time.monotonic()
+        return self
+
+    # Marca o catálogo como vencido (ex.: após cadastrar ou alterar um produto)
+    def invalidar(self):
+        self.atualizado_em = None
+
+    @property
+    def vencido(self) -> bool:
+        return self.atualizado_em is None or time.monotonic() - self.atualizado_em > self.ttl
+
+    # Busca de produtos atual, disparando a atualização em segundo plano se o catálogo venceu
+    def obter(self) -> BuscaTermos:
+        if not self.vencido:
+            _metricas_catalogo.acerto.inc()
+            return self.busca
+
+        _metricas_catalogo.falha.inc()
+        if not self._lock.locked():
+            threading.Thread(
+                target=self._atualizar_silenciosamente, name="atualizar-catalogo", daemon=True
+            ).start()
+        return self.busca
+
+    def _atualizar_silenciosamente(self):
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self.vencido:
+                self.atualizar()
+        except Exception as e:
+            self.atualizado_em = time.monotonic()
+            print(f"Erro ao atualizar catálogo de produtos: {e}")
+        finally:
+            self._lock.release()
+
+
+# Catálogo compartilhado pelos assistentes da API (ver routes/chatbot.py)
+catalogo_produtos = CatalogoProdutos()
+
+
+# Próxima ocorrência do dia da semana, sem contar o dia atual
+def _proximo_dia_semana(hoje: date, dia: int) -> date:
+    return hoje + timedelta(days=(dia - hoje.weekday() - 1) % 7 + 1)
+
+
+def _extrair_data(texto: str, hoje: date) -> Optional[date]:
+    try:
+        encontrado = _DATA_ISO_RE.search(texto)
+        if encontrado:
+            return date(*map(int, encontrado.groups()))
+
+        encontrado = _DATA_RE.search(texto)
+        if encontrado:
+            dia, mes, ano = encontrado.groups()
+            if ano:
+                ano = int(ano) + (2000 if len(ano) == 2 else 0)
+                return date(ano, int(mes), int(dia))
+            data = date(hoje.year, int(mes), int(dia))
+            return data if data >= hoje else date(hoje.year + 1, int(mes), int(dia))
+    except ValueError:
+        return None
+
+    encontrado = _RELATIVA_RE.search(texto)
+    if encontrado:
+        dias = {"hoje": 0, "amanha": 1, "depois de amanha": 2}[encontrado.group(1)]
+        return hoje + timedelta(days=dias)
+
+    encontrado = _DIA_SEMANA_RE.search(texto)
+    if encontrado:
+        return _proximo_dia_semana(hoje, _DIAS_SEMANA[encontrado.group(1)])
+
+    return None
+
+
+def _extrair_hora(texto: str) -> Optional[str]:
+    encontrado = _HORA_RE.search(texto)
+    if encontrado:
+        hora, minutos = int(encontrado.group(1)), int(encontrado.group(2) or encontrado.group(3) or 0)
+    else:
+        encontrado = _HORA_AS_RE.search(texto)
+        if not encontrado:
+            return None
+        hora, minutos = int(encontrado.group(1)), 0
+
+    if hora > 23 or minutos > 59:
+        return None
+    return f"{hora:02d}:{minutos:02d}"
+
+
+# Extrai, em uma única passada pela mensagem, produtos, categoria, data, horário, email e telefone
+# Os produtos são reconhecidos pelo catálogo em memória (sem consultas ao banco por mensagem);
+# sem catálogo, as demais entidades continuam sendo extraídas
+class ExtratorEntidades:
+    def __init__(self, catalogo: Optional[CatalogoProdutos] = None):
+        self.catalogo = catalogo
+        self.categorias = BuscaTermos(CATEGORIAS)
+
+    def extrair(self, mensagem: str, hoje: Optional[date] = None) -> Entidades:
+        hoje = hoje or datetime.now(FUSO).date()
+        with etapa("chatbot.tokenize"):
+            palavras = tokenizar(mensagem)
+        texto = remover_acentos(mensagem)
+
+        email = _EMAIL_RE.search(mensagem)
+        sem_email = _EMAIL_RE.sub(" ", mensagem)
+        telefone = _TELEFONE_RE.search(sem_email)
+
+        produtos = []
+        if self.catalogo is not None:
+            for produto in self.catalogo.obter().encontrar(palavras):
+                if all(produto is not p for p in produtos):
+                    produtos.append(produto)
+
+        categorias = self.categorias.encontrar(palavras)
+        categoria = categorias[0] if categorias else None
+        if produtos and produtos[0].get("categoria"):
+            categoria = produtos[0]["categoria"]
+
+        return Entidades(
+            produtos=produtos,
+            categoria=categoria,
+            data=_extrair_data(texto, hoje),
+            hora=_extrair_hora(_DATA_RE.sub(" ", texto)),
+            email=email.group(0) if email else None,
+            telefone=telefone.group(0).strip() if telefone else None,
+            compra=not PALAVRAS_COMPRA.isdisjoint(palavras),
+        )
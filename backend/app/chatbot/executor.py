@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import os
+import time
+from collections import deque
+from typing import Callable
+
+import numpy as np
+
+from app.metricas import duracao_classificacao, duracao_inferencia, tamanho_lote
+
+# Configuração do executor de inferência (pode ser alterada via .env)
+# - LOTE_MAX: quantidade máxima de mensagens classificadas em um único forward
+# - LOTE_ESPERA_MS: tempo máximo que a primeira mensagem do lote espera por outras
+# - FILA_MAX: mensagens aguardando classificação; acima disso novas requisições são recusadas
+LOTE_MAX = int(os.getenv("CHATBOT_LOTE_MAX", "32"))
+LOTE_ESPERA_MS = float(os.getenv("CHATBOT_LOTE_ESPERA_MS", "2"))
+FILA_MAX = int(os.getenv("CHATBOT_FILA_MAX", "1024"))
+
+# Quantidade de medições recentes usadas no cálculo dos percentis de latência
+JANELA_METRICAS = 2048
+
+
+# Erro levantado quando a fila de inferência atingiu o limite configurado
+class FilaCheia(RuntimeError):
+    pass
+
+
+# Executor de inferência com micro-batching
+# As requisições colocam a mensagem em uma fila e aguardam o resultado sem bloquear o event loop
+# Uma única tarefa consome a fila: junta as mensagens que chegaram dentro da janela de espera
+# (até max_lote) e as classifica em um único forward, executado em uma thread
+# Enquanto um lote é processado, as mensagens seguintes se acumulam e formam o próximo lote,
+# então sob rajadas o custo por mensagem cai em vez de a latência crescer com a concorrência
+# Cada mensagem é classificada pelo assistente informado por quem a enfileirou (o mesmo que vai
+# concluir o turno); se o modelo for trocado com mensagens na fila, o lote é dividido por assistente
+class ExecutorInferencia:
+    def __init__(
+        self,
+        obter_assistant: Callable,
+        max_lote: int = LOTE_MAX,
+        espera_ms: float = LOTE_ESPERA_MS,
+        max_fila: int = FILA_MAX,
+    ):
+        self.obter_assistant = obter_assistant
+        self.max_lote = max_lote
+        self.espera = espera_ms / 1000
+        self.max_fila = max_fila
+
+        self._loop = None
+        self._fila = None
+        self._tarefa = None
+
+        self.requisicoes = 0
+        self.lotes = 0
+        self.rejeitadas = 0
+        self.erros = 0
+        self._latencias_fila = deque(maxlen=JANELA_METRICAS)
+        self._latencias_total = deque(maxlen=JANELA_METRICAS)
+        self._tamanhos_lote = deque(maxlen=JANELA_METRICAS)
+
+    # Classifica a mensagem no próximo lote, retornando a Predicao correspondente
+    # Sem assistant, usa o assistente atual no momento em que a mensagem é enfileirada
+    async def classificar(self, mensagem: str, assistant=None):
+        self._garantir_tarefa()
+
+        assistant = assistant if assistant is not None else self.obter_assistant()
+        futuro = self._loop.create_future()
+        try:
+            self._fila.put_nowait((mensagem, assistant, futuro, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejeitadas += 1
+            raise FilaCheia("Fila de inferência cheia")
+
+        self.requisicoes += 1
+        return await futuro
+
+    # Cria a fila e a tarefa consumidora no event loop atual
+    # São recriadas se o loop mudar (ex.: clientes de teste) ou se a tarefa tiver terminado
+    # A tarefa roda em um contexto vazio, para não herdar o rastro da requisição que a criou
+    def _garantir_tarefa(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._tarefa is None or self._tarefa.done():
+            self._loop = loop
+            self._fila = asyncio.Queue(self.max_fila)
+            self._tarefa = loop.create_task(self._consumir(), context=contextvars.Context())
+
+    async def _consumir(self):
+        while True:
+            lote = [await self._fila.get()]
+            prazo = self._loop.time() + self.espera
+
+            while len(lote) < self.max_lote:
+                if not self._fila.empty():
+                    lote.append(self._fila.get_nowait())
+                    continue
+
+                restante = prazo - self._loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._executar(lote)
+
+    async def _executar(self, lote):
+        inicio = time.perf_counter()
+        for _, _, _, enfileirado in lote:
+            self._latencias_fila.append(inicio - enfileirado)
+
+        try:
+            predicoes = await asyncio.to_thread(self._classificar_lote, lote)
+        except Exception as e:
+            self.erros += 1
+            print(f"Erro na inferência em lote: {e}")
+            for _, _, futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        fim = time.perf_counter()
+        self.lotes += 1
+        self._tamanhos_lote.append(len(lote))
+        duracao_inferencia.observe(fim - inicio)
+        tamanho_lote.observe(len(lote))
+
+        for (_, _, futuro, enfileirado), predicao in zip(lote, predicoes):
+            self._latencias_total.append(fim - enfileirado)
+            duracao_classificacao.observe(fim - enfileirado)
+            if not futuro.done():
+                futuro.set_result(predicao)
+
+    # Um forward por assistente presente no lote (normalmente um só), mantendo a ordem das mensagens
+    def _classificar_lote(self, lote):
+        grupos = {}
+        for posicao, (mensagem, assistant, _, _) in enumerate(lote):
+            grupos.setdefault(id(assistant), (assistant, []))[1].append(posicao)
+
+        predicoes = [None] * len(lote)
+        for assistant, posicoes in grupos.values():
+            resultado = assistant.predict_intents([lote[posicao][0] for posicao in posicoes])
+            for posicao, predicao in zip(posicoes, resultado):
+                predicoes[posicao] = predicao
+        return predicoes
+
+    # Cancela a tarefa consumidora no desligamento da API
+    async def encerrar(self):
+        if self._tarefa is not None and not self._tarefa.done():
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+        self._tarefa = None
+
+    # Contadores e percentis de latência (em ms) para acompanhamento do executor
+    def metricas(self) -> dict:
+        return {
+            "requisicoes": self.requisicoes,
+            "lotes": self.lotes,
+            "rejeitadas": self.rejeitadas,
+            "erros": self.erros,
+            "fila_atual": self._fila.qsize() if self._fila is not None else 0,
+            "config": {
+                "max_lote": self.max_lote,
+                "espera_ms": self.espera * 1000,
+                "max_fila": self.max_fila,
+            },
+            "tamanho_medio_lote": (
+                round(float(np.mean(self._tamanhos_lote)), 2) if self._tamanhos_lote else None
+            ),
+            "latencia_fila_ms": _percentis(self._latencias_fila),
+            "latencia_total_ms": _percentis(self._latencias_total),
+        }
+
+
+def _percentis(amostras) -> dict:
+    if not amostras:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    valores = np.fromiter(amostras, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(valores, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(valores.max()), 3),
+    }
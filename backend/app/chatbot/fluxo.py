@@ -0,0 +1,339 @@
+import json
+import random
+import re
+from datetime import datetime, time
+
+from app.chatbot.entidades import FUSO
+from app.chatbot.handlers.agendamentos import (
+    confirmar_agendamento,
+    get_horarios_disponiveis,
+    iniciar_agendamento,
+)
+from app.chatbot.handlers.clientes import cadastrar_cliente
+from app.chatbot.handlers.produtos import (
+    listar_produtos_por_categoria,
+    selecionar_produto,
+    ver_produtos_selecionados,
+)
+from app.chatbot.sessoes import (
+    AGENDANDO,
+    CONFIRMANDO_AGENDAMENTO,
+    CONFIRMANDO_DADOS,
+    INICIO,
+    SELECIONANDO_PRODUTO,
+    ItemCarrinho,
+)
+from app.chatbot.tokenizador import chave_exata
+from app.metricas import intents_chatbot
+from app.rastreamento import medir
+
+# Opções exibidas como botões no front-end
+OPCOES_INICIAIS = ["Agendar", "Ver serviços", "Tirar dúvida"]
+OPCOES_CATEGORIAS = ["Insulfim", "Multimídia", "Caixas de Som", "PPF"]
+OPCOES_CONFIRMACAO_DADOS = ["Dados corretos", "Dados incorretos"]
+
+# Retorno de FluxoConversa.resolver indicando que a mensagem precisa passar pelo modelo de intents
+CLASSIFICAR = object()
+
+# Dados do cliente enviados em texto livre: "Nome, email@dominio.com, telefone"
+# Só é avaliada quando a mensagem contém "@", já que o email é obrigatório
+_DADOS_CLIENTE_RE = re.compile(
+    r"\s*([^,@\d]+),\s*([\w\.-]+@[\w\.-]+\.\w+),\s*(\+?\d{1,3}?[-.\s]?\(?\d{1,4}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4})"
+)
+
+# Trechos das respostas das intents que indicam quais botões exibir junto delas
+_OPCOES_POR_TRECHO = (
+    (("como posso te ajudar",), OPCOES_INICIAIS),
+    (
+        ("catálogo", "categorias disponíveis", "serviço/produto", "produto/serviço"),
+        OPCOES_CATEGORIAS,
+    ),
+)
+
+
+# Monta a mensagem de confirmação dos dados do cliente antes do cadastro
+def mensagem_confirmacao(dados: dict) -> str:
+    return (
+        "Por favor, confirme seus dados:\n"
+        f"Nome: {dados['nome']}\n"
+        f"Email: {dados['email']}\n"
+        f"Telefone: {dados['telefone']}\n\n"
+        "Digite 'dados corretos' para confirmar ou 'dados incorretos' para reenviar."
+    )
+
+
+# Máquina de estados da conversa com o chatbot
+# Cada ConversationState está em uma etapa (ver sessoes.py) e cada mensagem é resolvida, em ordem, por:
+#   1. transições da etapa atual, indexadas pelo comando exato (ex.: "dados corretos")
+#   2. nome de um produto listado, quando o usuário está escolhendo produtos
+#   3. comandos globais, válidos em qualquer etapa (ex.: "cancelar tudo")
+#   4. reconhecedores de texto livre: retorno do calendário, formulário JSON e dados do cliente
+#   5. ação padrão da etapa atual, para etapas que esperam uma resposta específica
+#   6. padrões das intents que coincidem exatamente com a mensagem
+#   7. entidades da mensagem (ver entidades.py): um pedido como "quero insulfilm G5 sábado 9h" já
+#      adiciona os produtos, guarda a data e segue direto para o agendamento
+# As buscas são feitas em dicionários; apenas mensagens que não casam com nenhuma regra vão para o modelo
+# Os handlers podem ser substituídos via function_mappings, o que permite testar o fluxo sem banco de dados
+class FluxoConversa:
+    def __init__(self, assistant):
+        self.assistant = assistant
+        mappings = assistant.function_mappings or {}
+
+        self.listar_produtos = mappings.get("listar_produtos", listar_produtos_por_categoria)
+        self.selecionar_produto = mappings.get("selecionar_produto", selecionar_produto)
+        self.ver_produtos = mappings.get("ver_produtos_selecionados", ver_produtos_selecionados)
+        self.cadastrar_cliente = mappings.get("cadastrar_cliente", cadastrar_cliente)
+        self.iniciar = mappings.get("iniciar_agendamento", iniciar_agendamento)
+        self.confirmar = mappings.get("confirmar_agendamento", confirmar_agendamento)
+        self.horarios_disponiveis = mappings.get("horarios_disponiveis", get_horarios_disponiveis)
+
+        self.transicoes = {
+            SELECIONANDO_PRODUTO: {
+                "quero comprar": lambda estado, m: self.selecionar_produto(estado),
+            },
+            CONFIRMANDO_DADOS: {
+                "dados corretos": self.confirmar_dados,
+                "dados incorretos": self.recusar_dados,
+            },
+            CONFIRMANDO_AGENDAMENTO: dict.fromkeys(
+                ["confirmar", "confirmar agendamento", "sim", "s", "alterar data"],
+                self.confirmar,
+            ),
+        }
+
+        listar = lambda estado, m: self.listar_produtos(estado)
+        self.comandos = {
+            "cancelar": self.cancelar,
+            "cancelar tudo": self.cancelar,
+            "adicionar mais produtos": listar,
+            "continuar comprando": listar,
+            "ver meus produtos": lambda estado, m: self.ver_produtos(estado),
+            "agendar instalacao": self.iniciar_agendamento,
+        }
+        for categoria in ("insulfilm", "insulfim", "som", "caixas de som", "multimidia"):
+            self.comandos[categoria] = listar
+
+        self.padroes = {
+            CONFIRMANDO_DADOS: lambda estado, m: (
+                "⚠️ Digite 'dados corretos' para confirmar ou 'dados incorretos' para corrigir"
+            ),
+            CONFIRMANDO_AGENDAMENTO: self.confirmar,
+        }
+
+        self.opcoes_resposta = {}
+        for respostas in assistant.intents_responses.values():
+            for resposta in respostas:
+                texto = resposta.lower()
+                for trechos, opcoes in _OPCOES_POR_TRECHO:
+                    if any(t in texto for t in trechos):
+                        self.opcoes_resposta[resposta] = opcoes
+                        break
+
+    # Processa a mensagem dentro da conversa, recorrendo ao modelo apenas quando nenhuma regra se aplica
+    def processar(self, estado, mensagem):
+        resposta = self.iniciar_turno(estado, mensagem)
+        if resposta is CLASSIFICAR:
+            resposta = self.concluir_turno(estado, self.assistant.predict_intent(mensagem))
+        return resposta
+
+    # Primeira metade de processar: registra a mensagem e aplica as regras da máquina de estados
+    # Retorna CLASSIFICAR quando a resposta depende do modelo, permitindo classificar fora do fluxo
+    # (ex.: no executor de inferência em lote, ver executor.py)
+    def iniciar_turno(self, estado, mensagem):
+        estado.current_message = mensagem
+        estado.last_user_choice = mensagem
+        return self.resolver(estado, mensagem)
+
+    # Segunda metade de processar: responde à intent prevista para a mensagem
+    # A intent prevista é contada na métrica intents_chatbot (ver responder_intent), sem log por mensagem
+    @medir("chatbot.fluxo.concluir_turno")
+    def concluir_turno(self, estado, predicao):
+        return self.responder_intent(estado, predicao.intent)
+
+    # Aplica as regras da máquina de estados, retornando CLASSIFICAR se nenhuma delas se aplicar
+    @medir("chatbot.fluxo.resolver")
+    def resolver(self, estado, mensagem):
+        comando = chave_exata(mensagem)
+
+        acao = self.transicoes.get(estado.etapa, {}).get(comando)
+        if acao:
+            return acao(estado, mensagem)
+
+        if (
+            estado.etapa == SELECIONANDO_PRODUTO
+            and estado.produtos_temp
+            and mensagem in estado.produtos_temp
+        ):
+            return self.selecionar_produto(estado, mensagem)
+
+        acao = self.comandos.get(comando)
+        if acao:
+            return acao(estado, mensagem)
+
+        if mensagem.startswith("calendar|"):
+            return self.confirmar(estado, mensagem)
+
+        if mensagem.startswith("{") and mensagem.endswith("}"):
+            return self.receber_formulario(estado, mensagem)
+
+        if (
+            "@" in mensagem
+            and estado.etapa not in (AGENDANDO, CONFIRMANDO_AGENDAMENTO)
+        ):
+            dados = _DADOS_CLIENTE_RE.match(mensagem)
+            if dados:
+                return self.receber_dados(estado, *dados.groups())
+
+        acao = self.padroes.get(estado.etapa)
+        if acao:
+            return acao(estado, mensagem)
+
+        intent = self.assistant.exact_patterns.get(comando)
+        if intent:
+            return self.responder_intent(estado, intent)
+
+        if estado.etapa in (INICIO, SELECIONANDO_PRODUTO):
+            entidades = self.assistant.extrair_entidades(mensagem)
+            if entidades.produtos and (entidades.compra or entidades.data or entidades.hora):
+                return self.preencher_pedido(estado, entidades)
+
+        return CLASSIFICAR
+
+    # Responde a uma intent, usando o handler associado ou uma das respostas cadastradas
+    # Cada intent respondida é contada nas métricas da API (ver app/metricas.py)
+    def responder_intent(self, estado, intent):
+        intents_chatbot.labels(intent).inc()
+        handler = (self.assistant.function_mappings or {}).get(intent)
+        if handler:
+            resposta = handler(estado)
+            if resposta:
+                return resposta
+
+        respostas = self.assistant.intents_responses.get(intent)
+        resposta = random.choice(respostas) if respostas else ""
+        if not resposta:
+            return "Desculpe, não entendi. Poderia reformular sua pergunta?"
+
+        opcoes = self.opcoes_resposta.get(resposta)
+        if opcoes:
+            return {"response": resposta, "options": opcoes}
+        return resposta
+
+    # Descarta seleções e etapas pendentes, mantendo os dados já confirmados do cliente
+    def cancelar(self, estado, mensagem):
+        estado.reset()
+        return {
+            "response": "Operação cancelada. Como posso ajudar?",
+            "options": OPCOES_INICIAIS,
+        }
+
+    # Abre o calendário se o cliente já tiver produtos e dados cadastrados
+    # Se o cliente já informou a data em texto livre, ela é usada no lugar do calendário
+    def iniciar_agendamento(self, estado, mensagem=None):
+        resposta = self.iniciar(estado)
+        if isinstance(resposta, dict) and resposta.get("calendar"):
+            estado.etapa = AGENDANDO
+            if estado.data_sugerida:
+                return self.agendar_data_sugerida(estado, resposta)
+        return resposta
+
+    # Adiciona ao carrinho os produtos citados na mensagem, guarda a data e o horário pedidos
+    # e segue para o agendamento; email e telefone encontrados pré-preenchem o formulário de dados
+    def preencher_pedido(self, estado, entidades):
+        ids = {item.id for item in estado.selected_products}
+        adicionados = [
+            ItemCarrinho.de_documento(p) for p in entidades.produtos if str(p["_id"]) not in ids
+        ]
+        estado.selected_products.extend(adicionados)
+        estado.data_sugerida = entidades.data or estado.data_sugerida
+        estado.hora_sugerida = entidades.hora or estado.hora_sugerida
+
+        resposta = self.iniciar_agendamento(estado)
+        if not isinstance(resposta, dict):
+            resposta = {"response": resposta}
+
+        if adicionados:
+            nomes = ", ".join(item.nome for item in adicionados)
+            resposta = {**resposta, "response": f"✅ Adicionado: {nomes}\n\n" + resposta["response"]}
+        if resposta.get("form") and (entidades.email or entidades.telefone):
+            resposta["form_data"] = {"email": entidades.email, "telefone": entidades.telefone}
+        return resposta
+
+    # Usa a data (e o horário, se informado) pedidos pelo cliente
+    # Com data e horário livres, vai direto para a confirmação do agendamento; caso contrário,
+    # abre o calendário já posicionado na data pedida
+    def agendar_data_sugerida(self, estado, calendario):
+        data, hora = estado.data_sugerida, estado.hora_sugerida
+        estado.data_sugerida = estado.hora_sugerida = None
+
+        calendario = {**calendario, "calendar_data": {"default_date": data.strftime("%Y-%m-%d")}}
+        if hora is None:
+            return calendario
+
+        agora = datetime.now(FUSO).replace(tzinfo=None)
+        if datetime.combine(data, time.fromisoformat(hora)) <= agora or hora not in (
+            self.horarios_disponiveis(data)
+        ):
+            return {
+                **calendario,
+                "response": (
+                    f"⚠️ O horário de {data.strftime('%d/%m')} às {hora} não está disponível. "
+                    "Selecione outra data ou horário:"
+                ),
+            }
+
+        return self.confirmar(estado, f"calendar|{data.strftime('%Y-%m-%d')}|{hora}")
+
+    # Dados do cliente enviados pelo formulário do front-end, em JSON
+    def receber_formulario(self, estado, mensagem):
+        try:
+            form_data = json.loads(mensagem)
+        except json.JSONDecodeError:
+            return "Ocorreu um erro ao processar seus dados. Por favor, tente novamente."
+
+        nome = str(form_data.get("nome", "")).strip()
+        email = str(form_data.get("email", "")).strip()
+        telefone = str(form_data.get("telefone", "")).strip()
+
+        if not all([nome, email, telefone]):
+            return "Por favor, preencha todos os campos corretamente."
+
+        resposta = self.receber_dados(estado, nome, email, telefone)
+        return {"response": resposta, "options": OPCOES_CONFIRMACAO_DADOS}
+
+    # Guarda os dados informados e aguarda a confirmação do cliente
+    def receber_dados(self, estado, nome, email, telefone):
+        estado.client_data_temp = {
+            "nome": nome.strip(),
+            "email": email.strip(),
+            "telefone": telefone.strip(),
+        }
+        estado.etapa = CONFIRMANDO_DADOS
+        return mensagem_confirmacao(estado.client_data_temp)
+
+    # Confirma os dados do cliente, cadastra-o e segue para o agendamento
+    # (sem produtos escolhidos, iniciar_agendamento pede que o cliente escolha um primeiro)
+    # Se o cadastro falhar, os dados continuam aguardando confirmação para que o cliente tente de novo
+    def confirmar_dados(self, estado, mensagem):
+        anterior = estado.client_data
+        estado.client_data = estado.client_data_temp
+
+        if not self.cadastrar_cliente(estado):
+            estado.client_data = anterior
+            return {
+                "response": "❌ Não foi possível salvar seus dados. Por favor, tente novamente.",
+                "options": OPCOES_CONFIRMACAO_DADOS,
+            }
+
+        estado.client_data_temp = None
+        estado.etapa = SELECIONANDO_PRODUTO if estado.produtos_temp else INICIO
+        resposta = self.iniciar_agendamento(estado)
+        if isinstance(resposta, dict):
+            return {**resposta, "response": "✅ Dados confirmados!\n\n" + resposta["response"]}
+        return "✅ Dados confirmados!\n\n" + resposta
+
+    # Descarta os dados informados para que o cliente os envie novamente
+    def recusar_dados(self, estado, mensagem):
+        estado.client_data_temp = None
+        estado.etapa = SELECIONANDO_PRODUTO if estado.produtos_temp else INICIO
+        return "↩️ Por favor, reenvie seus dados: Nome, Email, Telefone"
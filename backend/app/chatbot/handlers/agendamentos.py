@@ -2,12 +2,15 @@ from datetime import datetime, timedelta, time
 from typing import List
 from app.models.agendamento import Agendamento
 from app.models.cliente import Cliente
-from app.google.calendario import GoogleCalendarService
+from app.google.calendario import get_calendar_service
+from app.chatbot.sessoes import AGENDANDO, CONFIRMANDO_AGENDAMENTO, INICIO
 from pytz import timezone, utc
+from app.rastreamento import medir
 
 
 # Função que retorna a lista de horários disponíveis para agendamento em uma data específica
 # Considera horários de funcionamento (segunda a sábado) e remove os horários já ocupados com base no banco
+@medir("chatbot.handler.get_horarios_disponiveis")
 def get_horarios_disponiveis(data) -> List[str]:
     if data.weekday() == 6:
         return []
@@ -49,6 +52,7 @@ def get_horarios_disponiveis(data) -> List[str]:
 
 # Inicia o fluxo de agendamento no chatbot
 # Valida se o cliente forneceu seus dados e selecionou produtos antes de abrir o calendário
+@medir("chatbot.handler.iniciar_agendamento")
 def iniciar_agendamento(chatbot_assistant):
     if not chatbot_assistant.selected_products:
         return {
@@ -75,9 +79,12 @@ def iniciar_agendamento(chatbot_assistant):
 # Lida com ações como confirmar, alterar ou cancelar agendamentos
 # Se confirmado, cria o agendamento no banco e sincroniza com o Google Calendar
 # Também processa a entrada do usuário vinda do calendário e prepara a mensagem final de confirmação
+@medir("chatbot.handler.confirmar_agendamento")
 def confirmar_agendamento(chatbot_assistant, input_message):
-    if input_message.lower() == "cancelar tudo":
-        chatbot_assistant.awaiting_scheduling = False
+    comando = input_message.strip().lower()
+
+    if comando == "cancelar tudo":
+        chatbot_assistant.etapa = INICIO
         chatbot_assistant.temp_agendamento_data = None
         return {
             "response": "Agendamento cancelado. Como posso ajudar?",
@@ -85,15 +92,13 @@ def confirmar_agendamento(chatbot_assistant, input_message):
         }
 
     try:
-        if chatbot_assistant.awaiting_scheduling_confirmation:
-            if input_message.lower() in ["sim", "confirmar"]:
+        if chatbot_assistant.etapa == CONFIRMANDO_AGENDAMENTO:
+            if comando in ["sim", "s", "confirmar", "confirmar agendamento"]:
                 if not chatbot_assistant.temp_agendamento_data:
                     return "❌ Dados do agendamento perdidos. Por favor, recomece."
 
                 agendamento_data = chatbot_assistant.temp_agendamento_data
-                produtos_nomes = [
-                    p["nome"] for p in chatbot_assistant.selected_products
-                ]
+                produtos_nomes = [p.nome for p in chatbot_assistant.selected_products]
 
                 agendamento = Agendamento(
                     cliente_id=agendamento_data["cliente_id"],
@@ -108,7 +113,7 @@ def confirmar_agendamento(chatbot_assistant, input_message):
                     return "❌ Não foi possível confirmar o agendamento."
 
                 try:
-                    calendar = GoogleCalendarService()
+                    calendar = get_calendar_service()
                     event_data = {
                         "summary": f"Agendamento - {chatbot_assistant.client_data['nome']}",
                         "description": f"Produtos: {', '.join(produtos_nomes)}",
@@ -125,8 +130,7 @@ def confirmar_agendamento(chatbot_assistant, input_message):
                     print(f"Erro Google Calendar (não crítico): {e}")
 
                 chatbot_assistant.selected_products = []
-                chatbot_assistant.awaiting_scheduling = False
-                chatbot_assistant.awaiting_scheduling_confirmation = False
+                chatbot_assistant.etapa = INICIO
                 chatbot_assistant.temp_agendamento_data = None
 
                 return {
@@ -140,8 +144,8 @@ def confirmar_agendamento(chatbot_assistant, input_message):
                     "options": ["Ver serviços", "Tirar dúvida"],
                 }
 
-            elif input_message.lower() == "alterar data":
-                chatbot_assistant.awaiting_scheduling_confirmation = False
+            elif comando == "alterar data":
+                chatbot_assistant.etapa = AGENDANDO
                 return {
                     "response": "Por favor, selecione uma nova data:",
                     "calendar": True,
@@ -149,14 +153,14 @@ def confirmar_agendamento(chatbot_assistant, input_message):
                 }
 
             else:
-                chatbot_assistant.awaiting_scheduling_confirmation = False
+                chatbot_assistant.etapa = INICIO
                 chatbot_assistant.temp_agendamento_data = None
                 return {
                     "response": "Agendamento não confirmado. Como posso ajudar?",
                     "options": ["Agendar", "Ver serviços", "Tirar dúvida"],
                 }
 
-        if "calendar" in input_message:
+        if input_message.startswith("calendar|"):
             try:
                 _, data_str, hora_str = input_message.split("|")
                 data_local = timezone("America/Sao_Paulo").localize(
@@ -180,27 +184,22 @@ def confirmar_agendamento(chatbot_assistant, input_message):
                 chatbot_assistant.temp_agendamento_data = {
                     "cliente_id": str(cliente_db["_id"]),
                     "data": data_agendada,
-                    "produtos": [
-                        str(p["_id"]) for p in chatbot_assistant.selected_products
-                    ],
+                    "produtos": [p.id for p in chatbot_assistant.selected_products],
                 }
 
                 resposta = "📋 Confirme o agendamento:\n\n"
                 resposta += f"📅 Data: {data_agendada.strftime('%d/%m/%Y %H:%M')}\n"
                 resposta += "🔧 Serviços:\n"
                 for p in chatbot_assistant.selected_products:
-                    resposta += f"- {p['nome']} ({p.get('categoria', '')})\n"
+                    resposta += f"- {p.nome} ({p.categoria or ''})\n"
 
-                total = sum(
-                    p["preco"] + p.get("preco_mao_obra", 0)
-                    for p in chatbot_assistant.selected_products
-                )
+                total = sum(p.total for p in chatbot_assistant.selected_products)
                 resposta += f"\n💳 Valor Total: R${total:.2f}\n\n"
                 resposta += (
                     "Digite 'confirmar' para finalizar ou 'alterar data' para corrigir"
                 )
 
-                chatbot_assistant.awaiting_scheduling_confirmation = True
+                chatbot_assistant.etapa = CONFIRMANDO_AGENDAMENTO
                 return {
                     "response": resposta,
                     "options": ["Confirmar", "Alterar data", "Cancelar tudo"],
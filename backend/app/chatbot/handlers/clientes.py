@@ -1,10 +1,12 @@
 from app.models.cliente import Cliente
+from app.rastreamento import medir
 
 
 # Função responsável por cadastrar ou atualizar um cliente no sistema
 # Se o cliente já existir (baseado no telefone), atualiza os dados
 # Caso contrário, cria um novo cliente no banco
 # Retorna "existente", "novo" ou False conforme o resultado da operaçãos
+@medir("chatbot.handler.cadastrar_cliente")
 def cadastrar_cliente(chatbot_assistant):
     nome = chatbot_assistant.client_data["nome"]
     email = chatbot_assistant.client_data["email"]
@@ -1,16 +1,19 @@
 from app.models.produto import Produto
+from app.chatbot.sessoes import INICIO, SELECIONANDO_PRODUTO, ItemCarrinho
+from app.rastreamento import medir
 
 
 # Função que lista produtos de uma categoria específica para o chatbot
 # Caso a operação seja cancelada, limpa os estados relacionados
 # Se não for informada a categoria, tenta inferir a partir da mensagem do usuário
 # Retorna uma mensagem com a lista de produtos e opções para o usuário
+@medir("chatbot.handler.listar_produtos_por_categoria")
 def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
     if (
-        hasattr(chatbot_assistant, "last_user_choice")
+        chatbot_assistant.last_user_choice
         and chatbot_assistant.last_user_choice.lower() == "cancelar tudo"
     ):
-        chatbot_assistant.awaiting_product_selection = False
+        chatbot_assistant.etapa = INICIO
         chatbot_assistant.produtos_temp = None
         chatbot_assistant.current_category = None
         chatbot_assistant.selected_products = []
@@ -20,9 +23,9 @@ def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
         }
 
     if (
-        hasattr(chatbot_assistant, "last_user_choice")
-        and chatbot_assistant.last_user_choice
-        in ["Continuar comprando", "Adicionar mais produtos"]
+        chatbot_assistant.last_user_choice
+        and chatbot_assistant.last_user_choice.strip().lower()
+        in ["continuar comprando", "adicionar mais produtos"]
         and not categoria
     ):
         return {
@@ -31,7 +34,7 @@ def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
         }
 
     if not categoria:
-        message = getattr(chatbot_assistant, "current_message", "").lower()
+        message = (chatbot_assistant.current_message or "").lower()
         if "insulfilm" in message or "insulfim" in message:
             categoria = "insulfilm"
         elif "som" in message or "caixa" in message:
@@ -56,10 +59,7 @@ def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
             resposta += f" + R${produto['preco_mao_obra']:.2f} (instalação)"
         resposta += "\n"
 
-    if (
-        hasattr(chatbot_assistant, "selected_products")
-        and chatbot_assistant.selected_products
-    ):
+    if chatbot_assistant.selected_products:
         resposta += "\n\nVocê já tem produtos selecionados. Selecione uma opção:"
         options = [
             "Quero comprar",
@@ -75,9 +75,13 @@ def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
             "Cancelar tudo",
         ]
 
-    chatbot_assistant.produtos_temp = produtos
+    # Produtos indexados pelo nome, para que a escolha do usuário seja localizada diretamente
+    # Cada produto guarda apenas o id e os preços exibidos nesta lista (ver ItemCarrinho)
+    chatbot_assistant.produtos_temp = {
+        p["nome"]: ItemCarrinho.de_documento(p) for p in produtos
+    }
     chatbot_assistant.current_category = categoria
-    chatbot_assistant.awaiting_product_selection = True
+    chatbot_assistant.etapa = SELECIONANDO_PRODUTO
 
     return {"response": resposta, "options": options}
 
@@ -85,11 +89,9 @@ def listar_produtos_por_categoria(chatbot_assistant, categoria=None):
 # Função que permite o usuário selecionar um produto listado anteriormente
 # Se o produto for selecionado, adiciona à lista de produtos escolhidos
 # Mostra também um resumo dos produtos já selecionados e opções de próxima ação
+@medir("chatbot.handler.selecionar_produto")
 def selecionar_produto(chatbot_assistant, produto=None):
-    if (
-        not hasattr(chatbot_assistant, "produtos_temp")
-        or not chatbot_assistant.produtos_temp
-    ):
+    if not chatbot_assistant.produtos_temp:
         return "Por favor, primeiro liste os produtos de uma categoria."
 
     if produto == "Adicionar mais produtos":
@@ -100,32 +102,29 @@ def selecionar_produto(chatbot_assistant, produto=None):
 
     if produto is None:
         resposta = "Selecione o produto que deseja comprar:\n\n"
-        produtos = [p["nome"] for p in chatbot_assistant.produtos_temp]
+        produtos = list(chatbot_assistant.produtos_temp)
         return {"response": resposta, "options": produtos}
 
-    produto_selecionado = next(
-        (p for p in chatbot_assistant.produtos_temp if p["nome"] == produto), None
-    )
+    produto_selecionado = chatbot_assistant.produtos_temp.get(produto)
 
     if produto_selecionado:
         chatbot_assistant.selected_products.append(produto_selecionado)
         resposta = (
             f"✅ Produto adicionado:\n"
-            f"{produto_selecionado['nome']} - R${produto_selecionado['preco']:.2f}"
+            f"{produto_selecionado.nome} - R${produto_selecionado.preco:.2f}"
         )
 
-        if produto_selecionado.get("preco_mao_obra", 0) > 0:
+        if produto_selecionado.preco_mao_obra > 0:
             resposta += (
-                f" + R${produto_selecionado['preco_mao_obra']:.2f} (instalação)\n\n"
+                f" + R${produto_selecionado.preco_mao_obra:.2f} (instalação)\n\n"
             )
 
         if len(chatbot_assistant.selected_products) > 1:
             resposta += "\n📦 Seus produtos selecionados:\n"
             total = 0
             for idx, p in enumerate(chatbot_assistant.selected_products, 1):
-                preco_total = p["preco"] + p.get("preco_mao_obra", 0)
-                resposta += f"{idx}. {p['nome']} - R${preco_total:.2f}\n"
-                total += preco_total
+                resposta += f"{idx}. {p.nome} - R${p.total:.2f}\n"
+                total += p.total
             resposta += f"\n💰 Total: R${total:.2f}\n\n"
 
         resposta += "O que deseja fazer agora?"
@@ -145,11 +144,9 @@ def selecionar_produto(chatbot_assistant, produto=None):
 # Função que exibe ao usuário todos os produtos que ele já selecionou
 # Calcula o total de custo considerando preço e mão de obra
 # Retorna uma mensagem resumida e opções de próximas ações
+@medir("chatbot.handler.ver_produtos_selecionados")
 def ver_produtos_selecionados(chatbot_assistant):
-    if (
-        not hasattr(chatbot_assistant, "selected_products")
-        or not chatbot_assistant.selected_products
-    ):
+    if not chatbot_assistant.selected_products:
         return {
             "response": "Você ainda não selecionou nenhum produto.",
             "options": ["Ver serviços", "Agendar", "Tirar dúvida"],
@@ -159,9 +156,8 @@ def ver_produtos_selecionados(chatbot_assistant):
     total = 0
 
     for idx, produto in enumerate(chatbot_assistant.selected_products, 1):
-        preco_total = produto["preco"] + produto.get("preco_mao_obra", 0)
-        resposta += f"{idx}. {produto['nome']} - R${preco_total:.2f}\n"
-        total += preco_total
+        resposta += f"{idx}. {produto.nome} - R${produto.total:.2f}\n"
+        total += produto.total
 
     resposta += f"\n💰 TOTAL: R${total:.2f}\n\n"
     resposta += "O que deseja fazer agora?"
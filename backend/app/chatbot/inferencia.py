@@ -0,0 +1,204 @@
+import os
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+# Nomes das camadas densas do ChatbotModel, na ordem em que são aplicadas
+CAMADAS = ("fc1", "fc2", "fc3")
+
+# Precisão e poda usadas ao carregar o modelo (podem ser alteradas via .env)
+# - PRECISAO: "float32" (padrão) ou "int8" (pesos quantizados, 4x menos memória)
+# - PODA: fração dos neurônios ocultos removidos por magnitude (0 desativa)
+PRECISAO = os.getenv("CHATBOT_PRECISAO", "float32")
+PODA = float(os.getenv("CHATBOT_PODA", "0"))
+
+
+# Resultado da classificação de uma mensagem: intent prevista, confiança (softmax) e logits brutos
+class Predicao(NamedTuple):
+    intent: str
+    confianca: float
+    logits: np.ndarray
+
+
+# Resultado da classificação em lote: intent prevista, confiança e as k intents mais prováveis
+class Classificacao(NamedTuple):
+    intent: str
+    confianca: float
+    top_k: list
+
+
+# Converte logits em probabilidades, linha a linha, de forma numericamente estável
+def softmax(logits):
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+# Índices das k maiores probabilidades de cada linha, em ordem decrescente
+# argpartition evita ordenar todas as intents quando só as primeiras interessam
+def maiores_k(probs, k):
+    k = min(k, probs.shape[1])
+    indices = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    ordem = np.argsort(-np.take_along_axis(probs, indices, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(indices, ordem, axis=1)
+
+
+# Caminho padrão do arquivo de pesos NumPy correspondente a um arquivo .pth
+def caminho_npz(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+# Converte o state_dict do PyTorch em um dicionário de arrays float32
+def state_dict_para_arrays(state_dict) -> dict:
+    arrays = {}
+    for camada in CAMADAS:
+        for parametro in ("weight", "bias"):
+            nome = f"{camada}.{parametro}"
+            arrays[nome] = (
+                state_dict[nome].detach().cpu().numpy().astype(np.float32)
+            )
+    return arrays
+
+
+# Exporta os pesos de um chatbot_model.pth para um arquivo .npz sem compressão
+# Apenas esta etapa (e o treinamento) precisa do PyTorch
+def exportar_pesos(model_path: str, npz_path: str = None) -> str:
+    import torch
+
+    npz_path = npz_path or caminho_npz(model_path)
+    state_dict = torch.load(model_path, weights_only=True, map_location="cpu")
+    np.savez(npz_path, **state_dict_para_arrays(state_dict))
+    return npz_path
+
+
+# Motor de inferência do ChatbotModel implementado apenas com NumPy
+# Reproduz o forward em modo de avaliação (dropout desativado): Linear -> ReLU -> Linear -> ReLU -> Linear
+# Os pesos são guardados já transpostos e contíguos para que cada camada seja um único produto de matrizes
+class MotorNumpy:
+
+    def __init__(self, arrays):
+        self.camadas = []
+        for camada in CAMADAS:
+            peso = np.ascontiguousarray(arrays[f"{camada}.weight"].T, dtype=np.float32)
+            vies = np.ascontiguousarray(arrays[f"{camada}.bias"], dtype=np.float32)
+            self.camadas.append((peso, vies))
+
+        self.input_size = self.camadas[0][0].shape[0]
+        self.output_size = self.camadas[-1][0].shape[1]
+
+    # Carrega o motor a partir de um arquivo .npz gerado por exportar_pesos
+    @classmethod
+    def carregar(cls, npz_path: str):
+        with np.load(npz_path) as arrays:
+            return cls({nome: arrays[nome] for nome in arrays.files})
+
+    # Cria o motor a partir de um state_dict do PyTorch já em memória (ex.: logo após o treino)
+    @classmethod
+    def from_state_dict(cls, state_dict):
+        return cls(state_dict_para_arrays(state_dict))
+
+    # Calcula os logits de uma matriz de entrada (N x input_size)
+    def forward(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        ultima = len(self.camadas) - 1
+
+        for i, (peso, vies) in enumerate(self.camadas):
+            X = X @ peso
+            X += vies
+            if i < ultima:
+                np.maximum(X, 0, out=X)
+
+        return X
+
+    # Retorna o índice da classe prevista para cada linha da entrada
+    def predict(self, X):
+        return np.argmax(self.forward(X), axis=1)
+
+    # Memória ocupada pelos pesos, em bytes
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for camada in self.camadas for a in camada)
+
+
+# Quantiza uma matriz de pesos (entrada x saída) para int8, com uma escala por neurônio de saída
+# Quantização simétrica apenas dos pesos: as ativações continuam em float32
+def quantizar_int8(peso):
+    escala = np.abs(peso).max(axis=0) / 127
+    escala[escala == 0] = 1
+    q = np.clip(np.rint(peso / escala), -127, 127).astype(np.int8)
+    return q, escala.astype(np.float32)
+
+
+# Motor de inferência com pesos quantizados em int8 (weight-only)
+# Ocupa 4x menos memória que o MotorNumpy; a escala de cada neurônio é aplicada após o produto,
+# sobre a saída da camada, então a conversão int8 -> float32 não precisa de uma cópia reescalada dos pesos
+# Como o NumPy não tem produto de matrizes em int8, a conversão custa CPU: o ganho é de memória
+# (ver benchmarks/quantizacao.py); para reduzir CPU, combine com a poda
+class MotorInt8(MotorNumpy):
+
+    def __init__(self, arrays):
+        super().__init__(arrays)
+        self.camadas = [
+            (*quantizar_int8(peso), vies) for peso, vies in self.camadas
+        ]
+
+    def forward(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        ultima = len(self.camadas) - 1
+
+        for i, (peso, escala, vies) in enumerate(self.camadas):
+            X = np.matmul(X, peso, dtype=np.float32)
+            X *= escala
+            X += vies
+            if i < ultima:
+                np.maximum(X, 0, out=X)
+
+        return X
+
+
+# Poda estruturada por magnitude: remove a fração dos neurônios ocultos menos importantes
+# A importância de um neurônio é a norma dos pesos que chegam nele vezes a dos pesos que saem dele
+# Como neurônios inteiros são removidos, as matrizes ficam menores e o forward fica mais barato
+# sem depender de formatos esparsos
+def podar(arrays, fracao):
+    if fracao <= 0:
+        return arrays
+
+    arrays = dict(arrays)
+    for entrada, saida in zip(CAMADAS[:-1], CAMADAS[1:]):
+        peso_entrada = arrays[f"{entrada}.weight"]
+        peso_saida = arrays[f"{saida}.weight"]
+
+        importancia = np.linalg.norm(peso_entrada, axis=1) * np.linalg.norm(peso_saida, axis=0)
+        manter = max(1, int(round(len(importancia) * (1 - fracao))))
+        indices = np.sort(np.argsort(importancia)[::-1][:manter])
+
+        arrays[f"{entrada}.weight"] = peso_entrada[indices]
+        arrays[f"{entrada}.bias"] = arrays[f"{entrada}.bias"][indices]
+        arrays[f"{saida}.weight"] = peso_saida[:, indices]
+
+    return arrays
+
+
+# Cria o motor de inferência a partir do .npz com a precisão e a poda escolhidas
+def carregar_motor(npz_path: str, precisao: str = None, poda: float = None):
+    with np.load(npz_path) as npz:
+        return motor_de_arrays({nome: npz[nome] for nome in npz.files}, precisao, poda)
+
+
+# Cria o motor de inferência a partir dos pesos em memória, com a precisão e a poda escolhidas
+def motor_de_arrays(arrays, precisao: str = None, poda: float = None):
+    precisao = precisao or PRECISAO
+    poda = PODA if poda is None else poda
+    arrays = podar(arrays, poda)
+
+    if precisao == "int8":
+        return MotorInt8(arrays)
+    if precisao == "float32":
+        return MotorNumpy(arrays)
+    raise ValueError(f"Precisão desconhecida: {precisao}")
+
+
+if __name__ == "__main__":
+    origem = sys.argv[1] if len(sys.argv) > 1 else "app/chatbot/chatbot_model.pth"
+    print(f"Pesos exportados para {exportar_pesos(origem)}")
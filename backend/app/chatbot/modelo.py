@@ -0,0 +1,26 @@
+import torch.nn as nn
+
+
+# Modelo de rede neural para classificação de intents no chatbot
+# Possui três camadas densas com funções de ativação ReLU e dropout para evitar overfitting
+# O tamanho das camadas ocultas e a taxa de dropout são configuráveis para a busca de hiperparâmetros
+# Usado apenas no treinamento; em produção os pesos são executados pelo MotorNumpy (inferencia.py)
+class ChatbotModel(nn.Module):
+
+    def __init__(self, input_size, output_size, hidden_sizes=(128, 64), dropout=0.5):
+        super(ChatbotModel, self).__init__()
+
+        self.fc1 = nn.Linear(input_size, hidden_sizes[0])
+        self.fc2 = nn.Linear(hidden_sizes[0], hidden_sizes[1])
+        self.fc3 = nn.Linear(hidden_sizes[1], output_size)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(self, x):
+        x = self.relu(self.fc1(x))
+        x = self.dropout(x)
+        x = self.relu(self.fc2(x))
+        x = self.dropout(x)
+        x = self.fc3(x)
+
+        return x
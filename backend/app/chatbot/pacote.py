@@ -0,0 +1,41 @@
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+from app.chatbot.vetorizador import BagOfWords
+
+
+# Tudo o que o assistente precisa para responder mensagens, compartilhado por todas as conversas
+# É imutável: treinar, carregar outro modelo ou trocar de versão cria um novo pacote e substitui
+# a referência de uma só vez, então uma requisição nunca vê metade de um modelo e metade de outro
+# Os dados usados apenas no treino (documentos, vocabulário, matrizes X e y) ficam fora do pacote
+class PacoteModelo(NamedTuple):
+    intents: tuple
+    intents_responses: Mapping[str, tuple]
+    exact_patterns: Mapping[str, str]
+    vectorizer: BagOfWords
+    engine: Optional[object] = None
+    intents_hash: Optional[str] = None
+    versao: Optional[str] = None
+
+    # Pacote sem intents nem modelo, usado antes do carregamento
+    @classmethod
+    def vazio(cls) -> "PacoteModelo":
+        return cls((), MappingProxyType({}), MappingProxyType({}), BagOfWords([]))
+
+    # Cria o pacote a partir das intents compiladas (ver compilador.py), sem as matrizes de treino
+    @classmethod
+    def de_compilados(cls, compilados, engine=None, versao=None) -> "PacoteModelo":
+        return cls(
+            intents=tuple(compilados.intents),
+            intents_responses=imutavel_respostas(compilados.responses),
+            exact_patterns=MappingProxyType(dict(compilados.exact_patterns)),
+            vectorizer=BagOfWords(compilados.vocabulary),
+            engine=engine,
+            intents_hash=compilados.intents_hash,
+            versao=versao,
+        )
+
+
+# Cópia somente leitura das respostas de cada intent
+def imutavel_respostas(respostas: dict) -> Mapping[str, tuple]:
+    return MappingProxyType({tag: tuple(lista) for tag, lista in respostas.items()})
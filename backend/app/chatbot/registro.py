@@ -0,0 +1,288 @@
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.chatbot.compilador import (
+    IntentsCompilados,
+    caminho_artefato,
+    gravar_atomico,
+    hash_intents,
+)
+from app.chatbot.inferencia import caminho_npz, exportar_pesos
+
+# Diretório padrão do registro de modelos (pode ser alterado via .env)
+DIRETORIO_REGISTRO = os.getenv(
+    "CHATBOT_REGISTRO", os.path.join(os.path.dirname(__file__), "registro")
+)
+
+# Intervalo, em segundos, entre as verificações de troca de versão feitas por cada worker
+INTERVALO_VERIFICACAO = float(os.getenv("CHATBOT_REGISTRO_INTERVALO", "5"))
+
+INTENTS = "intents.json"
+MODELO = "chatbot_model.npz"
+DIMENSOES = "dimensions.json"
+METRICAS = "metricas.json"
+
+
+# Erro levantado para versões inexistentes ou incompletas no registro
+class VersaoInvalida(ValueError):
+    pass
+
+
+# Escreve um arquivo de texto de forma atômica, com um temporário de nome único (ver compilador.gravar_atomico)
+# Dois processos ativando versões ao mesmo tempo (CLI e API, ou dois workers) não escrevem no mesmo temporário
+def _escrever_atomico(caminho: str, conteudo: str):
+    gravar_atomico(
+        os.path.dirname(caminho), os.path.basename(caminho), lambda f: f.write(conteudo), binario=False
+    )
+
+
+# Registro de versões do modelo do chatbot em disco
+# Cada versão é um diretório imutável com os pesos (.npz), o intents.json e seu artefato compilado,
+# o dimensions.json e as métricas do treino:
+#   registro/
+#     versoes/<versao>/{chatbot_model.npz, intents.json, intents_compilado/, dimensions.json, metricas.json}
+#     ativo          -> nome da versão ativa
+#     historico.json -> versões ativadas, da mais antiga para a mais recente (usado no rollback)
+# A troca da versão ativa é um rename atômico do arquivo "ativo", lido por todos os workers
+class RegistroModelos:
+    def __init__(self, diretorio: str = DIRETORIO_REGISTRO):
+        self.diretorio = diretorio
+        self.versoes_dir = os.path.join(diretorio, "versoes")
+        self.arquivo_ativo = os.path.join(diretorio, "ativo")
+        self.arquivo_historico = os.path.join(diretorio, "historico.json")
+
+    # Caminhos dos arquivos de uma versão, no formato esperado pelo ChatbotAssistant
+    def caminhos(self, versao: str) -> dict:
+        base = os.path.join(self.versoes_dir, versao)
+        return {
+            "intents_path": os.path.join(base, INTENTS),
+            "model_path": os.path.join(base, MODELO),
+            "dimensions_path": os.path.join(base, DIMENSOES),
+        }
+
+    def existe(self, versao: str) -> bool:
+        return all(os.path.exists(c) for c in self.caminhos(versao).values())
+
+    # Copia um modelo treinado para uma nova versão do registro (sem ativá-la)
+    # Os pesos são gravados em .npz e as intents já compiladas, para que a ativação seja rápida
+    def publicar(
+        self,
+        intents_path: str,
+        model_path: str,
+        dimensions_path: str,
+        metricas: Optional[dict] = None,
+        versao: Optional[str] = None,
+    ) -> str:
+        versao = versao or (
+            datetime.now().strftime("%Y%m%d-%H%M%S") + "-" + hash_intents(intents_path)[:8]
+        )
+        destino = os.path.join(self.versoes_dir, versao)
+        if os.path.exists(destino):
+            raise VersaoInvalida(f"Versão {versao} já existe no registro")
+
+        temporario = os.path.join(self.versoes_dir, f".{versao}.tmp")
+        shutil.rmtree(temporario, ignore_errors=True)
+        os.makedirs(temporario)
+
+        npz_path = caminho_npz(model_path)
+        if model_path.endswith(".npz"):
+            npz_path = model_path
+        elif not os.path.exists(npz_path) or (
+            os.path.exists(model_path) and os.path.getmtime(model_path) > os.path.getmtime(npz_path)
+        ):
+            exportar_pesos(model_path, npz_path)
+
+        shutil.copyfile(npz_path, os.path.join(temporario, MODELO))
+        shutil.copyfile(intents_path, os.path.join(temporario, INTENTS))
+        shutil.copyfile(dimensions_path, os.path.join(temporario, DIMENSOES))
+
+        copia_intents = os.path.join(temporario, INTENTS)
+        IntentsCompilados.compilar(copia_intents).salvar(caminho_artefato(copia_intents))
+
+        _escrever_atomico(
+            os.path.join(temporario, METRICAS),
+            json.dumps({"criado_em": datetime.now().isoformat(), **(metricas or {})}),
+        )
+
+        os.replace(temporario, destino)
+        return versao
+
+    # Nome da versão ativa, ou None se nenhuma versão foi ativada
+    def versao_ativa(self) -> Optional[str]:
+        try:
+            with open(self.arquivo_ativo, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    # Marca a versão como ativa para todos os workers e registra a troca no histórico
+    def ativar(self, versao: str):
+        if not self.existe(versao):
+            raise VersaoInvalida(f"Versão {versao} não encontrada no registro")
+
+        historico = self.historico()
+        if not historico or historico[-1] != versao:
+            historico.append(versao)
+            _escrever_atomico(self.arquivo_historico, json.dumps(historico))
+        _escrever_atomico(self.arquivo_ativo, versao)
+
+    # Versão ativada antes da atual, usada no rollback
+    def versao_anterior(self) -> Optional[str]:
+        atual = self.versao_ativa()
+        for versao in reversed(self.historico()[:-1]):
+            if versao != atual and self.existe(versao):
+                return versao
+        return None
+
+    # Volta a ativar a versão anterior, descartando do histórico as versões posteriores a ela
+    def reverter(self) -> str:
+        anterior = self.versao_anterior()
+        if anterior is None:
+            raise VersaoInvalida("Não há versão anterior para reverter")
+
+        historico = self.historico()
+        while historico[-1] != anterior:
+            historico.pop()
+        _escrever_atomico(self.arquivo_historico, json.dumps(historico))
+        _escrever_atomico(self.arquivo_ativo, anterior)
+        return anterior
+
+    def historico(self) -> list:
+        try:
+            with open(self.arquivo_historico, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def metricas(self, versao: str) -> dict:
+        try:
+            with open(os.path.join(self.versoes_dir, versao, METRICAS), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    # Lista as versões publicadas, da mais recente para a mais antiga
+    def listar(self) -> list:
+        if not os.path.isdir(self.versoes_dir):
+            return []
+
+        ativa = self.versao_ativa()
+        versoes = sorted(
+            (v for v in os.listdir(self.versoes_dir) if not v.startswith(".")), reverse=True
+        )
+        return [
+            {"versao": v, "ativa": v == ativa, "metricas": self.metricas(v)}
+            for v in versoes
+        ]
+
+
+# Mantém o modelo em uso por um worker sincronizado com a versão ativa do registro
+# A nova versão é carregada por completo (e aquecida) antes de substituir a referência no recurso,
+# então requisições em andamento terminam com a versão antiga e as novas já usam a nova
+# Se a nova versão falhar ao carregar, o worker continua com a versão atual
+class AtualizadorModelo:
+    def __init__(
+        self,
+        registro: RegistroModelos,
+        recurso,
+        carregar_versao: Callable,
+        intervalo: float = INTERVALO_VERIFICACAO,
+    ):
+        self.registro = registro
+        self.recurso = recurso
+        self.carregar_versao = carregar_versao
+        self.intervalo = intervalo
+
+        self.erro = None
+        self._ultima_verificacao = 0.0
+        self._lock = threading.Lock()
+
+    # Versão carregada neste worker (None para o modelo fora do registro)
+    @property
+    def versao_carregada(self) -> Optional[str]:
+        return getattr(self.recurso.valor, "versao", None)
+
+    # Verificação barata, chamada a cada requisição: no máximo uma leitura do arquivo "ativo" por intervalo
+    # Se a versão ativa mudou, a troca acontece em uma thread, sem atrasar a requisição atual
+    def verificar(self):
+        agora = time.monotonic()
+        if agora - self._ultima_verificacao < self.intervalo:
+            return
+        self._ultima_verificacao = agora
+
+        versao = self.registro.versao_ativa()
+        if versao is None or versao == self.versao_carregada or self._lock.locked():
+            return
+
+        threading.Thread(
+            target=self._trocar_silenciosamente, args=(versao,), name="trocar-modelo", daemon=True
+        ).start()
+
+    # Carrega e aquece a versão informada e só então troca a referência usada pelas requisições
+    def trocar(self, versao: str):
+        with self._lock:
+            if versao == self.versao_carregada:
+                return self.recurso.valor
+            return self._substituir(versao, self.carregar_versao(versao))
+
+    # Ativa uma versão para todos os workers (endpoint de administração)
+    # A versão é carregada antes de ser marcada como ativa: um modelo inválido gera erro e nada muda
+    def ativar(self, versao: str):
+        if not self.registro.existe(versao):
+            raise VersaoInvalida(f"Versão {versao} não encontrada no registro")
+
+        with self._lock:
+            assistant = self.carregar_versao(versao)
+            self.registro.ativar(versao)
+            return self._substituir(versao, assistant)
+
+    # Volta para a versão ativada anteriormente, com a mesma validação de ativar
+    def reverter(self):
+        anterior = self.registro.versao_anterior()
+        if anterior is None:
+            raise VersaoInvalida("Não há versão anterior para reverter")
+
+        with self._lock:
+            assistant = self.carregar_versao(anterior)
+            self.registro.reverter()
+            return self._substituir(anterior, assistant)
+
+    def _substituir(self, versao, assistant):
+        self.recurso.substituir(assistant)
+        self.erro = None
+        print(f"Modelo do chatbot trocado para a versão {versao}")
+        return assistant
+
+    def _trocar_silenciosamente(self, versao: str):
+        try:
+            self.trocar(versao)
+        except Exception as e:
+            self.erro = f"{versao}: {e}"
+            print(f"Erro ao trocar modelo para a versão {versao}: {e}")
+
+
+if __name__ == "__main__":
+    registro = RegistroModelos()
+    comando = sys.argv[1] if len(sys.argv) > 1 else "listar"
+
+    if comando == "publicar":
+        versao = registro.publicar(
+            "app/chatbot/intents.json",
+            "app/chatbot/chatbot_model.pth",
+            "app/chatbot/dimensions.json",
+        )
+        print(f"Versão {versao} publicada")
+    elif comando == "ativar":
+        registro.ativar(sys.argv[2])
+        print(f"Versão {sys.argv[2]} ativada")
+    elif comando == "reverter":
+        print(f"Versão {registro.reverter()} reativada")
+    else:
+        for item in registro.listar():
+            print(("* " if item["ativa"] else "  ") + item["versao"], item["metricas"])
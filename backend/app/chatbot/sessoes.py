@@ -0,0 +1,155 @@
+import asyncio
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional
+
+# Cabeçalho e cookie usados para identificar a conversa de cada visitante
+SESSION_HEADER = "X-Session-Id"
+SESSION_COOKIE = "sennacar_session"
+
+# Formato dos ids de sessão aceitos (uuid4 em hexadecimal)
+_SESSION_ID = re.compile(r"[0-9a-f]{32}")
+
+# Limites padrão do armazenamento de sessões (podem ser alterados via .env)
+MAX_SESSOES = int(os.getenv("CHATBOT_MAX_SESSOES", "5000"))
+TTL_SESSAO = int(os.getenv("CHATBOT_TTL_SESSAO", "1800"))
+
+# Etapas da conversa (estados da máquina de estados em fluxo.py)
+INICIO = "inicio"
+SELECIONANDO_PRODUTO = "selecionando_produto"
+CONFIRMANDO_DADOS = "confirmando_dados"
+AGENDANDO = "agendando"
+CONFIRMANDO_AGENDAMENTO = "confirmando_agendamento"
+
+
+# Produto no carrinho de uma conversa
+# Guarda apenas o id e os preços do momento da escolha, e não o documento inteiro do MongoDB
+class ItemCarrinho(NamedTuple):
+    id: str
+    nome: str
+    preco: float
+    preco_mao_obra: float = 0.0
+    categoria: Optional[str] = None
+
+    # Cria o item a partir de um documento da coleção de produtos
+    @classmethod
+    def de_documento(cls, produto: dict) -> "ItemCarrinho":
+        return cls(
+            str(produto["_id"]),
+            produto["nome"],
+            float(produto["preco"]),
+            float(produto.get("preco_mao_obra") or 0),
+            produto.get("categoria"),
+        )
+
+    # Preço do produto somado à mão de obra da instalação
+    @property
+    def total(self) -> float:
+        return self.preco + self.preco_mao_obra
+
+
+def _client_data_vazio() -> dict:
+    return {"nome": None, "email": None, "telefone": None}
+
+
+# Estado de uma única conversa com o chatbot
+# Guarda apenas os dados que mudam a cada mensagem (carrinho, dados do cliente e etapas do fluxo)
+# O modelo treinado e o vocabulário ficam no ChatbotAssistant, compartilhados entre as sessões
+# Todos os campos são declarados aqui (slots=True): nenhum handler cria atributos novos na conversa
+@dataclass(slots=True)
+class ConversationState:
+    etapa: str = INICIO
+
+    current_message: str = ""
+    last_user_choice: Optional[str] = None
+
+    selected_products: List[ItemCarrinho] = field(default_factory=list)
+    produtos_temp: Optional[Dict[str, ItemCarrinho]] = None
+    current_category: Optional[str] = None
+
+    client_data: dict = field(default_factory=_client_data_vazio)
+    client_data_temp: Optional[dict] = None
+
+    temp_agendamento_data: Optional[dict] = None
+
+    # Data e horário citados pelo cliente em texto livre (ver entidades.py), usados no lugar do calendário
+    data_sugerida: Optional[date] = None
+    hora_sugerida: Optional[str] = None
+    # Garante que as mensagens da mesma conversa sejam processadas uma de cada vez pela API
+    trava: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+
+    # Limpa as seleções temporárias da conversa, mantendo os dados já confirmados do cliente
+    def reset(self):
+        self.etapa = INICIO
+        self.produtos_temp = None
+        self.current_category = None
+        self.selected_products = []
+        self.client_data_temp = None
+        self.temp_agendamento_data = None
+        self.data_sugerida = None
+        self.hora_sugerida = None
+
+
+# Armazenamento em memória das conversas ativas, indexado pelo id de sessão
+# - LRU: a sessão menos usada recentemente é descartada ao atingir o limite de sessões
+# - TTL: sessões sem mensagens há mais de `ttl` segundos expiram
+# As operações são síncronas e executadas no event loop, portanto não precisam de lock
+class SessionStore:
+    def __init__(self, max_sessoes: int = MAX_SESSOES, ttl: float = TTL_SESSAO):
+        self.max_sessoes = max_sessoes
+        self.ttl = ttl
+        self._sessoes = OrderedDict()
+
+    def __len__(self):
+        return len(self._sessoes)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessoes
+
+    # Gera um novo id de sessão aleatório
+    @staticmethod
+    def novo_id() -> str:
+        return uuid.uuid4().hex
+
+    # Indica se o id recebido do cliente tem o formato gerado por novo_id (32 caracteres hexadecimais)
+    @staticmethod
+    def id_valido(session_id: Optional[str]) -> bool:
+        return session_id is not None and _SESSION_ID.fullmatch(session_id) is not None
+
+    # Retorna o estado da sessão, criando um novo se ela não existir ou tiver expirado
+    # Toda leitura renova o TTL e move a sessão para o fim da fila LRU
+    def obter(self, session_id: str) -> ConversationState:
+        agora = time.monotonic()
+        item = self._sessoes.get(session_id)
+
+        if item is not None and agora - item[0] <= self.ttl:
+            self._sessoes[session_id] = (agora, item[1])
+            self._sessoes.move_to_end(session_id)
+            return item[1]
+
+        estado = ConversationState()
+        self._sessoes[session_id] = (agora, estado)
+        self._sessoes.move_to_end(session_id)
+        self._despejar(agora)
+        return estado
+
+    # Remove a sessão informada, retornando True se ela existia
+    def remover(self, session_id: str) -> bool:
+        return self._sessoes.pop(session_id, None) is not None
+
+    # Remove as sessões expiradas e, se ainda necessário, as menos usadas até respeitar o limite
+    # Como a fila está ordenada por último acesso, basta olhar o início dela
+    def _despejar(self, agora: Optional[float] = None):
+        agora = time.monotonic() if agora is None else agora
+
+        while self._sessoes:
+            session_id, (ultimo_acesso, _) = next(iter(self._sessoes.items()))
+            if agora - ultimo_acesso > self.ttl or len(self._sessoes) > self.max_sessoes:
+                del self._sessoes[session_id]
+            else:
+                break
@@ -0,0 +1,64 @@
+import re
+from functools import lru_cache
+
+# Versão do pipeline de tokenização
+# Deve ser incrementada sempre que as regras abaixo mudarem, pois o vocabulário do modelo depende delas
+TOKENIZER_VERSION = 1
+
+# Tabela de remoção de acentos (aplicada após converter para minúsculas)
+_SEM_ACENTOS = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçñ",
+    "aaaaaeeeeiiiiooooouuuucn",
+)
+
+# Tokens são sequências de letras e dígitos; todo o resto (pontuação, emojis, hífens) separa palavras
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Regras de redução de plural do português, no estilo do primeiro passo do stemmer RSLP
+# Cada regra: (sufixo, substituição, tamanho mínimo do radical)
+_REGRAS_PLURAL = (
+    ("oes", "ao", 1),
+    ("aes", "ao", 1),
+    ("ais", "al", 1),
+    ("eis", "el", 2),
+    ("ois", "ol", 2),
+    ("ns", "m", 1),
+    ("res", "r", 3),
+    ("les", "l", 3),
+    ("s", "", 3),
+)
+
+# Palavras curtas ou invariáveis que não devem ser reduzidas
+_INVARIAVEIS = frozenset(
+    {"mais", "menos", "depois", "pois", "vcs", "voces", "nos", "vos", "tres", "seis"}
+)
+
+
+# Converte para minúsculas e remove os acentos, para que "multimídia" e "multimidia" coincidam
+def remover_acentos(texto: str) -> str:
+    return texto.lower().translate(_SEM_ACENTOS)
+
+
+# Normaliza uma mensagem para busca exata nas tabelas de comandos e padrões das intents
+def chave_exata(texto: str) -> str:
+    return remover_acentos(texto.strip()).rstrip("?!. ")
+
+
+# Normaliza um token já sem acentos, reduzindo plurais para a forma singular
+# O resultado é memorizado por token, já que o vocabulário das conversas é pequeno e repetitivo
+@lru_cache(maxsize=16384)
+def normalizar_token(token: str) -> str:
+    if token in _INVARIAVEIS or not token.endswith("s") or token.endswith("ss"):
+        return token
+
+    for sufixo, substituicao, minimo in _REGRAS_PLURAL:
+        if token.endswith(sufixo) and len(token) - len(sufixo) >= minimo:
+            return token[: -len(sufixo)] + substituicao
+
+    return token
+
+
+# Tokeniza e normaliza um texto em português
+# Usado tanto na leitura do intents.json quanto nas mensagens recebidas, garantindo o mesmo vocabulário
+def tokenizar(texto: str) -> list:
+    return [normalizar_token(token) for token in _TOKEN_RE.findall(remover_acentos(texto))]
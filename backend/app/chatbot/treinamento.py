@@ -0,0 +1,341 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from app.chatbot.modelo import ChatbotModel
+
+# Limites padrão do treinamento com parada antecipada
+MAX_EPOCAS = 1000
+PACIENCIA = 50
+FRACAO_VALIDACAO = 0.2
+
+# Espaço de busca padrão dos hiperparâmetros
+GRADE_PADRAO = {
+    "hidden_sizes": [(64, 32), (128, 64), (256, 128)],
+    "dropout": [0.2, 0.5],
+    "lr": [0.01, 0.005, 0.001],
+}
+
+
+# Hiperparâmetros de um treinamento
+# batch_size = 0 treina com todos os exemplos em cada passo (full-batch)
+class Hiperparametros(NamedTuple):
+    hidden_sizes: Tuple[int, int] = (128, 64)
+    dropout: float = 0.5
+    lr: float = 0.001
+    batch_size: int = 0
+
+
+# Resultado de um treinamento: acurácia e perda na validação, épocas executadas e duração
+class ResultadoTreino(NamedTuple):
+    hiperparametros: Hiperparametros
+    acuracia: Optional[float]
+    perda: float
+    epocas: int
+    segundos: float
+
+
+# Separa uma parte dos exemplos de cada intent para validação
+# Intents com menos de três padrões ficam inteiras no treino, pois o modelo precisa conhecê-las
+def dividir_treino_validacao(X, y, fracao=FRACAO_VALIDACAO, semente=0):
+    rng = np.random.default_rng(semente)
+    treino, validacao = [], []
+
+    for classe in np.unique(y):
+        indices = rng.permutation(np.flatnonzero(y == classe))
+        n_validacao = max(1, int(len(indices) * fracao)) if len(indices) >= 3 else 0
+        validacao.extend(indices[:n_validacao])
+        treino.extend(indices[n_validacao:])
+
+    treino, validacao = np.sort(treino), np.sort(validacao)
+    return X[treino], y[treino], X[validacao], y[validacao]
+
+
+# Treina um ChatbotModel com as matrizes já em memória, sem DataLoader
+# Com dados de validação, para quando a perda na validação não melhora por `paciencia` épocas
+# e restaura os pesos da melhor época; sem validação, executa exatamente `max_epocas` épocas
+def treinar_modelo(
+    X,
+    y,
+    n_classes,
+    hiperparametros=Hiperparametros(),
+    max_epocas=MAX_EPOCAS,
+    X_val=None,
+    y_val=None,
+    paciencia=PACIENCIA,
+    semente=0,
+):
+    torch.manual_seed(semente)
+    inicio = time.perf_counter()
+
+    X_tensor = torch.from_numpy(np.array(X, dtype=np.float32))
+    y_tensor = torch.from_numpy(np.array(y, dtype=np.int64))
+    validar = X_val is not None and len(X_val) > 0
+    if validar:
+        X_val_tensor = torch.from_numpy(np.array(X_val, dtype=np.float32))
+        y_val_tensor = torch.from_numpy(np.array(y_val, dtype=np.int64))
+
+    model = ChatbotModel(
+        X_tensor.shape[1],
+        n_classes,
+        hidden_sizes=hiperparametros.hidden_sizes,
+        dropout=hiperparametros.dropout,
+    )
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=hiperparametros.lr)
+
+    n = len(X_tensor)
+    batch_size = hiperparametros.batch_size or n
+
+    melhor_perda = float("inf")
+    melhor_estado = None
+    melhor_epoca = 0
+    perda = float("inf")
+
+    for epoca in range(1, max_epocas + 1):
+        model.train()
+        ordem = torch.randperm(n) if batch_size < n else None
+        perda_total = 0.0
+
+        for inicio_lote in range(0, n, batch_size):
+            if ordem is None:
+                batch_X, batch_y = X_tensor, y_tensor
+            else:
+                indices = ordem[inicio_lote : inicio_lote + batch_size]
+                batch_X, batch_y = X_tensor[indices], y_tensor[indices]
+
+            optimizer.zero_grad()
+            loss = criterion(model(batch_X), batch_y)
+            loss.backward()
+            optimizer.step()
+            perda_total += loss.item() * len(batch_X)
+
+        perda = perda_total / n
+
+        if not validar:
+            continue
+
+        model.eval()
+        with torch.no_grad():
+            perda_val = criterion(model(X_val_tensor), y_val_tensor).item()
+
+        if perda_val < melhor_perda:
+            melhor_perda = perda_val
+            melhor_epoca = epoca
+            melhor_estado = {k: v.detach().clone() for k, v in model.state_dict().items()}
+        elif epoca - melhor_epoca >= paciencia:
+            break
+
+    acuracia = None
+    if validar and melhor_estado is None:
+        # A perda na validação nunca foi finita (ex.: lr alto demais fez o treino divergir):
+        # o resultado fica registrado como falho, no fim da ordenação da busca
+        acuracia = 0.0
+        perda = float("inf")
+    elif validar:
+        model.load_state_dict(melhor_estado)
+        model.eval()
+        with torch.no_grad():
+            acuracia = (model(X_val_tensor).argmax(dim=1) == y_val_tensor).float().mean().item()
+        perda = melhor_perda
+    else:
+        melhor_epoca = max_epocas
+
+    model.eval()
+    resultado = ResultadoTreino(
+        hiperparametros, acuracia, perda, melhor_epoca, time.perf_counter() - inicio
+    )
+    return model, resultado
+
+
+# Chave de ordenação dos resultados: maior acurácia e, em caso de empate, menor perda
+# Resultados sem acurácia (treinados sem validação) ou com perda NaN ficam por último
+def _ordem(resultado: ResultadoTreino):
+    perda = float("inf") if math.isnan(resultado.perda) else resultado.perda
+    return (resultado.acuracia is None, -(resultado.acuracia or 0.0), perda)
+
+
+# Gera todas as combinações da grade de hiperparâmetros
+def combinacoes(grade=GRADE_PADRAO) -> List[Hiperparametros]:
+    chaves = list(grade)
+    return [
+        Hiperparametros(**dict(zip(chaves, valores)))
+        for valores in itertools.product(*(grade[c] for c in chaves))
+    ]
+
+
+# Sorteia até `n` combinações da grade (busca aleatória)
+def amostrar(n, grade=GRADE_PADRAO, semente=0) -> List[Hiperparametros]:
+    candidatos = combinacoes(grade)
+    return random.Random(semente).sample(candidatos, min(n, len(candidatos)))
+
+
+# Executado em cada processo da busca; um thread por processo evita disputa entre os treinos
+def _avaliar(argumentos):
+    X, y, X_val, y_val, n_classes, hiperparametros, max_epocas, paciencia, semente = argumentos
+    torch.set_num_threads(1)
+    _, resultado = treinar_modelo(
+        X, y, n_classes, hiperparametros, max_epocas, X_val, y_val, paciencia, semente
+    )
+    return resultado
+
+
+# Treina cada combinação de hiperparâmetros em paralelo e retorna os resultados do melhor para o pior
+# (maior acurácia na validação e, em caso de empate, menor perda)
+def buscar_hiperparametros(
+    X,
+    y,
+    X_val,
+    y_val,
+    n_classes,
+    candidatos,
+    processos=None,
+    max_epocas=MAX_EPOCAS,
+    paciencia=PACIENCIA,
+    semente=0,
+) -> List[ResultadoTreino]:
+    tarefas = [
+        (X, y, X_val, y_val, n_classes, hp, max_epocas, paciencia, semente)
+        for hp in candidatos
+    ]
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+
+    if processos <= 1:
+        resultados = [_avaliar(tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(processos, mp_context=get_context("spawn")) as pool:
+            resultados = list(pool.map(_avaliar, tarefas))
+
+    return sorted(resultados, key=_ordem)
+
+
+# Acurácia formatada para o relatório ("-" quando o treino não teve validação)
+def formatar_acuracia(acuracia: Optional[float]) -> str:
+    return "-" if acuracia is None else f"{acuracia:.3f}"
+
+
+# Melhor resultado da busca, já ordenada; sem nenhuma combinação com perda finita (todas divergiram),
+# não há modelo a salvar e a busca termina com erro
+def escolher_melhor(resultados: List[ResultadoTreino]) -> ResultadoTreino:
+    melhor = resultados[0]
+    if not math.isfinite(melhor.perda):
+        raise ValueError("nenhuma combinação de hiperparâmetros convergiu")
+    return melhor
+
+
+# Imprime o resultado da busca em forma de tabela
+def imprimir_relatorio(resultados: List[ResultadoTreino]):
+    print(f"{'camadas':>12} {'dropout':>8} {'lr':>7} {'acurácia':>9} {'perda':>7} {'épocas':>7} {'tempo':>7}")
+    for r in resultados:
+        hp = r.hiperparametros
+        acuracia = f"{formatar_acuracia(r.acuracia):>9}"
+        print(
+            f"{str(hp.hidden_sizes):>12} {hp.dropout:>8.2f} {hp.lr:>7.4f} "
+            f"{acuracia} {r.perda:>7.4f} {r.epocas:>7} {r.segundos:>6.2f}s"
+        )
+
+
+# Comando de treinamento: busca de hiperparâmetros com validação, retreino do melhor com todos os
+# padrões pelo mesmo número de épocas e gravação do modelo e do dimensions.json
+# Com --publicar, o modelo também é copiado para uma nova versão do registro (ver registro.py);
+# com --ativar, essa versão passa a ser usada pelos workers da API sem reinício
+# Uso: python -m app.chatbot.treinamento [--aleatoria N] [--processos P] [--publicar] [--ativar]
+if __name__ == "__main__":
+    from app.chatbot.chatbot import ChatbotAssistant
+
+    parser = argparse.ArgumentParser(description="Treina o modelo de intents do chatbot")
+    parser.add_argument("--intents", default="app/chatbot/intents.json")
+    parser.add_argument("--modelo", default="app/chatbot/chatbot_model.pth")
+    parser.add_argument("--dimensoes", default="app/chatbot/dimensions.json")
+    parser.add_argument("--aleatoria", type=int, default=0, help="sorteia N combinações da grade")
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--max-epocas", type=int, default=MAX_EPOCAS)
+    parser.add_argument("--paciencia", type=int, default=PACIENCIA)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--publicar", action="store_true", help="publica no registro de modelos")
+    parser.add_argument("--ativar", action="store_true", help="publica e ativa a nova versão")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+
+    assistant = ChatbotAssistant(args.intents)
+    assistant.parse_intents()
+    assistant.prepare_data()
+
+    X_treino, y_treino, X_val, y_val = dividir_treino_validacao(
+        assistant.X, assistant.y, semente=args.semente
+    )
+    candidatos = (
+        amostrar(args.aleatoria, semente=args.semente) if args.aleatoria else combinacoes()
+    )
+    print(
+        f"Buscando entre {len(candidatos)} combinações "
+        f"({len(X_treino)} exemplos de treino, {len(X_val)} de validação)"
+    )
+
+    resultados = buscar_hiperparametros(
+        X_treino,
+        y_treino,
+        X_val,
+        y_val,
+        len(assistant.intents),
+        candidatos,
+        processos=args.processos,
+        max_epocas=args.max_epocas,
+        paciencia=args.paciencia,
+        semente=args.semente,
+    )
+    imprimir_relatorio(resultados)
+
+    try:
+        melhor = escolher_melhor(resultados)
+    except ValueError as erro:
+        sys.exit(f"Erro no treinamento: {erro}")
+    model, final = treinar_modelo(
+        assistant.X,
+        assistant.y,
+        len(assistant.intents),
+        melhor.hiperparametros,
+        max_epocas=melhor.epocas,
+        semente=args.semente,
+    )
+    assistant.usar_modelo(model)
+    assistant.save_model(args.modelo, args.dimensoes)
+
+    print(
+        f"Melhor: {melhor.hiperparametros} (acurácia {formatar_acuracia(melhor.acuracia)}); "
+        f"modelo final treinado em {final.segundos:.2f}s e salvo em {args.modelo}"
+    )
+    if args.publicar or args.ativar:
+        from app.chatbot.registro import RegistroModelos
+
+        registro = RegistroModelos()
+        versao = registro.publicar(
+            args.intents,
+            args.modelo,
+            args.dimensoes,
+            metricas={
+                "acuracia_validacao": melhor.acuracia,
+                "perda_validacao": melhor.perda,
+                "epocas": melhor.epocas,
+                "hiperparametros": melhor.hiperparametros._asdict(),
+                "segundos_treino": final.segundos,
+            },
+        )
+        if args.ativar:
+            registro.ativar(versao)
+        print(f"Versão {versao} publicada" + (" e ativada" if args.ativar else ""))
+
+    print(f"Tempo total: {time.perf_counter() - inicio:.1f}s")
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+# Vetorizador bag-of-words baseado em um índice palavra -> coluna
+# Em vez de percorrer todo o vocabulário a cada mensagem, consulta apenas as palavras da mensagem
+# no dicionário, então o custo cresce com o tamanho do texto e não com o do vocabulário
+class BagOfWords:
+
+    # Apenas o índice é mantido; a lista do vocabulário fica com quem treina o modelo
+    def __init__(self, vocabulary):
+        self.index = {word: i for i, word in enumerate(vocabulary)}
+        self.size = len(self.index)
+
+    def __len__(self):
+        return self.size
+
+    # Retorna as colunas (sem repetição) das palavras conhecidas de uma mensagem
+    def columns(self, words):
+        index = self.index
+        return sorted({index[word] for word in words if word in index})
+
+    # Gera o vetor de entrada (1 x vocabulário) de uma única mensagem já tokenizada
+    def transform(self, words, dtype=np.float32):
+        row = np.zeros((1, self.size), dtype=dtype)
+        row[0, self.columns(words)] = 1
+        return row
+
+    # Gera a matriz de entrada (N x vocabulário) de várias mensagens já tokenizadas
+    # Os índices das posições ativas são coletados primeiro e preenchidos de uma só vez
+    def transform_batch(self, documents, dtype=np.float32):
+        index = self.index
+        rows = []
+        cols = []
+
+        for i, words in enumerate(documents):
+            for col in {index[word] for word in words if word in index}:
+                rows.append(i)
+                cols.append(col)
+
+        matrix = np.zeros((len(documents), self.size), dtype=dtype)
+        matrix[rows, cols] = 1
+        return matrix
@@ -0,0 +1,275 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from pymongo import monitoring
+
+# Configuração do perfil de comandos do MongoDB (pode ser alterada via .env)
+# - MONGO_LIMITE_LENTO_MS: comandos acima desse tempo entram na lista de lentos
+# - MONGO_EXPLICAR_LENTAS: "ativado" roda explain() (uma vez por formato) das consultas lentas
+# - MONGO_MAX_FORMATOS: formatos de consulta acompanhados; acima disso sai o de menor tempo total
+# - MONGO_MAX_LENTAS: comandos lentos mais recentes mantidos em memória
+LIMITE_LENTO_MS = float(os.getenv("MONGO_LIMITE_LENTO_MS", "100"))
+EXPLICAR_LENTAS = os.getenv("MONGO_EXPLICAR_LENTAS", "desativado") == "ativado"
+MAX_FORMATOS = int(os.getenv("MONGO_MAX_FORMATOS", "500"))
+MAX_LENTAS = int(os.getenv("MONGO_MAX_LENTAS", "100"))
+
+# Comandos de controle do driver, que não dizem nada sobre as consultas da aplicação
+IGNORADOS = {
+    "explain", "hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart",
+    "saslContinue", "buildInfo", "getLastError", "killCursors",
+}
+
+# Comandos de leitura que podem ser explicados
+EXPLICAVEIS = {"find", "aggregate", "count", "distinct"}
+
+# Campos que o driver acrescenta ao comando e que não fazem parte da consulta
+_CAMPOS_DRIVER = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "readConcern"}
+
+_OPERADORES_LOGICOS = {"$and", "$or", "$nor"}
+
+
+# Formato de um filtro do MongoDB, com os valores trocados por "?"
+# Consultas que diferem apenas nos valores têm o mesmo formato e, portanto, usam os mesmos índices
+def formatar(valor):
+    if isinstance(valor, dict):
+        return {
+            chave: (
+                [formatar(item) for item in campo]
+                if chave in _OPERADORES_LOGICOS and isinstance(campo, list)
+                else formatar(campo)
+            )
+            for chave, campo in valor.items()
+        }
+    return "?"
+
+
+# Formato da consulta enviada em um comando: filtro, ordenação e, em agregações, as etapas do pipeline
+def formato_comando(nome: str, comando) -> str:
+    if nome == "find":
+        partes = [json.dumps(formatar(comando.get("filter", {})), ensure_ascii=False)]
+        if comando.get("sort"):
+            partes.append("sort=" + json.dumps(dict(comando["sort"])))
+        return " ".join(partes)
+
+    if nome == "aggregate":
+        etapas = []
+        for etapa in comando.get("pipeline", []):
+            operador = next(iter(etapa), "?")
+            if operador == "$match":
+                etapas.append(f"$match {json.dumps(formatar(etapa[operador]), ensure_ascii=False)}")
+            else:
+                etapas.append(operador)
+        return " | ".join(etapas)
+
+    if nome in ("update", "delete"):
+        operacoes = comando.get(nome + "s") or [{}]
+        return json.dumps(formatar(operacoes[0].get("q", {})), ensure_ascii=False)
+
+    if nome in ("count", "distinct", "findAndModify"):
+        return json.dumps(formatar(comando.get("query") or {}), ensure_ascii=False)
+
+    return "-"
+
+
+# Quantidade de documentos devolvidos ou afetados, conforme a resposta do servidor
+def documentos_resposta(resposta) -> int:
+    cursor = resposta.get("cursor")
+    if cursor is not None:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    if "values" in resposta:
+        return len(resposta["values"])
+    if "value" in resposta:
+        return 1 if resposta["value"] is not None else 0
+    return int(resposta.get("n", 0))
+
+
+# Resumo do plano vencedor de um explain(): etapas de cima para baixo, com o índice usado
+# Ex.: "FETCH > IXSCAN(cliente_id_1_data_agendada_1)" ou "COLLSCAN"
+def resumir_plano(explicacao: dict) -> str:
+    planejador = explicacao.get("queryPlanner")
+    if planejador is None:
+        for etapa in explicacao.get("stages", []):
+            planejador = etapa.get("$cursor", {}).get("queryPlanner")
+            if planejador:
+                break
+    plano = (planejador or {}).get("winningPlan", {})
+    plano = plano.get("queryPlan", plano)
+
+    etapas = []
+    while plano:
+        nome = plano.get("stage", "?")
+        if plano.get("indexName"):
+            nome += f"({plano['indexName']})"
+        etapas.append(nome)
+        plano = plano.get("inputStage") or (plano.get("inputStages") or [None])[0]
+    return " > ".join(etapas) or "?"
+
+
+# Roda explain() do comando no banco de origem, apenas com o plano escolhido (sem executar a consulta)
+def explicar_comando(banco: str, comando: dict) -> dict:
+    from app.database import get_client
+
+    return get_client()[banco].command({"explain": comando, "verbosity": "queryPlanner"})
+
+
+# Estatísticas acumuladas de um formato de consulta
+class EstatisticaFormato:
+    __slots__ = (
+        "colecao", "operacao", "formato", "n", "total_ms", "max_ms", "documentos", "ultimo", "plano"
+    )
+
+    def __init__(self, colecao: str, operacao: str, formato: str):
+        self.colecao = colecao
+        self.operacao = operacao
+        self.formato = formato
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.documentos = 0
+        self.ultimo = None
+        self.plano = None
+
+    def resumo(self) -> dict:
+        return {
+            "colecao": self.colecao,
+            "operacao": self.operacao,
+            "formato": self.formato,
+            "n": self.n,
+            "total_ms": round(self.total_ms, 3),
+            "media_ms": round(self.total_ms / self.n, 3) if self.n else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "documentos_media": round(self.documentos / self.n, 1) if self.n else 0.0,
+            "ultimo": self.ultimo,
+            "plano": self.plano,
+        }
+
+
+# Listener de comandos do pymongo que agrupa os comandos por formato de consulta
+# Para cada formato guarda quantidade, tempo total e máximo e documentos devolvidos; os comandos acima de
+# limite_ms também entram em uma lista circular dos mais recentes. Com explicar ativado, a primeira
+# ocorrência lenta de cada formato de leitura roda explain() em segundo plano e guarda o plano
+# (um COLLSCAN aponta um índice faltando)
+class PerfilComandos(monitoring.CommandListener):
+    def __init__(
+        self,
+        limite_ms: float = LIMITE_LENTO_MS,
+        explicar: bool = EXPLICAR_LENTAS,
+        max_formatos: int = MAX_FORMATOS,
+        max_lentas: int = MAX_LENTAS,
+        explicador: Callable[[str, dict], dict] = explicar_comando,
+    ):
+        self.limite_ms = limite_ms
+        self.explicar = explicar
+        self.max_formatos = max_formatos
+        self.explicador = explicador
+
+        self.formatos = {}
+        self.lentas = deque(maxlen=max_lentas)
+        self._pendentes = {}
+        self._explicados = set()
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        nome = event.command_name
+        if nome in IGNORADOS:
+            return
+        # No getMore o campo do comando é o id do cursor; a coleção vem em "collection"
+        colecao = event.command.get("collection" if nome == "getMore" else nome)
+        pendente = (
+            colecao if isinstance(colecao, str) else "-",
+            formato_comando(nome, event.command),
+            event.command if nome in EXPLICAVEIS else None,
+        )
+        with self._lock:
+            self._pendentes[(event.connection_id, event.request_id)] = pendente
+
+    def succeeded(self, event):
+        self._concluir(event, documentos_resposta(event.reply))
+
+    def failed(self, event):
+        self._concluir(event, 0)
+
+    def _concluir(self, event, documentos: int):
+        with self._lock:
+            pendente = self._pendentes.pop((event.connection_id, event.request_id), None)
+            if pendente is None:
+                return
+            colecao, formato, comando = pendente
+            duracao = event.duration_micros / 1000
+
+            chave = (colecao, event.command_name, formato)
+            estatistica = self.formatos.get(chave)
+            if estatistica is None:
+                if len(self.formatos) >= self.max_formatos:
+                    menor = min(self.formatos, key=lambda k: self.formatos[k].total_ms)
+                    del self.formatos[menor]
+                estatistica = self.formatos[chave] = EstatisticaFormato(*chave)
+
+            estatistica.n += 1
+            estatistica.total_ms += duracao
+            estatistica.documentos += documentos
+            estatistica.ultimo = time.time()
+            if duracao > estatistica.max_ms:
+                estatistica.max_ms = duracao
+
+            if duracao < self.limite_ms:
+                return
+            self.lentas.append(
+                {
+                    "colecao": colecao,
+                    "operacao": event.command_name,
+                    "formato": formato,
+                    "duracao_ms": round(duracao, 3),
+                    "documentos": documentos,
+                    "quando": estatistica.ultimo,
+                }
+            )
+            explicar = self.explicar and comando is not None and chave not in self._explicados
+            if explicar:
+                self._explicados.add(chave)
+
+        if explicar:
+            threading.Thread(
+                target=self._explicar,
+                args=(estatistica, event.database_name, comando),
+                name="explicar-consulta",
+                daemon=True,
+            ).start()
+
+    # Roda o explain fora da thread do driver e registra o plano no formato correspondente
+    def _explicar(self, estatistica: EstatisticaFormato, banco: str, comando):
+        consulta = {k: v for k, v in comando.items() if k not in _CAMPOS_DRIVER}
+        try:
+            estatistica.plano = resumir_plano(self.explicador(banco, consulta))
+            print(
+                f"Consulta lenta em {estatistica.colecao} ({estatistica.operacao} "
+                f"{estatistica.formato}): {estatistica.plano}"
+            )
+        except Exception as e:
+            estatistica.plano = f"erro: {e}"
+            print(f"Erro ao explicar consulta lenta: {e}")
+
+    # Formatos ordenados por "total_ms", "max_ms" ou "media_ms" (maiores primeiro)
+    def mais_lentos(self, limite: int = 20, ordem: str = "total_ms") -> list:
+        with self._lock:
+            resumos = [e.resumo() for e in self.formatos.values()]
+        resumos.sort(key=lambda r: r[ordem], reverse=True)
+        return resumos[:limite]
+
+    def recentes(self) -> list:
+        with self._lock:
+            return list(reversed(self.lentas))
+
+    def limpar(self):
+        with self._lock:
+            self.formatos.clear()
+            self.lentas.clear()
+            self._explicados.clear()
+
+
+# Perfil compartilhado, registrado no MongoClient da aplicação (ver app/database.py)
+perfil_comandos = PerfilComandos()
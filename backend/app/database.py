@@ -1,25 +1,103 @@
+import os
+import threading
+
 from pymongo import MongoClient
 
-client = MongoClient("mongodb://localhost:27017")
-db = client["sennacar_db"]
+from app.consultas_lentas import perfil_comandos
+from app.indices import INDICES, GerenciadorIndices
+from app.metricas import MetricasMongo
+
+# Configuração da conexão com o MongoDB (pode ser alterada via .env)
+# - MONGO_URI / MONGO_DB: servidor e banco da aplicação
+# - MONGO_POOL_MIN / MONGO_POOL_MAX: conexões mantidas / máximas por worker; com N workers o servidor
+#   recebe até N * MONGO_POOL_MAX conexões
+# - MONGO_CONNECT_TIMEOUT_MS: tempo para abrir uma conexão
+# - MONGO_SERVER_SELECTION_TIMEOUT_MS: quanto uma operação espera por um servidor disponível antes de falhar
+# - MONGO_SOCKET_TIMEOUT_MS: tempo máximo de espera por uma resposta (0 = sem limite)
+# - MONGO_READ_PREFERENCE: primary, primaryPreferred, secondary, secondaryPreferred ou nearest
+# - MONGO_WRITE_CONCERN: "majority" ou número de nós que confirmam a escrita (vazio = padrão do servidor)
+# Esses valores têm precedência sobre as mesmas opções escritas na URI
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+MONGO_DB = os.getenv("MONGO_DB", "sennacar_db")
+MONGO_POOL_MIN = int(os.getenv("MONGO_POOL_MIN", "0"))
+MONGO_POOL_MAX = int(os.getenv("MONGO_POOL_MAX", "100"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "")
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Opções do MongoClient montadas a partir da configuração acima
+def configuracao_cliente() -> dict:
+    opcoes = {
+        "minPoolSize": MONGO_POOL_MIN,
+        "maxPoolSize": MONGO_POOL_MAX,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+        "readPreference": MONGO_READ_PREFERENCE,
+    }
+    if MONGO_WRITE_CONCERN:
+        opcoes["w"] = int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+    return opcoes
+
+
+# Retorna o cliente do MongoDB, criando-o no primeiro uso
+# A criação do MongoClient não abre conexões; elas são estabelecidas em segundo plano pelo driver
+# A duração de cada comando é registrada nas métricas da API (ver app/metricas.py) e no perfil
+# de consultas lentas (ver app/consultas_lentas.py)
+def get_client() -> MongoClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    MONGO_URI,
+                    event_listeners=[MetricasMongo(), perfil_comandos],
+                    **configuracao_cliente(),
+                )
+    return _client
+
+
+def get_db():
+    return get_client()[MONGO_DB]
+
+
+# Verifica se o servidor do MongoDB está respondendo
+def verificar_conexao():
+    get_client().admin.command("ping")
+    return True
+
+
+# Índices declarados em app/indices.py, criados em segundo plano no aquecimento da API pelo recurso
+# "indices" (ver app/repositorios); o status de cada um fica disponível em /health/indices
+gerenciador_indices = GerenciadorIndices(INDICES, get_db)
+
 
-db["funcionarios"].create_index("email", unique=True)
-db["agendamentos"].create_index("data_agendada", unique=True)
-db["produtos"].create_index("nome")
-db["clientes"].create_index("telefone", unique=True)
+# Fecha o cliente do MongoDB no desligamento da API
+def fechar_conexao():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
 
 
 def get_funcionario_collection():
-    return db["funcionarios"]
+    return get_db()["funcionarios"]
 
 
 def get_clientes_collection():
-    return db["clientes"]
+    return get_db()["clientes"]
 
 
 def get_agendamentos_collection():
-    return db["agendamentos"]
+    return get_db()["agendamentos"]
 
 
 def get_produtos_collection():
-    return db["produtos"]
+    return get_db()["produtos"]
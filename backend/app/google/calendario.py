@@ -1,4 +1,5 @@
 import os
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from google.oauth2.credentials import Credentials
@@ -7,6 +8,10 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from app import recursos
+from app.metricas import erros_calendario, medir_calendario
+from app.rastreamento import medir_metodos
+
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CREDENTIALS_PATH = Path(__file__).parent.parent / "credenciais" / "credentials.json"
 TOKEN_PATH = Path(__file__).parent.parent / "credenciais" / "token.json"
@@ -14,9 +19,21 @@ TOKEN_PATH = Path(__file__).parent.parent / "credenciais" / "token.json"
 
 # Serviço de integração com a API do Google Calendar
 # Responsável pela autenticação e operações de criação e listagem de eventos
+# As chamadas à API são medidas como as etapas "calendar.<método>" (ver app/rastreamento.py)
+@medir_metodos("calendar")
 class GoogleCalendarService:
     def __init__(self):
-        self.service = self._authenticate()
+        self.creds = self._authenticate()
+        self._local = threading.local()
+
+    # Cliente da API exclusivo da thread atual
+    # O httplib2 usado pelo googleapiclient não é thread-safe, então apenas as credenciais são compartilhadas
+    @property
+    def service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = build("calendar", "v3", credentials=self.creds)
+        return service
 
     # Realiza autenticação OAuth2 com o Google Calendar
     # Carrega token existente ou inicia fluxo de autenticação
@@ -37,10 +54,11 @@ class GoogleCalendarService:
             with open(TOKEN_PATH, "w") as token:
                 token.write(creds.to_json())
 
-        return build("calendar", "v3", credentials=creds)
+        return creds
 
     # Cria um evento no Google Calendar com os dados fornecidos
     # Inclui lembretes padrão por popup e email
+    @medir_calendario("create_event")
     def create_event(self, event_data):
         try:
             event = {
@@ -66,11 +84,13 @@ class GoogleCalendarService:
                 self.service.events().insert(calendarId="primary", body=event).execute()
             )
         except HttpError as error:
+            erros_calendario.labels("create_event").inc()
             print(f"Erro ao criar evento: {error}")
             return None
 
     # Lista os próximos eventos no Google Calendar
     # Por padrão, retorna os 10 eventos futuros ordenados pela data de início
+    @medir_calendario("list_events")
     def list_events(self, max_results=10):
         now = datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
         try:
@@ -87,5 +107,32 @@ class GoogleCalendarService:
             )
             return events_result.get("items", [])
         except HttpError as error:
+            erros_calendario.labels("list_events").inc()
             print(f"Erro ao listar eventos: {error}")
             return []
+
+
+_servico = None
+_servico_lock = threading.Lock()
+
+
+# Retorna a instância compartilhada do serviço do Google Calendar
+# A autenticação acontece apenas uma vez por processo; cada thread constrói o próprio cliente da API
+def get_calendar_service() -> GoogleCalendarService:
+    global _servico
+    if _servico is None:
+        with _servico_lock:
+            if _servico is None:
+                _servico = GoogleCalendarService()
+    return _servico
+
+
+# Aquece o serviço do calendário na inicialização da API
+# Só autentica se já houver token salvo, para nunca abrir o fluxo OAuth interativo em segundo plano
+def aquecer_calendario():
+    if not TOKEN_PATH.exists():
+        raise RuntimeError("token do Google Calendar não encontrado")
+    return get_calendar_service()
+
+
+recursos.registrar("calendario", aquecer_calendario, obrigatorio=False)
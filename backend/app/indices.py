@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+PENDENTE = "pendente"
+CRIANDO = "criando"
+PRONTO = "pronto"
+ERRO = "erro"
+
+
+# Índice de uma coleção do MongoDB
+# chaves segue o formato do create_index: [("campo", 1), ("outro", -1)]
+# O nome é gerado como o driver faz (ex.: cliente_id_1_data_agendada_1), para reconhecer índices já existentes
+class Indice:
+    def __init__(self, colecao: str, chaves: List[Tuple[str, int]], unique: bool = False, **opcoes):
+        self.colecao = colecao
+        self.chaves = list(chaves)
+        self.unique = unique
+        self.opcoes = opcoes
+        self.nome = opcoes.pop("name", None) or "_".join(f"{campo}_{ordem}" for campo, ordem in self.chaves)
+
+        self.status = PENDENTE
+        self.erro = None
+        self.duracao = None
+        self.criado = False
+
+    # Compara com a descrição devolvida por index_information(); nomes iguais com definição
+    # diferente não são recriados automaticamente (exigiria remover o índice antigo)
+    def divergencia(self, existente: dict) -> Optional[str]:
+        chaves = [(campo, int(ordem)) for campo, ordem in existente.get("key", [])]
+        if chaves != self.chaves:
+            return f"chaves existentes {chaves} diferem de {self.chaves}"
+        if bool(existente.get("unique")) != self.unique:
+            return f"unique existente {bool(existente.get('unique'))} difere de {self.unique}"
+        return None
+
+    def resumo(self) -> dict:
+        return {
+            "colecao": self.colecao,
+            "nome": self.nome,
+            "chaves": [list(chave) for chave in self.chaves],
+            "unique": self.unique,
+            "status": self.status,
+            "criado": self.criado,
+            "duracao_ms": round(self.duracao * 1000, 1) if self.duracao is not None else None,
+            "erro": self.erro,
+        }
+
+
+# Todos os índices usados pelas consultas da aplicação, declarados em um único lugar
+# Em índices compostos os campos de igualdade vêm antes do campo ordenado ou filtrado por intervalo,
+# então o MongoDB percorre só o trecho do índice que interessa e já na ordem pedida (sem SORT em memória)
+INDICES = [
+    Indice("funcionarios", [("email", 1)], unique=True),
+    # Também atende a verificação de horário ocupado (data_agendada + status $in)
+    Indice("agendamentos", [("data_agendada", 1)], unique=True),
+    # Agendamentos de um cliente, do mais recente para o mais antigo (índice percorrido de trás para frente)
+    Indice("agendamentos", [("cliente_id", 1), ("data_agendada", 1)]),
+    # Agendamentos de um período filtrados pelo status
+    Indice("agendamentos", [("status", 1), ("data_agendada", 1)]),
+    # Multikey: uma entrada por produto do agendamento, para a busca paginada por produto
+    Indice("agendamentos", [("produtos", 1), ("data_agendada", 1)]),
+    # Ordem alfabética com o _id como desempate: atende a busca por nome e a listagem paginada de produtos
+    Indice("produtos", [("nome", 1), ("_id", 1)]),
+    Indice("clientes", [("telefone", 1)], unique=True),
+]
+
+
+# Cria os índices declarados que ainda não existem no banco e guarda o status de cada um
+# A operação é idempotente: os índices já existentes (criados por outro worker ou em um deploy anterior)
+# são apenas conferidos, então só o primeiro worker a subir paga o custo da criação
+class GerenciadorIndices:
+    def __init__(self, indices: List[Indice], obter_db: Callable):
+        self.indices = indices
+        self.obter_db = obter_db
+        self.verificado_em = None
+        self._lock = threading.Lock()
+
+    # Confere e cria os índices; falhas ficam registradas no índice e, ao final, geram um erro único
+    # com todos os que não puderam ser criados (o recurso "indices" fica com status de erro)
+    def criar(self) -> dict:
+        with self._lock:
+            db = self.obter_db()
+            existentes = {}
+            for indice in self.indices:
+                if indice.colecao not in existentes:
+                    existentes[indice.colecao] = db[indice.colecao].index_information()
+                self._garantir(db, indice, existentes[indice.colecao])
+            self.verificado_em = time.time()
+
+        falhas = [f"{i.colecao}.{i.nome}: {i.erro}" for i in self.indices if i.status == ERRO]
+        if falhas:
+            raise RuntimeError("Índices não criados: " + "; ".join(falhas))
+        return self.resumo()
+
+    def _garantir(self, db, indice: Indice, existentes: dict):
+        if indice.nome in existentes:
+            indice.erro = indice.divergencia(existentes[indice.nome])
+            indice.status = ERRO if indice.erro else PRONTO
+            return
+
+        indice.status = CRIANDO
+        inicio = time.perf_counter()
+        try:
+            db[indice.colecao].create_index(
+                indice.chaves, name=indice.nome, unique=indice.unique, **indice.opcoes
+            )
+            indice.status = PRONTO
+            indice.criado = True
+            indice.erro = None
+        except Exception as e:
+            indice.status = ERRO
+            indice.erro = str(e)
+            print(f"Erro ao criar índice {indice.colecao}.{indice.nome}: {e}")
+        finally:
+            indice.duracao = time.perf_counter() - inicio
+
+    def resumo(self) -> dict:
+        return {
+            "pronto": all(i.status == PRONTO for i in self.indices),
+            "verificado_em": self.verificado_em,
+            "indices": [i.resumo() for i in self.indices],
+        }
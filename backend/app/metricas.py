@@ -0,0 +1,208 @@
+import functools
+import os
+import threading
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from pymongo import monitoring
+
+# Com vários workers (uvicorn --workers N / gunicorn), defina PROMETHEUS_MULTIPROC_DIR com um diretório
+# vazio compartilhado por eles: cada processo grava os próprios valores ali e /metrics soma todos
+DIRETORIO_MULTIPROCESSO = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Intervalos (em segundos) dos histogramas de operações rápidas (MongoDB e inferência)
+INTERVALOS_RAPIDOS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+requisicoes = Counter(
+    "sennacar_http_requisicoes_total",
+    "Requisições HTTP atendidas",
+    ["metodo", "rota", "status"],
+)
+duracao_requisicoes = Histogram(
+    "sennacar_http_requisicao_duracao_segundos",
+    "Duração das requisições HTTP",
+    ["metodo", "rota", "status"],
+)
+em_andamento = Gauge(
+    "sennacar_http_requisicoes_em_andamento",
+    "Requisições HTTP sendo atendidas",
+    multiprocess_mode="livesum",
+)
+
+duracao_mongo = Histogram(
+    "sennacar_mongo_comando_duracao_segundos",
+    "Duração dos comandos enviados ao MongoDB",
+    ["colecao", "operacao"],
+    buckets=INTERVALOS_RAPIDOS,
+)
+falhas_mongo = Counter(
+    "sennacar_mongo_comando_falhas_total",
+    "Comandos do MongoDB que falharam",
+    ["colecao", "operacao"],
+)
+
+duracao_calendario = Histogram(
+    "sennacar_calendario_chamada_duracao_segundos",
+    "Duração das chamadas à API do Google Calendar",
+    ["operacao"],
+)
+erros_calendario = Counter(
+    "sennacar_calendario_erros_total",
+    "Chamadas à API do Google Calendar que falharam",
+    ["operacao"],
+)
+
+intents_chatbot = Counter(
+    "sennacar_chatbot_intents_total",
+    "Intents respondidas pelo chatbot",
+    ["intent"],
+)
+duracao_inferencia = Histogram(
+    "sennacar_chatbot_inferencia_duracao_segundos",
+    "Duração de cada lote de classificação do executor de inferência",
+    buckets=INTERVALOS_RAPIDOS,
+)
+duracao_classificacao = Histogram(
+    "sennacar_chatbot_classificacao_duracao_segundos",
+    "Tempo de cada mensagem no executor de inferência, incluindo a espera na fila",
+    buckets=INTERVALOS_RAPIDOS,
+)
+tamanho_lote = Histogram(
+    "sennacar_chatbot_lote_tamanho",
+    "Mensagens por lote do executor de inferência",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+consultas_cache = Counter(
+    "sennacar_cache_consultas_total",
+    "Consultas aos caches em memória (a taxa de acerto é acerto / total)",
+    ["cache", "resultado"],
+)
+
+
+# Contadores de acerto e falha de um cache, já com os rótulos resolvidos (usados a cada consulta)
+class ContadorCache:
+    def __init__(self, cache: str):
+        self.acerto = consultas_cache.labels(cache, "acerto")
+        self.falha = consultas_cache.labels(cache, "falha")
+
+
+# Conteúdo do endpoint /metrics no formato de texto do Prometheus
+def gerar() -> tuple:
+    if DIRETORIO_MULTIPROCESSO:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
+
+
+# Remove os valores "live" deste worker no modo multiprocesso (chamado no desligamento da API)
+def encerrar_processo():
+    if DIRETORIO_MULTIPROCESSO:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# Mede a duração de uma chamada ao Google Calendar e conta as exceções como erros
+def medir_calendario(operacao: str):
+    duracao = duracao_calendario.labels(operacao)
+    erros = erros_calendario.labels(operacao)
+
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            except Exception:
+                erros.inc()
+                raise
+            finally:
+                duracao.observe(time.perf_counter() - inicio)
+
+        return medida
+
+    return decorador
+
+
+# Listener de comandos do pymongo: mede cada comando por coleção e operação
+# O nome da coleção só está no evento de início, então é guardado até o evento de conclusão
+class MetricasMongo(monitoring.CommandListener):
+    def __init__(self):
+        self._colecoes = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        # No getMore o campo do comando é o id do cursor; a coleção vem em "collection"
+        nome = event.command_name
+        colecao = event.command.get("collection" if nome == "getMore" else nome)
+        if not isinstance(colecao, str):
+            colecao = "-"
+        with self._lock:
+            self._colecoes[(event.connection_id, event.request_id)] = colecao
+
+    def _colecao(self, event) -> str:
+        with self._lock:
+            return self._colecoes.pop((event.connection_id, event.request_id), "-")
+
+    def succeeded(self, event):
+        duracao_mongo.labels(self._colecao(event), event.command_name).observe(
+            event.duration_micros / 1e6
+        )
+
+    def failed(self, event):
+        colecao = self._colecao(event)
+        duracao_mongo.labels(colecao, event.command_name).observe(event.duration_micros / 1e6)
+        falhas_mongo.labels(colecao, event.command_name).inc()
+
+
+# Modelo da rota que atendeu a requisição (ex.: /clientes/{cliente_id}), já com o prefixo do router
+# Versões recentes do FastAPI incluem os routers sem copiar as rotas, então scope["route"] tem apenas
+# o caminho dentro do router; o caminho completo fica no contexto da rota efetiva
+def modelo_rota(scope) -> str:
+    efetiva = scope.get("fastapi", {}).get("effective_route_context")
+    if efetiva is not None:
+        return efetiva.path_format
+    return getattr(scope.get("route"), "path", None) or "desconhecida"
+
+
+# Middleware ASGI que conta as requisições e mede a duração por rota
+# Usa o modelo da rota (ex.: /clientes/{cliente_id}), não o caminho, para manter poucas séries;
+# caminhos que não correspondem a nenhuma rota são agrupados em "desconhecida"
+class MiddlewareMetricas:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+            await send(mensagem)
+
+        em_andamento.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            em_andamento.dec()
+            rotulos = (scope["method"], modelo_rota(scope), str(status[0]))
+            requisicoes.labels(*rotulos).inc()
+            duracao_requisicoes.labels(*rotulos).observe(duracao)
@@ -1,11 +1,13 @@
-from app.database import get_agendamentos_collection
-from bson import ObjectId
+from app import repositorios
+from app.rastreamento import medir_metodos
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from app.models.produto import Produto
-from app.google.calendario import GoogleCalendarService
+from app.google.calendario import get_calendar_service
 
 
+# Cada método público é medido como a etapa "db.agendamento.<método>" (ver app/rastreamento.py)
+@medir_metodos("db.agendamento")
 class Agendamento:
     def __init__(
         self,
@@ -30,14 +32,9 @@ class Agendamento:
     # - Salva o agendamento no banco de dados
     def criar_agendamento(self) -> Optional[str]:
         try:
-            agendamentos_col = get_agendamentos_collection()
+            agendamentos = repositorios.agendamentos()
 
-            if agendamentos_col.find_one(
-                {
-                    "data_agendada": self.data_agendada,
-                    "status": {"$in": ["pendente", "confirmado"]},
-                }
-            ):
+            if agendamentos.buscar_ativo_no_horario(self.data_agendada):
                 print("Horário já ocupado")
                 return None
 
@@ -54,7 +51,7 @@ class Agendamento:
                 if produto:
                     nomes_produtos.append(produto["nome"])
 
-            google_service = GoogleCalendarService()
+            google_service = get_calendar_service()
             start_time = self.data_agendada
             end_time = start_time + timedelta(minutes=30)
             event = google_service.create_event(
@@ -67,7 +64,7 @@ class Agendamento:
             )
             google_event_id = event.get("id") if event else None
 
-            agendamento_id = agendamentos_col.insert_one(
+            agendamento_id = agendamentos.inserir(
                 {
                     "cliente_id": self.cliente_id,
                     "data_agendada": self.data_agendada,
@@ -78,7 +75,7 @@ class Agendamento:
                     "google_event_id": google_event_id,
                     "criado_em": datetime.now(),
                 }
-            ).inserted_id
+            )
 
             print(
                 f"Agendamento criado | Cliente: {nome_cliente} | Total: R${valor_total:.2f} | ID: {agendamento_id}"
@@ -94,9 +91,7 @@ class Agendamento:
     @staticmethod
     def buscar_por_id(agendamento_id: str) -> Optional[Dict]:
         try:
-            return get_agendamentos_collection().find_one(
-                {"_id": ObjectId(agendamento_id)}
-            )
+            return repositorios.agendamentos().buscar_por_id(agendamento_id)
         except Exception as e:
             print(f"Erro ao buscar agendamento: {str(e)}")
             return None
@@ -105,11 +100,7 @@ class Agendamento:
     @staticmethod
     def buscar_por_cliente(cliente_id: str) -> List[Dict]:
         try:
-            return list(
-                get_agendamentos_collection().find(
-                    {"cliente_id": cliente_id}, sort=[("data_agendada", -1)]
-                )
-            )
+            return repositorios.agendamentos().listar_por_cliente(cliente_id)
         except Exception as e:
             print(f"Erro ao buscar agendamentos: {str(e)}")
             return []
@@ -121,35 +112,64 @@ class Agendamento:
         data_inicio: datetime, data_fim: datetime, status: Optional[str] = None
     ) -> List[Dict]:
         try:
-            query = {"data_agendada": {"$gte": data_inicio, "$lte": data_fim}}
-            if status:
-                query["status"] = status
-
-            return list(
-                get_agendamentos_collection().find(query, sort=[("data_agendada", 1)])
-            )
+            return repositorios.agendamentos().listar_por_periodo(data_inicio, data_fim, status)
         except Exception as e:
             print(f"Erro ao filtrar agendamentos: {str(e)}")
             return []
 
+    # Busca uma página dos agendamentos que incluem o produto, do mais recente para o mais antigo
+    # Para a próxima página, informe em apos a data do último agendamento recebido
+    # Com limite None, retorna todos
+    @staticmethod
+    def buscar_por_produto(
+        produto_id: str,
+        limite: Optional[int] = 50,
+        apos: Optional[datetime] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        try:
+            return repositorios.agendamentos().listar_por_produto(produto_id, limite, apos, campos)
+        except Exception as e:
+            print(f"Erro ao buscar agendamentos por produto: {str(e)}")
+            return []
+
     # Lista todos os agendamentos cadastrados no banco
     @staticmethod
     def listar_todos() -> List[Dict]:
         try:
-            return list(get_agendamentos_collection().find({}))
+            return repositorios.agendamentos().listar_todos()
         except Exception as e:
             print(f"Erro ao listar agendamentos: {e}")
             return []
 
+    # Lista uma página de agendamentos, do mais recente para o mais antigo
+    # - Para a próxima página, informe em apos a data do último agendamento recebido
+    # - Com campos, traz do banco apenas esses campos (e o _id)
+    @staticmethod
+    def listar_pagina(
+        limite: int = 50, apos: Optional[datetime] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        try:
+            return repositorios.agendamentos().listar_pagina_por_data(limite, apos, campos)
+        except Exception as e:
+            print(f"Erro ao listar agendamentos: {e}")
+            return []
+
+    # Total de agendamentos cadastrados
+    @staticmethod
+    def contar() -> int:
+        try:
+            return repositorios.agendamentos().contar()
+        except Exception as e:
+            print(f"Erro ao contar agendamentos: {e}")
+            return 0
+
     # Atualiza os dados de um agendamento com base no ID
     # Retorna True se houve modificação, False caso contrário
     @staticmethod
     def atualizar_agendamento(agendamento_id: str, dados: dict) -> bool:
         try:
-            result = get_agendamentos_collection().update_one(
-                {"_id": ObjectId(agendamento_id)}, {"$set": dados}
-            )
-            return result.modified_count > 0
+            return repositorios.agendamentos().atualizar(agendamento_id, dados)
         except Exception as e:
             print(f"Erro ao atualizar agendamento: {str(e)}")
             return False
@@ -160,11 +180,9 @@ class Agendamento:
     def atualizar_produtos(agendamento_id: str, novos_produtos: List[str]) -> bool:
         try:
             valor_total = Produto.calcular_valor_total(novos_produtos)
-            result = get_agendamentos_collection().update_one(
-                {"_id": ObjectId(agendamento_id)},
-                {"$set": {"produtos": novos_produtos, "valor_total": valor_total}},
-            )
-            if result.modified_count > 0:
+            if repositorios.agendamentos().atualizar(
+                agendamento_id, {"produtos": novos_produtos, "valor_total": valor_total}
+            ):
                 print(f"Atualizado | Novo total: R${valor_total:.2f}")
                 return True
             return False
@@ -177,10 +195,9 @@ class Agendamento:
     @staticmethod
     def atualizar_status(agendamento_id: str, novo_status: str) -> bool:
         try:
-            result = get_agendamentos_collection().update_one(
-                {"_id": ObjectId(agendamento_id)}, {"$set": {"status": novo_status}}
+            return repositorios.agendamentos().atualizar(
+                agendamento_id, {"status": novo_status}
             )
-            return result.modified_count > 0
         except Exception as e:
             print(f"Erro ao atualizar status: {str(e)}")
             return False
@@ -190,10 +207,7 @@ class Agendamento:
     @staticmethod
     def deletar_agendamento(agendamento_id: str) -> bool:
         try:
-            result = get_agendamentos_collection().delete_one(
-                {"_id": ObjectId(agendamento_id)}
-            )
-            return result.deleted_count > 0
+            return repositorios.agendamentos().deletar(agendamento_id)
         except Exception as e:
             print(f"Erro ao deletar agendamento: {str(e)}")
             return False
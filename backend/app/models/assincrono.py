@@ -0,0 +1,54 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database import MONGO_POOL_MAX
+from app.models.agendamento import Agendamento
+from app.models.cliente import Cliente
+from app.models.funcionario import Funcionario
+from app.models.produto import Produto
+
+# Threads dedicadas às chamadas ao MongoDB (pode ser alterado via .env)
+# Limita quantas consultas de um worker aguardam o banco ao mesmo tempo, sem ocupar o event loop
+# Mais threads que conexões no pool (MONGO_POOL_MAX) só fariam as consultas esperarem por uma conexão
+MONGO_THREADS = int(os.getenv("MONGO_THREADS", str(min(32, MONGO_POOL_MAX))))
+
+_executor = ThreadPoolExecutor(max_workers=MONGO_THREADS, thread_name_prefix="mongo")
+
+
+# Executa uma função síncrona (consulta ao MongoDB, handler do chatbot) nas threads do banco
+# e aguarda o resultado sem bloquear o event loop
+# O contexto é copiado, então as etapas medidas na thread entram no rastro da requisição
+async def executar(funcao, *args, **kwargs):
+    contexto = contextvars.copy_context()
+    chamada = functools.partial(contexto.run, funcao, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_executor, chamada)
+
+
+# Versão assíncrona de um modelo: expõe os mesmos métodos, que passam a ser aguardados
+# Ex.: await ClienteAsync.buscar_por_telefone(telefone) ou await ModeloAsync(novo_cliente).cadastrar_cliente()
+class ModeloAsync:
+    def __init__(self, modelo):
+        self._modelo = modelo
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._modelo, nome)
+        if not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        async def metodo(*args, **kwargs):
+            return await executar(atributo, *args, **kwargs)
+
+        # Métodos da classe são criados uma única vez; os de instâncias valem só para ela
+        setattr(self, nome, metodo)
+        return metodo
+
+
+ClienteAsync = ModeloAsync(Cliente)
+ProdutoAsync = ModeloAsync(Produto)
+AgendamentoAsync = ModeloAsync(Agendamento)
+FuncionarioAsync = ModeloAsync(Funcionario)
+
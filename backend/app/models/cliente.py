@@ -1,8 +1,10 @@
-from app.database import get_clientes_collection
-from bson import ObjectId
+from app import repositorios
+from app.rastreamento import medir_metodos
 from typing import Optional, Dict, List
 
 
+# Cada método público é medido como a etapa "db.cliente.<método>" (ver app/rastreamento.py)
+@medir_metodos("db.cliente")
 class Cliente:
     def __init__(self, nome: str, email: str, telefone: str):
         self.nome = nome
@@ -14,17 +16,15 @@ class Cliente:
     # - Retorna o ID do cliente cadastrado ou None se já existir
     def cadastrar_cliente(self) -> Optional[str]:
         try:
-            clientes_collection = get_clientes_collection()
+            clientes = repositorios.clientes()
 
-            if clientes_collection.find_one(
-                {"$or": [{"email": self.email}, {"telefone": self.telefone}]}
-            ):
+            if clientes.buscar_por_email_ou_telefone(self.email, self.telefone):
                 print("Cliente já cadastrado (email ou telefone existente)")
                 return None
 
-            cliente_id = clientes_collection.insert_one(
+            cliente_id = clientes.inserir(
                 {"nome": self.nome, "email": self.email, "telefone": self.telefone}
-            ).inserted_id
+            )
 
             print(f"Cliente cadastrado com sucesso. ID: {cliente_id}")
             return str(cliente_id)
@@ -38,7 +38,7 @@ class Cliente:
     @staticmethod
     def buscar_por_id(cliente_id: str) -> Optional[Dict]:
         try:
-            return get_clientes_collection().find_one({"_id": ObjectId(cliente_id)})
+            return repositorios.clientes().buscar_por_id(cliente_id)
         except Exception as e:
             print(f"Erro ao buscar cliente: {e}")
             return None
@@ -48,7 +48,7 @@ class Cliente:
     @staticmethod
     def buscar_por_telefone(telefone: str) -> Optional[Dict]:
         try:
-            return get_clientes_collection().find_one({"telefone": telefone})
+            return repositorios.clientes().buscar_por_telefone(telefone)
         except Exception as e:
             print(f"Erro ao buscar cliente por telefone: {e}")
             return None
@@ -58,7 +58,7 @@ class Cliente:
     @staticmethod
     def buscar_por_nome(nome: str) -> Optional[Dict]:
         try:
-            return get_clientes_collection().find_one({"nome": nome})
+            return repositorios.clientes().buscar_por_nome(nome)
         except Exception as e:
             print(f"Erro ao buscar cliente por nome: {e}")
             return None
@@ -68,7 +68,7 @@ class Cliente:
     @staticmethod
     def buscar_por_email(email: str) -> Optional[Dict]:
         try:
-            return get_clientes_collection().find_one({"email": email})
+            return repositorios.clientes().buscar_por_email(email)
         except Exception as e:
             print(f"Erro ao buscar cliente por email: {e}")
             return None
@@ -77,41 +77,57 @@ class Cliente:
     # Utiliza expressão regular para busca insensível a maiúsculas/minúsculas
     @staticmethod
     def listar_por_nome_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(get_clientes_collection().find({"nome": regex}).limit(10))
+        return repositorios.clientes().buscar_por_trecho("nome", texto, limite=10)
 
     # Lista clientes cujo email corresponde parcialmente ao texto informado
     # Utiliza expressão regular para busca insensível a maiúsculas/minúsculas
     @staticmethod
     def listar_por_email_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(get_clientes_collection().find({"email": regex}).limit(10))
+        return repositorios.clientes().buscar_por_trecho("email", texto, limite=10)
 
     # Lista clientes cujo telefone corresponde parcialmente ao texto informado
     # Utiliza expressão regular para busca insensível a maiúsculas/minúsculas
     @staticmethod
     def listar_por_telefone_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(get_clientes_collection().find({"telefone": regex}).limit(10))
+        return repositorios.clientes().buscar_por_trecho("telefone", texto, limite=10)
 
     # Lista todos os clientes cadastrados no banco
     @staticmethod
     def listar_todos() -> List[Dict]:
         try:
-            return list(get_clientes_collection().find({}))
+            return repositorios.clientes().listar_todos()
+        except Exception as e:
+            print(f"Erro ao listar clientes: {e}")
+            return []
+
+    # Lista uma página de clientes em ordem de cadastro (_id)
+    # - Para a próxima página, informe em apos o ID do último cliente recebido
+    # - Com campos, traz do banco apenas esses campos (e o _id)
+    @staticmethod
+    def listar_pagina(
+        limite: int = 50, apos: Optional[str] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        try:
+            return repositorios.clientes().listar_pagina(limite, apos, campos)
         except Exception as e:
             print(f"Erro ao listar clientes: {e}")
             return []
 
+    # Total de clientes cadastrados
+    @staticmethod
+    def contar() -> int:
+        try:
+            return repositorios.clientes().contar()
+        except Exception as e:
+            print(f"Erro ao contar clientes: {e}")
+            return 0
+
     # Atualiza os dados de um cliente com base no ID
     # Retorna True se a atualização foi realizada com sucesso
     @staticmethod
     def atualizar_cliente(cliente_id: str, dados_atualizacao: Dict) -> bool:
         try:
-            result = get_clientes_collection().update_one(
-                {"_id": ObjectId(cliente_id)}, {"$set": dados_atualizacao}
-            )
-            return result.modified_count > 0
+            return repositorios.clientes().atualizar(cliente_id, dados_atualizacao)
         except Exception as e:
             print(f"Erro ao atualizar cliente: {e}")
             return False
@@ -121,8 +137,7 @@ class Cliente:
     @staticmethod
     def deletar_cliente(cliente_id: str) -> bool:
         try:
-            result = get_clientes_collection().delete_one({"_id": ObjectId(cliente_id)})
-            return result.deleted_count > 0
+            return repositorios.clientes().deletar(cliente_id)
         except Exception as e:
             print(f"Erro ao deletar cliente: {e}")
             return False
@@ -1,9 +1,11 @@
-from app.database import get_funcionario_collection
+from app import repositorios
+from app.rastreamento import medir_metodos
 from bcrypt import hashpw, gensalt, checkpw
 from typing import Optional, Dict, List
-from bson import ObjectId
 
 
+# Cada método público é medido como a etapa "db.funcionario.<método>" (ver app/rastreamento.py)
+@medir_metodos("db.funcionario", ignorar=("verificar_senha",))
 class Funcionario:
     def __init__(self, nome: str, email: str, senha: str, is_admin: bool = False):
         self.nome = nome
@@ -17,22 +19,22 @@ class Funcionario:
     # - Retorna o ID do funcionário ou None se já existir
     def cadastrar_funcionario(self) -> Optional[str]:
         try:
-            funcionario_collection = get_funcionario_collection()
+            funcionarios = repositorios.funcionarios()
 
-            if funcionario_collection.find_one({"email": self.email}):
+            if funcionarios.buscar_por_email(self.email):
                 print("Email já cadastrado")
                 return None
 
             hashed_senha = hashpw(self.senha.encode("utf-8"), gensalt())
 
-            funcionario_id = funcionario_collection.insert_one(
+            funcionario_id = funcionarios.inserir(
                 {
                     "nome": self.nome,
                     "email": self.email,
                     "senha": hashed_senha,
                     "isAdmin": self.is_admin,
                 }
-            ).inserted_id
+            )
 
             print(f"Funcionário cadastrado com sucesso. ID: {funcionario_id}")
             return str(funcionario_id)
@@ -46,10 +48,7 @@ class Funcionario:
     @staticmethod
     def buscar_por_id(funcionario_id: str) -> Optional[Dict]:
         try:
-            funcionario_id_obj = ObjectId(funcionario_id)
-            funcionario = get_funcionario_collection().find_one(
-                {"_id": funcionario_id_obj}
-            )
+            funcionario = repositorios.funcionarios().buscar_por_id(funcionario_id)
             return funcionario if funcionario else None
         except Exception as e:
             print(f"Erro ao buscar funcionário: {e}")
@@ -60,8 +59,7 @@ class Funcionario:
     @staticmethod
     def obter_funcionario_por_id(funcionario_id: str) -> Optional[Dict]:
         try:
-            funcionario_id_obj = ObjectId(funcionario_id)
-            return get_funcionario_collection().find_one({"_id": funcionario_id_obj})
+            return repositorios.funcionarios().buscar_por_id(funcionario_id)
         except Exception as e:
             print(f"Erro ao buscar funcionário por id: {e}")
             return None
@@ -71,7 +69,7 @@ class Funcionario:
     @staticmethod
     def buscar_por_email(email: str) -> Optional[Dict]:
         try:
-            return get_funcionario_collection().find_one({"email": email})
+            return repositorios.funcionarios().buscar_por_email(email)
         except Exception as e:
             print(f"Erro ao buscar funcionário por email: {e}")
             return None
@@ -80,42 +78,51 @@ class Funcionario:
     # Apenas funcionários não administradores são listados
     @staticmethod
     def listar_por_nome_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(
-            get_funcionario_collection()
-            .find({"nome": regex, "isAdmin": False})
-            .limit(10)
-        )
+        return repositorios.funcionarios().buscar_por_trecho("nome", texto, limite=10)
 
     # Lista funcionários cujo email corresponde parcialmente ao texto informado
     # Apenas funcionários não administradores são listados
     @staticmethod
     def listar_por_email_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(
-            get_funcionario_collection()
-            .find({"email": regex, "isAdmin": False})
-            .limit(10)
-        )
+        return repositorios.funcionarios().buscar_por_trecho("email", texto, limite=10)
 
     # Lista todos os funcionários cadastrados que não são administradores
     @staticmethod
     def listar_todos() -> List[Dict]:
         try:
-            return list(get_funcionario_collection().find({"isAdmin": False}))
+            return repositorios.funcionarios().listar_nao_administradores()
+        except Exception as e:
+            print(f"Erro ao listar funcionários: {e}")
+            return []
+
+    # Lista uma página dos funcionários não administradores, em ordem de cadastro (_id)
+    # - Para a próxima página, informe em apos o ID do último funcionário recebido
+    # - Com campos, traz do banco apenas esses campos (e o _id)
+    @staticmethod
+    def listar_pagina(
+        limite: int = 50, apos: Optional[str] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        try:
+            return repositorios.funcionarios().listar_pagina(limite, apos, campos, {"isAdmin": False})
         except Exception as e:
             print(f"Erro ao listar funcionários: {e}")
             return []
 
+    # Total de funcionários não administradores
+    @staticmethod
+    def contar() -> int:
+        try:
+            return repositorios.funcionarios().contar({"isAdmin": False})
+        except Exception as e:
+            print(f"Erro ao contar funcionários: {e}")
+            return 0
+
     # Atualiza os dados de um funcionário com base no ID
     # Retorna True se a atualização foi realizada com sucesso
     @staticmethod
     def atualizar_funcionario(funcionario_id: str, dados_atualizacao: Dict) -> bool:
         try:
-            result = get_funcionario_collection().update_one(
-                {"_id": ObjectId(funcionario_id)}, {"$set": dados_atualizacao}
-            )
-            return result.modified_count > 0
+            return repositorios.funcionarios().atualizar(funcionario_id, dados_atualizacao)
         except Exception as e:
             print(f"Erro ao atualizar funcionário: {e}")
             return False
@@ -125,10 +132,7 @@ class Funcionario:
     @staticmethod
     def deletar_funcionario(funcionario_id: str) -> bool:
         try:
-            result = get_funcionario_collection().delete_one(
-                {"_id": ObjectId(funcionario_id)}
-            )
-            return result.deleted_count > 0
+            return repositorios.funcionarios().deletar(funcionario_id)
         except Exception as e:
             print(f"Erro ao deletar funcionário: {e}")
             return False
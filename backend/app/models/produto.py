@@ -1,9 +1,11 @@
-from app.database import get_produtos_collection, get_agendamentos_collection
-from bson import ObjectId
+from app import repositorios
+from app.rastreamento import medir_metodos
 from decimal import Decimal
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 
+# Cada método público é medido como a etapa "db.produto.<método>" (ver app/rastreamento.py)
+@medir_metodos("db.produto")
 class Produto:
     def __init__(
         self,
@@ -24,13 +26,13 @@ class Produto:
     # - Insere o produto e retorna o ID
     def cadastrar_produto(self) -> Optional[str]:
         try:
-            produtos_col = get_produtos_collection()
+            produtos = repositorios.produtos()
 
-            if produtos_col.find_one({"nome": self.nome}):
+            if produtos.buscar_por_nome(self.nome):
                 print("Produto já existe")
                 return None
 
-            produto_id = produtos_col.insert_one(
+            produto_id = produtos.inserir(
                 {
                     "nome": self.nome,
                     "preco": float(self.preco),
@@ -38,7 +40,7 @@ class Produto:
                     **({"categoria": self.categoria} if self.categoria else {}),
                     **({"descricao": self.descricao} if self.descricao else {}),
                 }
-            ).inserted_id
+            )
 
             print(f"Produto cadastrado | ID: {produto_id}")
             return str(produto_id)
@@ -48,22 +50,11 @@ class Produto:
 
     # Calcula o valor total de uma lista de produtos
     # - Soma o preço e o preço de mão de obra de cada produto
-    # - Utiliza uma agregação no MongoDB
+    # - No MongoDB a soma é feita com uma agregação no servidor
     @staticmethod
     def calcular_valor_total(produtos_ids: List[str]) -> float:
         try:
-            produtos_col = get_produtos_collection()
-            pipeline = [
-                {"$match": {"_id": {"$in": [ObjectId(id) for id in produtos_ids]}}},
-                {
-                    "$group": {
-                        "_id": None,
-                        "total": {"$sum": {"$add": ["$preco", "$preco_mao_obra"]}},
-                    }
-                },
-            ]
-            result = list(produtos_col.aggregate(pipeline))
-            return result[0]["total"] if result else 0.0
+            return repositorios.produtos().somar_precos(produtos_ids)
         except Exception as e:
             print(f"Erro no cálculo: {str(e)}")
             return 0.0
@@ -74,21 +65,15 @@ class Produto:
     @staticmethod
     def atualizar_agendamento_com_total(agendamento_id: str) -> bool:
         try:
-            agendamento = get_agendamentos_collection().find_one(
-                {"_id": ObjectId(agendamento_id)}
-            )
+            agendamentos = repositorios.agendamentos()
+            agendamento = agendamentos.buscar_por_id(agendamento_id)
 
             if not agendamento:
                 return False
 
             valor_total = Produto.calcular_valor_total(agendamento["produtos"])
 
-            result = get_agendamentos_collection().update_one(
-                {"_id": ObjectId(agendamento_id)},
-                {"$set": {"valor_total": valor_total}},
-            )
-
-            return result.modified_count > 0
+            return agendamentos.atualizar(agendamento_id, {"valor_total": valor_total})
         except Exception as e:
             print(f"Erro ao atualizar valor do agendamento: {str(e)}")
             return False
@@ -98,7 +83,7 @@ class Produto:
     @staticmethod
     def buscar_por_id(produto_id: str) -> Optional[Dict]:
         try:
-            return get_produtos_collection().find_one({"_id": ObjectId(produto_id)})
+            return repositorios.produtos().buscar_por_id(produto_id)
         except Exception as e:
             print(f"Erro ao buscar produto: {str(e)}")
             return None
@@ -108,32 +93,59 @@ class Produto:
     @staticmethod
     def listar_por_categoria(categoria: str) -> List[Dict]:
         try:
-            return list(
-                get_produtos_collection().find(
-                    {"categoria": categoria}, sort=[("nome", 1)]
-                )
-            )
+            return repositorios.produtos().listar_por_categoria(categoria)
         except Exception as e:
             print(f"Erro ao listar produtos: {str(e)}")
             return []
 
+    # Lista todos os produtos ordenados pelo nome
+    # - Com campos, traz do banco apenas esses campos (e o _id)
+    @staticmethod
+    def listar_todos(campos: Optional[List[str]] = None) -> List[Dict]:
+        return repositorios.produtos().listar_todos(campos=campos)
+
+    # Lista uma página de produtos em ordem alfabética
+    # - Para a próxima página, informe em apos o par (nome, ID) do último produto recebido
+    # - Com campos, traz do banco apenas esses campos (e o _id)
+    @staticmethod
+    def listar_pagina(
+        limite: int = 50,
+        apos: Optional[Tuple[str, str]] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        try:
+            return repositorios.produtos().listar_pagina_por_nome(limite, apos, campos)
+        except Exception as e:
+            print(f"Erro ao listar produtos: {e}")
+            return []
+
+    # Total de produtos cadastrados
+    @staticmethod
+    def contar() -> int:
+        try:
+            return repositorios.produtos().contar()
+        except Exception as e:
+            print(f"Erro ao contar produtos: {e}")
+            return 0
+
+    # Lista as descrições distintas que contêm o texto informado
+    # - Usado na sugestão de categorias do cadastro de produtos
+    @staticmethod
+    def listar_descricoes_regex(texto: str) -> List[str]:
+        return repositorios.produtos().descricoes_com_trecho(texto)
+
     # Lista produtos cujo nome corresponde parcialmente ao texto informado
     # - Utiliza expressão regular (case insensitive)
     @staticmethod
     def listar_por_nome_regex(texto: str) -> List[Dict]:
-        regex = {"$regex": f".*{texto}.*", "$options": "i"}
-        return list(get_produtos_collection().find({"nome": regex}).limit(15))
+        return repositorios.produtos().buscar_por_trecho("nome", texto, limite=15)
 
     # Atualiza os dados de um produto pelo ID
     # - Retorna True se a atualização foi bem-sucedida
     @staticmethod
     def atualizar_produto(produto_id: str, dados_atualizados: dict) -> bool:
         try:
-            produtos_col = get_produtos_collection()
-            result = produtos_col.update_one(
-                {"_id": ObjectId(produto_id)}, {"$set": dados_atualizados}
-            )
-            return result.modified_count > 0
+            return repositorios.produtos().atualizar(produto_id, dados_atualizados)
         except Exception as e:
             print(f"Erro ao atualizar produto: {str(e)}")
             return False
@@ -143,9 +155,7 @@ class Produto:
     @staticmethod
     def deletar_produto(produto_id: str) -> bool:
         try:
-            produtos_col = get_produtos_collection()
-            result = produtos_col.delete_one({"_id": ObjectId(produto_id)})
-            return result.deleted_count > 0
+            return repositorios.produtos().deletar(produto_id)
         except Exception as e:
             print(f"Erro ao deletar produto: {str(e)}")
             return False
@@ -0,0 +1,84 @@
+import base64
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, Query, Response, status
+
+# Paginação das listagens por cursor (keyset): cada página continua a partir do último item da anterior,
+# usando o índice da ordenação, em vez de pular os N primeiros documentos a cada página
+# O corpo da resposta continua sendo a lista de itens; quando há mais itens, o cursor da próxima página
+# vem no cabeçalho abaixo e deve ser enviado de volta no parâmetro "apos"
+CABECALHO_CURSOR = "X-Proximo-Cursor"
+
+# Total de itens da listagem, enviado apenas quando pedido com total=true (contar tem custo próprio)
+CABECALHO_TOTAL = "X-Total-Count"
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 500
+
+
+# Parâmetro "limite" das rotas paginadas
+def parametro_limite():
+    return Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Itens por página")
+
+
+# Parâmetro "apos" das listagens em ordem de _id: o ID do último item da página anterior
+def parametro_apos_id():
+    return Query(None, description=f"ID do último item da página anterior (cabeçalho {CABECALHO_CURSOR})")
+
+
+def parametro_total():
+    return Query(False, description=f"Informa o total de itens no cabeçalho {CABECALHO_TOTAL}")
+
+
+# Listagem completa, sem paginação nem projeção, como antes da paginação (para clientes antigos)
+def parametro_todos():
+    return Query(False, description="Lista todos os itens de uma vez, sem paginação")
+
+
+# Campos lidos pelo modelo de resposta, para trazer do banco apenas eles (o id vem do _id)
+def campos_resposta(modelo) -> List[str]:
+    return [campo for campo in modelo.model_fields if campo != "id"]
+
+
+# Valida o cursor por _id recebido no parâmetro "apos"
+def cursor_por_id(apos: Optional[str]) -> Optional[str]:
+    if apos is not None and not ObjectId.is_valid(apos):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    return apos
+
+
+# Cursor da listagem em ordem alfabética: o par (nome, _id) em JSON, codificado em base64 para que
+# nomes com acentos caibam no cabeçalho
+def cursor_por_nome(apos: Optional[str]) -> Optional[Tuple[str, str]]:
+    if apos is None:
+        return None
+    try:
+        nome, documento_id = json.loads(base64.urlsafe_b64decode(apos.encode()))
+    except (ValueError, TypeError):
+        nome, documento_id = None, None
+    if not isinstance(nome, str) or not isinstance(documento_id, str) or not ObjectId.is_valid(documento_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+    return nome, documento_id
+
+
+def cursor_nome(item: Dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps([item["nome"], str(item["_id"])]).encode()).decode()
+
+
+def cursor_id(item: Dict) -> str:
+    return str(item["_id"])
+
+
+def cursor_data(item: Dict) -> str:
+    return item["data_agendada"].isoformat()
+
+
+# Recebe a página buscada com limite + 1 itens: o item a mais indica que há próxima página,
+# então é descartado e o cursor do último item que fica vai no cabeçalho
+def paginar(itens: List[Dict], limite: int, response: Response, cursor: Callable[[Dict], str]) -> List[Dict]:
+    if len(itens) > limite:
+        itens = itens[:limite]
+        response.headers[CABECALHO_CURSOR] = cursor(itens[-1])
+    return itens
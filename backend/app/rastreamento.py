@@ -0,0 +1,236 @@
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+# Liga a medição das etapas de cada requisição ("ativado" ou "desativado")
+# Desativado, cada etapa custa apenas a verificação de um atributo; pode ser ligado em tempo de execução
+# pelo endpoint de administração (ver app/routes/rastreamento.py)
+RASTREAMENTO = os.getenv("SENNACAR_RASTREAMENTO", "desativado")
+
+# Quantidade de rastros recentes mantidos em memória
+MAX_RASTROS = int(os.getenv("SENNACAR_MAX_RASTROS", "200"))
+
+# Limites superiores (ms) dos intervalos dos histogramas; o último intervalo não tem limite
+LIMITES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Etapa aberta no contexto atual (thread ou tarefa assíncrona)
+_etapa_atual = contextvars.ContextVar("etapa_atual", default=None)
+
+_NULO = nullcontext()
+
+
+# Distribuição das durações de uma etapa em intervalos fixos
+# Os percentis são estimados pelo limite superior do intervalo em que caem
+class Histograma:
+    def __init__(self, limites=LIMITES_MS):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.n = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, ms: float):
+        self.contagens[bisect_left(self.limites, ms)] += 1
+        self.n += 1
+        self.soma += ms
+        if ms > self.maximo:
+            self.maximo = ms
+
+    def percentil(self, p: float) -> float:
+        if not self.n:
+            return 0.0
+        alvo = p / 100 * self.n
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return self.limites[i] if i < len(self.limites) else self.maximo
+        return self.maximo
+
+    def resumo(self) -> dict:
+        return {
+            "n": self.n,
+            "media_ms": round(self.soma / self.n, 3) if self.n else 0.0,
+            "max_ms": round(self.maximo, 3),
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "p99_ms": self.percentil(99),
+            "intervalos": {
+                (f"<={limite}" if i < len(self.limites) else "+inf"): contagem
+                for i, (limite, contagem) in enumerate(zip((*self.limites, None), self.contagens))
+                if contagem
+            },
+        }
+
+
+# Rastro de uma requisição (ex.: um turno do chatbot) com as etapas executadas dentro dela
+# Cada etapa é guardada como (nome, nível, início, duração, tempo próprio), com tempos em ms
+class Rastro:
+    __slots__ = ("id", "nome", "inicio", "duracao", "etapas")
+
+    def __init__(self, nome: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.nome = nome
+        self.inicio = time.time()
+        self.duracao = None
+        self.etapas = []
+
+    def resumo(self) -> dict:
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "inicio": self.inicio,
+            "duracao_ms": round(self.duracao, 3) if self.duracao is not None else None,
+            "etapas": [
+                {
+                    "nome": nome,
+                    "nivel": nivel,
+                    "inicio_ms": round(inicio, 3),
+                    "duracao_ms": round(duracao, 3),
+                    "proprio_ms": round(proprio, 3),
+                }
+                for nome, nivel, inicio, duracao, proprio in sorted(self.etapas, key=lambda e: e[2])
+            ],
+        }
+
+
+# Trecho medido do código; mede o tempo total e o tempo próprio (sem as etapas internas)
+class Etapa:
+    __slots__ = (
+        "rastreador", "nome", "rastro", "pai", "nivel", "inicio", "origem", "filhos", "fechada", "_token"
+    )
+
+    def __init__(self, rastreador, nome: str, raiz: bool = False):
+        self.rastreador = rastreador
+        self.nome = nome
+        self.rastro = Rastro(nome) if raiz else None
+        self.filhos = 0.0
+        self.fechada = False
+
+    def __enter__(self):
+        pai = _etapa_atual.get()
+        # Um contexto copiado de uma requisição já encerrada (ex.: tarefa criada por ela) não tem pai
+        if pai is not None and pai.fechada:
+            pai = None
+        self.pai = pai
+        self.nivel = pai.nivel + 1 if pai else 0
+        if self.rastro is None and pai is not None:
+            self.rastro = pai.rastro
+        self._token = _etapa_atual.set(self)
+        self.inicio = time.perf_counter()
+        # Início da etapa raiz, para posicionar a etapa dentro do rastro
+        self.origem = pai.origem if pai else self.inicio
+        return self
+
+    def __exit__(self, *exc):
+        fim = time.perf_counter()
+        self.fechada = True
+        _etapa_atual.reset(self._token)
+
+        duracao = (fim - self.inicio) * 1000
+        if self.pai is not None:
+            self.pai.filhos += duracao
+        if self.rastro is not None:
+            self.rastro.etapas.append(
+                (self.nome, self.nivel, (self.inicio - self.origem) * 1000, duracao, duracao - self.filhos)
+            )
+        self.rastreador.registrar(self, duracao)
+        return False
+
+
+# Mede as etapas das requisições: guarda os rastros recentes e um histograma por etapa
+# Com o rastreamento desativado, etapa() e rastrear() devolvem um contexto vazio compartilhado
+class Rastreador:
+    def __init__(self, ativo: bool = False, max_rastros: int = MAX_RASTROS):
+        self.ativo = ativo
+        self.rastros = deque(maxlen=max_rastros)
+        self.histogramas: Dict[str, Histograma] = {}
+        self._lock = threading.Lock()
+
+    # Mede um trecho do código; dentro de um rastro, a etapa também aparece nele
+    def etapa(self, nome: str):
+        if not self.ativo:
+            return _NULO
+        return Etapa(self, nome)
+
+    # Inicia um rastro (ex.: um turno do chatbot); aninhado em outro rastro, vira uma etapa dele
+    def rastrear(self, nome: str):
+        if not self.ativo:
+            return _NULO
+        atual = _etapa_atual.get()
+        return Etapa(self, nome, raiz=atual is None or atual.fechada)
+
+    # Decorador que mede cada chamada da função como uma etapa
+    def medir(self, nome: str):
+        def decorador(funcao):
+            @functools.wraps(funcao)
+            def medida(*args, **kwargs):
+                if not self.ativo:
+                    return funcao(*args, **kwargs)
+                with Etapa(self, nome):
+                    return funcao(*args, **kwargs)
+
+            return medida
+
+        return decorador
+
+    # Decorador de classe que mede os métodos públicos como etapas "<prefixo>.<método>"
+    def medir_metodos(self, prefixo: str, ignorar=()):
+        def decorador(classe):
+            for nome, valor in list(vars(classe).items()):
+                if nome.startswith("_") or nome in ignorar:
+                    continue
+                if isinstance(valor, staticmethod):
+                    medida = self.medir(f"{prefixo}.{nome}")(valor.__func__)
+                    setattr(classe, nome, staticmethod(medida))
+                elif inspect.isfunction(valor):
+                    setattr(classe, nome, self.medir(f"{prefixo}.{nome}")(valor))
+            return classe
+
+        return decorador
+
+    def registrar(self, etapa: Etapa, duracao: float):
+        with self._lock:
+            histograma = self.histogramas.get(etapa.nome)
+            if histograma is None:
+                histograma = self.histogramas[etapa.nome] = Histograma()
+            histograma.registrar(duracao)
+
+            if etapa.rastro is not None and etapa.nivel == 0:
+                etapa.rastro.duracao = duracao
+                self.rastros.append(etapa.rastro)
+
+    # Rastros mais recentes primeiro, opcionalmente apenas os de um nome ou acima de uma duração
+    def recentes(self, limite: int = 50, nome: Optional[str] = None, minimo_ms: float = 0.0) -> list:
+        with self._lock:
+            rastros = list(self.rastros)
+        selecionados = [
+            r for r in reversed(rastros)
+            if (nome is None or r.nome == nome) and r.duracao >= minimo_ms
+        ]
+        return [r.resumo() for r in selecionados[:limite]]
+
+    def resumo_histogramas(self) -> dict:
+        with self._lock:
+            return {nome: h.resumo() for nome, h in sorted(self.histogramas.items())}
+
+    def limpar(self):
+        with self._lock:
+            self.rastros.clear()
+            self.histogramas.clear()
+
+
+# Rastreador global da aplicação
+rastreador = Rastreador(ativo=RASTREAMENTO == "ativado")
+etapa = rastreador.etapa
+rastrear = rastreador.rastrear
+medir = rastreador.medir
+medir_metodos = rastreador.medir_metodos
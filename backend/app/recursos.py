@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Modo de aquecimento dos recursos na inicialização da API:
+# - "segundo_plano": a API sobe imediatamente e os recursos carregam em threads
+# - "bloqueante": a inicialização só termina depois que todos os recursos carregarem
+# - "desativado": nada é carregado na inicialização, apenas sob demanda (útil em testes)
+MODO_AQUECIMENTO = os.getenv("SENNACAR_AQUECIMENTO", "segundo_plano")
+
+PENDENTE = "pendente"
+CARREGANDO = "carregando"
+PRONTO = "pronto"
+ERRO = "erro"
+
+
+# Recurso caro (modelo, conexão, índices, clientes externos) inicializado uma única vez
+# O carregamento acontece no aquecimento da API ou, se ainda não tiver ocorrido, no primeiro uso
+# Em caso de erro, o status fica registrado e a próxima chamada tenta carregar novamente
+class Recurso:
+    def __init__(self, nome: str, carregar: Callable, obrigatorio: bool = True):
+        self.nome = nome
+        self.carregar = carregar
+        self.obrigatorio = obrigatorio
+
+        self.status = PENDENTE
+        self.erro = None
+        self.duracao = None
+        self.valor = None
+        self._lock = threading.Lock()
+
+    @property
+    def pronto(self) -> bool:
+        return self.status == PRONTO
+
+    # Retorna o valor do recurso, carregando-o na primeira chamada
+    def obter(self):
+        if self.status == PRONTO:
+            return self.valor
+
+        with self._lock:
+            if self.status != PRONTO:
+                self._executar()
+        return self.valor
+
+    # Versão assíncrona de obter: se o recurso ainda não estiver pronto, carrega fora do event loop
+    async def obter_async(self):
+        if self.status == PRONTO:
+            return self.valor
+        return await asyncio.to_thread(self.obter)
+
+    # Troca o valor do recurso por outro já carregado (ex.: nova versão do modelo)
+    # Quem já obteve o valor antigo continua usando-o até terminar; as próximas chamadas recebem o novo
+    def substituir(self, valor):
+        with self._lock:
+            self.valor = valor
+            self.status = PRONTO
+            self.erro = None
+
+    # Descarta o valor atual para que o próximo uso carregue o recurso novamente
+    def invalidar(self):
+        with self._lock:
+            self.status = PENDENTE
+            self.valor = None
+
+    def _executar(self):
+        self.status = CARREGANDO
+        inicio = time.perf_counter()
+        try:
+            self.valor = self.carregar()
+            self.status = PRONTO
+            self.erro = None
+        except Exception as e:
+            self.status = ERRO
+            self.erro = str(e)
+            print(f"Erro ao carregar recurso '{self.nome}': {e}")
+            raise
+        finally:
+            self.duracao = time.perf_counter() - inicio
+
+    # Resumo do estado do recurso para o endpoint de prontidão
+    def resumo(self) -> dict:
+        return {
+            "status": self.status,
+            "obrigatorio": self.obrigatorio,
+            "duracao_ms": round(self.duracao * 1000, 1) if self.duracao is not None else None,
+            "erro": self.erro,
+        }
+
+
+# Registro global dos recursos da aplicação
+recursos: Dict[str, Recurso] = {}
+
+
+# Registra um recurso pelo nome; cada módulo registra os próprios recursos ao ser importado
+def registrar(nome: str, carregar: Callable, obrigatorio: bool = True) -> Recurso:
+    recurso = Recurso(nome, carregar, obrigatorio)
+    recursos[nome] = recurso
+    return recurso
+
+
+# Indica se todos os recursos obrigatórios já foram carregados
+def pronto() -> bool:
+    return all(r.pronto for r in recursos.values() if r.obrigatorio)
+
+
+# Carrega um recurso ignorando falhas (o erro já fica registrado no próprio recurso)
+def _aquecer_recurso(recurso: Recurso):
+    try:
+        recurso.obter()
+    except Exception:
+        pass
+
+
+# Aquece todos os recursos registrados conforme o modo configurado
+# Cada recurso carrega em sua própria thread, então um serviço lento não atrasa os demais
+# No modo em segundo plano as threads são daemon, para não atrasar o desligamento do processo
+async def aquecer(modo: Optional[str] = None):
+    modo = modo or MODO_AQUECIMENTO
+    if modo == "desativado":
+        return
+
+    if modo == "bloqueante":
+        await asyncio.gather(
+            *(asyncio.to_thread(_aquecer_recurso, r) for r in recursos.values())
+        )
+        return
+
+    for recurso in recursos.values():
+        threading.Thread(
+            target=_aquecer_recurso,
+            args=(recurso,),
+            name=f"aquecer-{recurso.nome}",
+            daemon=True,
+        ).start()
@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import Union
+
+from app import recursos
+from app.repositorios.base import (
+    Repositorio,
+    RepositorioAgendamentos,
+    RepositorioClientes,
+    RepositorioFuncionarios,
+    RepositorioProdutos,
+    Repositorios,
+)
+from app.repositorios.memoria import RepositoriosMemoria
+from app.repositorios.mongo import RepositoriosMongo
+
+# Onde os modelos guardam os dados (pode ser alterado via .env):
+# - "mongo": MongoDB configurado em app/database.py
+# - "memoria": estruturas em memória com índices, sem banco de dados (testes, benchmarks e CI)
+REPOSITORIO = os.getenv("SENNACAR_REPOSITORIO", "mongo")
+
+IMPLEMENTACOES = {
+    RepositoriosMongo.tipo: RepositoriosMongo,
+    RepositoriosMemoria.tipo: RepositoriosMemoria,
+}
+
+_atual = None
+_atual_lock = threading.Lock()
+
+
+def criar(tipo: str) -> Repositorios:
+    if tipo not in IMPLEMENTACOES:
+        raise ValueError(f"Repositório desconhecido: {tipo} (use {', '.join(IMPLEMENTACOES)})")
+    return IMPLEMENTACOES[tipo]()
+
+
+# Repositórios em uso, criados no primeiro acesso conforme SENNACAR_REPOSITORIO
+def atual() -> Repositorios:
+    global _atual
+    if _atual is None:
+        with _atual_lock:
+            if _atual is None:
+                _atual = criar(REPOSITORIO)
+    return _atual
+
+
+# Troca os repositórios em uso (ex.: usar("memoria") em testes e benchmarks)
+# Recebe o tipo ou um conjunto já criado; devolve o conjunto em uso
+def usar(repositorios: Union[str, Repositorios]) -> Repositorios:
+    global _atual
+    if isinstance(repositorios, str):
+        repositorios = criar(repositorios)
+    with _atual_lock:
+        _atual = repositorios
+    return repositorios
+
+
+def clientes() -> RepositorioClientes:
+    return atual().clientes
+
+
+def produtos() -> RepositorioProdutos:
+    return atual().produtos
+
+
+def agendamentos() -> RepositorioAgendamentos:
+    return atual().agendamentos
+
+
+def funcionarios() -> RepositorioFuncionarios:
+    return atual().funcionarios
+
+
+recursos.registrar("mongo", lambda: atual().verificar_conexao())
+recursos.registrar("indices", lambda: atual().criar_indices())
+
+__all__ = [
+    "Repositorio",
+    "RepositorioClientes",
+    "RepositorioProdutos",
+    "RepositorioAgendamentos",
+    "RepositorioFuncionarios",
+    "Repositorios",
+    "RepositoriosMongo",
+    "RepositoriosMemoria",
+    "atual",
+    "usar",
+    "clientes",
+    "produtos",
+    "agendamentos",
+    "funcionarios",
+]
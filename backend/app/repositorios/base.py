@@ -0,0 +1,198 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+# Interface comum dos repositórios: operações por ID sobre os documentos de uma coleção
+# Todos os métodos são abstratos: uma implementação incompleta falha ao ser instanciada, não na requisição
+# Os documentos têm o mesmo formato em todas as implementações (dicionários com "_id" ObjectId),
+# então modelos e rotas não dependem de onde os dados estão guardados
+# - inserir(documento): grava e devolve o ID como texto
+# - buscar_por_id(id) / atualizar(id, dados) / deletar(id): um ID inválido gera bson.errors.InvalidId
+# - atualizar aplica os campos como um $set e devolve True apenas se algum valor mudou
+# - listar_pagina(limite, apos, campos, filtro): página em ordem de _id (keyset), começando depois do
+#   _id informado em apos; com campos, apenas esses campos (e o _id); filtro aceita só igualdades
+# - contar(filtro): total de documentos, com o mesmo filtro de igualdades
+# - limpar(): remove todos os documentos (usado por testes e benchmarks)
+class Repositorio(ABC):
+    @abstractmethod
+    def inserir(self, documento: Dict) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_id(self, documento_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def atualizar(self, documento_id: str, dados: Dict) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def deletar(self, documento_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def listar_todos(self) -> List[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def listar_pagina(
+        self,
+        limite: int,
+        apos: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        filtro: Optional[Dict] = None,
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def contar(self, filtro: Optional[Dict] = None) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def limpar(self):
+        raise NotImplementedError
+
+
+# As buscas "por trecho" seguem a busca parcial das rotas de filtro: o texto é usado como expressão
+# regular, sem diferenciar maiúsculas de minúsculas, e a busca para no limite informado
+class RepositorioClientes(Repositorio):
+    @abstractmethod
+    def buscar_por_telefone(self, telefone: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    # Cliente que já usa o email ou o telefone informado (verificação de cadastro duplicado)
+    @abstractmethod
+    def buscar_por_email_ou_telefone(self, email: str, telefone: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        raise NotImplementedError
+
+
+class RepositorioProdutos(Repositorio):
+    @abstractmethod
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    # Soma de preço e mão de obra dos produtos informados (cada ID conta uma vez)
+    @abstractmethod
+    def somar_precos(self, produtos_ids: List[str]) -> float:
+        raise NotImplementedError
+
+    # Produtos da categoria, ordenados pelo nome
+    @abstractmethod
+    def listar_por_categoria(self, categoria: str) -> List[Dict]:
+        raise NotImplementedError
+
+    # Todos os produtos ordenados pelo nome; com campos, apenas esses campos (e o _id) de cada um
+    @abstractmethod
+    def listar_todos(self, campos: Optional[List[str]] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    # Página de produtos em ordem alfabética, com o _id como desempate entre nomes iguais
+    # O cursor apos é o par (nome, _id) do último produto da página anterior
+    @abstractmethod
+    def listar_pagina_por_nome(
+        self,
+        limite: int,
+        apos: Optional[Tuple[str, str]] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 15) -> List[Dict]:
+        raise NotImplementedError
+
+    # Descrições distintas que contêm o texto (sugestão de categorias)
+    @abstractmethod
+    def descricoes_com_trecho(self, texto: str) -> List[str]:
+        raise NotImplementedError
+
+
+class RepositorioAgendamentos(Repositorio):
+    # Agendamento pendente ou confirmado que ocupa o horário informado
+    @abstractmethod
+    def buscar_ativo_no_horario(self, data_agendada: datetime) -> Optional[Dict]:
+        raise NotImplementedError
+
+    # Agendamentos do cliente, do mais recente para o mais antigo
+    @abstractmethod
+    def listar_por_cliente(self, cliente_id: str) -> List[Dict]:
+        raise NotImplementedError
+
+    # Agendamentos entre as datas (inclusive), em ordem cronológica, opcionalmente filtrados pelo status
+    @abstractmethod
+    def listar_por_periodo(
+        self, data_inicio: datetime, data_fim: datetime, status: Optional[str] = None
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+    # Agendamentos que incluem o produto, do mais recente para o mais antigo, até o limite informado
+    # (sem limite, todos); com apos, apenas os agendados antes dessa data (a data é única, então serve
+    # de cursor da próxima página)
+    @abstractmethod
+    def listar_por_produto(
+        self,
+        produto_id: str,
+        limite: Optional[int],
+        apos: Optional[datetime] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+    # Página de todos os agendamentos, do mais recente para o mais antigo, com o mesmo cursor por data
+    @abstractmethod
+    def listar_pagina_por_data(
+        self, limite: int, apos: Optional[datetime] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+
+# As buscas por trecho e a listagem de funcionários deixam de fora os administradores
+class RepositorioFuncionarios(Repositorio):
+    @abstractmethod
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def listar_nao_administradores(self) -> List[Dict]:
+        raise NotImplementedError
+
+
+# Conjunto dos repositórios de uma implementação, com a verificação do armazenamento e a criação
+# dos índices executadas no aquecimento da API (recursos "mongo" e "indices")
+class Repositorios(ABC):
+    tipo = None
+
+    clientes: RepositorioClientes
+    produtos: RepositorioProdutos
+    agendamentos: RepositorioAgendamentos
+    funcionarios: RepositorioFuncionarios
+
+    @abstractmethod
+    def verificar_conexao(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def criar_indices(self) -> dict:
+        raise NotImplementedError
+
+    # Status dos índices (exibido em /health/indices)
+    @abstractmethod
+    def resumo_indices(self) -> dict:
+        raise NotImplementedError
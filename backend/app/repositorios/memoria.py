@@ -0,0 +1,455 @@
+import bisect
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.repositorios.base import (
+    Repositorio,
+    RepositorioAgendamentos,
+    RepositorioClientes,
+    RepositorioFuncionarios,
+    RepositorioProdutos,
+    Repositorios,
+)
+
+STATUS_ATIVOS = ("pendente", "confirmado")
+
+
+# Datas com fuso viram UTC sem fuso, como o pymongo grava e devolve (datas sem fuso já são tratadas como UTC)
+# Aplicado a tudo que é gravado e a todos os argumentos de data das consultas, para nunca comparar os dois tipos
+def _utc(valor):
+    if isinstance(valor, datetime) and valor.tzinfo is not None:
+        return valor.astimezone(timezone.utc).replace(tzinfo=None)
+    return valor
+
+
+# Cópia de um documento até o primeiro nível de listas e dicionários, como se tivesse vindo do banco
+# Quem recebe o documento pode alterá-lo sem mexer no que está guardado
+def _copiar(documento: Optional[Dict]) -> Optional[Dict]:
+    if documento is None:
+        return None
+    return {
+        chave: list(valor) if isinstance(valor, list) else dict(valor) if isinstance(valor, dict) else _utc(valor)
+        for chave, valor in documento.items()
+    }
+
+
+# Cópia apenas com os campos informados e o _id, como uma projeção do MongoDB (sem campos, o documento todo)
+def _projetar(documento: Dict, campos: Optional[List[str]]) -> Dict:
+    if not campos:
+        return _copiar(documento)
+    manter = {"_id", *campos}
+    return _copiar({chave: valor for chave, valor in documento.items() if chave in manter})
+
+
+# Filtro apenas de igualdades, como {"isAdmin": False}
+def _atende(documento: Dict, filtro: Optional[Dict]) -> bool:
+    return not filtro or all(documento.get(campo) == valor for campo, valor in filtro.items())
+
+
+# Índice de igualdade: valor do campo -> IDs dos documentos
+# Campos com lista (ex.: produtos de um agendamento) indexam cada elemento, como um índice multikey
+# Documentos sem o campo entram com o valor None, como no MongoDB (inclusive para índices únicos)
+class IndiceHash:
+    def __init__(self, campo: str, unique: bool = False):
+        self.campo = campo
+        self.unique = unique
+        self.valores: Dict[object, set] = {}
+
+    def _chaves(self, documento: Dict) -> Iterable:
+        valor = documento.get(self.campo)
+        return set(valor) if isinstance(valor, list) else (valor,)
+
+    def verificar(self, documento: Dict):
+        if not self.unique:
+            return
+        for chave in self._chaves(documento):
+            outros = self.valores.get(chave, set()) - {documento["_id"]}
+            if outros:
+                raise DuplicateKeyError(f"E11000 duplicate key error: {self.campo}: {chave!r}")
+
+    def adicionar(self, documento: Dict):
+        for chave in self._chaves(documento):
+            self.valores.setdefault(chave, set()).add(documento["_id"])
+
+    def remover(self, documento: Dict):
+        for chave in self._chaves(documento):
+            ids = self.valores.get(chave)
+            if ids is not None:
+                ids.discard(documento["_id"])
+                if not ids:
+                    del self.valores[chave]
+
+    # IDs com o valor informado, na ordem de inserção (ObjectIds crescem com o tempo)
+    def buscar(self, valor) -> List[ObjectId]:
+        return sorted(self.valores.get(valor, ()))
+
+
+# Índice ordenado: lista de (valor, ID) mantida em ordem com bisect, para intervalos e ordenação
+# Documentos sem o campo ficam de fora
+class IndiceOrdenado:
+    def __init__(self, campo: str):
+        self.campo = campo
+        self.entradas: List[tuple] = []
+
+    def adicionar(self, documento: Dict):
+        valor = documento.get(self.campo)
+        if valor is not None:
+            bisect.insort(self.entradas, (valor, documento["_id"]))
+
+    def remover(self, documento: Dict):
+        valor = documento.get(self.campo)
+        if valor is None:
+            return
+        posicao = bisect.bisect_left(self.entradas, (valor, documento["_id"]))
+        if posicao < len(self.entradas) and self.entradas[posicao] == (valor, documento["_id"]):
+            del self.entradas[posicao]
+
+    # IDs com valor entre inicio e fim (inclusive), em ordem crescente do valor
+    def intervalo(self, inicio, fim) -> List[ObjectId]:
+        esquerda = bisect.bisect_left(self.entradas, (inicio,))
+        direita = bisect.bisect_right(self.entradas, (fim, _MAIOR))
+        return [documento_id for _, documento_id in self.entradas[esquerda:direita]]
+
+    def todos(self) -> List[ObjectId]:
+        return [documento_id for _, documento_id in self.entradas]
+
+    # Posição da primeira entrada com valor maior que o informado (sem valor, o início da lista)
+    # Com documento_id, a primeira depois de (valor, documento_id), para desempatar valores iguais pelo _id
+    def posicao_apos(self, valor, documento_id: Optional[ObjectId] = None) -> int:
+        if valor is None:
+            return 0
+        return bisect.bisect_right(self.entradas, (valor, documento_id or _MAIOR))
+
+    # Posição logo depois da última entrada com valor menor que o informado (sem valor, o fim da lista),
+    # para percorrer em ordem decrescente
+    def posicao_antes(self, valor) -> int:
+        return len(self.entradas) if valor is None else bisect.bisect_left(self.entradas, (valor,))
+
+
+# Maior que qualquer ObjectId, para incluir todos os IDs de um valor no fim do intervalo
+_MAIOR = ObjectId("f" * 24)
+
+
+# Repositório em memória: documentos em um dicionário por _id, com os índices declarados em cada subclasse
+# (indices: [(campo, unique)], ordenados: [campo]) atualizados a cada escrita
+# O _id sempre tem um índice ordenado, usado pela paginação (listar_pagina)
+# As operações são protegidas por uma trava, então pode ser usado pelas threads do banco (app/models/assincrono.py)
+class RepositorioMemoria(Repositorio):
+    colecao = None
+    indices = ()
+    ordenados = ()
+
+    def __init__(self):
+        self.documentos: Dict[ObjectId, Dict] = {}
+        self.hash = {campo: IndiceHash(campo, unique) for campo, unique in self.indices}
+        self.ordem = {campo: IndiceOrdenado(campo) for campo in ("_id", *self.ordenados)}
+        self._lock = threading.RLock()
+
+    def _indexar(self, documento: Dict):
+        for indice in self.hash.values():
+            indice.adicionar(documento)
+        for indice in self.ordem.values():
+            indice.adicionar(documento)
+
+    def _desindexar(self, documento: Dict):
+        for indice in self.hash.values():
+            indice.remover(documento)
+        for indice in self.ordem.values():
+            indice.remover(documento)
+
+    def _documentos(self, ids: Iterable[ObjectId]) -> List[Dict]:
+        return [_copiar(self.documentos[documento_id]) for documento_id in ids]
+
+    # Documentos com o valor no campo indexado, na ordem de inserção
+    def _por_valor(self, campo: str, valor) -> List[Dict]:
+        return self._documentos(self.hash[campo].buscar(valor))
+
+    def _primeiro(self, campo: str, valor) -> Optional[Dict]:
+        ids = self.hash[campo].buscar(valor)
+        return _copiar(self.documentos[ids[0]]) if ids else None
+
+    # Busca parcial sem índice (como o $regex sem âncora no MongoDB, que também percorre todos os valores)
+    def _por_trecho(self, campo: str, texto: str, limite: int, condicao=None) -> List[Dict]:
+        padrao = re.compile(texto, re.IGNORECASE)
+        encontrados = []
+        for documento in self.documentos.values():
+            valor = documento.get(campo)
+            if isinstance(valor, str) and padrao.search(valor) and (condicao is None or condicao(documento)):
+                encontrados.append(_copiar(documento))
+                if len(encontrados) >= limite:
+                    break
+        return encontrados
+
+    def inserir(self, documento: Dict) -> str:
+        documento.setdefault("_id", ObjectId())
+        novo = _copiar(documento)
+        with self._lock:
+            if novo["_id"] in self.documentos:
+                raise DuplicateKeyError(f"E11000 duplicate key error: _id: {novo['_id']!r}")
+            for indice in self.hash.values():
+                indice.verificar(novo)
+            self.documentos[novo["_id"]] = novo
+            self._indexar(novo)
+        return str(novo["_id"])
+
+    def buscar_por_id(self, documento_id: str) -> Optional[Dict]:
+        with self._lock:
+            return _copiar(self.documentos.get(ObjectId(documento_id)))
+
+    def atualizar(self, documento_id: str, dados: Dict) -> bool:
+        chave = ObjectId(documento_id)
+        with self._lock:
+            atual = self.documentos.get(chave)
+            if atual is None:
+                return False
+            novo = _copiar({**atual, **dados})
+            if novo == atual:
+                return False
+            for indice in self.hash.values():
+                indice.verificar(novo)
+            self._desindexar(atual)
+            self.documentos[chave] = novo
+            self._indexar(novo)
+            return True
+
+    def deletar(self, documento_id: str) -> bool:
+        chave = ObjectId(documento_id)
+        with self._lock:
+            documento = self.documentos.pop(chave, None)
+            if documento is None:
+                return False
+            self._desindexar(documento)
+            return True
+
+    def listar_todos(self) -> List[Dict]:
+        with self._lock:
+            return [_copiar(documento) for documento in self.documentos.values()]
+
+    def listar_pagina(
+        self,
+        limite: int,
+        apos: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        filtro: Optional[Dict] = None,
+    ) -> List[Dict]:
+        indice = self.ordem["_id"]
+        pagina = []
+        with self._lock:
+            inicio = indice.posicao_apos(None if apos is None else ObjectId(apos))
+            for posicao in range(inicio, len(indice.entradas)):
+                documento = self.documentos[indice.entradas[posicao][1]]
+                if _atende(documento, filtro):
+                    pagina.append(_projetar(documento, campos))
+                    if len(pagina) >= limite:
+                        break
+        return pagina
+
+    # Um filtro por um único campo indexado é contado pelo índice, sem percorrer os documentos
+    def contar(self, filtro: Optional[Dict] = None) -> int:
+        with self._lock:
+            if not filtro:
+                return len(self.documentos)
+            if len(filtro) == 1:
+                ((campo, valor),) = filtro.items()
+                if campo in self.hash:
+                    return len(self.hash[campo].valores.get(valor, ()))
+            return sum(1 for documento in self.documentos.values() if _atende(documento, filtro))
+
+    def limpar(self):
+        with self._lock:
+            self.documentos.clear()
+            for indice in self.hash.values():
+                indice.valores.clear()
+            for indice in self.ordem.values():
+                indice.entradas.clear()
+
+
+class ClientesMemoria(RepositorioMemoria, RepositorioClientes):
+    colecao = "clientes"
+    indices = (("telefone", True), ("email", False), ("nome", False))
+
+    def buscar_por_telefone(self, telefone: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("telefone", telefone)
+
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("email", email)
+
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("nome", nome)
+
+    def buscar_por_email_ou_telefone(self, email: str, telefone: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("email", email) or self._primeiro("telefone", telefone)
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        with self._lock:
+            return self._por_trecho(campo, texto, limite)
+
+
+class ProdutosMemoria(RepositorioMemoria, RepositorioProdutos):
+    colecao = "produtos"
+    indices = (("nome", False), ("categoria", False))
+    ordenados = ("nome",)
+
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("nome", nome)
+
+    # Como o $add da agregação, produtos sem preço ou mão de obra não entram na soma
+    def somar_precos(self, produtos_ids: List[str]) -> float:
+        ids = {ObjectId(id) for id in produtos_ids}
+        total = 0.0
+        with self._lock:
+            for documento_id in ids:
+                produto = self.documentos.get(documento_id)
+                if produto is None:
+                    continue
+                preco, mao_obra = produto.get("preco"), produto.get("preco_mao_obra")
+                if preco is not None and mao_obra is not None:
+                    total += preco + mao_obra
+        return total
+
+    def listar_por_categoria(self, categoria: str) -> List[Dict]:
+        with self._lock:
+            produtos = self._por_valor("categoria", categoria)
+        produtos.sort(key=lambda p: p.get("nome") or "")
+        return produtos
+
+    def listar_todos(self, campos: Optional[List[str]] = None) -> List[Dict]:
+        with self._lock:
+            ids = self.ordem["nome"].todos()
+            sem_nome = [i for i in self.documentos if self.documentos[i].get("nome") is None]
+            return [_projetar(self.documentos[i], campos) for i in sem_nome + ids]
+
+    # O índice ordenado por nome já guarda (nome, _id), a mesma ordem da paginação
+    def listar_pagina_por_nome(
+        self,
+        limite: int,
+        apos: Optional[Tuple[str, str]] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        indice = self.ordem["nome"]
+        with self._lock:
+            inicio = 0 if apos is None else indice.posicao_apos(apos[0], ObjectId(apos[1]))
+            entradas = indice.entradas[inicio:inicio + limite]
+            return [_projetar(self.documentos[i], campos) for _, i in entradas]
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 15) -> List[Dict]:
+        with self._lock:
+            return self._por_trecho(campo, texto, limite)
+
+    def descricoes_com_trecho(self, texto: str) -> List[str]:
+        with self._lock:
+            encontrados = self._por_trecho("descricao", texto, len(self.documentos) or 1)
+        return list(dict.fromkeys(p["descricao"] for p in encontrados))
+
+
+class AgendamentosMemoria(RepositorioMemoria, RepositorioAgendamentos):
+    colecao = "agendamentos"
+    indices = (("data_agendada", True), ("cliente_id", False), ("produtos", False))
+    ordenados = ("data_agendada",)
+
+    def buscar_ativo_no_horario(self, data_agendada: datetime) -> Optional[Dict]:
+        with self._lock:
+            for agendamento in self._por_valor("data_agendada", _utc(data_agendada)):
+                if agendamento.get("status") in STATUS_ATIVOS:
+                    return agendamento
+        return None
+
+    def listar_por_cliente(self, cliente_id: str) -> List[Dict]:
+        with self._lock:
+            agendamentos = self._por_valor("cliente_id", cliente_id)
+        agendamentos.sort(
+            key=lambda a: (a.get("data_agendada") is not None, a.get("data_agendada") or 0),
+            reverse=True,
+        )
+        return agendamentos
+
+    def listar_por_periodo(
+        self, data_inicio: datetime, data_fim: datetime, status: Optional[str] = None
+    ) -> List[Dict]:
+        with self._lock:
+            intervalo = self.ordem["data_agendada"].intervalo(_utc(data_inicio), _utc(data_fim))
+            agendamentos = self._documentos(intervalo)
+        if status:
+            agendamentos = [a for a in agendamentos if a.get("status") == status]
+        return agendamentos
+
+    def listar_por_produto(
+        self,
+        produto_id: str,
+        limite: Optional[int],
+        apos: Optional[datetime] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        apos = _utc(apos)
+        with self._lock:
+            datas = [(self.documentos[i].get("data_agendada"), i) for i in self.hash["produtos"].buscar(produto_id)]
+            datas = [(data, i) for data, i in datas if data is not None and (apos is None or data < apos)]
+            datas.sort(reverse=True)
+            return [_projetar(self.documentos[i], campos) for _, i in datas[:limite]]
+
+    def listar_pagina_por_data(
+        self, limite: int, apos: Optional[datetime] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        indice = self.ordem["data_agendada"]
+        with self._lock:
+            fim = indice.posicao_antes(_utc(apos))
+            entradas = indice.entradas[max(0, fim - limite):fim]
+            return [_projetar(self.documentos[i], campos) for _, i in reversed(entradas)]
+
+
+class FuncionariosMemoria(RepositorioMemoria, RepositorioFuncionarios):
+    colecao = "funcionarios"
+    indices = (("email", True), ("isAdmin", False))
+
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        with self._lock:
+            return self._primeiro("email", email)
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        with self._lock:
+            return self._por_trecho(campo, texto, limite, lambda f: f.get("isAdmin") is False)
+
+    def listar_nao_administradores(self) -> List[Dict]:
+        with self._lock:
+            return self._por_valor("isAdmin", False)
+
+
+# Repositórios em memória: sem banco de dados, para testes, benchmarks e CI
+# Os dados ficam apenas neste processo e se perdem ao reiniciar
+class RepositoriosMemoria(Repositorios):
+    tipo = "memoria"
+
+    def __init__(self):
+        self.clientes = ClientesMemoria()
+        self.produtos = ProdutosMemoria()
+        self.agendamentos = AgendamentosMemoria()
+        self.funcionarios = FuncionariosMemoria()
+
+    def verificar_conexao(self) -> bool:
+        return True
+
+    def criar_indices(self) -> dict:
+        return self.resumo_indices()
+
+    def resumo_indices(self) -> dict:
+        indices = []
+        for repositorio in (self.clientes, self.produtos, self.agendamentos, self.funcionarios):
+            for campo, unique in repositorio.indices:
+                indices.append(
+                    {"colecao": repositorio.colecao, "nome": f"{campo}_hash", "unique": unique, "status": "pronto"}
+                )
+            for campo in repositorio.ordenados:
+                indices.append(
+                    {"colecao": repositorio.colecao, "nome": f"{campo}_ordenado", "unique": False, "status": "pronto"}
+                )
+        return {"pronto": True, "verificado_em": None, "indices": indices}
@@ -0,0 +1,209 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app import database
+from app.repositorios.base import (
+    Repositorio,
+    RepositorioAgendamentos,
+    RepositorioClientes,
+    RepositorioFuncionarios,
+    RepositorioProdutos,
+    Repositorios,
+)
+
+
+def _trecho(texto: str) -> dict:
+    return {"$regex": f".*{texto}.*", "$options": "i"}
+
+
+def _projecao(campos: Optional[List[str]]) -> Optional[dict]:
+    return {campo: 1 for campo in campos} if campos else None
+
+
+# Repositório sobre uma coleção do MongoDB
+# A coleção é obtida a cada operação, então trocar o cliente em app/database.py vale para todos
+class RepositorioMongo(Repositorio):
+    def __init__(self, colecao: Callable):
+        self.colecao = colecao
+
+    def inserir(self, documento: Dict) -> str:
+        return str(self.colecao().insert_one(documento).inserted_id)
+
+    def buscar_por_id(self, documento_id: str) -> Optional[Dict]:
+        return self.colecao().find_one({"_id": ObjectId(documento_id)})
+
+    def atualizar(self, documento_id: str, dados: Dict) -> bool:
+        result = self.colecao().update_one({"_id": ObjectId(documento_id)}, {"$set": dados})
+        return result.modified_count > 0
+
+    def deletar(self, documento_id: str) -> bool:
+        return self.colecao().delete_one({"_id": ObjectId(documento_id)}).deleted_count > 0
+
+    def listar_todos(self) -> List[Dict]:
+        return list(self.colecao().find({}))
+
+    # Percorre o índice de _id a partir do cursor, sem pular documentos com skip
+    def listar_pagina(
+        self,
+        limite: int,
+        apos: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        filtro: Optional[Dict] = None,
+    ) -> List[Dict]:
+        query = dict(filtro or {})
+        if apos is not None:
+            query["_id"] = {"$gt": ObjectId(apos)}
+        return list(
+            self.colecao().find(query, _projecao(campos), sort=[("_id", 1)]).limit(limite)
+        )
+
+    # Sem filtro usa a contagem estimada pelos metadados da coleção, que não percorre os documentos
+    def contar(self, filtro: Optional[Dict] = None) -> int:
+        if not filtro:
+            return self.colecao().estimated_document_count()
+        return self.colecao().count_documents(filtro)
+
+    def limpar(self):
+        self.colecao().delete_many({})
+
+
+class ClientesMongo(RepositorioMongo, RepositorioClientes):
+    def buscar_por_telefone(self, telefone: str) -> Optional[Dict]:
+        return self.colecao().find_one({"telefone": telefone})
+
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        return self.colecao().find_one({"email": email})
+
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        return self.colecao().find_one({"nome": nome})
+
+    def buscar_por_email_ou_telefone(self, email: str, telefone: str) -> Optional[Dict]:
+        return self.colecao().find_one({"$or": [{"email": email}, {"telefone": telefone}]})
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        return list(self.colecao().find({campo: _trecho(texto)}).limit(limite))
+
+
+class ProdutosMongo(RepositorioMongo, RepositorioProdutos):
+    def buscar_por_nome(self, nome: str) -> Optional[Dict]:
+        return self.colecao().find_one({"nome": nome})
+
+    # Soma feita no servidor com uma agregação
+    def somar_precos(self, produtos_ids: List[str]) -> float:
+        pipeline = [
+            {"$match": {"_id": {"$in": [ObjectId(id) for id in produtos_ids]}}},
+            {
+                "$group": {
+                    "_id": None,
+                    "total": {"$sum": {"$add": ["$preco", "$preco_mao_obra"]}},
+                }
+            },
+        ]
+        result = list(self.colecao().aggregate(pipeline))
+        return result[0]["total"] if result else 0.0
+
+    def listar_por_categoria(self, categoria: str) -> List[Dict]:
+        return list(self.colecao().find({"categoria": categoria}, sort=[("nome", 1)]))
+
+    def listar_todos(self, campos: Optional[List[str]] = None) -> List[Dict]:
+        return list(self.colecao().find({}, _projecao(campos), sort=[("nome", 1)]))
+
+    # O $gte no nome limita a varredura do índice nome_1__id_1; o $or só desempata os nomes iguais
+    def listar_pagina_por_nome(
+        self,
+        limite: int,
+        apos: Optional[Tuple[str, str]] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        query = {}
+        if apos is not None:
+            nome, documento_id = apos
+            query = {
+                "nome": {"$gte": nome},
+                "$or": [{"nome": {"$gt": nome}}, {"_id": {"$gt": ObjectId(documento_id)}}],
+            }
+        return list(
+            self.colecao().find(query, _projecao(campos), sort=[("nome", 1), ("_id", 1)]).limit(limite)
+        )
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 15) -> List[Dict]:
+        return list(self.colecao().find({campo: _trecho(texto)}).limit(limite))
+
+    def descricoes_com_trecho(self, texto: str) -> List[str]:
+        return self.colecao().distinct("descricao", {"descricao": _trecho(texto)})
+
+
+class AgendamentosMongo(RepositorioMongo, RepositorioAgendamentos):
+    def buscar_ativo_no_horario(self, data_agendada: datetime) -> Optional[Dict]:
+        return self.colecao().find_one(
+            {"data_agendada": data_agendada, "status": {"$in": ["pendente", "confirmado"]}}
+        )
+
+    def listar_por_cliente(self, cliente_id: str) -> List[Dict]:
+        return list(self.colecao().find({"cliente_id": cliente_id}, sort=[("data_agendada", -1)]))
+
+    def listar_por_periodo(
+        self, data_inicio: datetime, data_fim: datetime, status: Optional[str] = None
+    ) -> List[Dict]:
+        query = {"data_agendada": {"$gte": data_inicio, "$lte": data_fim}}
+        if status:
+            query["status"] = status
+        return list(self.colecao().find(query, sort=[("data_agendada", 1)]))
+
+    # limit(0) no pymongo é o mesmo que não limitar
+    def listar_por_produto(
+        self,
+        produto_id: str,
+        limite: Optional[int],
+        apos: Optional[datetime] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        query = {"produtos": produto_id}
+        if apos is not None:
+            query["data_agendada"] = {"$lt": apos}
+        return list(
+            self.colecao()
+            .find(query, _projecao(campos), sort=[("data_agendada", -1)])
+            .limit(limite or 0)
+        )
+
+    def listar_pagina_por_data(
+        self, limite: int, apos: Optional[datetime] = None, campos: Optional[List[str]] = None
+    ) -> List[Dict]:
+        query = {"data_agendada": {"$lt": apos}} if apos is not None else {}
+        return list(
+            self.colecao().find(query, _projecao(campos), sort=[("data_agendada", -1)]).limit(limite)
+        )
+
+
+class FuncionariosMongo(RepositorioMongo, RepositorioFuncionarios):
+    def buscar_por_email(self, email: str) -> Optional[Dict]:
+        return self.colecao().find_one({"email": email})
+
+    def buscar_por_trecho(self, campo: str, texto: str, limite: int = 10) -> List[Dict]:
+        return list(self.colecao().find({campo: _trecho(texto), "isAdmin": False}).limit(limite))
+
+    def listar_nao_administradores(self) -> List[Dict]:
+        return list(self.colecao().find({"isAdmin": False}))
+
+
+# Repositórios sobre o MongoDB configurado em app/database.py, com os índices de app/indices.py
+class RepositoriosMongo(Repositorios):
+    tipo = "mongo"
+
+    def __init__(self):
+        self.clientes = ClientesMongo(database.get_clientes_collection)
+        self.produtos = ProdutosMongo(database.get_produtos_collection)
+        self.agendamentos = AgendamentosMongo(database.get_agendamentos_collection)
+        self.funcionarios = FuncionariosMongo(database.get_funcionario_collection)
+
+    def verificar_conexao(self) -> bool:
+        return database.verificar_conexao()
+
+    def criar_indices(self) -> dict:
+        return database.gerenciador_indices.criar()
+
+    def resumo_indices(self) -> dict:
+        return database.gerenciador_indices.resumo()
@@ -1,16 +1,28 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from app.models.agendamento import Agendamento
+from app.models.assincrono import AgendamentoAsync, ModeloAsync, executar
 from app.schemas.agendamento import AgendamentoResponse, AgendamentoUpdate
 from typing import List, Optional
 from app.auth.auth_utils import get_current_user
-from app.google.calendario import GoogleCalendarService
+from app.google.calendario import get_calendar_service
 from app.models.cliente import Cliente
 from app.models.produto import Produto
 from app.chatbot.handlers.agendamentos import get_horarios_disponiveis
+from app.paginacao import (
+    CABECALHO_TOTAL,
+    campos_resposta,
+    cursor_data,
+    paginar,
+    parametro_limite,
+    parametro_todos,
+    parametro_total,
+)
 
 router = APIRouter(prefix="/agendamentos", tags=["Agendamentos"])
 
+CAMPOS_RESPOSTA = campos_resposta(AgendamentoResponse)
+
 
 # Cria um novo agendamento
 # - Recebe dados via query params
@@ -29,7 +41,7 @@ async def criar_agendamento(
     novo_agendamento = Agendamento(
         cliente_id, data_agendada, lista_produtos, status, observacoes, valor_total
     )
-    agendamento_id = novo_agendamento.criar_agendamento()
+    agendamento_id = await ModeloAsync(novo_agendamento).criar_agendamento()
 
     if not agendamento_id:
         raise HTTPException(
@@ -40,13 +52,28 @@ async def criar_agendamento(
     return {"id": agendamento_id}
 
 
-# Lista todos os agendamentos
+# Lista os agendamentos, do mais recente para o mais antigo
 # - Requer autenticação
-# - Retorna lista ou erro se vazio
+# - Paginada pela data (ver app/paginacao.py), trazendo do banco apenas os campos da resposta
+# - Com todos=true, retorna a lista completa, sem paginação
+# - Retorna erro se não houver nenhum agendamento
 @router.get("/", response_model=List[AgendamentoResponse])
-async def listar_agendamentos(user: dict = Depends(get_current_user)):
-    agendamentos = Agendamento.listar_todos()
-    if not agendamentos:
+async def listar_agendamentos(
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[datetime] = Query(None, description="Data do último agendamento da página anterior"),
+    total: bool = parametro_total(),
+    todos: bool = parametro_todos(),
+    user: dict = Depends(get_current_user),
+):
+    if todos:
+        agendamentos = await AgendamentoAsync.listar_todos()
+    else:
+        agendamentos = await AgendamentoAsync.listar_pagina(limite + 1, apos, CAMPOS_RESPOSTA)
+        agendamentos = paginar(agendamentos, limite, response, cursor_data)
+    if total:
+        response.headers[CABECALHO_TOTAL] = str(await AgendamentoAsync.contar())
+    if not agendamentos and apos is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Nenhum agendamento encontrado",
@@ -61,7 +88,7 @@ async def listar_agendamentos(user: dict = Depends(get_current_user)):
 async def buscar_por_cliente_id(
     cliente_id: str, user: dict = Depends(get_current_user)
 ):
-    agendamentos = Agendamento.buscar_por_cliente(cliente_id)
+    agendamentos = await AgendamentoAsync.buscar_por_cliente(cliente_id)
 
     if not agendamentos:
         raise HTTPException(
@@ -84,17 +111,27 @@ async def buscar_por_cliente_id(
 
 
 # Busca agendamentos que possuem um produto específico
-# - Filtra agendamentos que contenham o ID do produto
+# - Consulta no banco pelo índice de produtos, do mais recente para o mais antigo
+# - Paginada: se houver mais agendamentos, o cabeçalho X-Proximo-Cursor traz o valor de "apos"
+#   para a próxima página
+# - Com todos=true, retorna todos os agendamentos do produto, sem paginação
 @router.get("/produto_id/{produto_id}", response_model=List[AgendamentoResponse])
 async def buscar_por_produto_id(
-    produto_id: str, user: dict = Depends(get_current_user)
+    produto_id: str,
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[datetime] = Query(None, description="Data do último agendamento da página anterior"),
+    todos: bool = parametro_todos(),
+    user: dict = Depends(get_current_user),
 ):
-    try:
-        todos = Agendamento.listar_todos()
-        filtrado = [a for a in todos if produto_id in a["produtos"]]
-        return [AgendamentoResponse.from_mongo(a) for a in filtrado]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro: {str(e)}")
+    if todos:
+        agendamentos = await AgendamentoAsync.buscar_por_produto(produto_id, None)
+    else:
+        agendamentos = await AgendamentoAsync.buscar_por_produto(
+            produto_id, limite + 1, apos, CAMPOS_RESPOSTA
+        )
+        agendamentos = paginar(agendamentos, limite, response, cursor_data)
+    return [AgendamentoResponse.from_mongo(a) for a in agendamentos]
 
 
 # Busca um agendamento pelo ID
@@ -105,7 +142,7 @@ async def buscar_agendamento_por_id(
     agendamento_id: str,
     user: dict = Depends(get_current_user),
 ):
-    agendamento = Agendamento.buscar_por_id(agendamento_id)
+    agendamento = await AgendamentoAsync.buscar_por_id(agendamento_id)
 
     if not agendamento:
         raise HTTPException(
@@ -133,7 +170,9 @@ async def buscar_por_periodo(
         data_inicio = data_inicio.replace(hour=0, minute=0, second=0, microsecond=0)
         data_fim = data_fim.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-        agendamentos = Agendamento.buscar_por_periodo(data_inicio, data_fim, status)
+        agendamentos = await AgendamentoAsync.buscar_por_periodo(
+            data_inicio, data_fim, status
+        )
 
         return [
             AgendamentoResponse(
@@ -162,7 +201,7 @@ async def obter_horarios_disponiveis(
 ):
     try:
         data_formatada = datetime.strptime(data, "%Y-%m-%d").date()
-        horarios = get_horarios_disponiveis(data_formatada)
+        horarios = await executar(get_horarios_disponiveis, data_formatada)
         return {"horarios": horarios}
     except ValueError:
         raise HTTPException(status_code=400, detail="Formato de data inválido")
@@ -177,7 +216,7 @@ async def atualizar_agendamento(
     dados: AgendamentoUpdate,
     user: dict = Depends(get_current_user),
 ):
-    atualizado = Agendamento.atualizar_agendamento(
+    atualizado = await AgendamentoAsync.atualizar_agendamento(
         agendamento_id, dados.dict(exclude_unset=True)
     )
 
@@ -199,7 +238,7 @@ async def atualizar_produtos(
     novos_produtos: List[str],
     user: dict = Depends(get_current_user),
 ):
-    sucesso = Agendamento.atualizar_produtos(agendamento_id, novos_produtos)
+    sucesso = await AgendamentoAsync.atualizar_produtos(agendamento_id, novos_produtos)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -214,7 +253,7 @@ async def atualizar_produtos(
 async def atualizar_status(
     agendamento_id: str, novo_status: str, user: dict = Depends(get_current_user)
 ):
-    sucesso = Agendamento.atualizar_status(agendamento_id, novo_status)
+    sucesso = await AgendamentoAsync.atualizar_status(agendamento_id, novo_status)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,7 +269,7 @@ async def atualizar_status(
 async def deletar_agendamento(
     agendamento_id: str, user: dict = Depends(get_current_user)
 ):
-    agendamento = Agendamento.buscar_por_id(agendamento_id)
+    agendamento = await AgendamentoAsync.buscar_por_id(agendamento_id)
 
     if not agendamento:
         raise HTTPException(status_code=404, detail="Agendamento não encontrado")
@@ -238,13 +277,16 @@ async def deletar_agendamento(
     google_event_id = agendamento.get("google_event_id")
     if google_event_id:
         try:
-            GoogleCalendarService().service.events().delete(
-                calendarId="primary", eventId=google_event_id
-            ).execute()
+            await executar(
+                lambda: get_calendar_service()
+                .service.events()
+                .delete(calendarId="primary", eventId=google_event_id)
+                .execute()
+            )
         except Exception as e:
             print(f"Erro ao excluir evento do Google: {e}")
 
-    sucesso = Agendamento.deletar_agendamento(agendamento_id)
+    sucesso = await AgendamentoAsync.deletar_agendamento(agendamento_id)
     if not sucesso:
         raise HTTPException(status_code=404, detail="Erro ao remover do MongoDB")
 
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
-from app.models.funcionario import Funcionario
+from app.models.assincrono import FuncionarioAsync
 from app.auth.auth_utils import criar_token_acesso
 from app.schemas.auth import AuthLogin, AuthToken
 
@@ -24,12 +24,12 @@ async def login(login_data: AuthLogin):
     if "@" not in login_data.email:
         raise HTTPException(status_code=400, detail="O email precisa conter '@'")
 
-    funcionario = Funcionario.buscar_por_email(login_data.email)
+    funcionario = await FuncionarioAsync.buscar_por_email(login_data.email)
 
     if not funcionario:
         raise HTTPException(status_code=401, detail="Email não encontrado")
 
-    if not Funcionario.verificar_senha(funcionario["senha"], login_data.senha):
+    if not await FuncionarioAsync.verificar_senha(funcionario["senha"], login_data.senha):
         raise HTTPException(status_code=401, detail="Senha incorreta")
 
     token = criar_token_acesso(
@@ -49,7 +49,7 @@ async def login(login_data: AuthLogin):
 # - Caso contrário, retorna erro 404
 @router.post("/auth/verificar-email")
 async def verificar_email(dados: EmailRequest):
-    funcionario = Funcionario.buscar_por_email(dados.email)
+    funcionario = await FuncionarioAsync.buscar_por_email(dados.email)
     if not funcionario:
         raise HTTPException(status_code=404, detail="Funcionário não encontrado")
     return {"nome": funcionario["nome"], "email": funcionario["email"]}
@@ -1,15 +1,30 @@
+import asyncio
 from datetime import datetime
-import json
-from fastapi import APIRouter, HTTPException, Depends, Response
+from typing import Optional
+from fastapi import APIRouter, Cookie, Header, HTTPException, Depends, Response
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.entidades import catalogo_produtos
+from app.chatbot.executor import ExecutorInferencia, FilaCheia
+from app.chatbot.fluxo import CLASSIFICAR
+from app.chatbot.registro import AtualizadorModelo, RegistroModelos, VersaoInvalida
 from app.chatbot.handlers import *
 import os
-from app.schemas.chatbot import ChatbotMessage, ChatbotResponse, ResetResponse
+from app import recursos
+from app.rastreamento import etapa, rastrear
+from app.models.assincrono import executar
+from app.auth.auth_utils import verificar_admin
+from app.schemas.chatbot import (
+    ChatbotMessage,
+    ChatbotResponse,
+    ClassifyBatchRequest,
+    ClassifyBatchResponse,
+    ResetResponse,
+)
+from app.chatbot.sessoes import SESSION_COOKIE, SESSION_HEADER, SessionStore
 from app.chatbot.handlers.agendamentos import (
     get_horarios_disponiveis as horarios_service,
-    confirmar_agendamento,
 )
 from app.chatbot.handlers.produtos import (
     selecionar_produto,
@@ -19,7 +34,13 @@ from app.chatbot.handlers.produtos import (
 router = APIRouter(prefix="", tags=["Chatbot"])
 
 
-intents_path = os.path.join(os.path.dirname(__file__), "../chatbot/intents.json")
+chatbot_dir = os.path.join(os.path.dirname(__file__), "../chatbot")
+intents_path = os.path.join(chatbot_dir, "intents.json")
+model_path = os.path.join(chatbot_dir, "chatbot_model.pth")
+dimensions_path = os.path.join(chatbot_dir, "dimensions.json")
+
+# Quantidade máxima de mensagens aceitas por requisição de classificação em lote
+MAX_LOTE_CLASSIFICACAO = int(os.getenv("CHATBOT_MAX_LOTE", "5000"))
 function_mappings = {
     "listar_produtos": listar_produtos_por_categoria,
     "selecionar_produto": selecionar_produto,
@@ -28,157 +49,165 @@ function_mappings = {
     "iniciar_agendamento": iniciar_agendamento,
 }
 
-chatbot = ChatbotAssistant(intents_path, function_mappings)
-chatbot.parse_intents()
-chatbot.load_model("app/chatbot/chatbot_model.pth", "app/chatbot/dimensions.json")
+
+# Registro de versões do modelo (ver app/chatbot/registro.py)
+registro = RegistroModelos()
+
+
+# Cria um assistente a partir de uma versão do registro e o aquece antes de colocá-lo em uso
+def carregar_versao(versao: str) -> ChatbotAssistant:
+    caminhos = registro.caminhos(versao)
+    assistant = ChatbotAssistant(caminhos["intents_path"], function_mappings, catalogo_produtos)
+    assistant.parse_intents(treino=False)
+    assistant.load_model(caminhos["model_path"], caminhos["dimensions_path"])
+    assistant.versao = versao
+    assistant.aquecer()
+    return assistant
+
+
+# Cria o assistente compartilhado, lendo as intents e os pesos do modelo
+# Usa a versão ativa do registro; sem registro, usa os arquivos em app/chatbot
+# Executado no aquecimento da API (ver main.py) ou, se ainda não tiver ocorrido, na primeira mensagem
+def carregar_chatbot() -> ChatbotAssistant:
+    versao = registro.versao_ativa()
+    if versao:
+        return carregar_versao(versao)
+
+    assistant = ChatbotAssistant(intents_path, function_mappings, catalogo_produtos)
+    assistant.parse_intents(treino=False)
+    assistant.load_model(model_path, dimensions_path)
+    assistant.aquecer()
+    return assistant
+
+
+recurso_chatbot = recursos.registrar("chatbot", carregar_chatbot)
+
+# Catálogo de produtos usado para reconhecer pedidos em texto livre; depois do aquecimento,
+# é atualizado em segundo plano a cada CHATBOT_TTL_CATALOGO segundos
+recursos.registrar("catalogo", catalogo_produtos.atualizar, obrigatorio=False)
+
+# Troca o modelo deste worker quando a versão ativa do registro muda, sem reiniciar a API
+atualizador = AtualizadorModelo(registro, recurso_chatbot, carregar_versao)
 
 
-# Reseta o estado do chatbot para valores iniciais, limpando seleções temporárias
-def reset_chatbot_state(chatbot):
-    chatbot.awaiting_product_selection = False
-    chatbot.produtos_temp = None
-    chatbot.current_category = None
-    chatbot.selected_products = []
-    chatbot.client_data_temp = None
-    chatbot.awaiting_confirmation = False
+# Dependência que entrega o assistente compartilhado, carregando-o fora do event loop se necessário
+# Também verifica, no máximo uma vez por intervalo, se outra versão do modelo foi ativada
+async def get_chatbot() -> ChatbotAssistant:
+    try:
+        chatbot = await recurso_chatbot.obter_async()
+    except Exception:
+        raise HTTPException(status_code=503, detail="Assistente indisponível no momento")
+
+    atualizador.verificar()
+    return chatbot
+
+
+# Executor que agrupa as classificações de requisições simultâneas em lotes, fora do event loop
+# Cada mensagem leva o assistente da requisição, então a classificação e a conclusão do turno usam
+# o mesmo modelo mesmo que a versão seja trocada enquanto a mensagem aguarda na fila
+executor = ExecutorInferencia(recurso_chatbot.obter)
+
+
+# Conversas ativas, uma por visitante; o modelo do assistente é compartilhado por todas
+sessoes = SessionStore()
+
+
+# Identifica a sessão do visitante pelo cabeçalho X-Session-Id ou pelo cookie de sessão
+# Se nenhum dos dois for enviado, gera um novo id e o devolve no cabeçalho e no cookie da resposta
+def obter_session_id(
+    response: Response,
+    x_session_id: Optional[str] = Header(None, alias=SESSION_HEADER),
+    sennacar_session: Optional[str] = Cookie(None, alias=SESSION_COOKIE),
+) -> str:
+    # Ids fora do formato gerado pelo servidor são descartados e substituídos por um novo
+    session_id = next(
+        (
+            candidato
+            for candidato in (x_session_id, sennacar_session)
+            if SessionStore.id_valido(candidato)
+        ),
+        None,
+    )
+    if session_id is None:
+        session_id = SessionStore.novo_id()
+
+    response.headers[SESSION_HEADER] = session_id
+    response.set_cookie(
+        SESSION_COOKIE, session_id, max_age=sessoes.ttl, httponly=True, samesite="lax"
+    )
+    return session_id
 
 
 # Processa a mensagem enviada pelo usuário e determina a resposta apropriada.
-# Define fluxo de tratamento conforme o tipo de mensagem: agendamento, formulário ou texto normal.
 # Valida se a mensagem não está vazia para evitar erros no processamento.
-# Trata comandos específicos de agendamento: "calendar|", "confirmar" ou "alterar data".
-# Chama diretamente a função de confirmação de agendamento.
-# Se a mensagem for um JSON, trata como dados de formulário enviados pelo usuário.
-# Extrai nome, email e telefone; valida se todos estão preenchidos.
-# Confirmação manual de agendamento para fluxos mais antigos.
-# Garante que cliente, produtos, data e hora estejam presentes.
-# Processa confirmação de dados temporários de cliente.
-# Se confirmado, cadastra cliente e inicia o fluxo de agendamento.
-# Se cancelado, reseta o estado do chatbot.
-# Processa a mensagem normalmente via modelo de intents do chatbot.
-# Define opções padrão conforme o conteúdo da resposta ou se houve cancelamento.
+# Todo o fluxo da conversa (formulário, confirmação de dados, calendário e agendamento)
+# é resolvido pela máquina de estados do assistente (ver app/chatbot/fluxo.py).
+# Mensagens em texto livre são classificadas pelo executor de inferência em lote, sem bloquear o event loop.
+# As regras e os handlers (que consultam o MongoDB e o Google Calendar) rodam nas threads do banco
+# (ver app/models/assincrono.py); mensagens da mesma conversa são processadas uma de cada vez.
+# Com o rastreamento ativo, o turno é registrado com o tempo de cada etapa (ver app/rastreamento.py);
+# a etapa chatbot.executor inclui a espera na fila de inferência.
+# Respostas com opções já chegam como dicionário; textos simples são encapsulados em ChatbotResponse.
 @router.post("/message", response_model=ChatbotResponse)
-async def process_message(message_data: ChatbotMessage):
+async def process_message(
+    message_data: ChatbotMessage,
+    session_id: str = Depends(obter_session_id),
+    chatbot: ChatbotAssistant = Depends(get_chatbot),
+):
     user_message = message_data.message
 
     if not user_message:
         raise HTTPException(status_code=400, detail="Message is required")
 
-    if user_message.startswith("calendar|") or user_message.lower() in [
-        "confirmar",
-        "alterar data",
-    ]:
-        try:
-            return confirmar_agendamento(chatbot, user_message)
-        except Exception as e:
-            print("Erro ao processar calendar/agendamento:", str(e))
-            return ChatbotResponse(
-                response="Erro ao processar agendamento. Tente novamente.",
-                options=["Cancelar tudo"],
-            )
-
-    chatbot.current_message = user_message
-    chatbot.last_user_choice = user_message
-
-    if user_message.startswith("{") and user_message.endswith("}"):
-        try:
-            form_data = json.loads(user_message)
-            nome = form_data.get("nome", "").strip()
-            email = form_data.get("email", "").strip()
-            telefone = form_data.get("telefone", "").strip()
-
-            if not all([nome, email, telefone]):
-                return ChatbotResponse(
-                    response="Por favor, preencha todos os campos corretamente."
-                )
-
-            chatbot.client_data_temp = {
-                "nome": nome,
-                "email": email,
-                "telefone": telefone,
-            }
+    estado = sessoes.obter(session_id)
+    async with estado.trava:
+        with rastrear("chatbot.turno"):
+            response = await executar(chatbot.fluxo.iniciar_turno, estado, user_message)
 
-            return ChatbotResponse(
-                response=(
-                    "Por favor, confirme seus dados:\n"
-                    f"Nome: {nome}\n"
-                    f"Email: {email}\n"
-                    f"Telefone: {telefone}"
-                ),
-                options=["Dados corretos", "Dados incorretos"],
-            )
-
-        except json.JSONDecodeError:
-            return ChatbotResponse(
-                response="Ocorreu um erro ao processar seus dados. Por favor, tente novamente.",
-                options=None,
-            )
-
-    if user_message.lower() == "confirmar agendamento":
-        try:
-            cliente = chatbot.client_data
-            produtos = chatbot.selected_products or []
-            data = chatbot.agendamento_data
-            hora = chatbot.agendamento_hora
-
-            if not all([cliente, produtos, data, hora]):
-                return ChatbotResponse(
-                    response="Informações insuficientes para confirmar o agendamento.",
-                    options=["Cancelar tudo"],
-                )
-
-            print(f"Agendamento confirmado para {cliente['nome']} em {data} às {hora}")
-
-            return ChatbotResponse(
-                response=f"✅ Agendamento confirmado para {data} às {hora}. Agradecemos pela preferência!",
-                options=["Agendar novamente", "Ver serviços"],
-            )
-
-        except Exception as e:
-            return ChatbotResponse(
-                response="Erro ao confirmar o agendamento. Por favor, tente novamente.",
-                options=["Cancelar tudo"],
-            )
+            if response is CLASSIFICAR:
+                try:
+                    with etapa("chatbot.executor"):
+                        predicao = await executor.classificar(user_message, chatbot)
+                except FilaCheia:
+                    raise HTTPException(
+                        status_code=503, detail="Assistente sobrecarregado, tente novamente"
+                    )
+                response = await executar(chatbot.fluxo.concluir_turno, estado, predicao)
 
-    if hasattr(chatbot, "client_data_temp") and chatbot.client_data_temp:
-        if user_message.lower() == "dados corretos":
-            chatbot.client_data = chatbot.client_data_temp.copy()
-            resultado = cadastrar_cliente(chatbot)
-            chatbot.awaiting_confirmation = False
-            chatbot.client_data_temp = None
-            return iniciar_agendamento(chatbot)
+    if isinstance(response, dict):
+        return response
 
-        if user_message.lower() in ["cancelar", "cancelar tudo"]:
-            reset_chatbot_state(chatbot)
-            return ChatbotResponse(
-                response="Operação cancelada. Como posso ajudar?",
-                options=["Agendar", "Ver serviços", "Tirar dúvida"],
-            )
+    return ChatbotResponse(response=response)
 
-    response = chatbot.process_message(user_message)
 
-    if isinstance(response, dict):
-        return response
+# Classifica um lote de mensagens sem alterar nenhuma conversa (avaliação offline, replay de logs)
+# O lote é vetorizado em uma única matriz e classificado em um único forward, fora do event loop
+@router.post("/classify/batch", response_model=ClassifyBatchResponse)
+async def classify_batch(
+    dados: ClassifyBatchRequest,
+    chatbot: ChatbotAssistant = Depends(get_chatbot),
+):
+    if len(dados.messages) > MAX_LOTE_CLASSIFICACAO:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {MAX_LOTE_CLASSIFICACAO} mensagens por requisição",
+        )
 
-    options = None
-    if chatbot.last_user_choice.lower() in ["cancelar", "cancelar tudo"]:
-        reset_chatbot_state(chatbot)
-        response = "Operação cancelada. Como posso ajudar?"
-        options = ["Agendar", "Ver serviços", "Tirar dúvida"]
-    elif "como posso te ajudar" in response.lower():
-        options = ["Agendar", "Ver serviços", "Tirar dúvida"]
-    elif any(
-        phrase in response.lower()
-        for phrase in [
-            "catálogo",
-            "categorias disponíveis",
-            "serviço/produto",
-            "produto/serviço",
-        ]
-    ):
-        options = ["Insulfim", "Multimídia", "Caixas de Som", "PPF"]
+    classificacoes = await asyncio.to_thread(
+        chatbot.predict_batch, dados.messages, dados.top_k
+    )
 
-    return ChatbotResponse(response=response, options=options)
+    return ClassifyBatchResponse(
+        results=[
+            {
+                "message": mensagem,
+                "intent": c.intent,
+                "confianca": c.confianca,
+                "top_k": [{"intent": i, "confianca": p} for i, p in c.top_k],
+            }
+            for mensagem, c in zip(dados.messages, classificacoes)
+        ]
+    )
 
 
 # Obtém horários disponíveis para a data fornecida.
@@ -187,7 +216,7 @@ async def process_message(message_data: ChatbotMessage):
 async def get_horarios(data: str):
     try:
         data_obj = datetime.strptime(data, "%Y-%m-%d").date()
-        horarios = horarios_service(data_obj)
+        horarios = await executar(horarios_service, data_obj)
         return {"horarios": horarios}
     except ValueError:
         raise HTTPException(
@@ -197,3 +226,64 @@ async def get_horarios(data: str):
                 options=["Cancelar tudo"],
             ).dict(),
         )
+
+
+# Encerra a conversa do visitante, descartando carrinho e etapas pendentes
+@router.post("/reset", response_model=ResetResponse)
+async def reset_session(session_id: str = Depends(obter_session_id)):
+    sessoes.remover(session_id)
+    return ResetResponse(status="ok")
+
+
+# Retorna os contadores do cache de intents (acertos, falhas e taxa de acerto)
+# Apenas administradores podem consultar
+@router.get("/cache")
+async def estatisticas_cache(
+    chatbot: ChatbotAssistant = Depends(get_chatbot),
+    admin: dict = Depends(verificar_admin),
+):
+    return chatbot.cache.estatisticas()
+
+
+# Retorna as métricas do executor de inferência (tamanho dos lotes, fila e latências)
+# Apenas administradores podem consultar
+@router.get("/executor")
+async def metricas_executor(admin: dict = Depends(verificar_admin)):
+    return executor.metricas()
+
+
+# Lista as versões do modelo no registro, indicando a ativa e a carregada neste worker
+# Apenas administradores podem consultar
+@router.get("/modelos")
+async def listar_modelos(admin: dict = Depends(verificar_admin)):
+    return {
+        "ativa": registro.versao_ativa(),
+        "carregada": atualizador.versao_carregada,
+        "erro": atualizador.erro,
+        "versoes": registro.listar(),
+    }
+
+
+# Ativa uma versão do modelo: ela é carregada e validada antes de substituir a atual
+# Os demais workers trocam de versão na próxima verificação do registro
+@router.post("/modelos/{versao}/ativar")
+async def ativar_modelo(versao: str, admin: dict = Depends(verificar_admin)):
+    try:
+        await asyncio.to_thread(atualizador.ativar, versao)
+    except VersaoInvalida as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Falha ao carregar a versão {versao}: {e}")
+    return {"ativa": versao}
+
+
+# Volta para a versão do modelo ativada anteriormente
+@router.post("/modelos/reverter")
+async def reverter_modelo(admin: dict = Depends(verificar_admin)):
+    try:
+        assistant = await asyncio.to_thread(atualizador.reverter)
+    except VersaoInvalida as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Falha ao carregar a versão anterior: {e}")
+    return {"ativa": assistant.versao}
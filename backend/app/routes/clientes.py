@@ -1,11 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from app.models.cliente import Cliente
+from app.models.assincrono import ClienteAsync, ModeloAsync
 from app.schemas.cliente import ClienteResponse, ClienteUpdate
 from typing import List, Optional
 from app.auth.auth_utils import get_current_user
+from app.paginacao import (
+    CABECALHO_TOTAL,
+    campos_resposta,
+    cursor_id,
+    cursor_por_id,
+    paginar,
+    parametro_apos_id,
+    parametro_limite,
+    parametro_todos,
+    parametro_total,
+)
 
 router = APIRouter(prefix="/clientes", tags=["Clientes"])
 
+CAMPOS_RESPOSTA = campos_resposta(ClienteResponse)
+
+
+# Listagem de clientes em ordem de cadastro, paginada por _id (ver app/paginacao.py)
+# Com todos=true, retorna a lista completa, sem paginação
+async def listar_clientes(response: Response, limite: int, apos: Optional[str], total: bool, todos: bool):
+    if todos:
+        clientes = await ClienteAsync.listar_todos()
+    else:
+        clientes = await ClienteAsync.listar_pagina(limite + 1, cursor_por_id(apos), CAMPOS_RESPOSTA)
+        clientes = paginar(clientes, limite, response, cursor_id)
+    if total:
+        response.headers[CABECALHO_TOTAL] = str(await ClienteAsync.contar())
+    return [ClienteResponse.from_mongo(c) for c in clientes]
+
 
 # Cria um novo cliente com nome, email e telefone fornecidos.
 # Retorna erro se já houver cliente com o mesmo email ou telefone.
@@ -14,7 +41,7 @@ async def criar_cliente(
     nome: str, email: str, telefone: str, user: dict = Depends(get_current_user)
 ):
     novo_cliente = Cliente(nome, email, telefone)
-    cliente_id = novo_cliente.cadastrar_cliente()
+    cliente_id = await ModeloAsync(novo_cliente).cadastrar_cliente()
 
     if not cliente_id:
         raise HTTPException(
@@ -28,17 +55,28 @@ async def criar_cliente(
 # Endpoint de debug para listar todos os clientes cadastrados.
 # Não exige autenticação ou parâmetros de busca.
 @router.get("/debug", response_model=List[ClienteResponse])
-async def debug_busca_geral():
-    clientes = Cliente.listar_todos()
-    return [ClienteResponse.from_mongo(c) for c in clientes]
+async def debug_busca_geral(
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[str] = parametro_apos_id(),
+    total: bool = parametro_total(),
+    todos: bool = parametro_todos(),
+):
+    return await listar_clientes(response, limite, apos, total, todos)
 
 
 # Lista todos os clientes cadastrados no sistema.
 # Protegido por autenticação.
 @router.get("/todos", response_model=List[ClienteResponse])
-async def listar_todos_clientes(user: dict = Depends(get_current_user)):
-    clientes = Cliente.listar_todos()
-    return [ClienteResponse.from_mongo(c) for c in clientes]
+async def listar_todos_clientes(
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[str] = parametro_apos_id(),
+    total: bool = parametro_total(),
+    todos: bool = parametro_todos(),
+    user: dict = Depends(get_current_user),
+):
+    return await listar_clientes(response, limite, apos, total, todos)
 
 
 # Busca um cliente por nome, email ou telefone (busca exata).
@@ -61,11 +99,11 @@ async def buscar_clientes(
 
     cliente = None
     if nome:
-        cliente = Cliente.buscar_por_nome(nome)
+        cliente = await ClienteAsync.buscar_por_nome(nome)
     elif email:
-        cliente = Cliente.buscar_por_email(email)
+        cliente = await ClienteAsync.buscar_por_email(email)
     elif telefone:
-        cliente = Cliente.buscar_por_telefone(telefone)
+        cliente = await ClienteAsync.buscar_por_telefone(telefone)
 
     if not cliente:
         raise HTTPException(
@@ -86,11 +124,11 @@ async def buscar_clientes_parcial(
     user: dict = Depends(get_current_user),
 ):
     if nome:
-        clientes = Cliente.listar_por_nome_regex(nome)
+        clientes = await ClienteAsync.listar_por_nome_regex(nome)
     elif email:
-        clientes = Cliente.listar_por_email_regex(email)
+        clientes = await ClienteAsync.listar_por_email_regex(email)
     elif telefone:
-        clientes = Cliente.listar_por_telefone_regex(telefone)
+        clientes = await ClienteAsync.listar_por_telefone_regex(telefone)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -103,7 +141,7 @@ async def buscar_clientes_parcial(
 # Retorna erro se o cliente não for encontrado.
 @router.get("/{cliente_id}", response_model=ClienteResponse)
 async def obter_cliente_por_id(cliente_id: str, user: dict = Depends(get_current_user)):
-    cliente = Cliente.buscar_por_id(cliente_id)
+    cliente = await ClienteAsync.buscar_por_id(cliente_id)
     if not cliente:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     return ClienteResponse.from_mongo(cliente)
@@ -126,7 +164,7 @@ async def atualizar_cliente(
             detail="Nenhum dado fornecido para atualização",
         )
 
-    sucesso = Cliente.atualizar_cliente(cliente_id, dados_atualizacao)
+    sucesso = await ClienteAsync.atualizar_cliente(cliente_id, dados_atualizacao)
     if not sucesso:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
 
@@ -137,7 +175,7 @@ async def atualizar_cliente(
 # Retorna erro se cliente não for encontrado.
 @router.delete("/{cliente_id}")
 async def deletar_cliente(cliente_id: str, user: dict = Depends(get_current_user)):
-    sucesso = Cliente.deletar_cliente(cliente_id)
+    sucesso = await ClienteAsync.deletar_cliente(cliente_id)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
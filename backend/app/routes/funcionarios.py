@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.models.funcionario import Funcionario
+from app.models.assincrono import FuncionarioAsync, ModeloAsync
 from app.auth.auth_utils import get_current_user, verificar_admin
 from typing import List, Optional
 from app.schemas.funcionario import FuncionarioResponse, FuncionarioUpdate
+from app.paginacao import (
+    CABECALHO_TOTAL,
+    campos_resposta,
+    cursor_id,
+    cursor_por_id,
+    paginar,
+    parametro_apos_id,
+    parametro_limite,
+    parametro_todos,
+    parametro_total,
+)
 
 router = APIRouter(prefix="/funcionarios", tags=["Funcionários"])
 
+# A projeção deixa de fora a senha, que nunca sai do banco na listagem
+CAMPOS_RESPOSTA = campos_resposta(FuncionarioResponse)
+
 
 # Cria um novo funcionário com os dados fornecidos.
 # Apenas administradores podem realizar essa operação.
@@ -19,7 +34,7 @@ async def criar_funcionario(
     admin: dict = Depends(verificar_admin),
 ):
     novo_funcionario = Funcionario(nome, email, senha, is_admin)
-    funcionario_id = novo_funcionario.cadastrar_funcionario()
+    funcionario_id = await ModeloAsync(novo_funcionario).cadastrar_funcionario()
 
     if not funcionario_id:
         raise HTTPException(
@@ -30,13 +45,29 @@ async def criar_funcionario(
     return {"id": funcionario_id}
 
 
-# Lista todos os funcionários não administradores cadastrados.
+# Lista os funcionários não administradores em ordem de cadastro.
 # Requer autenticação.
+# Paginada por _id (ver app/paginacao.py); com todos=true, retorna a lista completa.
 # Retorna erro se nenhum funcionário for encontrado.
 @router.get("/", response_model=List[FuncionarioResponse])
-async def listar_funcionarios(user: dict = Depends(get_current_user)):
-    funcionarios = Funcionario.listar_todos()
-    if not funcionarios:
+async def listar_funcionarios(
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[str] = parametro_apos_id(),
+    total: bool = parametro_total(),
+    todos: bool = parametro_todos(),
+    user: dict = Depends(get_current_user),
+):
+    if todos:
+        funcionarios = await FuncionarioAsync.listar_todos()
+    else:
+        funcionarios = await FuncionarioAsync.listar_pagina(
+            limite + 1, cursor_por_id(apos), CAMPOS_RESPOSTA
+        )
+        funcionarios = paginar(funcionarios, limite, response, cursor_id)
+    if total:
+        response.headers[CABECALHO_TOTAL] = str(await FuncionarioAsync.contar())
+    if not funcionarios and apos is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Nenhum funcionário encontrado",
@@ -54,9 +85,9 @@ async def buscar_funcionarios_parcial(
     user: dict = Depends(get_current_user),
 ):
     if nome:
-        funcionarios = Funcionario.listar_por_nome_regex(nome)
+        funcionarios = await FuncionarioAsync.listar_por_nome_regex(nome)
     elif email:
-        funcionarios = Funcionario.listar_por_email_regex(email)
+        funcionarios = await FuncionarioAsync.listar_por_email_regex(email)
     else:
         raise HTTPException(status_code=400, detail="Informe nome ou email para busca")
     return [FuncionarioResponse.from_mongo(f) for f in funcionarios]
@@ -69,7 +100,7 @@ async def buscar_funcionarios_parcial(
 async def obter_funcionario(
     funcionario_id: str, user: dict = Depends(get_current_user)
 ):
-    funcionario = Funcionario.obter_funcionario_por_id(funcionario_id)
+    funcionario = await FuncionarioAsync.obter_funcionario_por_id(funcionario_id)
     if not funcionario:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -103,7 +134,9 @@ async def atualizar_funcionario(
             detail="Nenhum dado fornecido para atualização",
         )
 
-    sucesso = Funcionario.atualizar_funcionario(funcionario_id, dados_atualizacao_dict)
+    sucesso = await FuncionarioAsync.atualizar_funcionario(
+        funcionario_id, dados_atualizacao_dict
+    )
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -120,7 +153,7 @@ async def atualizar_funcionario(
 async def deletar_funcionario(
     funcionario_id: str, admin: dict = Depends(verificar_admin)
 ):
-    sucesso = Funcionario.deletar_funcionario(funcionario_id)
+    sucesso = await FuncionarioAsync.deletar_funcionario(funcionario_id)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app import metricas
+
+router = APIRouter(tags=["Métricas"])
+
+
+# Métricas da API no formato do Prometheus (requisições, MongoDB, Google Calendar, chatbot e caches)
+# Com PROMETHEUS_MULTIPROC_DIR definido, soma os valores de todos os workers
+@router.get("/metrics", include_in_schema=False)
+def exportar_metricas():
+    conteudo, tipo = metricas.gerar()
+    return Response(conteudo, media_type=tipo)
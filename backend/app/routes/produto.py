@@ -1,14 +1,27 @@
 from decimal import Decimal
 from typing import List, Optional
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Query, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
 from app.schemas.produto import ProdutoResponse
 from app.models.produto import Produto
+from app.models.assincrono import ModeloAsync, ProdutoAsync
 from app.auth.auth_utils import verificar_admin, get_current_user
-from app.database import get_produtos_collection
+from app.chatbot.entidades import catalogo_produtos
+from app.paginacao import (
+    CABECALHO_CURSOR,
+    CABECALHO_TOTAL,
+    campos_resposta,
+    cursor_nome,
+    cursor_por_nome,
+    paginar,
+    parametro_limite,
+    parametro_todos,
+    parametro_total,
+)
 
 router = APIRouter(prefix="/produtos", tags=["Produtos"])
 
+CAMPOS_RESPOSTA = campos_resposta(ProdutoResponse)
+
 
 # Cria um novo produto com os dados fornecidos.
 # Apenas administradores podem realizar essa operação.
@@ -23,7 +36,7 @@ async def criar_produto(
     admin: dict = Depends(verificar_admin),
 ):
     novo_produto = Produto(nome, preco, preco_mao_obra, categoria, descricao)
-    produto_id = novo_produto.cadastrar_produto()
+    produto_id = await ModeloAsync(novo_produto).cadastrar_produto()
 
     if not produto_id:
         raise HTTPException(
@@ -31,6 +44,7 @@ async def criar_produto(
             detail="Produto já cadastrado ou dados inválidos",
         )
 
+    catalogo_produtos.invalidar()
     return {"id": produto_id}
 
 
@@ -45,7 +59,7 @@ async def filtrar_produtos_por_nome(
     nome: str = Query(..., min_length=1),
     user: dict = Depends(get_current_user),
 ):
-    produtos = Produto.listar_por_nome_regex(nome)
+    produtos = await ProdutoAsync.listar_por_nome_regex(nome)
     return [ProdutoResponse.from_mongo(p) for p in produtos]
 
 
@@ -54,17 +68,29 @@ async def filtrar_produtos_por_nome(
 # Retorna lista de descrições únicas encontradas.
 @router.get("/categorias/sugestoes", response_model=List[str])
 async def sugerir_categorias(descricao: str = Query(..., min_length=1)):
-    categorias = get_produtos_collection().distinct(
-        "descricao", {"descricao": {"$regex": f".*{descricao}.*", "$options": "i"}}
-    )
+    categorias = await ProdutoAsync.listar_descricoes_regex(descricao)
     return sorted(filter(None, categorias))
 
 
-# Lista todos os produtos cadastrados, ordenados pelo nome.
+# Lista os produtos cadastrados ordenados pelo nome, paginada por (nome, _id) (ver app/paginacao.py).
+# Com todos=true, retorna a lista completa, sem paginação.
 # Requer autenticação.
 @router.get("/", response_model=List[ProdutoResponse])
-async def listar_todos_produtos(user=Depends(get_current_user)):
-    produtos = get_produtos_collection().find().sort("nome", 1)
+async def listar_todos_produtos(
+    response: Response,
+    limite: int = parametro_limite(),
+    apos: Optional[str] = Query(None, description=f"Cursor recebido no cabeçalho {CABECALHO_CURSOR}"),
+    total: bool = parametro_total(),
+    todos: bool = parametro_todos(),
+    user=Depends(get_current_user),
+):
+    if todos:
+        produtos = await ProdutoAsync.listar_todos()
+    else:
+        produtos = await ProdutoAsync.listar_pagina(limite + 1, cursor_por_nome(apos), CAMPOS_RESPOSTA)
+        produtos = paginar(produtos, limite, response, cursor_nome)
+    if total:
+        response.headers[CABECALHO_TOTAL] = str(await ProdutoAsync.contar())
     return [ProdutoResponse.from_mongo(p) for p in produtos]
 
 
@@ -73,7 +99,7 @@ async def listar_todos_produtos(user=Depends(get_current_user)):
 # Retorna erro se o produto não for encontrado.
 @router.get("/{produto_id}", response_model=ProdutoResponse)
 async def obter_produto(produto_id: str, user=Depends(get_current_user)):
-    produto = Produto.buscar_por_id(produto_id)
+    produto = await ProdutoAsync.buscar_por_id(produto_id)
 
     if not produto:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
@@ -86,7 +112,7 @@ async def obter_produto(produto_id: str, user=Depends(get_current_user)):
 # Retorna lista de produtos encontrados ou vazia.
 @router.get("/categoria/{categoria}", response_model=list[ProdutoResponse])
 async def listar_produtos_por_categoria(categoria: str, user=Depends(get_current_user)):
-    produtos = Produto.listar_por_categoria(categoria)
+    produtos = await ProdutoAsync.listar_por_categoria(categoria)
     return [
         ProdutoResponse(
             _id=str(produto["_id"]),
@@ -132,12 +158,13 @@ async def atualizar_produto(
             detail="Nenhum dado fornecido para atualização",
         )
 
-    sucesso = Produto.atualizar_produto(produto_id, dados_atualizacao)
+    sucesso = await ProdutoAsync.atualizar_produto(produto_id, dados_atualizacao)
     if not sucesso:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Produto não encontrado",
         )
+    catalogo_produtos.invalidar()
     return {"message": "Produto atualizado"}
 
 
@@ -146,8 +173,6 @@ async def atualizar_produto(
 # Retorna erro se o produto não for encontrado.
 @router.delete("/{produto_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def deletar_produto(produto_id: str, user=Depends(verificar_admin)):
-    produtos_col = get_produtos_collection()
-    result = produtos_col.delete_one({"_id": ObjectId(produto_id)})
-
-    if result.deleted_count == 0:
+    if not await ProdutoAsync.deletar_produto(produto_id):
         raise HTTPException(status_code=404, detail="Produto não encontrado")
+    catalogo_produtos.invalidar()
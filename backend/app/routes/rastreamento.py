@@ -0,0 +1,82 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.auth_utils import verificar_admin
+from app.consultas_lentas import perfil_comandos
+from app.rastreamento import rastreador
+
+router = APIRouter(tags=["Rastreamento"])
+
+
+# Indica se o rastreamento está ativo e quantos rastros estão guardados
+# Apenas administradores podem consultar
+@router.get("/")
+async def status_rastreamento(admin: dict = Depends(verificar_admin)):
+    return {
+        "ativo": rastreador.ativo,
+        "rastros": len(rastreador.rastros),
+        "capacidade": rastreador.rastros.maxlen,
+    }
+
+
+# Liga ou desliga o rastreamento neste worker, sem reiniciar a API
+@router.post("/ativar")
+async def ativar_rastreamento(admin: dict = Depends(verificar_admin)):
+    rastreador.ativo = True
+    return {"ativo": True}
+
+
+@router.post("/desativar")
+async def desativar_rastreamento(admin: dict = Depends(verificar_admin)):
+    rastreador.ativo = False
+    return {"ativo": False}
+
+
+# Rastros mais recentes, com o tempo total e o tempo próprio de cada etapa
+# Pode filtrar pelo nome do rastro (ex.: chatbot.turno) e pela duração mínima em ms
+@router.get("/rastros")
+async def listar_rastros(
+    limite: int = Query(50, ge=1, le=1000),
+    nome: Optional[str] = None,
+    minimo_ms: float = 0.0,
+    admin: dict = Depends(verificar_admin),
+):
+    return rastreador.recentes(limite, nome, minimo_ms)
+
+
+# Histograma das durações de cada etapa (contagem por intervalo, média, máximo e percentis estimados)
+@router.get("/histogramas")
+async def histogramas(admin: dict = Depends(verificar_admin)):
+    return rastreador.resumo_histogramas()
+
+
+# Descarta os rastros e histogramas acumulados
+@router.delete("/")
+async def limpar_rastreamento(admin: dict = Depends(verificar_admin)):
+    rastreador.limpar()
+    return {"status": "ok"}
+
+
+# Formatos de consulta do MongoDB que mais consomem tempo, com o plano do explain() quando disponível,
+# e os comandos mais recentes acima do limite de lentidão (MONGO_LIMITE_LENTO_MS)
+# ordem: "total_ms" (padrão), "max_ms" ou "media_ms"
+@router.get("/mongo")
+async def consultas_lentas(
+    limite: int = Query(20, ge=1, le=500),
+    ordem: str = Query("total_ms", pattern="^(total_ms|max_ms|media_ms)$"),
+    admin: dict = Depends(verificar_admin),
+):
+    return {
+        "limite_lento_ms": perfil_comandos.limite_ms,
+        "explicar": perfil_comandos.explicar,
+        "formatos": perfil_comandos.mais_lentos(limite, ordem),
+        "lentas": perfil_comandos.recentes(),
+    }
+
+
+# Descarta o perfil acumulado de consultas do MongoDB
+@router.delete("/mongo")
+async def limpar_consultas_lentas(admin: dict = Depends(verificar_admin)):
+    perfil_comandos.limpar()
+    return {"status": "ok"}
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app import recursos, repositorios
+from app.auth.auth_utils import verificar_admin
+
+router = APIRouter(tags=["Saúde"])
+
+
+# Indica apenas que o processo está no ar (usado como liveness probe)
+@router.get("/live")
+async def live():
+    return {"status": "ok"}
+
+
+# Indica se a API está pronta para receber tráfego (usado como readiness probe)
+# Retorna 503 enquanto algum recurso obrigatório não estiver carregado, com o estado de cada um
+@router.get("/ready")
+async def ready():
+    corpo = {
+        "status": "pronto" if recursos.pronto() else "aquecendo",
+        "recursos": {nome: r.resumo() for nome, r in recursos.recursos.items()},
+    }
+    return JSONResponse(corpo, status_code=200 if recursos.pronto() else 503)
+
+
+# Status de cada índice declarado em app/indices.py (pendente, criando, pronto ou erro)
+# Com os repositórios em memória, lista os índices mantidos em memória
+# Apenas administradores podem consultar
+@router.get("/indices")
+async def indices(admin: dict = Depends(verificar_admin)):
+    return repositorios.atual().resumo_indices()
@@ -1,11 +1,16 @@
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from typing import Annotated, Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+# Tamanho máximo de cada mensagem enviada ao chatbot (o texto fica guardado na sessão da conversa)
+MAX_TAMANHO_MENSAGEM = 2000
+
+Mensagem = Annotated[str, Field(max_length=MAX_TAMANHO_MENSAGEM)]
 
 
 # Modelo para representar a mensagem recebida pelo chatbot.
 # Contém apenas o campo 'message' como texto enviado pelo usuário.
 class ChatbotMessage(BaseModel):
-    message: str
+    message: Mensagem
 
 
 # Modelo para a resposta do chatbot.
@@ -14,6 +19,7 @@ class ChatbotMessage(BaseModel):
 # 'form': Indica se a resposta inclui um formulário.
 # 'calendar': Indica se deve ativar um componente de calendário.
 # 'calendar_data': Dados adicionais para o calendário.
+# 'form_data': Valores já informados pelo usuário para pré-preencher o formulário.
 # 'extra = "allow"': Permite campos adicionais sem gerar erro.
 class ChatbotResponse(BaseModel):
     response: str
@@ -21,6 +27,7 @@ class ChatbotResponse(BaseModel):
     form: Optional[bool] = False
     calendar: Optional[bool] = False
     calendar_data: Optional[Dict[str, Any]] = None
+    form_data: Optional[Dict[str, Any]] = None
 
     class Config:
         extra = "allow"
@@ -29,3 +36,30 @@ class ChatbotResponse(BaseModel):
 # Modelo para indicar o status de um reset do chatbot.
 class ResetResponse(BaseModel):
     status: str
+
+
+# Modelo da requisição de classificação em lote.
+# 'messages': Mensagens a classificar (não alteram nenhuma conversa).
+# 'top_k': Quantidade de intents mais prováveis retornadas para cada mensagem.
+class ClassifyBatchRequest(BaseModel):
+    messages: List[Mensagem]
+    top_k: int = Field(3, ge=1, le=20)
+
+
+# Intent candidata e a probabilidade atribuída pelo modelo.
+class IntentScore(BaseModel):
+    intent: str
+    confianca: float
+
+
+# Classificação de uma mensagem do lote.
+class ClassifyResult(BaseModel):
+    message: str
+    intent: str
+    confianca: float
+    top_k: List[IntentScore]
+
+
+# Modelo da resposta da classificação em lote, na mesma ordem das mensagens enviadas.
+class ClassifyBatchResponse(BaseModel):
+    results: List[ClassifyResult]
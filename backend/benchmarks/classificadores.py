@@ -0,0 +1,116 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.classificadores import BACKENDS, ClassificadorMLP, carregar_classificador
+
+
+# Divide os padrões em k partes preservando a proporção de cada intent (k-fold estratificado)
+# Intents com um único padrão ficam sempre no treino, pois não há como avaliá-las sem removê-las
+def dividir_estratificado(y, k, semente=0):
+    rng = np.random.default_rng(semente)
+    dobras = np.full(len(y), -1)
+    for classe in np.unique(y):
+        indices = np.flatnonzero(y == classe)
+        if len(indices) < 2:
+            continue
+        rng.shuffle(indices)
+        dobras[indices] = np.arange(len(indices)) % k
+    return dobras
+
+
+# Acurácia média da validação cruzada de um classificador
+def validar(criar, X, y, n_classes, k):
+    dobras = dividir_estratificado(y, k)
+    acertos = avaliados = 0
+    for dobra in range(k):
+        teste = dobras == dobra
+        classificador = criar().fit(X[~teste], y[~teste], n_classes)
+        acertos += int((classificador.predict(X[teste]) == y[teste]).sum())
+        avaliados += int(teste.sum())
+    return acertos / avaliados
+
+
+# Latência de classificação de uma mensagem por vez, em microssegundos (p50, p99)
+def medir_latencia(classificador, X, repeticoes):
+    for i in range(10):
+        classificador.predict_proba(X[i % len(X)][None, :])
+
+    tempos = np.empty(repeticoes)
+    for i in range(repeticoes):
+        linha = X[i % len(X)][None, :]
+        inicio = time.perf_counter()
+        classificador.predict_proba(linha)
+        tempos[i] = time.perf_counter() - inicio
+    return np.percentile(tempos, 50) * 1e6, np.percentile(tempos, 99) * 1e6
+
+
+# Tamanho do .npz salvo (KB) e mediana do tempo de carregamento (ms)
+def medir_arquivo(classificador, diretorio, repeticoes=20):
+    npz_path = os.path.join(diretorio, f"{classificador.tipo}.npz")
+    classificador.save(npz_path)
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        carregar_classificador(npz_path)
+        tempos.append(time.perf_counter() - inicio)
+    return os.path.getsize(npz_path) / 1024, float(np.median(tempos)) * 1e3
+
+
+# Compara os classificadores de intents com validação cruzada sobre os padrões do intents.json
+# Para cada um, mostra a acurácia, a latência de uma mensagem (p50/p99), o tamanho do .npz e o
+# tempo de carregamento; o MLP é ignorado se o PyTorch não estiver instalado
+# Uso: python -m benchmarks.classificadores [--dobras K] [--repeticoes N] [--epocas N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intents", default="app/chatbot/intents.json")
+    parser.add_argument("--dobras", type=int, default=5)
+    parser.add_argument("--repeticoes", type=int, default=5000)
+    parser.add_argument("--epocas", type=int, default=300)
+    args = parser.parse_args()
+
+    assistant = ChatbotAssistant(args.intents)
+    assistant.parse_intents()
+    assistant.prepare_data()
+
+    X = np.ascontiguousarray(assistant.X, dtype=np.float32)
+    y = np.asarray(assistant.y)
+    n_classes = len(assistant.intents)
+
+    opcoes = {ClassificadorMLP.tipo: {"epocas": args.epocas}}
+    backends = dict(BACKENDS)
+    try:
+        import torch  # noqa: F401
+    except ImportError:
+        print("PyTorch não instalado: o MLP não será avaliado\n")
+        backends.pop(ClassificadorMLP.tipo)
+
+    print(f"{len(X)} padrões, {X.shape[1]} palavras, {n_classes} intents, {args.dobras} dobras\n")
+    print(
+        f"{'classificador':>13} {'acurácia':>9} {'p50 (µs)':>9} {'p99 (µs)':>9} "
+        f"{'arquivo':>9} {'carga (ms)':>11} {'treino (s)':>11}"
+    )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tipo, classe in backends.items():
+            def criar():
+                return classe(**opcoes.get(tipo, {}))
+
+            acuracia = validar(criar, X, y, n_classes, args.dobras)
+
+            inicio = time.perf_counter()
+            classificador = criar().fit(X, y, n_classes)
+            treino = time.perf_counter() - inicio
+
+            p50, p99 = medir_latencia(classificador, X, args.repeticoes)
+            tamanho, carga = medir_arquivo(classificador, diretorio)
+
+            print(
+                f"{tipo:>13} {acuracia:>9.3f} {p50:>9.1f} {p99:>9.1f} "
+                f"{tamanho:>7.1f}KB {carga:>11.2f} {treino:>11.2f}"
+            )
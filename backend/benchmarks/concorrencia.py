@@ -0,0 +1,108 @@
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+from app import database
+from app.models.assincrono import ProdutoAsync
+from app.models.produto import Produto
+
+CATEGORIA = "benchmark-concorrencia"
+
+
+# API mínima com a mesma consulta feita de duas formas:
+# - /sincrono: chama o modelo direto no event loop (como as rotas faziam antes)
+# - /assincrono: aguarda a versão assíncrona do modelo, que roda nas threads do banco
+def criar_api() -> FastAPI:
+    api = FastAPI()
+
+    @api.get("/sincrono")
+    async def sincrono():
+        return len(Produto.listar_por_categoria(CATEGORIA))
+
+    @api.get("/assincrono")
+    async def assincrono():
+        return len(await ProdutoAsync.listar_por_categoria(CATEGORIA))
+
+    return api
+
+
+# Dispara `total` requisições com `concorrencia` clientes simultâneos e mede vazão e latências
+async def medir(api, rota, total, concorrencia) -> dict:
+    latencias = []
+    restantes = iter(range(total))
+
+    async def cliente(http):
+        for _ in restantes:
+            inicio = time.perf_counter()
+            resposta = await http.get(rota)
+            resposta.raise_for_status()
+            latencias.append(time.perf_counter() - inicio)
+
+    transporte = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as http:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente(http) for _ in range(concorrencia)))
+        duracao = time.perf_counter() - inicio
+
+    p50, p95 = np.percentile(np.array(latencias) * 1000, [50, 95])
+    return {"req_s": total / duracao, "p50_ms": p50, "p95_ms": p95}
+
+
+# Troca o MongoDB pelo mongomock, com uma espera em cada consulta simulando a latência de rede
+def usar_mongomock(latencia_ms):
+    try:
+        import mongomock
+    except ImportError:
+        sys.exit("--mongomock requer o pacote mongomock: pip install -r requirements-dev.txt")
+
+    find = mongomock.collection.Collection.find
+
+    def find_com_latencia(self, *args, **kwargs):
+        time.sleep(latencia_ms / 1000)
+        return find(self, *args, **kwargs)
+
+    mongomock.collection.Collection.find = find_com_latencia
+    database._client = mongomock.MongoClient()
+
+
+# Compara a vazão das rotas com o modelo síncrono e com a versão assíncrona do modelo
+# Por padrão usa o mongod local (mongodb://localhost:27017); sem servidor, use --mongomock --latencia-ms N
+# Os produtos de teste são criados na categoria "benchmark-concorrencia" e removidos no final
+# Uso: python -m benchmarks.concorrencia [--requisicoes 2000] [--concorrencia 1 8 32 64]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--produtos", type=int, default=20)
+    parser.add_argument("--mongomock", action="store_true")
+    parser.add_argument("--latencia-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.mongomock:
+        usar_mongomock(args.latencia_ms)
+
+    produtos = database.get_produtos_collection()
+    produtos.insert_many(
+        [
+            {"nome": f"Produto {i:03d}", "preco": 100.0, "preco_mao_obra": 0.0, "categoria": CATEGORIA}
+            for i in range(args.produtos)
+        ]
+    )
+
+    api = criar_api()
+    try:
+        print(f"{'concorrência':>12} {'rota':>11} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for concorrencia in args.concorrencia:
+            for rota in ("/sincrono", "/assincrono"):
+                r = asyncio.run(medir(api, rota, args.requisicoes, concorrencia))
+                print(
+                    f"{concorrencia:>12} {rota[1:]:>11} {r['req_s']:>9.0f} "
+                    f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}"
+                )
+    finally:
+        produtos.delete_many({"categoria": CATEGORIA})
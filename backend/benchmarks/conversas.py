@@ -0,0 +1,260 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+
+# A API é usada em processo, sem aquecimento em segundo plano e sem o registro de modelos do ambiente
+os.environ.setdefault("SENNACAR_AQUECIMENTO", "desativado")
+os.environ.setdefault(
+    "CHATBOT_REGISTRO", os.path.join(tempfile.gettempdir(), "sennacar-replay-registro")
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from app import repositorios  # noqa: E402
+from app.chatbot.chatbot import ChatbotAssistant  # noqa: E402
+from app.chatbot.entidades import catalogo_produtos  # noqa: E402
+from app.chatbot.sessoes import SESSION_HEADER  # noqa: E402
+from app.google import calendario  # noqa: E402
+from app.rastreamento import medir, rastreador  # noqa: E402
+from app.routes import chatbot as rotas_chatbot  # noqa: E402
+
+DIRETORIO = os.path.dirname(__file__)
+TRANSCRICOES = os.path.join(DIRETORIO, "transcricoes", "*.json")
+ORCAMENTO = os.path.join(DIRETORIO, "orcamento.json")
+
+# Etapas do relatório e os prefixos das etapas do rastreamento (ver app/rastreamento.py) que as compõem
+# Cada etapa soma o tempo próprio das etapas rastreadas, sem as etapas internas: um handler que
+# consulta o banco não conta o tempo do banco como tempo de handler
+ETAPAS = {
+    "tokenize": ("chatbot.tokenize",),
+    "classify": ("chatbot.classify", "chatbot.executor"),
+    "handler": ("chatbot.fluxo.", "chatbot.handler."),
+    "db": ("db.",),
+    "calendar": ("calendar.",),
+}
+PERCENTIS = (50, 95, 99)
+
+# Catálogo usado nas conversas gravadas
+PRODUTOS = [
+    ("Insulfilm G5", 250.0, 100.0, "insulfilm"),
+    ("Insulfilm G20", 230.0, 100.0, "insulfilm"),
+    ("Insulfilm G35", 210.0, 100.0, "insulfilm"),
+    ("Caixa de Som JBL 6x9", 450.0, 80.0, "som"),
+    ("Caixa de Som Pioneer 6", 380.0, 80.0, "som"),
+    ("Central Multimídia Pioneer", 1500.0, 200.0, "multimidia"),
+    ("PPF Fosco", 3000.0, 800.0, "ppf"),
+]
+
+
+# Substituto do Google Calendar: devolve um id de evento após a latência configurada
+class CalendarioSimulado:
+    def __init__(self, latencia_ms=0.0):
+        self.latencia = latencia_ms / 1000
+        self.eventos = 0
+
+    @medir("calendar.create_event")
+    def create_event(self, event_data):
+        if self.latencia:
+            time.sleep(self.latencia)
+        self.eventos += 1
+        return {"id": f"evento-{self.eventos}"}
+
+
+# Próximo dia útil com pelo menos dois dias de antecedência, para que o horário esteja livre
+def proximo_dia_util(hoje=None) -> date:
+    dia = (hoje or date.today()) + timedelta(days=2)
+    while dia.weekday() >= 5:
+        dia += timedelta(days=1)
+    return dia
+
+
+def carregar_transcricoes(padrao=TRANSCRICOES) -> dict:
+    transcricoes = {}
+    for caminho in sorted(glob.glob(padrao)):
+        with open(caminho, "r", encoding="utf-8") as f:
+            transcricoes[os.path.splitext(os.path.basename(caminho))[0]] = json.load(f)
+    return transcricoes
+
+
+# Prepara a API para o replay: repositórios em memória com o catálogo, calendário simulado
+# e o modelo do chatbot; sem modelo treinado, treina o classificador linear em um diretório temporário
+def preparar_ambiente(args, diretorio_temporario):
+    produtos = repositorios.usar("memoria").produtos
+    for nome, preco, mao_obra, categoria in PRODUTOS:
+        produtos.inserir(
+            {"nome": nome, "preco": preco, "preco_mao_obra": mao_obra, "categoria": categoria}
+        )
+
+    calendario._servico = CalendarioSimulado(args.latencia_calendario)
+
+    model_path, dimensions_path = args.modelo, args.dimensoes
+    if not os.path.exists(dimensions_path):
+        print(f"Modelo não encontrado em {dimensions_path}; treinando o classificador linear")
+        assistant = ChatbotAssistant(rotas_chatbot.intents_path)
+        assistant.parse_intents()
+        assistant.train_classifier("linear")
+        model_path = os.path.join(diretorio_temporario, "chatbot_model.pth")
+        dimensions_path = os.path.join(diretorio_temporario, "dimensions.json")
+        assistant.save_model(model_path, dimensions_path)
+
+    rotas_chatbot.model_path = model_path
+    rotas_chatbot.dimensions_path = dimensions_path
+    rotas_chatbot.recurso_chatbot.obter()
+    catalogo_produtos.atualizar()
+
+
+# Tempo próprio de cada etapa do relatório no rastro de um turno, em segundos
+def tempos_por_etapa(rastro) -> dict:
+    etapas = {}
+    for nome, _, _, _, proprio in rastro.etapas:
+        for etapa, prefixos in ETAPAS.items():
+            if nome.startswith(prefixos):
+                etapas[etapa] = etapas.get(etapa, 0.0) + proprio / 1000
+    return etapas
+
+
+# Reproduz uma conversa gravada em uma nova sessão, medindo cada turno
+# Retorna uma lista de (turno, segundos, tempo por etapa, erro ou None)
+def reproduzir(cliente, nome, transcricao, variaveis) -> list:
+    headers = {SESSION_HEADER: uuid.uuid4().hex}
+    turnos = []
+
+    for i, turno in enumerate(transcricao["turnos"], 1):
+        mensagem = turno["mensagem"]
+        for chave, valor in variaveis.items():
+            mensagem = mensagem.replace("{" + chave + "}", valor)
+
+        inicio = time.perf_counter()
+        resposta = cliente.post("/chatbot/message", json={"message": mensagem}, headers=headers)
+        duracao = time.perf_counter() - inicio
+        etapas = tempos_por_etapa(rastreador.rastros[-1])
+
+        erro = None
+        if resposta.status_code != 200:
+            erro = f"HTTP {resposta.status_code}"
+        elif turno.get("espera") and turno["espera"] not in resposta.json()["response"]:
+            erro = f"esperava '{turno['espera']}': {resposta.json()['response'][:80]!r}"
+
+        turnos.append((f"{nome}#{i:02d} {turno['mensagem'][:30]}", duracao, etapas, erro))
+    return turnos
+
+
+def percentis(valores) -> dict:
+    if not valores:
+        return {f"p{p}": 0.0 for p in PERCENTIS}
+    return {f"p{p}": float(np.percentile(valores, p)) * 1000 for p in PERCENTIS}
+
+
+# Agrupa as medições em percentis (ms) por turno, por etapa e para todos os turnos
+def resumir(medicoes) -> dict:
+    por_turno = defaultdict(list)
+    por_etapa = defaultdict(list)
+    for rotulo, duracao, etapas, _ in medicoes:
+        por_turno[rotulo].append(duracao)
+        for etapa in ETAPAS:
+            if etapa in etapas:
+                por_etapa[etapa].append(etapas[etapa])
+
+    return {
+        "turno": {"n": len(medicoes), **percentis([m[1] for m in medicoes])},
+        "turnos": {rotulo: percentis(valores) for rotulo, valores in por_turno.items()},
+        "etapas": {
+            etapa: {"n": len(por_etapa[etapa]), **percentis(por_etapa[etapa])} for etapa in ETAPAS
+        },
+        "erros": sorted({f"{m[0]}: {m[3]}" for m in medicoes if m[3]}),
+    }
+
+
+# Compara o resumo com o orçamento de latência: {"turno": {"p95": ms}, "etapas": {etapa: {"p95": ms}}}
+def verificar_orcamento(resumo, orcamento) -> list:
+    violacoes = []
+    limites = [("turno", resumo["turno"], orcamento.get("turno", {}))]
+    for etapa, limite in orcamento.get("etapas", {}).items():
+        limites.append((etapa, resumo["etapas"].get(etapa, {}), limite))
+
+    for nome, medido, limite in limites:
+        for percentil, maximo in limite.items():
+            if medido.get(percentil, 0.0) > maximo:
+                violacoes.append(f"{nome} {percentil}: {medido[percentil]:.2f}ms > {maximo}ms")
+    return violacoes
+
+
+def imprimir(resumo):
+    cabecalho = f"{'':<50} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(cabecalho)
+    for rotulo, valores in resumo["turnos"].items():
+        print(f"{rotulo:<50} " + " ".join(f"{valores[f'p{p}']:>8.2f}" for p in PERCENTIS))
+
+    print(f"\n{'etapa (ms)':<16} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for nome, valores in [("turno", resumo["turno"]), *resumo["etapas"].items()]:
+        print(
+            f"{nome:<16} {valores['n']:>6} "
+            + " ".join(f"{valores[f'p{p}']:>8.2f}" for p in PERCENTIS)
+        )
+
+
+# Reproduz as conversas gravadas em benchmarks/transcricoes contra a API em processo e mede a latência
+# de cada turno e de cada etapa (tokenize, classify, handler, db, calendar)
+# Termina com código 1 se alguma resposta não for a esperada ou se o orçamento de latência for excedido
+# Uso: python -m benchmarks.conversas [--repeticoes N] [--orcamento arquivo.json] [--latencia-calendario MS]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcricoes", default=TRANSCRICOES)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--orcamento", default=ORCAMENTO)
+    parser.add_argument("--latencia-calendario", type=float, default=0.0)
+    parser.add_argument("--modelo", default=rotas_chatbot.model_path)
+    parser.add_argument("--dimensoes", default=rotas_chatbot.dimensions_path)
+    parser.add_argument("--json", help="grava o resumo neste arquivo")
+    args = parser.parse_args()
+
+    transcricoes = carregar_transcricoes(args.transcricoes)
+    dia = proximo_dia_util()
+    variaveis = {
+        "data": dia.strftime("%Y-%m-%d"),
+        "data_br": dia.strftime("%d/%m/%Y"),
+        "hora": "09:00",
+    }
+
+    rastreador.ativo = True
+    medicoes = []
+    with tempfile.TemporaryDirectory() as diretorio, TestClient(main.app) as cliente:
+        preparar_ambiente(args, diretorio)
+
+        for repeticao in range(args.aquecimento + args.repeticoes):
+            for nome, transcricao in transcricoes.items():
+                turnos = reproduzir(cliente, nome, transcricao, variaveis)
+                if repeticao >= args.aquecimento:
+                    medicoes.extend(turnos)
+                # Libera o horário reservado para a próxima repetição
+                repositorios.agendamentos().limpar()
+
+    resumo = resumir(medicoes)
+    imprimir(resumo)
+
+    violacoes = []
+    if args.orcamento:
+        with open(args.orcamento, "r", encoding="utf-8") as f:
+            violacoes = verificar_orcamento(resumo, json.load(f))
+    resumo["violacoes"] = violacoes
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+
+    for erro in resumo["erros"]:
+        print(f"ERRO {erro}")
+    for violacao in violacoes:
+        print(f"ORÇAMENTO EXCEDIDO {violacao}")
+    sys.exit(1 if resumo["erros"] or violacoes else 0)
@@ -0,0 +1,91 @@
+import argparse
+import gc
+import tracemalloc
+
+from bson import ObjectId
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.sessoes import SELECIONANDO_PRODUTO, ItemCarrinho, SessionStore
+
+
+# Documento de produto como retornado pelo MongoDB
+def documento(i):
+    return {
+        "_id": ObjectId(),
+        "nome": f"Insulfilm G{i}",
+        "preco": 100.0 + i,
+        "preco_mao_obra": 50.0,
+        "categoria": "insulfilm",
+        "descricao": "Película automotiva com proteção UV e garantia de 5 anos",
+    }
+
+
+# Bytes alocados por `criar`, medidos com tracemalloc
+def medir(criar):
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    valor = criar()
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return valor, total
+
+
+# Preenche uma conversa típica: categoria listada, dois produtos no carrinho e dados do cliente
+# Cada conversa recebe a própria lista de produtos, como acontece ao consultar o banco
+def preencher(estado, produtos, nomes):
+    estado.etapa = SELECIONANDO_PRODUTO
+    estado.current_message = "Insulfilm G5"
+    estado.last_user_choice = "Insulfilm G5"
+    estado.produtos_temp = dict(zip(nomes, produtos))
+    estado.current_category = "insulfilm"
+    estado.selected_products = [produtos[0], produtos[1]]
+    estado.client_data = {"nome": "João Silva", "email": "joao@email.com", "telefone": "11999999999"}
+
+
+# Mede a memória ocupada por conversa ativa e pelo assistente compartilhado
+# Uso: python -m benchmarks.memoria [--conversas N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intents", default="app/chatbot/intents.json")
+    parser.add_argument("--modelo", default="app/chatbot/chatbot_model.pth")
+    parser.add_argument("--dimensoes", default="app/chatbot/dimensions.json")
+    parser.add_argument("--conversas", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Carrinho com ItemCarrinho comparado ao carrinho com os documentos inteiros do MongoDB
+    formatos = {
+        "ItemCarrinho": ItemCarrinho.de_documento,
+        "documentos": lambda produto: produto,
+    }
+
+    for nome, converter in formatos.items():
+        def criar_conversas():
+            store = SessionStore(max_sessoes=args.conversas, ttl=3600)
+            for i in range(args.conversas):
+                documentos = [documento(j) for j in range(5)]
+                preencher(
+                    store.obter(f"{i:032x}"),
+                    [converter(d) for d in documentos],
+                    [d["nome"] for d in documentos],
+                )
+            return store
+
+        store, total = medir(criar_conversas)
+        del store
+        print(
+            f"{args.conversas} conversas ({nome}): {total / 2**20:.1f} MB "
+            f"({total / args.conversas:.0f} bytes por conversa)"
+        )
+
+    def criar_assistente(treino):
+        assistant = ChatbotAssistant(args.intents)
+        assistant.parse_intents(treino=treino)
+        assistant.load_model(args.modelo, args.dimensoes)
+        return assistant
+
+    for treino in (True, False):
+        _, total = medir(lambda: criar_assistente(treino))
+        rotulo = "com dados de treino" if treino else "apenas o pacote"
+        print(f"assistente {rotulo}: {total / 1024:.0f} KB")
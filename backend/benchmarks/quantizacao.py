@@ -0,0 +1,77 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.classificadores import ClassificadorMLP, tipo_do_arquivo
+from app.chatbot.inferencia import caminho_npz, carregar_motor
+
+# Configurações comparadas: (precisão, fração de neurônios podados)
+CONFIGURACOES = [
+    ("float32", 0.0),
+    ("int8", 0.0),
+    ("float32", 0.25),
+    ("int8", 0.25),
+    ("float32", 0.5),
+    ("int8", 0.5),
+]
+
+
+# Mediana do tempo de `funcao` em microssegundos, após algumas execuções de aquecimento
+def medir(funcao, repeticoes):
+    for _ in range(10):
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos)) * 1e6
+
+
+# Compara latência, memória e acurácia do modelo em float32 com as versões quantizadas e podadas
+# A acurácia é medida sobre os próprios padrões do intents.json e a concordância em relação ao float32
+# Uso: python -m benchmarks.quantizacao [--repeticoes N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara o modelo em float32 com as versões quantizadas (int8) e podadas"
+    )
+    parser.add_argument("--intents", default="app/chatbot/intents.json")
+    parser.add_argument("--modelo", default="app/chatbot/chatbot_model.pth")
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+
+    assistant = ChatbotAssistant(args.intents)
+    assistant.parse_intents()
+    assistant.prepare_data()
+
+    X = np.ascontiguousarray(assistant.X, dtype=np.float32)
+    y = np.asarray(assistant.y)
+    npz_path = caminho_npz(args.modelo)
+    # Quantização e poda só existem para o MLP; os outros classificadores são comparados em benchmarks.classificadores
+    with np.load(npz_path) as npz:
+        tipo = tipo_do_arquivo(npz)
+    if tipo != ClassificadorMLP.tipo:
+        sys.exit(f"{npz_path} guarda um classificador '{tipo}'; a quantização e a poda se aplicam apenas ao MLP")
+
+    referencia = carregar_motor(npz_path, "float32", 0.0).predict(X)
+
+    print(f"{len(X)} padrões, {X.shape[1]} palavras, {len(assistant.intents)} intents\n")
+    print(
+        f"{'precisão':>9} {'poda':>5} {'pesos':>9} {'1 msg (µs)':>11} "
+        f"{'lote (µs)':>10} {'acurácia':>9} {'concorda':>9}"
+    )
+
+    for precisao, poda in CONFIGURACOES:
+        motor = carregar_motor(npz_path, precisao, poda)
+        previsto = motor.predict(X)
+
+        uma = medir(lambda: motor.forward(X[:1]), args.repeticoes)
+        lote = medir(lambda: motor.forward(X), args.repeticoes // 10)
+
+        print(
+            f"{precisao:>9} {poda:>5.2f} {motor.nbytes / 1024:>7.1f}KB {uma:>11.1f} "
+            f"{lote:>10.1f} {np.mean(previsto == y):>9.3f} {np.mean(previsto == referencia):>9.3f}"
+        )
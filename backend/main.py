@@ -1,11 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import funcionarios, auth, produto, clientes, agendamentos, chatbot
+from app.routes import (
+    funcionarios, auth, produto, clientes, agendamentos, chatbot, saude, rastreamento, metricas
+)
+from app import recursos
+from app.metricas import MiddlewareMetricas, encerrar_processo
+from app.database import fechar_conexao
+from app.paginacao import CABECALHO_CURSOR, CABECALHO_TOTAL
 from fastapi.openapi.utils import get_openapi
 
+
+# Ciclo de vida da API
+# Na inicialização aquece os recursos caros (modelo do chatbot, MongoDB, índices e Google Calendar)
+# conforme SENNACAR_AQUECIMENTO; no desligamento encerra o executor de inferência do chatbot
+# e fecha a conexão com o MongoDB; no modo multiprocesso, libera as métricas deste worker
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await recursos.aquecer()
+    yield
+    await chatbot.executor.encerrar()
+    fechar_conexao()
+    encerrar_processo()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Sennacar API",
     version="1.0.0",
     description="API do sistema de agendamentos e atendimento da Sennacar",
@@ -16,6 +39,8 @@ app = FastAPI(
         {"name": "Agendamentos", "description": "Gestão de agendamentos"},
         {"name": "Produtos", "description": "Catálogo de produtos"},
         {"name": "Chatbot", "description": "Endpoints para o assistente virtual"},
+        {"name": "Saúde", "description": "Verificações de disponibilidade da API"},
+        {"name": "Rastreamento", "description": "Tempo de cada etapa das requisições"},
     ],
 )
 
@@ -34,8 +59,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Session-Id", CABECALHO_CURSOR, CABECALHO_TOTAL],
 )
 
+# Conta e mede as requisições de todos os routers (exposto em /metrics, ver app/metricas.py)
+app.add_middleware(MiddlewareMetricas)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 app.include_router(funcionarios.router, prefix="/funcionarios", tags=["Funcionários"])
@@ -44,6 +73,9 @@ app.include_router(produto.router, prefix="/produtos", tags=["Produtos"])
 app.include_router(clientes.router, prefix="/clientes", tags=["Clientes"])
 app.include_router(agendamentos.router, prefix="/agendamentos", tags=["Agendamentos"])
 app.include_router(chatbot.router, prefix="/chatbot", tags=["Chatbot"])
+app.include_router(saude.router, prefix="/health", tags=["Saúde"])
+app.include_router(rastreamento.router, prefix="/rastreamento", tags=["Rastreamento"])
+app.include_router(metricas.router)
 
 
 def custom_openapi():
@@ -15,7 +15,7 @@ import {
   Dialog,
 } from "react-native-paper";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { router } from "expo-router";
 import {
   textInputPropsComLista,
@@ -86,11 +86,16 @@ export default function AdminAgendamentosScreen() {
     setLoading(true);
     try {
       if ((filtro === "cliente" || filtro === "produto") && itemSelecionado) {
-        const rota =
+        const data =
           filtro === "cliente"
-            ? `/agendamentos/agendamentos/cliente_id/${itemSelecionado._id}`
-            : `/agendamentos/agendamentos/produto_id/${itemSelecionado._id}`;
-        const { data } = await api.get(rota);
+            ? (
+                await api.get(
+                  `/agendamentos/agendamentos/cliente_id/${itemSelecionado._id}`
+                )
+              ).data
+            : await listarTodasPaginas(
+                `/agendamentos/agendamentos/produto_id/${itemSelecionado._id}`
+              );
         setAgendamentos(await formatarAgendamentos(data));
       } else if (filtro === "periodo") {
         if (!dataInicio || !dataFim) {
@@ -122,11 +127,13 @@ export default function AdminAgendamentosScreen() {
     setAgendamentos([]);
     setLoading(true);
     try {
-      const endpoint =
+      const data =
         filtro === "cliente"
-          ? `/agendamentos/agendamentos/cliente_id/${obj._id}`
-          : `/agendamentos/agendamentos/produto_id/${obj._id}`;
-      const { data } = await api.get(endpoint);
+          ? (await api.get(`/agendamentos/agendamentos/cliente_id/${obj._id}`))
+              .data
+          : await listarTodasPaginas(
+              `/agendamentos/agendamentos/produto_id/${obj._id}`
+            );
       setAgendamentos(await formatarAgendamentos(data));
     } catch (e) {
       setErro("Erro ao buscar agendamentos.");
@@ -15,7 +15,7 @@ import {
   Dialog,
 } from "react-native-paper";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import MechanicIcon from "../assets/icons/mechanic-grey.svg";
 import EmailIcon from "../assets/icons/email.svg";
 import SearchIcon from "../assets/icons/search-white.svg";
@@ -66,9 +66,7 @@ export default function AdminFuncionariosScreen() {
     setSugestoes([]);
     setLoading(true);
     try {
-      const { data } = await api.get("/funcionarios/funcionarios/", {
-        params: { [metodo]: valor },
-      });
+      const data = await listarTodasPaginas("/funcionarios/funcionarios/");
 
       const encontrado = Array.isArray(data)
         ? data.find((f: any) =>
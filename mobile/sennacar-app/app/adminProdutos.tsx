@@ -8,7 +8,7 @@ import {
 import { useRef, useState } from "react";
 import { Button, Text, TextInput, Portal, Dialog } from "react-native-paper";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { router } from "expo-router";
 import {
   textInputPropsComLista,
@@ -55,10 +55,12 @@ export default function AdminProdutosScreen() {
     setSugestoes([]);
     setLoading(true);
     try {
-      const { data } = await api.get("/produtos", {
-        params: { nome: valor },
-      });
-      setProduto(data);
+      const data = await listarTodasPaginas("/produtos/produtos/");
+      const encontrado = data.find(
+        (p: any) => p.nome.toLowerCase() === valor.trim().toLowerCase()
+      );
+      if (encontrado) setProduto(encontrado);
+      else setErro("Produto não encontrado.");
     } catch {
       setErro("Produto não encontrado.");
     } finally {
@@ -9,7 +9,7 @@ import { useEffect, useState, useMemo } from "react";
 import { Text, Button, Portal, Dialog } from "react-native-paper";
 import { useRouter } from "expo-router";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { Ionicons, Feather } from "@expo/vector-icons";
 import { format } from "date-fns";
 import ptBR from "date-fns/locale/pt-BR";
@@ -43,7 +43,7 @@ export default function ListaAgendamentosScreen() {
   const carregarAgendamentos = async () => {
     setLoading(true);
     try {
-      const { data } = await api.get("/agendamentos/agendamentos");
+      const data = await listarTodasPaginas("/agendamentos/agendamentos");
       const agsComDetalhes = await Promise.all(
         data.map(async (ag: any) => {
           let clienteNome = ag.cliente_id;
@@ -8,7 +8,7 @@ import {
 import { useState, useCallback } from "react";
 import { Text, Button, Portal, Dialog } from "react-native-paper";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { Ionicons } from "@expo/vector-icons";
 import { router, useFocusEffect } from "expo-router";
 
@@ -24,7 +24,7 @@ export default function ListaClientesScreen() {
   const carregarClientes = async () => {
     setLoading(true);
     try {
-      const { data } = await api.get("/clientes/clientes/todos");
+      const data = await listarTodasPaginas("/clientes/clientes/todos");
       setClientes(data);
     } catch (err) {
       console.error("Erro ao buscar clientes", err);
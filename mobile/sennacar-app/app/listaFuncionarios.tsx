@@ -8,7 +8,7 @@ import {
 import { useState, useCallback } from "react";
 import { Text, Button, Portal, Dialog } from "react-native-paper";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { Ionicons } from "@expo/vector-icons";
 import { router, useFocusEffect } from "expo-router";
 import { fontes } from "../styles/fontes";
@@ -26,7 +26,7 @@ export default function ListaFuncionariosScreen() {
   const carregarFuncionarios = async () => {
     setLoading(true);
     try {
-      const { data } = await api.get("/funcionarios/funcionarios/");
+      const data = await listarTodasPaginas("/funcionarios/funcionarios/");
       setFuncionarios(data);
     } catch (err) {
       console.error("Erro ao buscar funcionários", err);
@@ -9,7 +9,7 @@ import { useEffect, useState } from "react";
 import { Button, Text, Portal, Dialog } from "react-native-paper";
 import { useRouter } from "expo-router";
 import { TelaComFundo } from "../components/TelaComFundo";
-import { api } from "./services/api";
+import { api, listarTodasPaginas } from "./services/api";
 import { Ionicons, Feather } from "@expo/vector-icons";
 
 // Tela de listagem de produtos: permite visualizar, filtrar por categoria, editar e excluir produtos.
@@ -29,12 +29,11 @@ export default function ListaProdutosScreen() {
   const carregarProdutos = async () => {
     setLoading(true);
     try {
-      const rota =
+      const data =
         categoriaSelecionada === "Todas"
-          ? "/produtos/produtos/"
-          : `/produtos/produtos/categoria/${categoriaSelecionada}`;
-
-      const { data } = await api.get(rota);
+          ? await listarTodasPaginas("/produtos/produtos/")
+          : (await api.get(`/produtos/produtos/categoria/${categoriaSelecionada}`))
+              .data;
       setProdutos(data);
 
       if (categoriaSelecionada === "Todas") {
@@ -16,4 +16,24 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
-export { api };
+// Busca todas as páginas de uma listagem paginada da API (limite/apos), seguindo o cursor
+// devolvido no cabeçalho X-Proximo-Cursor até a última página
+const TAMANHO_PAGINA = 500;
+
+async function listarTodasPaginas<T = any>(
+  rota: string,
+  params: Record<string, any> = {}
+): Promise<T[]> {
+  const itens: T[] = [];
+  let apos: string | undefined;
+  do {
+    const { data, headers } = await api.get<T[]>(rota, {
+      params: { ...params, limite: TAMANHO_PAGINA, ...(apos ? { apos } : {}) },
+    });
+    itens.push(...data);
+    apos = headers["x-proximo-cursor"];
+  } while (apos);
+  return itens;
+}
+
+export { api, listarTodasPaginas };
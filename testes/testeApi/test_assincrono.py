@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import time
+
+from app.models.assincrono import ModeloAsync, executar
+from app.rastreamento import Rastreador
+
+
+def test_metodos_rodam_fora_do_event_loop_em_paralelo():
+    class Modelo:
+        @staticmethod
+        def buscar(valor):
+            time.sleep(0.05)
+            return valor, threading.current_thread().name
+
+    modelo = ModeloAsync(Modelo)
+
+    async def requisicoes():
+        loop = threading.current_thread().name
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(modelo.buscar(i) for i in range(8)))
+        return loop, resultados, time.perf_counter() - inicio
+
+    loop, resultados, duracao = asyncio.run(requisicoes())
+
+    assert [valor for valor, _ in resultados] == list(range(8))
+    assert all(thread != loop and thread.startswith("mongo") for _, thread in resultados)
+    assert duracao < 0.05 * 8 / 2
+    assert modelo.buscar is modelo.buscar
+
+
+def test_etapas_na_thread_entram_no_rastro_da_requisicao():
+    rastreador = Rastreador(ativo=True)
+
+    @rastreador.medir("db.teste.buscar")
+    def buscar():
+        return "documento"
+
+    async def requisicao():
+        with rastreador.rastrear("turno"):
+            return await executar(buscar)
+
+    assert asyncio.run(requisicao()) == "documento"
+    assert [e["nome"] for e in rastreador.recentes()[0]["etapas"]] == ["turno", "db.teste.buscar"]
@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.google import calendario
+
+
+class Requisicao:
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def execute(self):
+        return {"thread": self.cliente.thread, "cliente": id(self.cliente)}
+
+
+class Eventos:
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def insert(self, calendarId, body):
+        assert threading.get_ident() == self.cliente.thread
+        return Requisicao(self.cliente)
+
+
+class ClienteFalso:
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.thread = threading.get_ident()
+
+    def events(self):
+        return Eventos(self)
+
+
+def test_cada_thread_usa_o_proprio_cliente_com_as_mesmas_credenciais(monkeypatch):
+    credenciais = object()
+    clientes = []
+
+    def construir(nome, versao, credentials):
+        cliente = ClienteFalso(credentials)
+        clientes.append(cliente)
+        return cliente
+
+    monkeypatch.setattr(calendario.GoogleCalendarService, "_authenticate", lambda self: credenciais)
+    monkeypatch.setattr(calendario, "build", construir)
+    servico = calendario.GoogleCalendarService()
+    barreira = threading.Barrier(4)
+
+    def criar(_):
+        barreira.wait()
+        dados = {"summary": "Revisão", "start_time": datetime(2030, 1, 1, 9), "end_time": datetime(2030, 1, 1, 10)}
+        primeiro = servico.create_event(dados)
+        segundo = servico.create_event(dados)
+        assert primeiro == segundo
+        return primeiro
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        resultados = list(pool.map(criar, range(4)))
+
+    assert len(clientes) == 4
+    assert len({r["cliente"] for r in resultados}) == 4
+    assert all(cliente.credentials is credenciais for cliente in clientes)
@@ -0,0 +1,126 @@
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.auth.auth_utils import verificar_admin
+from app.consultas_lentas import PerfilComandos, formato_comando, resumir_plano
+from main import app
+
+_ids = iter(range(1, 10**6))
+
+
+# Envia ao perfil os eventos de início e de conclusão de um comando, como o pymongo faria
+def executar(perfil, comando, duracao_ms, resposta=None):
+    nome = next(iter(comando))
+    evento = SimpleNamespace(
+        command=comando,
+        command_name=nome,
+        connection_id=("localhost", 27017),
+        request_id=next(_ids),
+        database_name="sennacar_db",
+    )
+    perfil.started(evento)
+    perfil.succeeded(
+        SimpleNamespace(**vars(evento), duration_micros=int(duracao_ms * 1000), reply=resposta or {"ok": 1})
+    )
+
+
+def test_formato_ignora_os_valores():
+    regex = {"find": "clientes", "filter": {"nome": {"$regex": ".*ana.*", "$options": "i"}}}
+    assert formato_comando("find", regex) == '{"nome": {"$regex": "?", "$options": "?"}}'
+
+    periodo = {
+        "find": "agendamentos",
+        "filter": {"$or": [{"status": "pendente"}, {"data_agendada": {"$gte": 1, "$lte": 2}}]},
+        "sort": {"data_agendada": 1},
+    }
+    assert formato_comando("find", periodo) == (
+        '{"$or": [{"status": "?"}, {"data_agendada": {"$gte": "?", "$lte": "?"}}]} '
+        'sort={"data_agendada": 1}'
+    )
+
+    total = {"aggregate": "produtos", "pipeline": [{"$match": {"_id": {"$in": [1, 2]}}}, {"$group": {}}]}
+    assert formato_comando("aggregate", total) == '$match {"_id": {"$in": "?"}} | $group'
+
+
+def test_agrupa_por_formato_e_guarda_as_lentas():
+    perfil = PerfilComandos(limite_ms=50, explicar=False)
+    for nome, duracao in [("ana", 10), ("bruno", 80), ("carla", 30)]:
+        executar(
+            perfil,
+            {"find": "clientes", "filter": {"nome": {"$regex": nome}}},
+            duracao,
+            {"cursor": {"firstBatch": [{}, {}], "id": 0}},
+        )
+    executar(perfil, {"find": "clientes", "filter": {"telefone": "1199"}}, 1)
+    executar(perfil, {"ping": 1}, 500)
+
+    formatos = perfil.mais_lentos()
+    assert [f["formato"] for f in formatos] == ['{"nome": {"$regex": "?"}}', '{"telefone": "?"}']
+    assert formatos[0]["n"] == 3
+    assert formatos[0]["total_ms"] == 120
+    assert formatos[0]["max_ms"] == 80
+    assert formatos[0]["documentos_media"] == 2
+    assert [(l["duracao_ms"], l["documentos"]) for l in perfil.recentes()] == [(80, 2)]
+    assert perfil._pendentes == {}
+
+
+def test_limite_de_formatos_descarta_o_de_menor_tempo_total():
+    perfil = PerfilComandos(explicar=False, max_formatos=2)
+    executar(perfil, {"find": "produtos", "filter": {"nome": 1}}, 5)
+    executar(perfil, {"find": "produtos", "filter": {"categoria": 1}}, 1)
+    executar(perfil, {"find": "produtos", "filter": {"preco": 1}}, 3)
+
+    assert {f["formato"] for f in perfil.mais_lentos()} == {'{"nome": "?"}', '{"preco": "?"}'}
+
+
+def test_explica_uma_vez_cada_formato_lento():
+    chamadas = []
+
+    def explicador(banco, comando):
+        chamadas.append((banco, comando))
+        return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+    perfil = PerfilComandos(limite_ms=10, explicar=True, explicador=explicador)
+    comando = {"find": "agendamentos", "filter": {"produtos": "abc"}, "lsid": {"id": 1}, "$db": "sennacar_db"}
+    executar(perfil, comando, 50)
+    executar(perfil, comando, 60)
+    executar(perfil, {"insert": "agendamentos", "documents": [{}]}, 70)
+
+    prazo = time.time() + 2
+    while perfil.mais_lentos(ordem="max_ms")[1]["plano"] is None and time.time() < prazo:
+        time.sleep(0.01)
+
+    formato = [f for f in perfil.mais_lentos() if f["operacao"] == "find"][0]
+    assert formato["plano"] == "COLLSCAN"
+    assert chamadas == [("sennacar_db", {"find": "agendamentos", "filter": {"produtos": "abc"}})]
+
+
+def test_resumir_plano():
+    explicacao = {
+        "queryPlanner": {
+            "winningPlan": {
+                "stage": "FETCH",
+                "inputStage": {"stage": "IXSCAN", "indexName": "cliente_id_1_data_agendada_1"},
+            }
+        }
+    }
+    assert resumir_plano(explicacao) == "FETCH > IXSCAN(cliente_id_1_data_agendada_1)"
+
+    agregacao = {"stages": [{"$cursor": {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}}]}
+    assert resumir_plano(agregacao) == "COLLSCAN"
+
+
+def test_endpoint_de_consultas_lentas():
+    client = TestClient(app)
+    assert client.get("/rastreamento/mongo").status_code == 401
+
+    app.dependency_overrides[verificar_admin] = lambda: {"is_admin": True}
+    try:
+        resposta = client.get("/rastreamento/mongo", params={"ordem": "max_ms"})
+        assert resposta.status_code == 200
+        assert {"formatos", "lentas", "limite_lento_ms"} <= set(resposta.json())
+        assert client.get("/rastreamento/mongo", params={"ordem": "nome"}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo import MongoClient, monitoring
+
+from app import database
+from app.auth.auth_utils import verificar_admin
+from app.consultas_lentas import resumir_plano
+from app.indices import ERRO, INDICES, PRONTO, GerenciadorIndices, Indice
+from app.repositorios.mongo import AgendamentosMongo
+from main import app
+
+
+def declarar():
+    return [
+        Indice("clientes", [("telefone", 1)], unique=True),
+        Indice("agendamentos", [("cliente_id", 1), ("data_agendada", -1)]),
+    ]
+
+
+def test_cria_apenas_os_indices_que_faltam():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["teste"]
+    db["clientes"].create_index([("telefone", 1)], name="telefone_1", unique=True)
+
+    gerenciador = GerenciadorIndices(declarar(), lambda: db)
+    resumo = gerenciador.criar()
+
+    assert resumo["pronto"] is True
+    assert [(i["nome"], i["criado"]) for i in resumo["indices"]] == [
+        ("telefone_1", False),
+        ("cliente_id_1_data_agendada_-1", True),
+    ]
+    assert "cliente_id_1_data_agendada_-1" in db["agendamentos"].index_information()
+
+    # Um segundo worker apenas confere os índices já criados
+    segundo = GerenciadorIndices(declarar(), lambda: db).criar()
+    assert not any(i["criado"] for i in segundo["indices"])
+
+
+def test_indice_com_definicao_diferente_fica_com_erro():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["teste"]
+    db["clientes"].create_index([("telefone", 1)], name="telefone_1")
+
+    gerenciador = GerenciadorIndices(declarar(), lambda: db)
+    with pytest.raises(RuntimeError, match="clientes.telefone_1"):
+        gerenciador.criar()
+
+    status = {i["nome"]: i["status"] for i in gerenciador.resumo()["indices"]}
+    assert status == {"telefone_1": ERRO, "cliente_id_1_data_agendada_-1": PRONTO}
+    assert gerenciador.resumo()["pronto"] is False
+
+
+def test_configuracao_do_cliente(monkeypatch):
+    monkeypatch.setattr(database, "MONGO_POOL_MAX", 8)
+    monkeypatch.setattr(database, "MONGO_SOCKET_TIMEOUT_MS", 0)
+    monkeypatch.setattr(database, "MONGO_WRITE_CONCERN", "majority")
+
+    opcoes = database.configuracao_cliente()
+    assert opcoes["maxPoolSize"] == 8
+    assert opcoes["socketTimeoutMS"] is None
+    assert opcoes["w"] == "majority"
+
+    monkeypatch.setattr(database, "MONGO_WRITE_CONCERN", "1")
+    assert database.configuracao_cliente()["w"] == 1
+
+
+def test_status_dos_indices_exige_admin():
+    client = TestClient(app)
+    assert client.get("/health/indices").status_code == 401
+
+    app.dependency_overrides[verificar_admin] = lambda: {"is_admin": True}
+    try:
+        resumo = client.get("/health/indices").json()
+    finally:
+        app.dependency_overrides.clear()
+    assert {i["nome"] for i in resumo["indices"]} >= {"email_1", "telefone_1", "data_agendada_1"}
+
+
+# Comandos find enviados ao servidor, para rodar o explain() exatamente da consulta que o repositório faz
+class CapturaFind(monitoring.CommandListener):
+    def __init__(self):
+        self.comandos = []
+
+    def started(self, event):
+        if event.command_name == "find":
+            campos = ("find", "filter", "sort", "limit", "projection")
+            self.comandos.append({k: event.command[k] for k in campos if k in event.command})
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Cada formato de consulta de agendamentos usa o índice esperado, sem COLLSCAN e sem SORT em memória
+# Requer um MongoDB de verdade (MONGO_URI); o mongomock não implementa explain()
+def test_consultas_de_agendamentos_usam_os_indices():
+    captura = CapturaFind()
+    cliente = MongoClient(database.MONGO_URI, serverSelectionTimeoutMS=500, event_listeners=[captura])
+    try:
+        cliente.admin.command("ping")
+    except Exception:
+        pytest.skip("MongoDB não disponível em " + database.MONGO_URI)
+
+    db = cliente["sennacar_teste_indices"]
+    cliente.drop_database(db.name)
+    try:
+        indices = [i for i in INDICES if i.colecao == "agendamentos"]
+        GerenciadorIndices([Indice(i.colecao, i.chaves, i.unique) for i in indices], lambda: db).criar()
+
+        inicio = datetime(2030, 1, 1, 8, 0)
+        db["agendamentos"].insert_many(
+            {
+                "cliente_id": f"c{i % 20}",
+                "data_agendada": inicio + timedelta(hours=i),
+                "produtos": [f"p{i % 7}", f"p{i % 11}"],
+                "status": ["pendente", "confirmado", "cancelado", "concluido"][i % 4],
+            }
+            for i in range(400)
+        )
+        agendamentos = AgendamentosMongo(lambda: db["agendamentos"])
+        fim = inicio + timedelta(days=5)
+
+        esperados = [
+            (lambda: agendamentos.listar_por_cliente("c3"), {"cliente_id_1_data_agendada_1"}),
+            (lambda: agendamentos.listar_por_periodo(inicio, fim, "pendente"), {"status_1_data_agendada_1"}),
+            (lambda: agendamentos.listar_por_periodo(inicio, fim), {"data_agendada_1"}),
+            (
+                lambda: agendamentos.buscar_ativo_no_horario(inicio),
+                {"data_agendada_1", "status_1_data_agendada_1"},
+            ),
+            (lambda: agendamentos.listar_por_produto("p3", 10), {"produtos_1_data_agendada_1"}),
+            (lambda: agendamentos.listar_por_produto("p3", 10, fim), {"produtos_1_data_agendada_1"}),
+            (lambda: agendamentos.listar_pagina_por_data(10, fim), {"data_agendada_1"}),
+        ]
+        for consulta, nomes in esperados:
+            captura.comandos.clear()
+            consulta()
+            plano = resumir_plano(
+                db.command({"explain": captura.comandos[0], "verbosity": "queryPlanner"})
+            )
+            assert "COLLSCAN" not in plano and "SORT" not in plano, plano
+            assert any(f"IXSCAN({nome})" in plano for nome in nomes), plano
+    finally:
+        cliente.drop_database(db.name)
+        cliente.close()
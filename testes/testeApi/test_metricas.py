@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.metricas import MetricasMongo, duracao_mongo, falhas_mongo
+from main import app
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "..", "backend")
+
+
+def valor(texto, serie):
+    for linha in texto.splitlines():
+        if linha.startswith(serie + " "):
+            return float(linha.split()[-1])
+    return 0.0
+
+
+def test_requisicoes_por_modelo_de_rota_e_status():
+    client = TestClient(app)
+    serie_live = 'sennacar_http_requisicoes_total{metodo="GET",rota="/health/live",status="200"}'
+    serie_ativar = (
+        'sennacar_http_requisicoes_total'
+        '{metodo="POST",rota="/chatbot/modelos/{versao}/ativar",status="401"}'
+    )
+    serie_404 = 'sennacar_http_requisicoes_total{metodo="GET",rota="desconhecida",status="404"}'
+    antes = client.get("/metrics").text
+
+    client.get("/health/live")
+    client.get("/health/live")
+    client.post("/chatbot/modelos/v1/ativar")
+    client.get("/nao-existe/123")
+
+    resposta = client.get("/metrics")
+    assert resposta.headers["content-type"].startswith("text/plain")
+    depois = resposta.text
+    assert valor(depois, serie_live) - valor(antes, serie_live) == 2
+    assert valor(depois, serie_ativar) - valor(antes, serie_ativar) == 1
+    assert valor(depois, serie_404) - valor(antes, serie_404) == 1
+    assert "sennacar_http_requisicoes_em_andamento" in depois
+
+
+def test_listener_mede_comandos_por_colecao():
+    listener = MetricasMongo()
+    amostras = duracao_mongo.labels("produtos", "find")._sum
+    antes = amostras.get()
+
+    inicio = SimpleNamespace(
+        command={"find": "produtos", "filter": {}}, command_name="find", connection_id=1, request_id=7
+    )
+    listener.started(inicio)
+    listener.succeeded(SimpleNamespace(**vars(inicio), duration_micros=2500))
+
+    listener.started(SimpleNamespace(**{**vars(inicio), "request_id": 8}))
+    falhas = falhas_mongo.labels("produtos", "find")._value.get()
+    listener.failed(SimpleNamespace(**{**vars(inicio), "request_id": 8}, duration_micros=500))
+
+    assert amostras.get() - antes == 0.003
+    assert falhas_mongo.labels("produtos", "find")._value.get() == falhas + 1
+    assert listener._colecoes == {}
+
+
+# No modo multiprocesso, /metrics soma os valores gravados por todos os workers
+def test_modo_multiprocesso_soma_os_workers(tmp_path):
+    ambiente = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = "from app.metricas import intents_chatbot; intents_chatbot.labels('saudacao').inc()"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], cwd=BACKEND, env=ambiente, check=True)
+
+    leitor = "from app import metricas; print(metricas.gerar()[0].decode())"
+    saida = subprocess.run(
+        [sys.executable, "-c", leitor], cwd=BACKEND, env=ambiente, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    assert valor(saida, 'sennacar_chatbot_intents_total{intent="saudacao"}') == 2
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.auth.auth_utils import verificar_admin
+from app.rastreamento import Histograma, Rastreador
+from main import app
+
+
+def test_desativado_nao_registra_nada():
+    rastreador = Rastreador(ativo=False)
+
+    @rastreador.medir("soma")
+    def somar(a, b):
+        return a + b
+
+    with rastreador.rastrear("turno"), rastreador.etapa("etapa"):
+        assert somar(1, 2) == 3
+
+    assert rastreador.etapa("x") is rastreador.rastrear("y")
+    assert not rastreador.rastros and not rastreador.histogramas
+
+
+def test_rastro_com_tempo_proprio_das_etapas():
+    rastreador = Rastreador(ativo=True)
+
+    @rastreador.medir_metodos("db.teste")
+    class Modelo:
+        @staticmethod
+        def buscar():
+            time.sleep(0.02)
+            return "documento"
+
+        def _interno(self):
+            return None
+
+    @rastreador.medir("handler")
+    def handler():
+        time.sleep(0.01)
+        return Modelo.buscar()
+
+    with rastreador.rastrear("turno"):
+        assert handler() == "documento"
+
+    with rastreador.etapa("fora_do_rastro"):
+        pass
+
+    assert len(rastreador.rastros) == 1
+    rastro = rastreador.recentes()[0]
+    etapas = {e["nome"]: e for e in rastro["etapas"]}
+
+    assert [e["nome"] for e in rastro["etapas"]] == ["turno", "handler", "db.teste.buscar"]
+    assert etapas["db.teste.buscar"]["nivel"] == 2
+    assert etapas["handler"]["duracao_ms"] >= 30
+    assert 10 <= etapas["handler"]["proprio_ms"] < etapas["handler"]["duracao_ms"] - 15
+    assert Modelo._interno.__name__ == "_interno"
+    assert set(rastreador.resumo_histogramas()) == {
+        "turno", "handler", "db.teste.buscar", "fora_do_rastro"
+    }
+
+
+def test_tarefa_que_sobrevive_a_requisicao_nao_altera_o_rastro_encerrado():
+    rastreador = Rastreador(ativo=True)
+
+    async def tarefa():
+        await asyncio.sleep(0.01)
+        with rastreador.etapa("depois"):
+            pass
+
+    async def requisicao():
+        with rastreador.rastrear("turno"):
+            pendente = asyncio.get_running_loop().create_task(tarefa())
+        await pendente
+
+    asyncio.run(requisicao())
+
+    assert [e["nome"] for e in rastreador.recentes()[0]["etapas"]] == ["turno"]
+    assert rastreador.histogramas["depois"].n == 1
+
+
+def test_histograma_percentis():
+    histograma = Histograma(limites=(1, 5, 10))
+    for ms in [0.5] * 90 + [4] * 9 + [50]:
+        histograma.registrar(ms)
+
+    resumo = histograma.resumo()
+    assert (resumo["p50_ms"], resumo["p95_ms"], resumo["p99_ms"]) == (1, 5, 5)
+    assert histograma.percentil(100) == 50
+    assert resumo["intervalos"] == {"<=1": 90, "<=5": 9, "+inf": 1}
+
+
+def test_endpoints_exigem_admin_e_ligam_o_rastreamento():
+    client = TestClient(app)
+    assert client.get("/rastreamento/rastros").status_code == 401
+
+    app.dependency_overrides[verificar_admin] = lambda: {"is_admin": True}
+    try:
+        assert client.post("/rastreamento/ativar").json() == {"ativo": True}
+        assert client.get("/rastreamento/").json()["ativo"] is True
+        assert isinstance(client.get("/rastreamento/histogramas").json(), dict)
+        assert client.post("/rastreamento/desativar").json() == {"ativo": False}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,346 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError
+
+from app import repositorios
+from app.auth.auth_utils import get_current_user
+from app.google import calendario
+from app.indices import INDICES, GerenciadorIndices, Indice
+from app.models.agendamento import Agendamento
+from app.models.cliente import Cliente
+from app.models.produto import Produto
+from app.repositorios.base import RepositorioClientes
+from app.repositorios.mongo import (
+    AgendamentosMongo,
+    ClientesMongo,
+    FuncionariosMongo,
+    ProdutosMongo,
+    RepositoriosMongo,
+)
+from main import app
+
+
+# Repositórios do MongoDB sobre um banco do mongomock, com os mesmos índices da aplicação
+def repositorios_mongo():
+    mongomock = pytest.importorskip("mongomock")
+    db = mongomock.MongoClient()["teste"]
+    GerenciadorIndices([Indice(i.colecao, i.chaves, i.unique) for i in INDICES], lambda: db).criar()
+
+    conjunto = RepositoriosMongo()
+    conjunto.clientes = ClientesMongo(lambda: db["clientes"])
+    conjunto.produtos = ProdutosMongo(lambda: db["produtos"])
+    conjunto.agendamentos = AgendamentosMongo(lambda: db["agendamentos"])
+    conjunto.funcionarios = FuncionariosMongo(lambda: db["funcionarios"])
+    return conjunto
+
+
+# As duas implementações passam pelos mesmos testes
+@pytest.fixture(params=["memoria", "mongo"])
+def repos(request, monkeypatch):
+    conjunto = repositorios.criar("memoria") if request.param == "memoria" else repositorios_mongo()
+    monkeypatch.setattr(repositorios, "_atual", conjunto)
+    return conjunto
+
+
+def test_clientes_indices_e_buscas(repos):
+    clientes = repos.clientes
+    ana = clientes.inserir({"nome": "Ana Souza", "email": "ana@x.com", "telefone": "1199"})
+    clientes.inserir({"nome": "Mariana", "email": "mari@x.com", "telefone": "1188"})
+
+    with pytest.raises(DuplicateKeyError):
+        clientes.inserir({"nome": "Outra", "email": "o@x.com", "telefone": "1199"})
+
+    assert clientes.buscar_por_email_ou_telefone("nao@x.com", "1188")["nome"] == "Mariana"
+    assert [c["nome"] for c in clientes.buscar_por_trecho("nome", "ANA")] == ["Ana Souza", "Mariana"]
+    assert len(clientes.buscar_por_trecho("nome", "ana", limite=1)) == 1
+
+    assert clientes.atualizar(ana, {"telefone": "1199"}) is False
+    assert clientes.atualizar(ana, {"telefone": "1177"}) is True
+    assert clientes.buscar_por_telefone("1199") is None
+    assert clientes.buscar_por_telefone("1177")["_id"] == clientes.buscar_por_id(ana)["_id"]
+
+    assert clientes.deletar(ana) is True
+    assert clientes.deletar(ana) is False
+    assert len(clientes.listar_todos()) == 1
+
+
+def test_produtos_ordenados_e_soma(repos):
+    produtos = repos.produtos
+    som = produtos.inserir({"nome": "Som", "preco": 400.0, "preco_mao_obra": 80.0, "categoria": "som"})
+    produtos.inserir({"nome": "Alarme", "preco": 300.0, "preco_mao_obra": 50.0, "categoria": "som"})
+    g5 = produtos.inserir(
+        {"nome": "Insulfilm", "preco": 250.0, "preco_mao_obra": 100.0, "descricao": "Película G5"}
+    )
+
+    assert [p["nome"] for p in produtos.listar_por_categoria("som")] == ["Alarme", "Som"]
+    catalogo = produtos.listar_todos(campos=["nome", "preco"])
+    assert [p["nome"] for p in catalogo] == ["Alarme", "Insulfilm", "Som"]
+    assert set(catalogo[0]) == {"_id", "nome", "preco"}
+
+    assert produtos.somar_precos([som, g5, som]) == 830.0
+    assert produtos.somar_precos([]) == 0.0
+    assert produtos.descricoes_com_trecho("película") == ["Película G5"]
+
+
+def test_agendamentos_por_periodo_cliente_e_horario(repos):
+    agendamentos = repos.agendamentos
+    inicio = datetime(2030, 1, 7, 9, 0)
+    for i, status in enumerate(["pendente", "confirmado", "cancelado", "pendente"]):
+        agendamentos.inserir(
+            {
+                "cliente_id": "c1" if i % 2 == 0 else "c2",
+                "data_agendada": inicio + timedelta(hours=i),
+                "produtos": [],
+                "status": status,
+            }
+        )
+
+    with pytest.raises(DuplicateKeyError):
+        agendamentos.inserir({"cliente_id": "c3", "data_agendada": inicio, "status": "pendente"})
+
+    periodo = agendamentos.listar_por_periodo(inicio + timedelta(hours=1), inicio + timedelta(hours=3))
+    assert [a["data_agendada"].hour for a in periodo] == [10, 11, 12]
+    pendentes = agendamentos.listar_por_periodo(inicio, inicio + timedelta(days=1), "pendente")
+    assert [a["data_agendada"].hour for a in pendentes] == [9, 12]
+
+    assert [a["data_agendada"].hour for a in agendamentos.listar_por_cliente("c1")] == [11, 9]
+    assert agendamentos.buscar_ativo_no_horario(inicio + timedelta(hours=1))["cliente_id"] == "c2"
+    assert agendamentos.buscar_ativo_no_horario(inicio + timedelta(hours=2)) is None
+
+
+def test_funcionarios_sem_administradores(repos):
+    funcionarios = repos.funcionarios
+    funcionarios.inserir({"nome": "Admin", "email": "admin@x.com", "isAdmin": True})
+    funcionarios.inserir({"nome": "Adriana", "email": "adri@x.com", "isAdmin": False})
+
+    assert [f["nome"] for f in funcionarios.listar_nao_administradores()] == ["Adriana"]
+    assert [f["nome"] for f in funcionarios.buscar_por_trecho("nome", "ad")] == ["Adriana"]
+    assert funcionarios.buscar_por_email("admin@x.com")["isAdmin"] is True
+
+
+def test_fluxo_de_agendamento_pelos_modelos(repos, monkeypatch):
+    eventos = []
+    monkeypatch.setattr(
+        calendario,
+        "_servico",
+        SimpleNamespace(create_event=lambda evento: eventos.append(evento) or {"id": "evento-1"}),
+    )
+
+    cliente_id = Cliente("Ana", "ana@x.com", "1199").cadastrar_cliente()
+    assert Cliente("Ana", "ana@x.com", "1199").cadastrar_cliente() is None
+
+    insulfilm = Produto("Insulfilm G5", 250, 100, "insulfilm").cadastrar_produto()
+    som = Produto("Som JBL", 450, 80, "som").cadastrar_produto()
+
+    horario = datetime(2030, 1, 7, 14, 0)
+    agendamento_id = Agendamento(cliente_id, horario, [insulfilm, som]).criar_agendamento()
+    assert agendamento_id is not None
+    assert Agendamento(cliente_id, horario, [som]).criar_agendamento() is None
+
+    agendamento = Agendamento.buscar_por_id(agendamento_id)
+    assert agendamento["valor_total"] == 880.0
+    assert agendamento["google_event_id"] == "evento-1"
+    assert eventos[0]["summary"] == "Agendamento - Ana"
+
+    assert Agendamento.atualizar_produtos(agendamento_id, [insulfilm]) is True
+    assert Agendamento.buscar_por_id(agendamento_id)["valor_total"] == 350.0
+    assert Agendamento.atualizar_status(agendamento_id, "confirmado") is True
+    assert [a["status"] for a in Agendamento.buscar_por_cliente(cliente_id)] == ["confirmado"]
+    assert Agendamento.buscar_por_id("id-invalido") is None
+
+
+def test_agendamentos_por_produto_paginados(repos):
+    agendamentos = repos.agendamentos
+    inicio = datetime(2030, 1, 7, 9, 0)
+    for i in range(7):
+        agendamentos.inserir(
+            {
+                "cliente_id": "c1",
+                "data_agendada": inicio + timedelta(hours=i),
+                "produtos": ["p1", "p2"] if i % 2 == 0 else ["p2"],
+                "status": "pendente",
+            }
+        )
+
+    primeira = agendamentos.listar_por_produto("p1", 3)
+    assert [a["data_agendada"].hour for a in primeira] == [15, 13, 11]
+    segunda = agendamentos.listar_por_produto("p1", 3, apos=primeira[-1]["data_agendada"])
+    assert [a["data_agendada"].hour for a in segunda] == [9]
+    assert len(agendamentos.listar_por_produto("p2", 10)) == 7
+    assert agendamentos.listar_por_produto("p3", 10) == []
+
+
+def test_rota_de_agendamentos_por_produto_com_cursor(monkeypatch):
+    monkeypatch.setattr(repositorios, "_atual", repositorios.criar("memoria"))
+    inicio = datetime(2030, 1, 7, 9, 0)
+    for i in range(5):
+        repositorios.agendamentos().inserir(
+            {
+                "cliente_id": "c1",
+                "data_agendada": inicio + timedelta(hours=i),
+                "produtos": ["p1"],
+                "status": "pendente",
+                "observacoes": "",
+                "valor_total": 0.0,
+            }
+        )
+
+    client = TestClient(app)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "teste@x.com"}
+    try:
+        paginas, apos = [], None
+        while True:
+            params = {"limite": 2, **({"apos": apos} if apos else {})}
+            resposta = client.get("/agendamentos/agendamentos/produto_id/p1", params=params)
+            assert resposta.status_code == 200
+            paginas.append([datetime.fromisoformat(a["data_agendada"]).hour for a in resposta.json()])
+            apos = resposta.headers.get("X-Proximo-Cursor")
+            if apos is None:
+                break
+        todos = client.get("/agendamentos/agendamentos/produto_id/p1", params={"limite": 2, "todos": True})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert paginas == [[13, 12], [11, 10], [9]]
+    assert len(todos.json()) == 5 and "X-Proximo-Cursor" not in todos.headers
+
+
+def test_listagens_paginadas_por_id_com_projecao_e_contagem(repos):
+    funcionarios = repos.funcionarios
+    for i in range(7):
+        funcionarios.inserir(
+            {"nome": f"F{i}", "email": f"f{i}@x.com", "senha": b"hash", "isAdmin": i == 3}
+        )
+
+    nomes, apos = [], None
+    while True:
+        pagina = funcionarios.listar_pagina(2, apos, ["nome", "email"], {"isAdmin": False})
+        if not pagina:
+            break
+        assert all(set(f) == {"_id", "nome", "email"} for f in pagina)
+        nomes.append([f["nome"] for f in pagina])
+        apos = str(pagina[-1]["_id"])
+
+    assert nomes == [["F0", "F1"], ["F2", "F4"], ["F5", "F6"]]
+    assert funcionarios.contar() == 7
+    assert funcionarios.contar({"isAdmin": False}) == 6
+    assert "senha" in funcionarios.listar_pagina(1)[0]
+
+
+def test_produtos_paginados_por_nome(repos):
+    produtos = repos.produtos
+    for nome in ["Som", "Alarme", "Película", "Alarme", "Insulfilm"]:
+        produtos.inserir({"nome": nome, "preco": 100.0, "preco_mao_obra": 10.0})
+
+    paginas, apos = [], None
+    while True:
+        pagina = produtos.listar_pagina_por_nome(2, apos, ["nome"])
+        if not pagina:
+            break
+        paginas.append([p["nome"] for p in pagina])
+        apos = (pagina[-1]["nome"], str(pagina[-1]["_id"]))
+
+    assert paginas == [["Alarme", "Alarme"], ["Insulfilm", "Película"], ["Som"]]
+
+
+def test_agendamentos_com_datas_com_e_sem_fuso(repos):
+    agendamentos = repos.agendamentos
+    brasilia = timezone(timedelta(hours=-3))
+    # A rota grava datas sem fuso (UTC) e o chatbot grava datas com fuso
+    agendamentos.inserir({"cliente_id": "c1", "data_agendada": datetime(2030, 1, 7, 12, 0), "status": "pendente"})
+    agendamentos.inserir(
+        {"cliente_id": "c2", "data_agendada": datetime(2030, 1, 7, 10, 0, tzinfo=brasilia), "status": "pendente"}
+    )
+
+    assert agendamentos.buscar_por_id(agendamentos.listar_por_cliente("c2")[0]["_id"])["data_agendada"] == datetime(
+        2030, 1, 7, 13, 0
+    )
+    periodo = agendamentos.listar_por_periodo(
+        datetime(2030, 1, 7, 8, 0, tzinfo=brasilia), datetime(2030, 1, 7, 10, 0, tzinfo=brasilia)
+    )
+    assert [a["cliente_id"] for a in periodo] == ["c1", "c2"]
+    assert agendamentos.buscar_ativo_no_horario(datetime(2030, 1, 7, 9, 0, tzinfo=brasilia))["cliente_id"] == "c1"
+    assert agendamentos.buscar_ativo_no_horario(datetime(2030, 1, 7, 13, 0))["cliente_id"] == "c2"
+    pagina = agendamentos.listar_pagina_por_data(5, datetime(2030, 1, 7, 10, 0, tzinfo=brasilia))
+    assert [a["cliente_id"] for a in pagina] == ["c1"]
+
+
+def test_agendamentos_paginados_por_data(repos):
+    agendamentos = repos.agendamentos
+    inicio = datetime(2030, 1, 7, 9, 0)
+    for i in [2, 0, 4, 1, 3]:
+        agendamentos.inserir(
+            {"cliente_id": "c1", "data_agendada": inicio + timedelta(hours=i), "status": "pendente"}
+        )
+
+    primeira = agendamentos.listar_pagina_por_data(3, campos=["data_agendada"])
+    assert [a["data_agendada"].hour for a in primeira] == [13, 12, 11]
+    assert set(primeira[0]) == {"_id", "data_agendada"}
+    segunda = agendamentos.listar_pagina_por_data(3, primeira[-1]["data_agendada"])
+    assert [a["data_agendada"].hour for a in segunda] == [10, 9]
+    assert agendamentos.contar() == 5
+
+
+def test_rotas_de_listagem_paginadas(monkeypatch):
+    monkeypatch.setattr(repositorios, "_atual", repositorios.criar("memoria"))
+    for i in range(5):
+        repositorios.clientes().inserir(
+            {"nome": f"C{i}", "email": f"c{i}@x.com", "telefone": f"11{i}", "criado_em": datetime(2030, 1, 1)}
+        )
+
+    client = TestClient(app)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "teste@x.com"}
+    try:
+        primeira = client.get("/clientes/clientes/todos", params={"limite": 3, "total": True})
+        segunda = client.get(
+            "/clientes/clientes/todos", params={"limite": 3, "apos": primeira.headers["X-Proximo-Cursor"]}
+        )
+        todos = client.get("/clientes/clientes/todos", params={"todos": True})
+        invalido = client.get("/clientes/clientes/todos", params={"apos": "nao-e-um-id"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [c["nome"] for c in primeira.json()] == ["C0", "C1", "C2"]
+    assert primeira.headers["X-Total-Count"] == "5"
+    assert [c["nome"] for c in segunda.json()] == ["C3", "C4"]
+    assert "X-Proximo-Cursor" not in segunda.headers
+    assert "X-Total-Count" not in segunda.headers
+    assert len(todos.json()) == 5 and "X-Proximo-Cursor" not in todos.headers
+    assert invalido.status_code == 400
+
+
+def test_rota_de_produtos_paginada_em_ordem_alfabetica(monkeypatch):
+    monkeypatch.setattr(repositorios, "_atual", repositorios.criar("memoria"))
+    for nome in ["Som", "Película", "Alarme", "Insulfilm", "Alarme"]:
+        repositorios.produtos().inserir({"nome": nome, "preco": 100.0, "preco_mao_obra": 10.0})
+
+    client = TestClient(app)
+    app.dependency_overrides[get_current_user] = lambda: {"email": "teste@x.com"}
+    try:
+        nomes, apos = [], None
+        while True:
+            params = {"limite": 2, **({"apos": apos} if apos else {})}
+            resposta = client.get("/produtos/produtos/", params=params)
+            nomes += [p["nome"] for p in resposta.json()]
+            apos = resposta.headers.get("X-Proximo-Cursor")
+            if apos is None:
+                break
+        todos = client.get("/produtos/produtos/", params={"todos": True})
+        invalido = client.get("/produtos/produtos/", params={"apos": "nao-e-um-cursor"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert nomes == ["Alarme", "Alarme", "Insulfilm", "Película", "Som"]
+    assert [p["nome"] for p in todos.json()] == nomes
+    assert invalido.status_code == 400
+
+
+def test_repositorio_incompleto_falha_ao_ser_instanciado():
+    class ClientesIncompleto(ClientesMongo):
+        buscar_por_telefone = RepositorioClientes.buscar_por_telefone
+
+    with pytest.raises(TypeError, match="buscar_por_telefone"):
+        ClientesIncompleto(lambda: None)
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from app import recursos
+from main import app
+
+
+def test_app_importa_sem_carregar_recursos():
+    assert all(r.status == recursos.PENDENTE for r in recursos.recursos.values())
+
+
+def test_live_e_ready_antes_do_aquecimento():
+    client = TestClient(app)
+
+    assert client.get("/health/live").json() == {"status": "ok"}
+
+    resposta = client.get("/health/ready")
+    assert resposta.status_code == 503
+    assert {"mongo", "indices", "chatbot", "calendario"} <= set(resposta.json()["recursos"])
+
+
+def test_recurso_carrega_uma_vez_e_registra_erro():
+    chamadas = []
+
+    def carregar():
+        chamadas.append(1)
+        return "valor"
+
+    recurso = recursos.Recurso("teste", carregar)
+    assert recurso.obter() == "valor"
+    assert recurso.obter() == "valor"
+    assert len(chamadas) == 1
+
+    def falhar():
+        raise RuntimeError("indisponível")
+
+    com_erro = recursos.Recurso("falha", falhar)
+    try:
+        com_erro.obter()
+    except RuntimeError:
+        pass
+    assert com_erro.resumo()["status"] == recursos.ERRO
+    assert com_erro.resumo()["erro"] == "indisponível"
@@ -1,4 +1,4 @@
-from app.chatbot.chatbot_assistant import ChatbotAssistant
+from app.chatbot.chatbot import ChatbotAssistant
 
 def test_bag_of_words():
     assistant = ChatbotAssistant("fake_path.json")
@@ -1,14 +1,15 @@
-from app.chatbot.chatbot_assistant import ChatbotAssistant
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.sessoes import CONFIRMANDO_DADOS, ConversationState
 
 def test_dados_do_cliente_validos():
-    assistant = ChatbotAssistant("fake_path.json")
-    assistant.function_mappings = {"cadastrar_cliente": lambda self: True}
-    assistant.client_data_temp = {
+    assistant = ChatbotAssistant("fake_path.json", function_mappings={"cadastrar_cliente": lambda estado: True})
+    estado = ConversationState()
+    estado.client_data_temp = {
         "nome": "João",
         "email": "joao@email.com",
         "telefone": "+55 11999999999"
     }
-    assistant.awaiting_confirmation = True
+    estado.etapa = CONFIRMANDO_DADOS
 
-    resposta = assistant.process_message("dados corretos")
-    assert "✅ Dados confirmados" in resposta
+    resposta = assistant.process_message("dados corretos", estado)
+    assert "✅ Dados confirmados" in resposta["response"]
@@ -0,0 +1,24 @@
+from app.chatbot.cache import CacheIntencoes
+
+
+def test_cache_conta_acertos_e_descarta_menos_usado():
+    cache = CacheIntencoes(tamanho=2)
+    cache.guardar("agendar", "agendar_produto")
+    cache.guardar("ver servico", "produtos_populares")
+
+    assert cache.obter("agendar") == "agendar_produto"
+    cache.guardar("tirar duvida", "duvida")
+
+    assert cache.obter("ver servico") is None
+    assert cache.obter("tirar duvida") == "duvida"
+    assert cache.estatisticas()["hits"] == 2
+    assert cache.estatisticas()["misses"] == 1
+
+
+def test_limpar_invalida_predicoes():
+    cache = CacheIntencoes()
+    cache.guardar("agendar", "agendar_produto")
+    cache.limpar()
+
+    assert cache.obter("agendar") is None
+    assert len(cache) == 0
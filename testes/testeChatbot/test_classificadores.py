@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from app.chatbot.classificadores import (
+    BACKENDS,
+    Classificador,
+    ClassificadorCentroide,
+    ClassificadorLinear,
+    ClassificadorMLP,
+    carregar_classificador,
+    tipo_do_arquivo,
+)
+from app.chatbot.inferencia import MotorInt8
+
+
+# Três intents, cada uma ativando um grupo diferente de palavras do vocabulário
+@pytest.fixture
+def dados():
+    rng = np.random.default_rng(0)
+    y = np.repeat(np.arange(3), 20)
+    X = (rng.random((60, 30)) < 0.05).astype(np.float32)
+    for classe in range(3):
+        X[y == classe, classe * 10 : classe * 10 + 4] = 1
+    return X, y
+
+
+@pytest.mark.parametrize("classe", [ClassificadorLinear, ClassificadorCentroide])
+def test_treina_e_classifica(classe, dados, tmp_path):
+    X, y = dados
+    classificador = classe().fit(X, y, 3)
+
+    probs = classificador.predict_proba(X)
+    assert probs.shape == (60, 3)
+    assert np.allclose(probs.sum(axis=1), 1, atol=1e-5)
+    assert np.mean(classificador.predict(X) == y) > 0.95
+
+    npz_path = str(tmp_path / "classificador.npz")
+    classificador.save(npz_path)
+    carregado = carregar_classificador(npz_path)
+
+    assert type(carregado) is classe
+    assert (carregado.input_size, carregado.output_size) == (30, 3)
+    assert np.allclose(carregado.forward(X), classificador.forward(X))
+
+
+def test_npz_sem_tipo_e_carregado_como_mlp(tmp_path):
+    rng = np.random.default_rng(0)
+    npz_path = str(tmp_path / "chatbot_model.npz")
+    np.savez(
+        npz_path,
+        **{
+            "fc1.weight": rng.normal(size=(8, 30)).astype(np.float32),
+            "fc1.bias": np.zeros(8, np.float32),
+            "fc2.weight": rng.normal(size=(4, 8)).astype(np.float32),
+            "fc2.bias": np.zeros(4, np.float32),
+            "fc3.weight": rng.normal(size=(3, 4)).astype(np.float32),
+            "fc3.bias": np.zeros(3, np.float32),
+        },
+    )
+
+    classificador = carregar_classificador(npz_path)
+    assert type(classificador) is ClassificadorMLP
+    assert (classificador.input_size, classificador.output_size) == (30, 3)
+
+    resalvo = str(tmp_path / "resalvo.npz")
+    classificador.save(resalvo)
+    assert type(carregar_classificador(resalvo)) is ClassificadorMLP
+
+    quantizado = carregar_classificador(npz_path, precisao="int8")
+    assert type(quantizado.motor) is MotorInt8
+    with pytest.raises(ValueError):
+        quantizado.save(resalvo)
+
+
+def test_tipo_desconhecido(tmp_path):
+    npz_path = str(tmp_path / "outro.npz")
+    np.savez(npz_path, tipo=np.array("svm"))
+
+    assert "svm" not in BACKENDS
+    with np.load(npz_path) as npz:
+        assert tipo_do_arquivo(npz) == "svm"
+    with pytest.raises(ValueError):
+        carregar_classificador(npz_path)
+
+
+def test_classificador_incompleto_falha_ao_ser_instanciado():
+    class SemArrays(Classificador):
+        def fit(self, X, y, n_classes):
+            return self
+
+        def forward(self, X):
+            return X
+
+    with pytest.raises(TypeError):
+        SemArrays()
+
+
+def test_mlp_treinado_atualiza_dimensoes(dados):
+    pytest.importorskip("torch")
+    X, y = dados
+
+    classificador = ClassificadorMLP(epocas=5).fit(X, y, 3)
+
+    assert (classificador.input_size, classificador.output_size) == (30, 3)
+    assert classificador.epocas == 5
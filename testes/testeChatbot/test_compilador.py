@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.compilador import IntentsCompilados, caminho_artefato, carregar_intents
+
+INTENTS = {
+    "intents": [
+        {"tag": "saudacoes", "patterns": ["Olá", "bom dia"], "responses": ["Oi!"]},
+        {"tag": "pagamento", "patterns": ["aceita pix?", "cartões"], "responses": ["Sim"]},
+    ]
+}
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    caminho = tmp_path / "intents.json"
+    caminho.write_text(json.dumps(INTENTS), encoding="utf-8")
+    return str(caminho)
+
+
+def test_artefato_e_reaproveitado_enquanto_o_arquivo_nao_muda(intents_path, monkeypatch):
+    primeiro = carregar_intents(intents_path)
+    assert primeiro.vocabulary == ["aceita", "bom", "cartao", "dia", "ola", "pix"]
+    assert primeiro.dimensoes == {"input_size": 6, "output_size": 2}
+
+    def nao_compilar(*args):
+        raise AssertionError("artefato deveria ter sido reaproveitado")
+
+    monkeypatch.setattr(IntentsCompilados, "compilar", nao_compilar)
+    segundo = carregar_intents(intents_path)
+
+    assert isinstance(segundo.X, np.memmap)
+    np.testing.assert_array_equal(segundo.X, primeiro.X)
+    assert segundo.exact_patterns == {
+        "ola": "saudacoes",
+        "bom dia": "saudacoes",
+        "aceita pix": "pagamento",
+        "cartoes": "pagamento",
+    }
+
+
+def test_artefato_e_recompilado_quando_o_arquivo_muda(intents_path):
+    carregar_intents(intents_path)
+
+    dados = json.loads(open(intents_path, encoding="utf-8").read())
+    dados["intents"][0]["patterns"].append("boa noite")
+    with open(intents_path, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+
+    compilados = carregar_intents(intents_path)
+    assert "noite" in compilados.vocabulary
+    assert IntentsCompilados.carregar(caminho_artefato(intents_path)).intents_hash == (
+        compilados.intents_hash
+    )
+
+
+def test_modelo_com_dimensoes_diferentes_e_rejeitado_no_carregamento(intents_path, tmp_path):
+    dimensions_path = tmp_path / "dimensions.json"
+    dimensions_path.write_text(json.dumps({"input_size": 5, "output_size": 2}))
+
+    assistant = ChatbotAssistant(intents_path)
+    assistant.parse_intents()
+
+    with pytest.raises(ValueError, match="outro intents.json"):
+        assistant.load_model(str(tmp_path / "chatbot_model.pth"), str(dimensions_path))
+
+
+def test_matriz_que_nao_corresponde_ao_meta_e_recompilada(intents_path):
+    diretorio = caminho_artefato(intents_path)
+    carregar_intents(intents_path)
+    assert not [nome for nome in os.listdir(diretorio) if nome.endswith(".tmp")]
+
+    # X.npy de outra compilação, gravado depois do meta.json atual
+    np.save(os.path.join(diretorio, "X.npy"), np.zeros((1, 3), dtype=np.float32))
+    with pytest.raises(ValueError, match="não correspondem"):
+        IntentsCompilados.carregar(diretorio)
+
+    compilados = carregar_intents(intents_path)
+    assert compilados.X.shape == (4, 6)
+    assert IntentsCompilados.carregar(diretorio).X.shape == (4, 6)
@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(__file__), "..", "..", "backend")
+
+
+# O replay altera globais da aplicação (banco, calendário, métodos medidos e variáveis de ambiente),
+# então roda em outro processo
+def replay(tmp_path, orcamento):
+    caminho = tmp_path / "orcamento.json"
+    caminho.write_text(json.dumps(orcamento), encoding="utf-8")
+    return subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.conversas",
+            "--repeticoes", "1", "--aquecimento", "0",
+            "--orcamento", str(caminho), "--json", str(tmp_path / "resumo.json"),
+        ],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        timeout=300,
+        env={**os.environ, "CHATBOT_REGISTRO": str(tmp_path / "registro")},
+    )
+
+
+def test_replay_dentro_e_fora_do_orcamento(tmp_path):
+    folgado = replay(tmp_path, {"turno": {"p95": 10000}, "etapas": {"db": {"p95": 10000}}})
+    assert folgado.returncode == 0, folgado.stdout[-2000:] + folgado.stderr[-2000:]
+
+    resumo = json.loads((tmp_path / "resumo.json").read_text(encoding="utf-8"))
+    assert resumo["erros"] == []
+    assert resumo["etapas"]["classify"]["n"] > 0
+    assert resumo["etapas"]["calendar"]["n"] > 0
+
+    apertado = replay(tmp_path, {"turno": {"p50": 0.0001}})
+    assert apertado.returncode == 1
+    assert "ORÇAMENTO EXCEDIDO turno p50" in apertado.stdout
+
@@ -0,0 +1,150 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot import entidades as modulo_entidades
+from app.chatbot.entidades import CatalogoProdutos, ExtratorEntidades
+from app.chatbot.fluxo import CLASSIFICAR
+from app.chatbot.sessoes import CONFIRMANDO_AGENDAMENTO, ConversationState
+
+PRODUTOS = [
+    {"_id": "1", "nome": "Insulfilm G5", "preco": 100.0, "categoria": "insulfilm"},
+    {"_id": "2", "nome": "Insulfilm G20", "preco": 120.0, "categoria": "insulfilm"},
+    {"_id": "3", "nome": "Central Multimídia Pioneer", "preco": 900.0, "categoria": "multimidia"},
+]
+
+# Quarta-feira
+HOJE = date(2025, 6, 11)
+
+
+@pytest.fixture
+def catalogo():
+    return CatalogoProdutos(carregar=lambda: PRODUTOS).atualizar()
+
+
+@pytest.fixture
+def extrator(catalogo):
+    return ExtratorEntidades(catalogo)
+
+
+def test_extrai_produto_data_e_hora(extrator):
+    entidades = extrator.extrair("quero insulfilm G5 sábado 9h", HOJE)
+
+    assert entidades.produtos == [PRODUTOS[0]]
+    assert entidades.categoria == "insulfilm"
+    assert entidades.data == date(2025, 6, 14)
+    assert entidades.hora == "09:00"
+    assert entidades.compra
+
+
+def test_trecho_unico_identifica_produto(extrator):
+    assert extrator.extrair("pioneer e g20", HOJE).produtos == [PRODUTOS[2], PRODUTOS[1]]
+    assert extrator.extrair("quanto custa insulfilm?", HOJE).produtos == []
+
+
+@pytest.mark.parametrize(
+    "mensagem, data, hora",
+    [
+        ("dia 20/06/2025 14:30", date(2025, 6, 20), "14:30"),
+        ("pode ser 05/01 às 10", date(2026, 1, 5), "10:00"),
+        ("amanhã 8h30", date(2025, 6, 12), "08:30"),
+        ("depois de amanhã", date(2025, 6, 13), None),
+        ("na quarta-feira", date(2025, 6, 18), None),
+        ("hoje 25h", HOJE, None),
+    ],
+)
+def test_datas_e_horarios(extrator, mensagem, data, hora):
+    entidades = extrator.extrair(mensagem, HOJE)
+    assert (entidades.data, entidades.hora) == (data, hora)
+
+
+def test_datas_relativas_usam_o_fuso_da_loja(extrator, monkeypatch):
+    # 01:00 UTC de quinta = 22:00 de quarta em São Paulo
+    class Relogio(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            agora = datetime(2025, 6, 12, 1, 0, tzinfo=timezone.utc)
+            return agora.astimezone(tz) if tz else agora.replace(tzinfo=None)
+
+    monkeypatch.setattr(modulo_entidades, "datetime", Relogio)
+
+    assert extrator.extrair("amanhã 8h").data == date(2025, 6, 12)
+
+
+def test_email_e_telefone(extrator):
+    entidades = extrator.extrair("meu email é joao.silva@email.com e tel (11) 99999-8888", HOJE)
+
+    assert entidades.email == "joao.silva@email.com"
+    assert entidades.telefone == "(11) 99999-8888"
+    assert entidades.data is None
+
+
+@pytest.fixture
+def assistant(catalogo):
+    confirmacoes = []
+
+    def fake_confirmar(estado, mensagem):
+        confirmacoes.append(mensagem)
+        estado.etapa = CONFIRMANDO_AGENDAMENTO
+        return {"response": "Confirme o agendamento"}
+
+    mappings = {
+        "iniciar_agendamento": lambda estado: (
+            {"response": "Selecione a data", "calendar": True}
+            if estado.client_data.get("nome")
+            else {"response": "Para agendar, preciso dos seus dados.", "form": True}
+        ),
+        "confirmar_agendamento": fake_confirmar,
+        "cadastrar_cliente": lambda estado: True,
+        "horarios_disponiveis": lambda data: ["08:00", "09:00"],
+    }
+    bot = ChatbotAssistant("inexistente.json", function_mappings=mappings, catalogo=catalogo)
+    bot.confirmacoes = confirmacoes
+    return bot
+
+
+def test_pedido_completo_vai_direto_para_confirmacao(assistant):
+    estado = ConversationState()
+    estado.client_data = {"nome": "João", "email": "joao@email.com", "telefone": "11999999999"}
+
+    resposta = assistant.process_message("quero insulfilm G5 sábado 9h", estado)
+
+    assert resposta["response"].startswith("✅ Adicionado: Insulfilm G5")
+    assert estado.etapa == CONFIRMANDO_AGENDAMENTO
+    assert [item.id for item in estado.selected_products] == ["1"]
+    assert assistant.confirmacoes[0].startswith("calendar|")
+    assert assistant.confirmacoes[0].endswith("|09:00")
+
+
+def test_sem_dados_do_cliente_pede_formulario_e_usa_a_data_depois(assistant):
+    estado = ConversationState()
+
+    resposta = assistant.process_message("quero o G20 amanhã às 8, tel 11 98888-7777", estado)
+    assert resposta["form"]
+    assert resposta["form_data"]["telefone"] == "11 98888-7777"
+    assert estado.data_sugerida is not None
+
+    assistant.process_message('{"nome": "Ana", "email": "ana@email.com", "telefone": "11988887777"}', estado)
+    assistant.process_message("Dados corretos", estado)
+
+    assert estado.etapa == CONFIRMANDO_AGENDAMENTO
+    assert assistant.confirmacoes[0].endswith("|08:00")
+    assert estado.data_sugerida is None
+
+
+def test_duvida_sobre_produto_continua_no_modelo(assistant):
+    estado = ConversationState()
+
+    assert assistant.fluxo.resolver(estado, "o G5 escurece muito?") is CLASSIFICAR
+    assert estado.selected_products == []
+
+
+def test_catalogo_carrega_apenas_os_campos_usados(monkeypatch):
+    from app.models.produto import Produto
+
+    chamadas = []
+    monkeypatch.setattr(Produto, "listar_todos", lambda campos=None: chamadas.append(campos) or PRODUTOS)
+
+    assert CatalogoProdutos().atualizar().produtos == PRODUTOS
+    assert chamadas == [list(modulo_entidades.CAMPOS_CATALOGO)]
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.chatbot.executor import ExecutorInferencia, FilaCheia
+from app.chatbot.inferencia import Predicao
+
+
+class AssistantFalso:
+    def __init__(self, liberar=None):
+        self.lotes = []
+        self.liberar = liberar
+
+    def predict_intents(self, mensagens):
+        if self.liberar is not None:
+            self.liberar.wait(5)
+        self.lotes.append(list(mensagens))
+        return [Predicao(m.upper(), 1.0, None) for m in mensagens]
+
+
+def test_requisicoes_simultaneas_formam_um_lote():
+    assistant = AssistantFalso()
+    executor = ExecutorInferencia(lambda: assistant, max_lote=16, espera_ms=50)
+
+    async def cenario():
+        return await asyncio.gather(*(executor.classificar(f"m{i}") for i in range(10)))
+
+    predicoes = asyncio.run(cenario())
+
+    assert [p.intent for p in predicoes] == [f"M{i}" for i in range(10)]
+    assert len(assistant.lotes) == 1
+    assert executor.metricas()["tamanho_medio_lote"] == 10
+
+
+def test_lote_respeita_tamanho_maximo():
+    assistant = AssistantFalso()
+    executor = ExecutorInferencia(lambda: assistant, max_lote=4, espera_ms=50)
+
+    async def cenario():
+        await asyncio.gather(*(executor.classificar(f"m{i}") for i in range(10)))
+
+    asyncio.run(cenario())
+
+    assert [len(lote) for lote in assistant.lotes] == [4, 4, 2]
+    assert executor.metricas()["lotes"] == 3
+
+
+def test_fila_cheia_recusa_novas_mensagens():
+    liberar = threading.Event()
+    assistant = AssistantFalso(liberar)
+    executor = ExecutorInferencia(lambda: assistant, max_lote=1, espera_ms=0, max_fila=1)
+
+    async def cenario():
+        primeira = asyncio.ensure_future(executor.classificar("a"))
+        await asyncio.sleep(0.05)
+        segunda = asyncio.ensure_future(executor.classificar("b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(FilaCheia):
+            await executor.classificar("c")
+
+        liberar.set()
+        await asyncio.gather(primeira, segunda)
+        await executor.encerrar()
+
+    asyncio.run(cenario())
+
+    assert executor.metricas()["rejeitadas"] == 1
+
+
+def test_erro_no_modelo_e_propagado():
+    class AssistantQuebrado:
+        def predict_intents(self, mensagens):
+            raise ValueError("sem modelo")
+
+    executor = ExecutorInferencia(lambda: AssistantQuebrado())
+
+    async def cenario():
+        with pytest.raises(ValueError):
+            await executor.classificar("oi")
+
+    asyncio.run(cenario())
+    assert executor.metricas()["erros"] == 1
+
+
+def test_mensagens_sao_classificadas_pelo_assistente_de_cada_requisicao():
+    antigo, novo = AssistantFalso(), AssistantFalso()
+    executor = ExecutorInferencia(lambda: novo, max_lote=16, espera_ms=50)
+
+    async def cenario():
+        return await asyncio.gather(
+            executor.classificar("a", antigo),
+            executor.classificar("b"),
+            executor.classificar("c", antigo),
+        )
+
+    predicoes = asyncio.run(cenario())
+
+    assert [p.intent for p in predicoes] == ["A", "B", "C"]
+    assert antigo.lotes == [["a", "c"]]
+    assert novo.lotes == [["b"]]
+    assert executor.metricas()["lotes"] == 1
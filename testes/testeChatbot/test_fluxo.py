@@ -0,0 +1,139 @@
+import pytest
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.fluxo import CLASSIFICAR, FluxoConversa
+from app.chatbot.sessoes import (
+    AGENDANDO,
+    CONFIRMANDO_DADOS,
+    INICIO,
+    SELECIONANDO_PRODUTO,
+    ConversationState,
+    ItemCarrinho,
+)
+
+PRODUTOS = [
+    {"_id": "1", "nome": "G5", "preco": 100.0, "preco_mao_obra": 50.0},
+    {"_id": "2", "nome": "G20", "preco": 120.0},
+]
+
+
+def fake_listar(estado):
+    estado.produtos_temp = {p["nome"]: ItemCarrinho.de_documento(p) for p in PRODUTOS}
+    estado.etapa = SELECIONANDO_PRODUTO
+    return {"response": "lista", "options": ["Quero comprar"]}
+
+
+def fake_iniciar(estado):
+    return {"response": "Selecione a data", "calendar": True}
+
+
+@pytest.fixture
+def assistant():
+    mappings = {
+        "listar_produtos": fake_listar,
+        "cadastrar_cliente": lambda estado: True,
+        "iniciar_agendamento": fake_iniciar,
+    }
+    bot = ChatbotAssistant("inexistente.json", function_mappings=mappings)
+    bot.intents_responses = {"saudacoes": ["Olá! Como posso te ajudar?"]}
+    bot.exact_patterns = {"ola": "saudacoes"}
+    bot.fluxo = FluxoConversa(bot)
+    return bot
+
+
+@pytest.fixture
+def estado():
+    return ConversationState()
+
+
+def test_padrao_exato_responde_sem_modelo(assistant, estado):
+    resposta = assistant.process_message("Olá!", estado)
+
+    assert resposta["response"] == "Olá! Como posso te ajudar?"
+    assert resposta["options"] == ["Agendar", "Ver serviços", "Tirar dúvida"]
+
+
+def test_texto_livre_vai_para_o_modelo(assistant, estado):
+    assert assistant.fluxo.resolver(estado, "qual o horário de vocês") is CLASSIFICAR
+
+
+def test_selecao_de_produto_pelo_nome(assistant, estado):
+    assistant.process_message("Insulfilm", estado)
+    assert estado.etapa == SELECIONANDO_PRODUTO
+
+    resposta = assistant.process_message("G20", estado)
+
+    assert "Produto adicionado" in resposta["response"]
+    assert estado.selected_products == [ItemCarrinho("2", "G20", 120.0)]
+
+
+def test_dados_com_acento_e_confirmacao_abrem_calendario(assistant, estado):
+    estado.selected_products = [ItemCarrinho.de_documento(PRODUTOS[0])]
+
+    resposta = assistant.process_message("João Silva, joao@email.com, 11999999999", estado)
+    assert "confirme seus dados" in resposta
+    assert estado.etapa == CONFIRMANDO_DADOS
+
+    lembrete = assistant.process_message("talvez", estado)
+    assert "dados corretos" in lembrete
+
+    resposta = assistant.process_message("Dados corretos", estado)
+    assert resposta["response"].startswith("✅ Dados confirmados!")
+    assert estado.client_data["nome"] == "João Silva"
+    assert estado.etapa == AGENDANDO
+
+
+def test_confirmacao_sem_produtos_pede_escolha_com_opcoes(assistant, estado):
+    assistant.fluxo.iniciar = lambda estado: {
+        "response": "Nenhum produto selecionado.",
+        "options": ["Ver serviços", "Tirar dúvida"],
+    }
+    assistant.process_message("João Silva, joao@email.com, 11999999999", estado)
+
+    resposta = assistant.process_message("Dados corretos", estado)
+
+    assert resposta["response"] == "✅ Dados confirmados!\n\nNenhum produto selecionado."
+    assert resposta["options"] == ["Ver serviços", "Tirar dúvida"]
+    assert estado.client_data["nome"] == "João Silva"
+    assert estado.etapa == INICIO
+
+
+def test_falha_no_cadastro_mantem_dados_para_nova_tentativa(assistant, estado):
+    estado.selected_products = [ItemCarrinho.de_documento(PRODUTOS[0])]
+    assistant.fluxo.cadastrar_cliente = lambda estado: False
+    assistant.process_message("João Silva, joao@email.com, 11999999999", estado)
+
+    resposta = assistant.process_message("Dados corretos", estado)
+
+    assert resposta["response"].startswith("❌")
+    assert resposta["options"] == ["Dados corretos", "Dados incorretos"]
+    assert estado.etapa == CONFIRMANDO_DADOS
+    assert estado.client_data_temp["nome"] == "João Silva"
+    assert not estado.client_data.get("nome")
+
+    assistant.fluxo.cadastrar_cliente = lambda estado: True
+    resposta = assistant.process_message("Dados corretos", estado)
+    assert resposta["response"].startswith("✅ Dados confirmados!")
+    assert estado.etapa == AGENDANDO
+
+
+def test_formulario_json(assistant, estado):
+    resposta = assistant.process_message(
+        '{"nome": "Ana", "email": "ana@email.com", "telefone": "11988887777"}', estado
+    )
+
+    assert resposta["options"] == ["Dados corretos", "Dados incorretos"]
+    assert estado.client_data_temp["nome"] == "Ana"
+    assert estado.etapa == CONFIRMANDO_DADOS
+
+
+def test_cancelar_tudo_em_qualquer_etapa(assistant, estado):
+    assistant.process_message("Insulfilm", estado)
+    assistant.process_message("G5", estado)
+
+    resposta = assistant.process_message("Cancelar tudo", estado)
+
+    assert resposta["response"] == "Operação cancelada. Como posso ajudar?"
+    assert estado.etapa == INICIO
+    assert estado.selected_products == []
+    assert estado.produtos_temp is None
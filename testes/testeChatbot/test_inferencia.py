@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.chatbot.modelo import ChatbotModel
+from app.chatbot.inferencia import MotorNumpy, exportar_pesos
+
+
+@pytest.fixture
+def modelo():
+    torch.manual_seed(0)
+    modelo = ChatbotModel(120, 16)
+    modelo.eval()
+    return modelo
+
+
+@pytest.fixture
+def entradas():
+    rng = np.random.default_rng(0)
+    return (rng.random((64, 120)) < 0.05).astype(np.float32)
+
+
+def test_motor_numpy_reproduz_logits_do_torch(modelo, entradas):
+    with torch.no_grad():
+        esperado = modelo(torch.from_numpy(entradas)).numpy()
+
+    motor = MotorNumpy.from_state_dict(modelo.state_dict())
+
+    np.testing.assert_allclose(motor.forward(entradas), esperado, rtol=1e-5, atol=1e-5)
+    assert (motor.predict(entradas) == esperado.argmax(axis=1)).all()
+
+
+def test_exportacao_npz_preserva_pesos(modelo, entradas, tmp_path):
+    model_path = tmp_path / "chatbot_model.pth"
+    torch.save(modelo.state_dict(), model_path)
+
+    npz_path = exportar_pesos(str(model_path))
+    motor = MotorNumpy.carregar(npz_path)
+
+    with torch.no_grad():
+        esperado = modelo(torch.from_numpy(entradas)).numpy()
+
+    assert (motor.input_size, motor.output_size) == (120, 16)
+    np.testing.assert_allclose(motor.forward(entradas), esperado, rtol=1e-5, atol=1e-5)
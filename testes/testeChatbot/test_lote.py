@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.inferencia import MotorNumpy
+
+
+@pytest.fixture
+def assistant():
+    bot = ChatbotAssistant("inexistente.json")
+    bot.vocabulary = ["agendar", "endereco", "insulfilm", "ola", "pix", "preco"]
+    bot.intents = ["saudacoes", "agendar_produto", "pagamento", "informacoes_sobre_loja"]
+
+    rng = np.random.default_rng(0)
+    bot.engine = MotorNumpy(
+        {
+            "fc1.weight": rng.normal(size=(8, 6)),
+            "fc1.bias": rng.normal(size=8),
+            "fc2.weight": rng.normal(size=(8, 8)),
+            "fc2.bias": rng.normal(size=8),
+            "fc3.weight": rng.normal(size=(4, 8)),
+            "fc3.bias": rng.normal(size=4),
+        }
+    )
+    return bot
+
+
+MENSAGENS = ["Olá", "quero agendar", "aceita pix?", "qual o endereço", "preço do insulfilm"]
+
+
+def test_lote_coincide_com_predicao_individual(assistant):
+    resultados = assistant.predict_batch(MENSAGENS, top_k=2)
+
+    for mensagem, resultado in zip(MENSAGENS, resultados):
+        individual = assistant.predict_intent(mensagem)
+        assert resultado.intent == individual.intent
+        assert resultado.confianca == pytest.approx(individual.confianca, rel=1e-5)
+
+
+def test_top_k_ordenado_por_confianca(assistant):
+    resultado = assistant.predict_batch(["quero agendar"], top_k=10)[0]
+
+    confiancas = [p for _, p in resultado.top_k]
+    assert len(resultado.top_k) == len(assistant.intents)
+    assert confiancas == sorted(confiancas, reverse=True)
+    assert resultado.top_k[0] == (resultado.intent, resultado.confianca)
+    assert sum(confiancas) == pytest.approx(1.0, rel=1e-5)
+
+
+def test_lote_nao_altera_o_cache_por_padrao(assistant):
+    assistant.predict_batch(MENSAGENS)
+    assert len(assistant.cache) == 0
+
+    assistant.predict_batch(MENSAGENS, aquecer_cache=True)
+    assert len(assistant.cache) == len(MENSAGENS)
+    assert assistant.predict_intent("Olá").intent == assistant.predict_batch(["Olá"])[0].intent
+    assert assistant.cache.hits == 1
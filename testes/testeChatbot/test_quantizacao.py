@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.chatbot.inferencia import MotorInt8, MotorNumpy, carregar_motor, podar
+
+
+@pytest.fixture
+def arrays():
+    rng = np.random.default_rng(0)
+    return {
+        "fc1.weight": rng.normal(size=(32, 50)).astype(np.float32),
+        "fc1.bias": rng.normal(size=32).astype(np.float32),
+        "fc2.weight": rng.normal(size=(16, 32)).astype(np.float32),
+        "fc2.bias": rng.normal(size=16).astype(np.float32),
+        "fc3.weight": rng.normal(size=(6, 16)).astype(np.float32),
+        "fc3.bias": rng.normal(size=6).astype(np.float32),
+    }
+
+
+@pytest.fixture
+def entradas():
+    rng = np.random.default_rng(1)
+    return (rng.random((200, 50)) < 0.1).astype(np.float32)
+
+
+def test_int8_aproxima_o_modelo_float(arrays, entradas):
+    referencia = MotorNumpy(arrays)
+    quantizado = MotorInt8(arrays)
+
+    esperado = referencia.forward(entradas)
+    obtido = quantizado.forward(entradas)
+
+    assert quantizado.nbytes < referencia.nbytes / 3
+    assert np.abs(obtido - esperado).max() < 0.05 * np.abs(esperado).max()
+    assert np.mean(quantizado.predict(entradas) == referencia.predict(entradas)) > 0.95
+
+
+def test_poda_remove_neuronios_ocultos(arrays, entradas):
+    podados = podar(arrays, 0.5)
+
+    assert podados["fc1.weight"].shape == (16, 50)
+    assert podados["fc2.weight"].shape == (8, 16)
+    assert podados["fc3.weight"].shape == (6, 8)
+    assert MotorNumpy(podados).forward(entradas).shape == (200, 6)
+    assert podar(arrays, 0) is arrays
+
+
+def test_carregar_motor_escolhe_a_precisao(arrays, tmp_path):
+    npz_path = tmp_path / "modelo.npz"
+    np.savez(npz_path, **arrays)
+
+    assert type(carregar_motor(str(npz_path), "float32", 0)) is MotorNumpy
+    assert type(carregar_motor(str(npz_path), "int8", 0)) is MotorInt8
+    with pytest.raises(ValueError):
+        carregar_motor(str(npz_path), "int4", 0)
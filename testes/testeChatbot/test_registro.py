@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.compilador import IntentsCompilados
+from app.chatbot.registro import AtualizadorModelo, RegistroModelos, VersaoInvalida, _escrever_atomico
+from app.recursos import Recurso
+
+INTENTS = {
+    "intents": [
+        {"tag": "saudacoes", "patterns": ["olá", "bom dia"], "responses": ["Oi!"]},
+        {"tag": "pagamento", "patterns": ["aceita pix"], "responses": ["Sim"]},
+    ]
+}
+
+
+# Grava um intents.json, pesos aleatórios compatíveis e o dimensions.json em tmp_path
+def criar_modelo(tmp_path, nome, input_size=None):
+    intents_path = tmp_path / f"{nome}.json"
+    intents_path.write_text(json.dumps(INTENTS), encoding="utf-8")
+    dimensoes = IntentsCompilados.compilar(str(intents_path)).dimensoes
+    input_size = input_size or dimensoes["input_size"]
+
+    rng = np.random.default_rng(0)
+    model_path = tmp_path / f"{nome}.npz"
+    np.savez(
+        model_path,
+        **{
+            "fc1.weight": rng.normal(size=(8, input_size)).astype(np.float32),
+            "fc1.bias": np.zeros(8, np.float32),
+            "fc2.weight": rng.normal(size=(4, 8)).astype(np.float32),
+            "fc2.bias": np.zeros(4, np.float32),
+            "fc3.weight": rng.normal(size=(2, 4)).astype(np.float32),
+            "fc3.bias": np.zeros(2, np.float32),
+        },
+    )
+    dimensions_path = tmp_path / f"{nome}_dimensions.json"
+    dimensions_path.write_text(
+        json.dumps({"input_size": input_size, "output_size": dimensoes["output_size"]})
+    )
+    return str(intents_path), str(model_path), str(dimensions_path)
+
+
+@pytest.fixture
+def registro(tmp_path):
+    return RegistroModelos(str(tmp_path / "registro"))
+
+
+@pytest.fixture
+def atualizador(registro):
+    def carregar_versao(versao):
+        caminhos = registro.caminhos(versao)
+        assistant = ChatbotAssistant(caminhos["intents_path"])
+        assistant.parse_intents()
+        assistant.load_model(caminhos["model_path"], caminhos["dimensions_path"])
+        assistant.versao = versao
+        return assistant
+
+    recurso = Recurso("chatbot", lambda: carregar_versao(registro.versao_ativa()))
+    return AtualizadorModelo(registro, recurso, carregar_versao, intervalo=0)
+
+
+def test_ativacao_e_rollback(registro, tmp_path):
+    arquivos = criar_modelo(tmp_path, "modelo")
+    v1 = registro.publicar(*arquivos, versao="v1", metricas={"acuracia_validacao": 0.9})
+    v2 = registro.publicar(*arquivos, versao="v2")
+
+    registro.ativar(v1)
+    registro.ativar(v2)
+    assert registro.versao_ativa() == "v2"
+    assert registro.metricas("v1")["acuracia_validacao"] == 0.9
+
+    assert registro.reverter() == "v1"
+    assert registro.versao_ativa() == "v1"
+    assert [v["versao"] for v in registro.listar() if v["ativa"]] == ["v1"]
+
+    with pytest.raises(VersaoInvalida):
+        registro.reverter()
+
+
+def test_troca_mantem_referencia_antiga_valida(registro, atualizador, tmp_path):
+    arquivos = criar_modelo(tmp_path, "modelo")
+    registro.publicar(*arquivos, versao="v1")
+    registro.publicar(*arquivos, versao="v2")
+    registro.ativar("v1")
+
+    antigo = atualizador.recurso.obter()
+    atualizador.ativar("v2")
+
+    assert atualizador.recurso.obter().versao == "v2"
+    assert antigo.versao == "v1"
+    assert antigo.predict_intent("olá").intent in ("saudacoes", "pagamento")
+
+
+def test_modelo_invalido_nao_e_ativado(registro, atualizador, tmp_path):
+    registro.publicar(*criar_modelo(tmp_path, "bom"), versao="v1")
+    registro.publicar(*criar_modelo(tmp_path, "ruim", input_size=3), versao="v2")
+    registro.ativar("v1")
+    atualizador.recurso.obter()
+
+    with pytest.raises(ValueError):
+        atualizador.ativar("v2")
+
+    assert registro.versao_ativa() == "v1"
+    assert atualizador.versao_carregada == "v1"
+
+
+def test_worker_detecta_versao_ativada_por_outro_processo(registro, atualizador, tmp_path):
+    arquivos = criar_modelo(tmp_path, "modelo")
+    registro.publicar(*arquivos, versao="v1")
+    registro.publicar(*arquivos, versao="v2")
+    registro.ativar("v1")
+    atualizador.recurso.obter()
+
+    registro.ativar("v2")
+    atualizador.verificar()
+
+    for _ in range(100):
+        if atualizador.versao_carregada == "v2":
+            break
+        time.sleep(0.02)
+    assert atualizador.versao_carregada == "v2"
+
+
+def test_escritas_simultaneas_nao_disputam_o_temporario(tmp_path):
+    caminho = str(tmp_path / "ativo")
+
+    def escrever(i):
+        for _ in range(50):
+            _escrever_atomico(caminho, f"v{i}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(escrever, range(8)))
+
+    assert open(caminho, encoding="utf-8").read() in {f"v{i}" for i in range(8)}
+    assert os.listdir(tmp_path) == ["ativo"]
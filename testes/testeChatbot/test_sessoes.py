@@ -0,0 +1,99 @@
+import pytest
+
+from app.chatbot.sessoes import (
+    CONFIRMANDO_DADOS,
+    INICIO,
+    ConversationState,
+    ItemCarrinho,
+    SESSION_HEADER,
+    SessionStore,
+)
+
+
+def test_sessoes_tem_estados_independentes():
+    store = SessionStore()
+    a = store.obter("a")
+    b = store.obter("b")
+
+    a.selected_products.append(ItemCarrinho("1", "G5", 100.0))
+
+    assert store.obter("a") is a
+    assert b.selected_products == []
+
+
+def test_sessao_menos_usada_e_descartada_no_limite():
+    store = SessionStore(max_sessoes=2)
+    store.obter("a")
+    store.obter("b")
+    store.obter("a")
+    store.obter("c")
+
+    assert "a" in store
+    assert "b" not in store
+    assert len(store) == 2
+
+
+def test_sessao_expirada_recomeca_vazia():
+    store = SessionStore(ttl=-1)
+    estado = store.obter("a")
+    estado.etapa = CONFIRMANDO_DADOS
+
+    novo = store.obter("a")
+    assert novo is not estado
+    assert isinstance(novo, ConversationState)
+    assert novo.etapa == INICIO
+
+
+def test_estado_nao_aceita_atributos_novos():
+    estado = ConversationState()
+
+    assert not hasattr(estado, "__dict__")
+    with pytest.raises(AttributeError):
+        estado.agendamento_data = {}
+
+
+def test_item_do_carrinho_guarda_id_e_precos():
+    item = ItemCarrinho.de_documento(
+        {"_id": 42, "nome": "G5", "preco": 100, "preco_mao_obra": 50, "descricao": "..."}
+    )
+
+    assert item == ItemCarrinho("42", "G5", 100.0, 50.0, None)
+    assert item.total == 150.0
+
+
+def test_id_de_sessao_aceita_apenas_o_formato_gerado():
+    assert SessionStore.id_valido(SessionStore.novo_id())
+    assert not SessionStore.id_valido(None)
+    assert not SessionStore.id_valido("")
+    assert not SessionStore.id_valido("a" * 31)
+    assert not SessionStore.id_valido("a" * 33)
+    assert not SessionStore.id_valido("A" * 32)
+    assert not SessionStore.id_valido("x" * 5000)
+
+
+def test_rota_substitui_id_de_sessao_fora_do_formato():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    valido = SessionStore.novo_id()
+
+    resposta = client.post("/chatbot/reset", headers={SESSION_HEADER: valido})
+    assert resposta.headers[SESSION_HEADER] == valido
+
+    resposta = client.post("/chatbot/reset", headers={SESSION_HEADER: "x" * 5000})
+    novo = resposta.headers[SESSION_HEADER]
+    assert novo != "x" * 5000
+    assert SessionStore.id_valido(novo)
+
+
+def test_rota_recusa_mensagens_acima_do_limite():
+    from fastapi.testclient import TestClient
+    from app.schemas.chatbot import MAX_TAMANHO_MENSAGEM
+    from main import app
+
+    client = TestClient(app)
+    grande = "a" * (MAX_TAMANHO_MENSAGEM + 1)
+
+    assert client.post("/chatbot/message", json={"message": grande}).status_code == 422
+    assert client.post("/chatbot/classify/batch", json={"messages": ["oi", grande]}).status_code == 422
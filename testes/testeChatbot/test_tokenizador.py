@@ -0,0 +1,18 @@
+from app.chatbot.tokenizador import tokenizar
+
+
+def test_remove_acentos_e_pontuacao():
+    assert tokenizar("Multimídia? Instalação!") == ["multimidia", "instalacao"]
+
+
+def test_reduz_plurais_para_o_singular():
+    assert tokenizar("opções insulfims produtos itens") == [
+        "opcao",
+        "insulfim",
+        "produto",
+        "item",
+    ]
+
+
+def test_mantem_modelos_e_horarios():
+    assert tokenizar("G5 sábado 9h") == ["g5", "sabado", "9h"]
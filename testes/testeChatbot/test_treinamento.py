@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from app.chatbot.inferencia import MotorNumpy
+from app.chatbot.treinamento import (
+    Hiperparametros,
+    ResultadoTreino,
+    _ordem,
+    buscar_hiperparametros,
+    combinacoes,
+    dividir_treino_validacao,
+    escolher_melhor,
+    formatar_acuracia,
+    imprimir_relatorio,
+    treinar_modelo,
+)
+
+
+@pytest.fixture
+def dados():
+    # Quatro classes, cada uma ativada por um bloco próprio de palavras
+    rng = np.random.default_rng(0)
+    X, y = [], []
+    for classe in range(4):
+        for _ in range(10):
+            linha = (rng.random(20) < 0.05).astype(np.float32)
+            linha[classe * 5 : classe * 5 + 5] = rng.random(5) < 0.6
+            linha[classe * 5] = 1
+            X.append(linha)
+            y.append(classe)
+    return np.array(X), np.array(y)
+
+
+def test_divisao_mantem_intents_pequenas_no_treino():
+    X = np.eye(12, dtype=np.float32)
+    y = np.array([0] * 10 + [1] * 2)
+
+    X_treino, y_treino, X_val, y_val = dividir_treino_validacao(X, y, fracao=0.2)
+
+    assert list(y_val) == [0, 0]
+    assert list(y_treino).count(1) == 2
+    assert len(X_treino) + len(X_val) == 12
+
+
+def test_parada_antecipada_restaura_melhor_epoca(dados):
+    X, y = dados
+    X_treino, y_treino, X_val, y_val = dividir_treino_validacao(X, y)
+
+    model, resultado = treinar_modelo(
+        X_treino, y_treino, 4, Hiperparametros(lr=0.01), 2000, X_val, y_val, paciencia=20
+    )
+
+    assert resultado.epocas < 2000
+    assert resultado.acuracia == 1.0
+    motor = MotorNumpy.from_state_dict(model.state_dict())
+    assert (motor.predict(X_val) == y_val).all()
+
+
+def test_busca_ordena_pela_acuracia(dados):
+    X, y = dados
+    X_treino, y_treino, X_val, y_val = dividir_treino_validacao(X, y)
+    candidatos = combinacoes({"hidden_sizes": [(16, 8)], "dropout": [0.2], "lr": [0.01, 1e-5]})
+
+    resultados = buscar_hiperparametros(
+        X_treino, y_treino, X_val, y_val, 4, candidatos, processos=1, max_epocas=100
+    )
+
+    assert [r.hiperparametros.lr for r in resultados] == [0.01, 1e-5]
+    assert resultados[0].acuracia >= resultados[1].acuracia
+
+
+def test_treino_divergente_fica_registrado_como_falho(dados):
+    X, y = dados
+    X_treino, y_treino, X_val, y_val = dividir_treino_validacao(X, y)
+
+    # Perda de validação NaN em todas as épocas, como quando o treino diverge
+    X_val = np.full_like(X_val, np.nan)
+
+    _, resultado = treinar_modelo(X_treino, y_treino, 4, Hiperparametros(), 5, X_val, y_val)
+
+    assert resultado.acuracia == 0.0
+    assert resultado.perda == float("inf")
+
+
+def test_relatorio_e_ordenacao_aceitam_resultado_sem_acuracia(capsys):
+    resultados = [
+        ResultadoTreino(Hiperparametros(lr=0.01), None, 0.1, 10, 1.0),
+        ResultadoTreino(Hiperparametros(lr=0.005), 0.5, float("nan"), 10, 1.0),
+        ResultadoTreino(Hiperparametros(lr=0.001), 0.5, 0.3, 10, 1.0),
+    ]
+
+    ordenados = sorted(resultados, key=_ordem)
+    imprimir_relatorio(ordenados)
+
+    assert [r.hiperparametros.lr for r in ordenados] == [0.001, 0.005, 0.01]
+    assert capsys.readouterr().out.splitlines()[-1].split()[-4] == "-"
+
+
+def test_escolha_do_melhor_recusa_busca_sem_convergencia():
+    convergiu = ResultadoTreino(Hiperparametros(), None, 0.2, 10, 1.0)
+    divergiu = ResultadoTreino(Hiperparametros(lr=0.01), 0.0, float("inf"), 0, 1.0)
+
+    assert escolher_melhor([convergiu, divergiu]) is convergiu
+    assert formatar_acuracia(convergiu.acuracia) == "-"
+    with pytest.raises(ValueError):
+        escolher_melhor([divergiu])
+    with pytest.raises(ValueError):
+        escolher_melhor([ResultadoTreino(Hiperparametros(), None, float("nan"), 10, 1.0)])
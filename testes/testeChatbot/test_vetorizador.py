@@ -0,0 +1,23 @@
+import numpy as np
+
+from app.chatbot.vetorizador import BagOfWords
+
+
+def test_transform_marca_apenas_palavras_conhecidas():
+    vetorizador = BagOfWords(["comprar", "oi", "tchau"])
+
+    resultado = vetorizador.transform(["oi", "comprar", "oi", "desconhecida"])
+
+    assert resultado.dtype == np.float32
+    assert resultado.tolist() == [[1, 1, 0]]
+
+
+def test_transform_batch_equivale_a_transform_por_mensagem():
+    vetorizador = BagOfWords(["comprar", "oi", "tchau"])
+    documentos = [["oi"], [], ["tchau", "comprar"]]
+
+    matriz = vetorizador.transform_batch(documentos)
+
+    assert matriz.shape == (3, 3)
+    for linha, palavras in zip(matriz, documentos):
+        assert linha.tolist() == vetorizador.transform(palavras)[0].tolist()
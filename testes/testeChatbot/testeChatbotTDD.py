@@ -1,5 +1,6 @@
 import pytest
 from app.chatbot.chatbot import ChatbotAssistant
+from app.chatbot.sessoes import CONFIRMANDO_DADOS, INICIO, ConversationState
 
 @pytest.fixture
 def assistant():
@@ -18,32 +19,36 @@ def assistant():
 
     return bot
 
-def test_fluxo_cadastro_valido(assistant):
+@pytest.fixture
+def estado():
+    return ConversationState()
+
+def test_fluxo_cadastro_valido(assistant, estado):
     entrada = "João Silva, joao@email.com, 11999999999"
-    resposta = assistant.process_message(entrada)
+    resposta = assistant.process_message(entrada, estado)
 
     assert "confirme seus dados" in resposta
-    assert assistant.awaiting_confirmation is True
+    assert estado.etapa == CONFIRMANDO_DADOS
 
-def test_confirma_dados_e_cadastra_cliente(assistant):
+def test_confirma_dados_e_cadastra_cliente(assistant, estado):
     # Simular estado após envio dos dados
-    assistant.client_data_temp = {
+    estado.client_data_temp = {
         "nome": "João Silva",
         "email": "joao@email.com",
         "telefone": "11999999999"
     }
-    assistant.awaiting_confirmation = True
+    estado.etapa = CONFIRMANDO_DADOS
 
-    resposta = assistant.process_message("dados corretos")
+    resposta = assistant.process_message("dados corretos", estado)
 
-    assert "✅ Dados confirmados" in resposta
-    assert assistant.awaiting_confirmation is False
-    assert assistant.client_data["nome"] == "João Silva"
+    assert "✅ Dados confirmados" in resposta["response"]
+    assert estado.etapa == INICIO
+    assert estado.client_data["nome"] == "João Silva"
 
-def test_dados_incorretos_reinicia_fluxo(assistant):
-    assistant.awaiting_confirmation = True
-    resposta = assistant.process_message("dados incorretos")
+def test_dados_incorretos_reinicia_fluxo(assistant, estado):
+    estado.etapa = CONFIRMANDO_DADOS
+    resposta = assistant.process_message("dados incorretos", estado)
 
     assert "reenvie seus dados" in resposta
-    assert assistant.client_data_temp is None
-    assert assistant.awaiting_confirmation is False
+    assert estado.client_data_temp is None
+    assert estado.etapa == INICIO
@@ -170,13 +170,19 @@ function Chatbot() {
       const token = localStorage.getItem("token");
       const headers = { "Content-Type": "application/json" };
       if (token) headers.Authorization = `Bearer ${token}`;
+      const sessionId = sessionStorage.getItem("chatbotSessionId");
+      if (sessionId) headers["X-Session-Id"] = sessionId;
       const response = await fetch("http://localhost:8000/chatbot/message", {
         method: "POST",
         headers,
+        credentials: "include",
         body: JSON.stringify({ message }),
       });
       if (!response.ok)
         throw new Error(`HTTP error! status: ${response.status}`);
+      // Guarda o id da conversa para que o backend mantenha o carrinho desta aba
+      const novoSessionId = response.headers.get("X-Session-Id");
+      if (novoSessionId) sessionStorage.setItem("chatbotSessionId", novoSessionId);
       return await response.json();
     } catch (error) {
       console.error("Erro:", error);